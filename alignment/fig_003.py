@@ -3,11 +3,17 @@ fig_003: ATPE — From Ordinal to Temporal Encoding
 Detailed diagram of the Absolute Temporal Positional Encoding module.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.atpe import draw_encoding, normalize_timestamps  # noqa: E402
+
 # ── colour palette ──────────────────────────────────────────────────
 BG       = "#FFFFFF"
 DARK     = "#1B2A4A"
@@ -23,6 +29,10 @@ GRAY     = "#BDC3C7"
 LGRAY    = "#F2F3F4"
 TXTCOL   = "#2C3E50"
 
+# ── encoding shown in the heatmap ──────────────────────────────────
+D_MODEL   = 128   # ATPE width in the model
+N_PATCHES = 512   # irregularly spaced patch midpoints
+
 fig = plt.figure(figsize=(11, 16), facecolor=BG, dpi=200)
 ax = fig.add_axes([0, 0, 1, 1])
 ax.set_xlim(0, 11)
@@ -173,30 +183,24 @@ heatmap_x = 8.5
 heatmap_y = 10.6
 hm_w, hm_h = 2.05, 2.0
 
-# Generate sinusoidal encoding matrix for heatmap
-n_pos = 20
-d_model = 64  # show 64 dims for visualization
-positions = np.linspace(0, 1, n_pos)
-encoding = np.zeros((n_pos, d_model))
-for i in range(d_model // 2):
-    freq = 1.0 / (10000 ** (2 * i / 128))
-    encoding[:, 2 * i]     = np.sin(positions * freq * 2 * np.pi * (i + 1))
-    encoding[:, 2 * i + 1] = np.cos(positions * freq * 2 * np.pi * (i + 1))
-
-# Create inset axes for heatmap
+# Irregular patch midpoints (exponential gaps), normalised to [0, 1]
+rng = np.random.default_rng(0)
+timestamps = normalize_timestamps(np.cumsum(rng.exponential(size=N_PATCHES)))
+
+# Create inset axes for heatmap: the ATPE encoding itself, at the real
+# d_model, scaled so uniform timestamps would give standard PE
 hm_ax = fig.add_axes([heatmap_x / 11, heatmap_y / 16,
                        hm_w / 11, hm_h / 16])
-im = hm_ax.imshow(encoding.T, aspect="auto", cmap="RdBu_r",
-                   interpolation="nearest", vmin=-1, vmax=1)
+im = draw_encoding(hm_ax, timestamps, D_MODEL, scale=N_PATCHES - 1)
 hm_ax.set_xlabel("Norm. Time", fontsize=6.5, color=DARK, labelpad=1)
 hm_ax.set_ylabel("Encoding Dim", fontsize=6.5, color=DARK, labelpad=1)
 hm_ax.set_title("Sinusoidal Encoding Matrix", fontsize=7.5,
                  fontweight="bold", color=ACCENT1, pad=3)
 hm_ax.tick_params(axis="both", labelsize=5.5, colors=DARK, pad=1)
-hm_ax.set_xticks([0, n_pos - 1])
+hm_ax.set_xticks([0, 1])
 hm_ax.set_xticklabels(["0", "1"])
-hm_ax.set_yticks([0, d_model - 1])
-hm_ax.set_yticklabels(["0", f"{d_model-1}"])
+hm_ax.set_yticks([0, D_MODEL - 1])
+hm_ax.set_yticklabels(["0", f"{D_MODEL-1}"])
 
 # Colorbar
 cbar = fig.colorbar(im, ax=hm_ax, fraction=0.06, pad=0.04)
@@ -217,14 +221,14 @@ draw_arrow(right_x + rcol_w / 2, stage4_y, right_x + rcol_w / 2, stage4_y - 0.85
 stage5_y = 6.8
 draw_box(right_x, stage5_y, rcol_w, 0.85, LIGHT3, ACCENT3,
          "Temporal Embeddings", fontsize=11,
-         sublabel="d_model = 128")
+         sublabel=f"d_model = {D_MODEL}")
 
 # =====================================================================
 #  PARAMETER ANNOTATION
 # =====================================================================
 param_x = right_x + rcol_w + 0.15
 param_y = 8.9
-ax.annotate("~16K params\n(128 × 128)",
+ax.annotate(f"~{D_MODEL * D_MODEL // 1000}K params\n({D_MODEL} × {D_MODEL})",
             xy=(right_x + rcol_w, stage4_y + 0.42),
             xytext=(param_x + 0.05, param_y),
             fontsize=9, fontweight="bold", color=ACCENT4,
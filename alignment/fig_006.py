@@ -1,24 +1,49 @@
 """
 fig_006: Parameter Budget Breakdown
 Two-level visualization:
-  (1) Main bar chart comparing Encoder (~1.5M), TPA Total (~4.3M), LLM (~1B)
-      with broken y-axis to handle the ~230x scale difference.
-  (2) Inset donut chart breaking TPA into ATPE (~16K), Anchor Injector (~260K),
-      Cross-Attention (~4M) with manually placed labels to avoid overlap.
+  (1) Main bar chart comparing Encoder, TPA Total and the frozen LLM
+      with broken y-axis to handle the ~275x scale difference.
+  (2) Inset donut chart breaking TPA into ATPE, Anchor Injector and
+      Cross-Attention with manually placed labels to avoid overlap.
+Parameter counts are computed from the architecture config by figkit.params.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
-# ── Data ──────────────────────────────────────────────────────────────────────
-main_labels = ["Encoder", "TPA (Total)", "Frozen LLM\n(Llama-3.2-1B)"]
-main_values = [1.5, 4.3, 1000.0]  # in millions
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.params import (LLMS, Budget, anchor_injector, atpe, decoder,  # noqa: E402
+                           format_params, patch_encoder, temporal_cross_attention)
+
+# ── Architecture ──────────────────────────────────────────────────────────────
+LLM = "Llama-3.2-1B"
+D_MODEL = 128       # encoder / ATPE width
+XATTN_HEADS = 4     # temporally-biased cross-attention, 128 dims per head
 
+d_llm = LLMS[LLM].hidden
+budget = Budget()
+# TransformerCNNEncoder; ATPE replaces its learned positional embedding
+budget.add("Encoder", patch_encoder(4, D_MODEL, layers=6, heads=8, ff=1024))
+budget.add("ATPE", atpe(D_MODEL))
+budget.add("Anchor Injector", anchor_injector(D_MODEL, d_llm))
+budget.add("Cross-Attention", temporal_cross_attention(d_llm, XATTN_HEADS, dim_head=128))
+budget.add(LLM, decoder(LLMS[LLM]), trainable=False)
+
+# ── Data ──────────────────────────────────────────────────────────────────────
 tpa_labels = ["ATPE", "Anchor Injector", "Cross-Attention"]
-tpa_values_k = [16, 260, 4000]  # in thousands
+tpa_counts = [budget[name].params for name in tpa_labels]
+tpa_total = sum(tpa_counts)
+tpa_values_k = [n / 1e3 for n in tpa_counts]  # in thousands
 tpa_pcts = [v / sum(tpa_values_k) * 100 for v in tpa_values_k]
 
+main_labels = ["Encoder", "TPA (Total)", f"Frozen LLM\n({LLM})"]
+main_counts = [budget["Encoder"].params, tpa_total, budget[LLM].params]
+main_values = [n / 1e6 for n in main_counts]  # in millions
+
 # ── Colors ────────────────────────────────────────────────────────────────────
 color_encoder = "#4A90C4"      # steel blue
 color_tpa_total = "#E07B54"    # warm orange
@@ -51,14 +76,18 @@ for ax in [ax_top, ax_bot]:
                   edgecolor="white", linewidth=1.8, zorder=3)
 
 # Top portion: only shows the LLM bar
-ax_top.set_ylim(850, 1080)
-ax_top.set_yticks([900, 1000])
-ax_top.set_yticklabels(["900M", "1,000M"], fontsize=10)
+top_low, top_high = 0.85 * main_values[2], 1.08 * main_values[2]
+top_ticks = np.arange(np.ceil(top_low / 100) * 100, top_high, 100)
+ax_top.set_ylim(top_low, top_high)
+ax_top.set_yticks(top_ticks)
+ax_top.set_yticklabels([f"{t / 1000:g}B" for t in top_ticks], fontsize=10)
 
 # Bottom portion: shows Encoder and TPA bars
-ax_bot.set_ylim(0, 10)
-ax_bot.set_yticks([0, 2, 4, 6, 8, 10])
-ax_bot.set_yticklabels(["0", "2M", "4M", "6M", "8M", "10M"], fontsize=10)
+bot_high = 5 * np.ceil(max(main_values[:2]) * 2 / 5)
+bot_ticks = np.linspace(0, bot_high, 6)
+ax_bot.set_ylim(0, bot_high)
+ax_bot.set_yticks(bot_ticks)
+ax_bot.set_yticklabels(["0"] + [f"{t:g}M" for t in bot_ticks[1:]], fontsize=10)
 
 # Hide spines between the two axes
 ax_top.spines["bottom"].set_visible(False)
@@ -75,7 +104,7 @@ ax_bot.plot((-d, +d), (1 - d, 1 + d), **kwargs)
 ax_bot.plot((1 - d, 1 + d), (1 - d, 1 + d), **kwargs)
 
 # Annotate bars with exact parameter counts
-annotations = ["~1.5M", "~4.3M", "~1B"]
+annotations = [f"~{format_params(n)}" for n in main_counts]
 ann_colors = ["#2E5C82", "#B85A33", "#3E7A4E"]  # darker versions
 
 # Encoder and TPA labels on bottom axes
@@ -123,16 +152,17 @@ wedges, _ = ax_donut.pie(
 # Center text (inside the donut hole)
 ax_donut.text(0, 0.08, "Total", ha="center", va="center",
               fontsize=12, color="#666666", fontweight="medium", zorder=10)
-ax_donut.text(0, -0.12, "~4.3M", ha="center", va="center",
+ax_donut.text(0, -0.12, f"~{format_params(tpa_total)}", ha="center", va="center",
               fontsize=17, color="#333333", fontweight="bold", zorder=10)
 
 # Manual label positions to avoid overlap
-# ATPE is tiny (0.4%), Anchor is small (6.0%), Cross-Attn is dominant (93.0%)
+# ATPE and the Anchor Injector are thin slivers; Cross-Attn dominates
+label_positions = [(1.45, 1.05), (1.45, 0.45), (1.35, -0.85)]
 label_info = [
     # (label_text, xytext position, color)
-    ("ATPE\n~16K (0.4%)",        (1.45, 1.05),  color_atpe),
-    ("Anchor Injector\n~260K (6.0%)", (1.45, 0.45), color_anchor),
-    ("Cross-Attention\n~4M (93.0%)",  (1.35, -0.85), color_crossattn),
+    (f"{name}\n~{format_params(n)} ({pct:.1f}%)", xytext, color)
+    for name, n, pct, xytext, color in zip(tpa_labels, tpa_counts, tpa_pcts,
+                                           label_positions, tpa_colors)
 ]
 
 for i, (wedge, (label, xytext, color)) in enumerate(zip(wedges, label_info)):
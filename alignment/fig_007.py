@@ -5,11 +5,17 @@ as a clean grid/matrix with checkmarks and X marks, plus a progressive
 building-blocks sidebar.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.grid import cell_grid  # noqa: E402
+
 # ---------------------------------------------------------------------------
 # Data
 # ---------------------------------------------------------------------------
@@ -95,7 +101,7 @@ for j, comp in enumerate(components):
     ax.text(cx, cy - 0.22, param_costs[j], ha="center", va="center",
             fontsize=7.5, color="#C0C8D8", fontfamily="sans-serif")
 
-# Row headers + cells
+# Row headers
 for i, var in enumerate(variants):
     row_y = y_start + (2 - i) * cell_h
     row_color = ROW_EVEN if i % 2 == 0 else ROW_ODD
@@ -114,24 +120,14 @@ for i, var in enumerate(variants):
             ha="center", va="center", fontsize=8, color="#7F8C8D",
             fontfamily="sans-serif", style="italic")
 
-    for j in range(3):
-        cx = x_start + j * cell_w + cell_w / 2
-        cy = row_y + cell_h / 2
-
-        if matrix[i, j]:
-            circle = plt.Circle((cx, cy), 0.24, facecolor="#E8F8F0",
-                                edgecolor=CHECK_CLR, linewidth=2)
-            ax.add_patch(circle)
-            ax.text(cx, cy, "\u2713", ha="center", va="center",
-                    fontsize=18, fontweight="bold", color=CHECK_CLR,
-                    fontfamily="sans-serif")
-        else:
-            circle = plt.Circle((cx, cy), 0.24, facecolor="#FDEDEC",
-                                edgecolor=CROSS_CLR, linewidth=2)
-            ax.add_patch(circle)
-            ax.text(cx, cy, "\u2717", ha="center", va="center",
-                    fontsize=18, fontweight="bold", color=CROSS_CLR,
-                    fontfamily="sans-serif")
+# Cells: check / cross circles, variants from the top row down
+cell_grid(ax, facecolors=np.where(matrix, "#E8F8F0", "#FDEDEC"),
+          origin=(x_start + cell_w / 2, y_start + 2.5 * cell_h), step=(cell_w, -cell_h),
+          shape="circle", size=0.48, linewidth=2,
+          edgecolor=np.where(matrix, CHECK_CLR, CROSS_CLR),
+          labels=np.where(matrix, "\u2713", "\u2717"),
+          label_colors=np.where(matrix, CHECK_CLR, CROSS_CLR),
+          fontsize=18, fontweight="bold", fontfamily="sans-serif")
 
 # =========================================================================
 # RIGHT PANEL — Progressive Building Blocks
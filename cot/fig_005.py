@@ -3,13 +3,18 @@ fig_005: GRPO Training Pipeline — Data Flow Diagram
 Visualizes one GRPO training step per Section 4.2, 4.3, 4.5 of the plan.
 """
 
+import os
+import sys
+
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 import matplotlib.patheffects as pe
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.diagram import Diagram  # noqa: E402
+
 # ── colour palette ──────────────────────────────────────────────────
 BLUE        = "#3B82F6"   # policy-model operations
 BLUE_LIGHT  = "#DBEAFE"
@@ -31,17 +36,18 @@ ax.set_ylim(0, 9.6)
 ax.axis("off")
 fig.patch.set_facecolor(WHITE)
 ax.set_facecolor(WHITE)
+diagram = Diagram(ax)
 
 # ── helper: rounded box ────────────────────────────────────────────
-def draw_box(ax, x, y, w, h, facecolor, edgecolor, label_lines,
+def draw_box(d, x, y, w, h, facecolor, edgecolor, label_lines,
              sublabel=None, fontsize=11, fontweight="bold",
              sublabel_fontsize=9, linewidth=2.0):
-    """Draw a rounded rectangle with label and optional sublabel."""
-    box = FancyBboxPatch((x, y), w, h,
-                         boxstyle="round,pad=0.18",
-                         facecolor=facecolor, edgecolor=edgecolor,
-                         linewidth=linewidth, zorder=2)
-    ax.add_patch(box)
+    """Draw a rounded rectangle with label and optional sublabel on diagram *d*."""
+    ax = d.ax
+    d.box(x, y, w, h,
+          boxstyle="round,pad=0.18",
+          facecolor=facecolor, edgecolor=edgecolor,
+          linewidth=linewidth, zorder=2)
     cx, cy = x + w / 2, y + h / 2
     if sublabel:
         ax.text(cx, cy + 0.20, label_lines,
@@ -57,14 +63,12 @@ def draw_box(ax, x, y, w, h, facecolor, edgecolor, label_lines,
     return (x, y, w, h)  # return geometry for arrow anchoring
 
 # ── helper: arrow ──────────────────────────────────────────────────
-def draw_arrow(ax, start, end, color=GRAY, lw=2.0, style="-|>",
+def draw_arrow(d, start, end, color=GRAY, lw=2.0, style="-|>",
                conn="arc3,rad=0", ls="-", zorder=1, ms=18):
-    arrow = FancyArrowPatch(
-        start, end,
-        arrowstyle=style, color=color,
-        linewidth=lw, connectionstyle=conn,
-        mutation_scale=ms, zorder=zorder, linestyle=ls)
-    ax.add_patch(arrow)
+    d.arrow(*start, *end,
+            style=style, color=color,
+            lw=lw, connectionstyle=conn,
+            mutation_scale=ms, zorder=zorder, linestyle=ls)
 
 # ── helper: circled step number ────────────────────────────────────
 def step_num(ax, x, y, num, color):
@@ -107,26 +111,26 @@ x6 = x5 + W_ADV + GAP
 by = MAIN_Y - BH / 2  # box bottom-y
 
 # ── (1) Time-series input ──────────────────────────────────────────
-b1 = draw_box(ax, x1, by, W_INP, BH,
+b1 = draw_box(diagram, x1, by, W_INP, BH,
               INPUT_BG, GRAY,
               "Time-Series\nInput", sublabel="prompt  x")
 step_num(ax, x1 + 0.28, by + BH + 0.35, 1, BLUE)
 
 # ── (2a) Policy model ─────────────────────────────────────────────
-b2 = draw_box(ax, x2, by, W_POL, BH,
+b2 = draw_box(diagram, x2, by, W_POL, BH,
               BLUE_LIGHT, BLUE,
               "Policy Model", sublabel="$\\pi_\\theta$",
               fontsize=12)
 
 # ── (2b) Sampling ─────────────────────────────────────────────────
-b3 = draw_box(ax, x3, by, W_SAMP, BH,
+b3 = draw_box(diagram, x3, by, W_SAMP, BH,
               BLUE_LIGHT, BLUE,
               "Sample G = 8\nCoT Completions", sublabel="T = 0.7",
               fontsize=10.5)
 step_num(ax, x3 + 0.28, by + BH + 0.35, 2, BLUE)
 
 # ── (3) Reward function ───────────────────────────────────────────
-b4 = draw_box(ax, x4, by, W_REW, BH,
+b4 = draw_box(diagram, x4, by, W_REW, BH,
               GREEN_LIGHT, GREEN,
               "Reward\nFunction", sublabel="$r = r_c + r_f$")
 step_num(ax, x4 + 0.28, by + BH + 0.35, 3, GREEN)
@@ -136,7 +140,7 @@ ax.text(x4 + W_REW / 2, by - 0.30,
         fontsize=8.5, color=GREEN, zorder=3)
 
 # ── (4) Advantages ────────────────────────────────────────────────
-b5 = draw_box(ax, x5, by, W_ADV, BH,
+b5 = draw_box(diagram, x5, by, W_ADV, BH,
               ORANGE_LIGHT, ORANGE,
               "Group-Normalized\nAdvantages",
               sublabel="$\\hat{A}_i = (r_i - \\mu)\\,/\\,(\\sigma + \\delta)$",
@@ -144,7 +148,7 @@ b5 = draw_box(ax, x5, by, W_ADV, BH,
 step_num(ax, x5 + 0.28, by + BH + 0.35, 4, ORANGE)
 
 # ── (5) Policy gradient update ────────────────────────────────────
-b6 = draw_box(ax, x6, by, W_UPD, BH,
+b6 = draw_box(diagram, x6, by, W_UPD, BH,
               BLUE_LIGHT, BLUE,
               "Policy Gradient\nUpdate",
               sublabel="$\\epsilon = 0.2$,  $\\beta = 0.04$",
@@ -155,7 +159,7 @@ step_num(ax, x6 + 0.28, by + BH + 0.35, 5, BLUE)
 REF_W, REF_H = 3.0, 1.2
 ref_x = (x4 + W_REW / 2 + x6 + W_UPD / 2) / 2 - REF_W / 2
 ref_y = 1.5
-bref = draw_box(ax, ref_x, ref_y, REF_W, REF_H,
+bref = draw_box(diagram, ref_x, ref_y, REF_W, REF_H,
                 RED_LIGHT, RED,
                 "Reference Model",
                 sublabel="$\\pi_{\\mathrm{ref}}$  (SFT policy)",
@@ -167,21 +171,21 @@ bref = draw_box(ax, ref_x, ref_y, REF_W, REF_H,
 arr_y = MAIN_Y  # arrows at vertical centre
 
 # input → policy
-draw_arrow(ax, (x1 + W_INP, arr_y), (x2, arr_y), color=GRAY, lw=2.2)
+draw_arrow(diagram, (x1 + W_INP, arr_y), (x2, arr_y), color=GRAY, lw=2.2)
 # policy → sampling
-draw_arrow(ax, (x2 + W_POL, arr_y), (x3, arr_y), color=BLUE, lw=2.2)
+draw_arrow(diagram, (x2 + W_POL, arr_y), (x3, arr_y), color=BLUE, lw=2.2)
 # sampling → reward
-draw_arrow(ax, (x3 + W_SAMP, arr_y), (x4, arr_y), color=BLUE, lw=2.2)
+draw_arrow(diagram, (x3 + W_SAMP, arr_y), (x4, arr_y), color=BLUE, lw=2.2)
 # reward → advantages
-draw_arrow(ax, (x4 + W_REW, arr_y), (x5, arr_y), color=GREEN, lw=2.2)
+draw_arrow(diagram, (x4 + W_REW, arr_y), (x5, arr_y), color=GREEN, lw=2.2)
 # advantages → update
-draw_arrow(ax, (x5 + W_ADV, arr_y), (x6, arr_y), color=ORANGE, lw=2.2)
+draw_arrow(diagram, (x5 + W_ADV, arr_y), (x6, arr_y), color=ORANGE, lw=2.2)
 
 # ====================================================================
 # FEEDBACK ARROW: update → policy (curved, on top)
 # ====================================================================
 # Use annotation with a manual curved path going ABOVE the boxes
-draw_arrow(ax,
+draw_arrow(diagram,
            (x6 + W_UPD / 2, by + BH),          # top of update box
            (x2 + W_POL / 2, by + BH),           # top of policy box
            color=BLUE, lw=2.2, style="-|>",
@@ -199,7 +203,7 @@ ax.text(mid_fb_x, 8.55, "update  $\\theta$",
 # ====================================================================
 
 # ref → update  (KL penalty)
-draw_arrow(ax,
+draw_arrow(diagram,
            (ref_x + REF_W * 0.75, ref_y + REF_H),
            (x6 + W_UPD / 2, by),
            color=RED, lw=1.8, style="-|>",
@@ -214,7 +218,7 @@ ax.text(kl_lx, kl_ly, "KL penalty",
                   edgecolor="none", alpha=0.9))
 
 # ref → sampling area (ratio π_ref(y|x))
-draw_arrow(ax,
+draw_arrow(diagram,
            (ref_x + REF_W * 0.25, ref_y + REF_H),
            (x3 + W_SAMP / 2, by),
            color=RED, lw=1.5, style="-|>",
@@ -255,11 +259,10 @@ legend_items = [
 lx_start, ly = 0.6, 0.35
 for i, (fc, ec, label) in enumerate(legend_items):
     lx = lx_start + i * 4.3
-    box = FancyBboxPatch((lx, ly), 0.4, 0.3,
-                         boxstyle="round,pad=0.05",
-                         facecolor=fc, edgecolor=ec,
-                         linewidth=1.5, zorder=2)
-    ax.add_patch(box)
+    diagram.box(lx, ly, 0.4, 0.3,
+                boxstyle="round,pad=0.05",
+                facecolor=fc, edgecolor=ec,
+                linewidth=1.5, zorder=2)
     ax.text(lx + 0.55, ly + 0.15, label,
             ha="left", va="center", fontsize=9, color=DARK, zorder=3)
 
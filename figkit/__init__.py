@@ -0,0 +1,21 @@
+"""
+figkit: shared tooling for the notion-figures scripts.
+
+The figure scripts in this repository are standalone matplotlib programs.
+figkit discovers them, renders them on a pool of warm worker processes and
+redirects their hardcoded output paths to a configurable output root.
+
+Run ``python -m figkit --help`` from the repository root for the CLI.
+"""
+
+from figkit.runner import LEGACY_ROOT, JobResult, WorkerPool, run_script
+from figkit.build import build_all, discover_scripts
+
+__all__ = [
+    "LEGACY_ROOT",
+    "JobResult",
+    "WorkerPool",
+    "build_all",
+    "discover_scripts",
+    "run_script",
+]
@@ -0,0 +1,55 @@
+"""Command-line entry point: ``python -m figkit <command> ...``."""
+
+import argparse
+import sys
+
+from figkit import bench, build, profile, registry, watch
+from figkit.runner import preload, run_script
+
+
+def _configure_run(parser):
+    parser.add_argument("script")
+    parser.add_argument("--out", default=None, help="output root (default: repo root)")
+
+
+def _run(args):
+    preload()
+    result = run_script(args.script, args.out)
+    sys.stdout.write(result.log)
+    if not result.ok:
+        sys.stderr.write(result.error)
+    return 0 if result.ok else 1
+
+
+# name -> (configure(parser), run(args) -> exit code, help)
+COMMANDS = {
+    "build": (build.configure, build.run,
+              "render every figure script on a worker pool"),
+    "watch": (watch.configure, watch.run,
+              "re-render figures in a warm interpreter as they are saved"),
+    "list": (registry.configure_list, registry.run_list,
+             "list registered figures without running them"),
+    "render": (registry.configure_render, registry.run_render,
+               "render selected figures in this process via the registry"),
+    "profile": (profile.configure, profile.run,
+                "time each render phase per figure (cold interpreter each)"),
+    "bench": (bench.configure, bench.run,
+              "micro-benchmark diagram primitives; fail on regressions"),
+    "run": (_configure_run, _run,
+            "render one script in this interpreter"),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m figkit")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, (configure, _, help_text) in COMMANDS.items():
+        configure(sub.add_parser(name, help=help_text))
+
+    args = parser.parse_args(argv)
+    _, run, _ = COMMANDS[args.command]
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Absolute Temporal Positional Encoding (ATPE) for irregular timestamps.
+
+ATPE is the sinusoidal positional encoding evaluated at real (normalised)
+timestamps instead of ordinal indices:
+
+    PE(t, 2i)     = sin(scale * t / base^(2i/d))
+    PE(t, 2i + 1) = cos(scale * t / base^(2i/d))
+
+With *scale* = N - 1 and uniform timestamps it is exactly the standard
+encoding of positions 0..N-1.  ``encode`` computes a block with one
+broadcast outer product of timestamps and frequencies, writing sin and cos
+straight into the interleaved output columns.  ``encode_chunks`` streams
+any number of positions (a million at d_model 4096 is 16 GB in float32)
+one ``CHUNK_BYTES`` band at a time, and ``save_encoding`` writes the stream
+to a memory-mapped ``.npy``:
+
+    from figkit.atpe import draw_encoding, normalize_timestamps
+
+    t = normalize_timestamps(patch_midpoints)
+    mesh = draw_encoding(ax, t, d_model=128, scale=len(t) - 1)
+
+Rows are independent, so a heatmap of N positions decimated to
+*max_positions* columns is computed directly from the sampled timestamps,
+without the full encoding.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+CHUNK_BYTES = 64 << 20
+BASE = 10000.0
+FLOAT32_ANGLE = 256.0
+
+
+def normalize_timestamps(t):
+    """Map timestamps onto [0, 1] (``(t - min) / (max - min)``); constant input maps to 0."""
+    t = np.asarray(t, float)
+    low, high = t.min(), t.max()
+    return (t - low) / (high - low) if high > low else np.zeros_like(t)
+
+
+def frequencies(d_model, base=BASE, dtype=np.float32):
+    """The ``d_model // 2`` angular frequencies ``base^(-2i/d_model)``."""
+    if d_model % 2:
+        raise ValueError(f"d_model must be even, not {d_model}")
+    return np.power(base, -np.arange(0, d_model, 2) / d_model).astype(dtype)
+
+
+def encode(t, d_model, scale=1.0, base=BASE, dtype=np.float32, out=None):
+    """(len(t), d_model) encoding of timestamps *t*; sin in even, cos in odd columns."""
+    if out is None:
+        out = np.empty((len(t), d_model), dtype)
+    positions = np.asarray(t, np.float64) * scale
+    freqs = frequencies(d_model, base, np.float64)
+    # A float32 angle is off by about |angle| * 6e-8 rad, a few hundredths at
+    # a million positions.  Columns whose angles stay below FLOAT32_ANGLE are
+    # computed in float32 (several times faster); the rest, a prefix since
+    # frequencies decrease, in float64.
+    exact = len(freqs)
+    if np.dtype(dtype).itemsize < 8:
+        reach = np.abs(positions).max(initial=0.0) * freqs
+        exact = int(np.count_nonzero(reach > FLOAT32_ANGLE))
+    for cols, work in ((slice(0, exact), np.float64), (slice(exact, None), np.float32)):
+        angles = np.multiply.outer(positions.astype(work), freqs[cols].astype(work))
+        np.sin(angles, out=out[:, 0::2][:, cols])
+        np.cos(angles, out=out[:, 1::2][:, cols])
+    return out
+
+
+def encode_chunks(t, d_model, scale=1.0, base=BASE, dtype=np.float32,
+                  chunk_bytes=CHUNK_BYTES):
+    """Yield ``(first_row, block)`` bands of the encoding of *t*.
+
+    *t* may be a memmap; it is read one band at a time.  Blocks share one
+    buffer, which the next band overwrites: copy a block to keep it.
+    """
+    step = max(1, chunk_bytes // (np.dtype(dtype).itemsize * d_model))
+    buffer = np.empty((min(step, len(t)), d_model), dtype)
+    for start in range(0, len(t), step):
+        stop = min(start + step, len(t))
+        yield start, encode(t[start:stop], d_model, scale, base, dtype,
+                            out=buffer[:stop - start])
+
+
+def save_encoding(path, t, d_model, scale=1.0, base=BASE, dtype=np.float32,
+                  chunk_bytes=CHUNK_BYTES):
+    """Stream the encoding of *t* into a ``.npy`` file; return it memory-mapped."""
+    out = np.lib.format.open_memmap(Path(path), mode="w+", dtype=dtype,
+                                    shape=(len(t), d_model))
+    for start, block in encode_chunks(t, d_model, scale, base, dtype, chunk_bytes):
+        out[start:start + len(block)] = block
+    out.flush()
+    return out
+
+
+def decimate(n, max_count):
+    """At most *max_count* evenly spaced indices into ``range(n)``, ends included."""
+    if n <= max_count:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max_count).round().astype(np.int64))
+
+
+def draw_encoding(ax, t, d_model, scale=1.0, base=BASE, max_positions=512,
+                  max_dims=512, cmap="RdBu_r", **mesh_kwargs):
+    """Heatmap of the encoding, dimensions down and time across; returns the QuadMesh.
+
+    Columns sit at their timestamps, so irregular sampling shows as uneven
+    column widths.  At most *max_positions* x *max_dims* cells are computed
+    and drawn; dimension 0 is at the top, as with ``imshow``.
+    """
+    t = np.asarray(t, float)
+    rows = decimate(len(t), max_positions)
+    dims = decimate(d_model, max_dims)
+    values = encode(t[rows], d_model, scale, base)[:, dims]
+    ts = t[rows]
+    mid = (ts[1:] + ts[:-1]) / 2
+    x_edges = np.r_[ts[0] - (mid[0] - ts[0]), mid, ts[-1] + (ts[-1] - mid[-1])] \
+        if len(ts) > 1 else np.array([ts[0] - 0.5, ts[0] + 0.5])
+    y_edges = np.r_[dims - 0.5, dims[-1] + 0.5] if len(dims) == d_model \
+        else np.linspace(-0.5, d_model - 0.5, len(dims) + 1)
+    mesh_kwargs.setdefault("vmin", -1)
+    mesh_kwargs.setdefault("vmax", 1)
+    mesh = ax.pcolormesh(x_edges, y_edges, values.T, cmap=cmap, shading="flat",
+                         **mesh_kwargs)
+    if not ax.yaxis_inverted():
+        ax.invert_yaxis()
+    return mesh
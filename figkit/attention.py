@@ -0,0 +1,249 @@
+"""
+Attention maps at any sequence length: chunked bias + softmax, block downsampling.
+
+The attention figures compute a (queries x keys) matrix with Python loops
+and draw it with one ``imshow`` cell per entry, which is fine for 8 x 12
+tokens and hopeless for a real 16k x 16k dump.  Here the matrix is produced
+a band of query rows at a time, in float32, and each band is folded
+straight into an output-sized image and a running top-k, so memory stays at
+one band (``CHUNK_BYTES``) plus the output:
+
+    from figkit.attention import attention_map, draw_attention, label_top
+
+    amap = attention_map(logits=scores, t_q=t_ts, t_k=t_text, alpha=1.0,
+                         out_shape=(512, 512), reduce="max", top_k=10)
+    im = draw_attention(ax, amap, cmap="magma")
+    label_top(ax, amap, fontsize=7)
+
+The source is one of ``logits`` (pre-softmax scores), ``q``/``k``
+projections (scores are ``q @ k.T / sqrt(d)``) or ``weights`` (already
+softmaxed, as most attention dumps are).  Leading axes (batch, heads) are
+averaged after the softmax; index a head out first to plot it alone.
+Arrays may be ``np.memmap``s, e.g. from ``load_attention``, and are only
+read one band at a time.
+
+Downsampling splits the rows and columns into ``out_shape`` near-equal
+blocks and keeps each block's max (peaks stay visible) or mean (mass is
+preserved).  Maps no larger than ``out_shape`` are drawn cell for cell.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+CHUNK_BYTES = 64 << 20
+UNTIMED_BIAS = -0.5
+
+_REDUCERS = {"max": np.maximum, "mean": np.add}
+
+
+@dataclass
+class AttentionMap:
+    """A downsampled attention matrix and its largest full-resolution entries."""
+
+    image: np.ndarray        # (out_rows, out_cols) block max or mean
+    shape: tuple             # (n_queries, n_keys) of the full matrix
+    reduce: str
+    top_rows: np.ndarray     # full-resolution indices, largest value first
+    top_cols: np.ndarray
+    top_values: np.ndarray
+
+    @property
+    def extent(self):
+        """``imshow`` extent placing the image on full-resolution cell indices."""
+        n_q, n_k = self.shape
+        return (-0.5, n_k - 0.5, n_q - 0.5, -0.5)
+
+
+def temporal_bias(t_q, t_k, alpha=1.0, untimed=UNTIMED_BIAS, dtype=np.float32):
+    """``-alpha * |t_q[i] - t_k[j]|``; keys without a timestamp (NaN) get *untimed*."""
+    t_q = np.asarray(t_q, dtype)
+    t_k = np.asarray(t_k, dtype)
+    bias = np.abs(t_q[:, None] - t_k[None, :])
+    bias *= -alpha
+    return np.where(np.isnan(t_k), np.asarray(untimed, dtype), bias)
+
+
+def softmax(x, axis=-1, out=None):
+    """Numerically stable softmax; ``out=x`` works in place."""
+    out = np.subtract(x, np.max(x, axis=axis, keepdims=True), out=out)
+    np.exp(out, out=out)
+    out /= out.sum(axis=axis, keepdims=True)
+    return out
+
+
+def _source(logits, q, k, weights):
+    given = [name for name, value in (("logits", logits), ("q", q), ("weights", weights))
+             if value is not None]
+    if len(given) != 1 or (q is None) != (k is None):
+        raise ValueError("pass exactly one of logits=, q= and k=, or weights=")
+    if q is not None:
+        return "qk", (q.shape[:-2], q.shape[-2], k.shape[-2])
+    array = logits if logits is not None else weights
+    return ("logits" if logits is not None else "weights"), (
+        array.shape[:-2], array.shape[-2], array.shape[-1])
+
+
+def attention_chunks(logits=None, *, q=None, k=None, weights=None, t_q=None, t_k=None,
+                     alpha=1.0, untimed=UNTIMED_BIAS, chunk_bytes=CHUNK_BYTES,
+                     dtype=np.float32):
+    """Yield ``(first_row, rows)`` bands of the attention weights.
+
+    Each band is a (rows, n_keys) *dtype* array: scores plus the temporal
+    bias (when *t_q* and *t_k* are given), softmaxed over keys and averaged
+    over any leading axes.  Bands are sized so one holds at most about
+    *chunk_bytes* across all heads.
+    """
+    kind, (lead, n_q, n_k) = _source(logits, q, k, weights)
+    heads = int(np.prod(lead, dtype=int))
+    step = max(1, chunk_bytes // (np.dtype(dtype).itemsize * n_k * heads))
+    timed = t_q is not None and t_k is not None
+    if kind == "qk":
+        keys = np.swapaxes(np.asarray(k, dtype), -1, -2)
+        scale = np.asarray(1 / np.sqrt(q.shape[-1]), dtype)
+    for start in range(0, n_q, step):
+        stop = min(start + step, n_q)
+        if kind == "qk":
+            band = np.matmul(np.asarray(q[..., start:stop, :], dtype), keys)
+            band *= scale
+        else:
+            band = np.array((logits if kind == "logits" else weights)[..., start:stop, :],
+                            dtype)
+        if kind != "weights":
+            if timed:
+                band += temporal_bias(t_q[start:stop], t_k, alpha, untimed, dtype)
+            softmax(band, out=band)
+        if lead:
+            band = band.reshape(heads, stop - start, n_k).mean(axis=0)
+        yield start, band
+
+
+def _edges(n, bins):
+    """Start index of each of *bins* near-equal blocks over ``range(n)``."""
+    return (np.arange(bins) * n + bins - 1) // bins
+
+
+class _BlockReducer:
+    """Folds row bands into an (out_rows, out_cols) block max or block mean."""
+
+    def __init__(self, shape, out_shape, reduce):
+        if reduce not in _REDUCERS:
+            raise ValueError(f"reduce must be one of {sorted(_REDUCERS)}, not {reduce!r}")
+        self.shape = shape
+        self.out_shape = tuple(min(o, n) for o, n in zip(out_shape, shape))
+        self.reduce = reduce
+        self.ufunc = _REDUCERS[reduce]
+        self.col_edges = _edges(shape[1], self.out_shape[1])
+        self.image = np.full(self.out_shape, -np.inf if reduce == "max" else 0.0)
+
+    def add(self, start, band):
+        (n_q, _), (out_rows, _) = self.shape, self.out_shape
+        bins = np.arange(start, start + len(band)) * out_rows // n_q
+        firsts = np.flatnonzero(np.r_[True, bins[1:] != bins[:-1]])
+        block = self.ufunc.reduceat(self.ufunc.reduceat(band, self.col_edges, axis=1),
+                                    firsts, axis=0)
+        rows = bins[firsts]
+        self.image[rows] = self.ufunc(self.image[rows], block)
+
+    def result(self):
+        if self.reduce == "max":
+            return self.image
+        row_counts = np.diff(np.r_[_edges(self.shape[0], self.out_shape[0]), self.shape[0]])
+        col_counts = np.diff(np.r_[self.col_edges, self.shape[1]])
+        return self.image / np.outer(row_counts, col_counts)
+
+
+class _TopK:
+    """The *k* largest entries seen so far, as flat full-resolution indices."""
+
+    def __init__(self, k, n_cols):
+        self.k = k
+        self.n_cols = n_cols
+        self.values = np.empty(0)
+        self.index = np.empty(0, dtype=np.int64)
+
+    def add(self, start, band):
+        if not self.k:
+            return
+        flat = band.ravel()
+        best = np.argpartition(flat, -self.k)[-self.k:] if flat.size > self.k \
+            else np.arange(flat.size)
+        values = np.r_[self.values, flat[best]]
+        index = np.r_[self.index, best + start * self.n_cols]
+        if len(values) > self.k:
+            keep = np.argpartition(values, -self.k)[-self.k:]
+            values, index = values[keep], index[keep]
+        self.values, self.index = values, index
+
+    def result(self):
+        order = np.argsort(self.values, kind="stable")[::-1]
+        rows, cols = np.divmod(self.index[order], self.n_cols)
+        return rows, cols, self.values[order]
+
+
+def attention_map(logits=None, *, q=None, k=None, weights=None, out_shape=(512, 512),
+                  reduce="max", top_k=10, **chunk_kwargs):
+    """Downsample an attention matrix to *out_shape* and find its *top_k* entries.
+
+    Sources and *chunk_kwargs* (``t_q``, ``t_k``, ``alpha``, ``untimed``,
+    ``chunk_bytes``, ``dtype``) are as for ``attention_chunks``.
+    """
+    _, (_, n_q, n_k) = _source(logits, q, k, weights)
+    reducer = _BlockReducer((n_q, n_k), out_shape, reduce)
+    top = _TopK(top_k, n_k)
+    for start, band in attention_chunks(logits, q=q, k=k, weights=weights, **chunk_kwargs):
+        reducer.add(start, band)
+        top.add(start, band)
+    rows, cols, values = top.result()
+    return AttentionMap(image=reducer.result(), shape=(n_q, n_k), reduce=reduce,
+                        top_rows=rows, top_cols=cols, top_values=values)
+
+
+def load_attention(path, key=None):
+    """Open an attention dump without reading it into memory where possible.
+
+    ``.npy`` files are memory-mapped.  ``.npz`` archives return the array
+    *key* (default: the first one), which numpy reads in full.  ``.pt`` /
+    ``.pth`` files need torch; *key* picks an entry of a saved dict.
+    """
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    if path.suffix == ".npz":
+        with np.load(path) as archive:
+            return archive[key or archive.files[0]]
+    if path.suffix in (".pt", ".pth"):
+        try:
+            import torch
+        except ImportError as exc:
+            raise ImportError(f"reading {path.name} requires torch") from exc
+        data = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+        if isinstance(data, dict):
+            data = data[key] if key is not None else next(iter(data.values()))
+        return data.float().numpy()
+    raise ValueError(f"unsupported attention dump: {path.name} (use .npy, .npz or .pt)")
+
+
+def draw_attention(ax, amap, cmap=None, norm=None, **imshow_kwargs):
+    """``imshow`` an ``AttentionMap`` on full-resolution cell indices; returns the image."""
+    imshow_kwargs.setdefault("aspect", "auto")
+    imshow_kwargs.setdefault("interpolation", "nearest")
+    return ax.imshow(amap.image, cmap=cmap, norm=norm, extent=amap.extent, **imshow_kwargs)
+
+
+def label_top(ax, amap, fmt="{:.2f}", colors=("#1E3A5F", "white"), split=None,
+              zorder=6, **text_kwargs):
+    """Write each top-k value of *amap* on its cell; returns the Text artists.
+
+    Values above *split* (default: the middle of the image's range) use
+    ``colors[1]``, the rest ``colors[0]``.  Remaining keywords
+    (``fontsize``, ``fontweight``, ...) go to ``ax.text``.
+    """
+    if split is None:
+        split = (np.nanmin(amap.image) + np.nanmax(amap.image)) / 2
+    text_kwargs.setdefault("ha", "center")
+    text_kwargs.setdefault("va", "center")
+    return [ax.text(col, row, fmt.format(value), color=colors[int(value > split)],
+                    zorder=zorder, **text_kwargs)
+            for row, col, value in zip(amap.top_rows, amap.top_cols, amap.top_values)]
@@ -0,0 +1,193 @@
+"""
+Betting backtests of prediction-market bet logs, for every model and stake policy at once.
+
+A bet log has one row per bet: which model placed it, on which market, on
+which side (1 = YES, 0 = NO), at what price (the probability paid for that
+side), with the model's own probability for the side and the stake it
+actually placed.  A resolution table gives each market's outcome (1 = YES,
+0 = NO; anything else is unresolved, and bets on it are left out).  A
+winning bet of stake s at price p returns s * (1 / p - 1); a losing one
+loses s.
+
+Stakes come from one or more policies in ``STAKE_POLICIES`` (add your own:
+a function of the bet columns returning one stake per bet, zero for "no
+bet").  Every policy is one row of a (policies, bets) stake matrix, so
+totals are one ``bincount`` over combined (policy, model) codes and the
+equity curves are one ``cumsum`` over bets sorted by (model, time):
+
+    from figkit.backtest import backtest, read_columns
+
+    result = backtest(read_columns("bets.parquet"), read_columns("markets.parquet"),
+                      policies=("logged", "flat", "kelly"))
+    result.summary("logged")               # per-model pnl, roi, win rate, drawdown
+    t, equity = result.curve("OpenTSLM", "kelly")
+
+``read_columns`` reads ``.npz`` and, with pyarrow, Parquet/Arrow/Feather
+tables into a dict of arrays.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+FLAT_STAKE = 1.0
+KELLY_BANKROLL = 1000.0
+KELLY_FRACTION = 0.25
+
+
+def _logged(bets):
+    return np.asarray(bets["stake"], np.float64)
+
+
+def _flat(bets):
+    return np.full(len(bets["market"]), FLAT_STAKE)
+
+
+def _kelly(bets):
+    """Fractional Kelly on a fixed bankroll: f* = (q - p) / (1 - p), if positive."""
+    price = np.asarray(bets["price"], np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        edge = (np.asarray(bets["prob"], np.float64) - price) / (1 - price)
+    return KELLY_BANKROLL * KELLY_FRACTION * np.nan_to_num(edge.clip(0, 1))
+
+
+STAKE_POLICIES = {"logged": _logged, "flat": _flat, "kelly": _kelly}
+
+
+def read_columns(path):
+    """Columns of a ``.npz``, ``.parquet``, ``.arrow`` or ``.feather`` table, as a dict."""
+    path = Path(path)
+    if path.suffix == ".npz":
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    try:
+        import pyarrow.feather as feather
+        import pyarrow.parquet as parquet
+    except ImportError as exc:
+        raise ImportError(f"reading {path.name} requires pyarrow") from exc
+    table = parquet.read_table(path) if path.suffix == ".parquet" \
+        else feather.read_table(path, memory_map=True)
+    return {name: table.column(name).to_numpy() for name in table.column_names}
+
+
+@dataclass
+class Backtest:
+    """Per-(policy, model) totals and per-bet equity curves."""
+
+    models: list
+    policies: list
+    bets: np.ndarray            # (policies, models) bets with a positive stake
+    wins: np.ndarray            # (policies, models)
+    staked: np.ndarray          # (policies, models)
+    pnl: np.ndarray             # (policies, models)
+    max_drawdown: np.ndarray    # (policies, models) largest fall from a running peak
+    offsets: np.ndarray         # bets offsets[m]:offsets[m + 1] of the curves are models[m]
+    time: np.ndarray            # (bets,) time of each bet, in curve order
+    equity: np.ndarray          # (policies, bets) cumulative pnl, per model
+
+    @property
+    def roi(self):
+        """pnl / staked, in percent."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 100 * self.pnl / self.staked
+
+    @property
+    def win_rate(self):
+        """Winning bets / bets placed, in percent."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 100 * self.wins / self.bets
+
+    def summary(self, policy):
+        """Dict of per-model arrays for one *policy*."""
+        row = self.policies.index(policy)
+        return {"model": self.models, "bets": self.bets[row], "win_rate": self.win_rate[row],
+                "pnl": self.pnl[row], "roi": self.roi[row],
+                "max_drawdown": self.max_drawdown[row]}
+
+    def curve(self, model, policy):
+        """(time, equity) after each bet of *model* under *policy*, skipped bets included."""
+        m = self.models.index(model)
+        span = slice(self.offsets[m], self.offsets[m + 1])
+        return self.time[span], self.equity[self.policies.index(policy), span]
+
+
+def _segment_drawdown(equity, segment, offsets):
+    """Largest peak-to-trough fall of *equity* within each segment, peaks counting 0."""
+    if not equity.shape[-1]:
+        return np.zeros(equity.shape[:-1] + (len(offsets) - 1,))
+    # Lift every segment above all earlier ones so one running maximum
+    # never carries a peak across a segment boundary.
+    step = np.ptp(equity, axis=-1, keepdims=True) + 1
+    lift = segment * step
+    peak = np.maximum(np.maximum.accumulate(equity + lift, axis=-1) - lift, 0)
+    drop = peak - equity
+    out = np.zeros(equity.shape[:-1] + (len(offsets) - 1,))
+    starts = offsets[:-1][np.diff(offsets) > 0]
+    out[..., np.diff(offsets) > 0] = np.maximum.reduceat(drop, starts, axis=-1)
+    return out
+
+
+def backtest(bets, resolutions, policies=("logged",), models=None):
+    """Backtest bet log *bets* against market *resolutions* under each stake policy.
+
+    *bets* maps column names to arrays: model, market, price, and as needed
+    side (default YES), prob (for "kelly"), stake (for "logged") and time
+    (default: log order).  *resolutions* maps market and outcome.  *models*
+    fixes the model order (default: sorted).
+    """
+    market_ids = np.asarray(resolutions["market"])
+    order = np.argsort(market_ids, kind="stable")
+    market_ids, outcomes = market_ids[order], np.asarray(resolutions["outcome"])[order]
+    market = np.asarray(bets["market"])
+    slot = np.searchsorted(market_ids, market).clip(0, max(len(market_ids) - 1, 0))
+    outcome = np.where(market_ids[slot] == market, outcomes[slot], -1) if len(market_ids) \
+        else np.full(len(market), -1)
+    resolved = (outcome == 0) | (outcome == 1)
+
+    names = np.asarray(bets["model"])
+    models = sorted(set(np.unique(names).tolist())) if models is None else list(models)
+    labels = np.asarray(models)
+    lookup = np.argsort(labels)
+    code = lookup[np.searchsorted(labels[lookup], names).clip(0, len(models) - 1)]
+    resolved &= labels[code] == names
+
+    side = np.asarray(bets["side"]) if "side" in bets else np.ones(len(market), np.int8)
+    won = resolved & (side == outcome)
+    price = np.asarray(bets["price"], np.float64)
+    with np.errstate(divide="ignore"):
+        unit = np.where(won, 1 / price - 1, -1.0)
+
+    stakes = np.stack([STAKE_POLICIES[name](bets) for name in policies])
+    stakes = np.where(resolved & (stakes > 0), stakes, 0.0)
+    placed = stakes > 0
+    gain = stakes * unit
+
+    groups = len(policies) * len(models)
+    key = (np.arange(len(policies))[:, None] * len(models) + code).ravel()
+
+    def total(weights):
+        return np.bincount(key, weights.ravel(), minlength=groups).reshape(len(policies), -1)
+
+    # Equity curves: bets sorted by (model, time), one cumsum per policy,
+    # rebased to zero at each model's first bet.
+    time = np.asarray(bets["time"]) if "time" in bets else np.arange(len(market))
+    keep = np.flatnonzero(resolved)
+    # Two stable sorts beat one lexsort several times over: the second, by
+    # small-integer model codes, is a radix sort.
+    keep = keep[np.argsort(time[keep], kind="stable")]
+    curve_order = keep[np.argsort(code[keep].astype(np.min_scalar_type(len(models))),
+                                  kind="stable")]
+    curve_code = code[curve_order]
+    offsets = np.searchsorted(curve_code, np.arange(len(models) + 1))
+    running = np.cumsum(gain[:, curve_order], axis=1)
+    base = np.concatenate([np.zeros((len(policies), 1)), running], axis=1)[:, offsets[:-1]]
+    equity = running - base[:, curve_code]
+
+    return Backtest(
+        models=models, policies=list(policies),
+        bets=total(placed.astype(np.float64)).astype(np.int64),
+        wins=total((placed & won).astype(np.float64)).astype(np.int64),
+        staked=total(stakes), pnl=total(gain),
+        max_drawdown=_segment_drawdown(equity, curve_code, offsets),
+        offsets=offsets, time=time[curve_order], equity=equity)
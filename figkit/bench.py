@@ -0,0 +1,338 @@
+"""
+Micro-benchmarks for the diagram primitives the figures are built from.
+
+    python -m figkit bench                                  # full matrix
+    python -m figkit bench -k arrow --counts 10 1000        # a subset
+    python -m figkit bench --save base.json                 # keep a baseline
+    python -m figkit bench --compare base.json              # fail on regressions
+
+Each case builds ``count`` copies of one primitive on a fresh figure, then
+times ``canvas.draw()`` at the given dpi (best of ``--repeat`` runs).
+Construction time is reported separately.  Results are stored as JSON
+(default ``.figcache/bench/latest.json``); with ``--compare`` any case whose
+draw time grows by more than ``--threshold`` over the baseline fails the run.
+"""
+
+import json
+import math
+import platform
+import sys
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+
+from figkit.runner import REPO_ROOT, preload
+
+COUNTS = (10, 1000, 10000)
+DPIS = (100, 200)
+
+# Labels in the style of cot/fig_005.py.
+MATHTEXT = [
+    r"$\pi_\theta$",
+    r"$\hat{A}_i = (r_i - \mu)\,/\,(\sigma + \delta)$",
+    r"$\epsilon = 0.2$,  $\beta = 0.04$",
+    r"$\pi_{\mathrm{ref}}$",
+]
+
+
+# ── Primitives ──────────────────────────────────────────────────────────────
+# Each takes an Axes and an (n, 2) array of grid positions and adds n items.
+
+def draw_box(ax, xy):
+    """Rounded FancyBboxPatch plus centred label (the per-script draw_box helper)."""
+    from matplotlib.patches import FancyBboxPatch
+
+    for x, y in xy:
+        ax.add_patch(FancyBboxPatch((x, y), 0.7, 0.5, boxstyle="round,pad=0.1",
+                                    facecolor="#4FC3F7", edgecolor="#424242",
+                                    linewidth=1.5))
+        ax.text(x + 0.35, y + 0.25, "Box", ha="center", va="center", fontsize=6)
+
+
+def box_outline(ax, xy):
+    """``draw_box`` without labels: the cost of the patches alone."""
+    from matplotlib.patches import FancyBboxPatch
+
+    for x, y in xy:
+        ax.add_patch(FancyBboxPatch((x, y), 0.7, 0.5, boxstyle="round,pad=0.1",
+                                    facecolor="#4FC3F7", edgecolor="#424242",
+                                    linewidth=1.5))
+
+
+def annotate_arrow(ax, xy):
+    """``ax.annotate('', arrowprops=...)``, the per-script draw_arrow helper."""
+    for x, y in xy:
+        ax.annotate("", xy=(x + 0.8, y + 0.6), xytext=(x, y),
+                    arrowprops=dict(arrowstyle="->", color="#424242", lw=1.5))
+
+
+def arc_arrow(ax, xy):
+    """FancyArrowPatch with ``connectionstyle="arc3,rad=..."``."""
+    from matplotlib.patches import FancyArrowPatch
+
+    for x, y in xy:
+        ax.add_patch(FancyArrowPatch((x, y), (x + 0.8, y + 0.6), arrowstyle="-|>",
+                                     connectionstyle="arc3,rad=0.3",
+                                     mutation_scale=12, color="#475569", lw=1.2))
+
+
+def diagram_box(ax, xy):
+    """``draw_box`` through ``figkit.diagram``: one collection, labels still Text."""
+    from figkit.diagram import Diagram
+
+    diagram = Diagram(ax)
+    for x, y in xy:
+        diagram.box(x, y, 0.7, 0.5, facecolor="#4FC3F7", edgecolor="#424242",
+                    linewidth=1.5)
+        ax.text(x + 0.35, y + 0.25, "Box", ha="center", va="center", fontsize=6)
+
+
+def diagram_outline(ax, xy):
+    """``diagram_box`` without labels: the cost of the shapes alone."""
+    from figkit.diagram import Diagram
+
+    diagram = Diagram(ax)
+    for x, y in xy:
+        diagram.box(x, y, 0.7, 0.5, facecolor="#4FC3F7", edgecolor="#424242",
+                    linewidth=1.5)
+
+
+def diagram_arrow(ax, xy):
+    """``annotate_arrow`` through ``figkit.diagram``."""
+    from figkit.diagram import Diagram
+
+    diagram = Diagram(ax)
+    for x, y in xy:
+        diagram.arrow(x, y, x + 0.8, y + 0.6, color="#424242", lw=1.5)
+
+
+def grid_loop(ax, xy):
+    """Per-cell FancyBboxPatch, colormap lookup and label, as in genomics/fig_002.py."""
+    import matplotlib
+    from matplotlib.patches import FancyBboxPatch
+
+    cmap = matplotlib.colormaps["Blues"]
+    values = (xy[:, 0] * 7 + xy[:, 1] * 3) % 10 / 9
+    for (x, y), value in zip(xy, values):
+        ax.add_patch(FancyBboxPatch((x - 0.42, y - 0.42), 0.84, 0.84,
+                                    boxstyle="round,pad=0.03", facecolor=cmap(value),
+                                    edgecolor="#aaaaaa", linewidth=0.8))
+        ax.text(x, y, f"{value * 9:.0f}", ha="center", va="center", fontsize=6,
+                color="white" if value > 0.55 else "#222222")
+
+
+def cell_grid(ax, xy):
+    """``grid_loop`` through ``figkit.grid.cell_grid``."""
+    import numpy as np
+    from figkit.grid import cell_grid
+
+    side = int(xy[:, 0].max()) + 1
+    values = np.full(side * side, np.nan)
+    values[:len(xy)] = (xy[:, 0] * 7 + xy[:, 1] * 3) % 10 / 9
+    values = values.reshape(side, side)
+    labels = np.char.mod("%.0f", np.nan_to_num(values) * 9)
+    cell_grid(ax, values, cmap="Blues", norm=None, size=0.84, boxstyle="round,pad=0.03",
+              edgecolor="#aaaaaa", labels=labels,
+              label_colors=np.where(values > 0.55, "white", "#222222"), fontsize=6)
+
+
+def _walks(count):
+    import numpy as np
+
+    steps = np.random.default_rng(0).standard_normal((12, count)).astype(np.float32)
+    return np.cumsum(steps, axis=1)
+
+
+def plot_trace(ax, xy):
+    """Twelve channels of *count* samples, one ``ax.plot`` each, as in llava/fig_005.py."""
+    import numpy as np
+
+    side = ax.get_xlim()[1]
+    x = np.linspace(0, side, len(xy))
+    for c, walk in enumerate(_walks(len(xy))):
+        ax.plot(x, c * side / 12 + walk * 0.01, lw=0.8)
+
+
+def trace_collection(ax, xy):
+    """``plot_trace`` through ``figkit.traces``: one collection, decimated at draw."""
+    from figkit.traces import traces
+
+    side = ax.get_xlim()[1]
+    traces(ax, _walks(len(xy)), span=(0, side),
+           baseline=[c * side / 12 for c in range(12)], scale=0.01, linewidths=0.8)
+
+
+def mathtext(ax, xy):
+    """Mathtext labels as used for the GRPO diagram."""
+    for i, (x, y) in enumerate(xy):
+        ax.text(x, y, MATHTEXT[i % len(MATHTEXT)], fontsize=6)
+
+
+def stroke_text(ax, xy):
+    """Text with a ``withStroke`` path effect, as in finance/fig_008.py."""
+    import matplotlib.patheffects as pe
+
+    effects = [pe.withStroke(linewidth=3, foreground="white")]
+    for x, y in xy:
+        ax.text(x, y, "Train", fontsize=6, fontweight="bold", color="#1565C0",
+                path_effects=effects)
+
+
+def imshow_heatmap(ax, xy):
+    """An n-cell imshow heatmap, as in alignment/fig_005.py."""
+    import numpy as np
+
+    side = max(1, int(math.isqrt(len(xy))))
+    values = np.random.default_rng(0).random((side, side))
+    ax.imshow(values, cmap="Purples", aspect="auto", interpolation="nearest",
+              extent=(0, ax.get_xlim()[1], 0, ax.get_ylim()[1]))
+
+
+PRIMITIVES = {
+    "draw_box": draw_box,
+    "box_outline": box_outline,
+    "annotate_arrow": annotate_arrow,
+    "arc_arrow": arc_arrow,
+    "mathtext": mathtext,
+    "stroke_text": stroke_text,
+    "imshow_heatmap": imshow_heatmap,
+    # Batched equivalents from figkit.diagram, for comparison.
+    "diagram_box": diagram_box,
+    "diagram_outline": diagram_outline,
+    "diagram_arrow": diagram_arrow,
+    "grid_loop": grid_loop,
+    "cell_grid": cell_grid,
+    "plot_trace": plot_trace,
+    "trace_collection": trace_collection,
+}
+
+
+# ── Running ─────────────────────────────────────────────────────────────────
+
+def _grid(count):
+    import numpy as np
+
+    side = math.ceil(math.sqrt(count))
+    index = np.arange(count)
+    return np.column_stack([index % side, index // side]).astype(float), side
+
+
+def run_case(primitive, count, dpi, repeat=3):
+    """Best-of-*repeat* construction and draw time for one benchmark case."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    build = PRIMITIVES[primitive]
+    xy, side = _grid(count)
+    best_construct = best_draw = math.inf
+    for _ in range(repeat):
+        fig = Figure(figsize=(8, 6), dpi=dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_axes((0, 0, 1, 1))
+        ax.set_xlim(-0.5, side + 0.5)
+        ax.set_ylim(-0.5, side + 0.5)
+        ax.axis("off")
+        start = time.perf_counter()
+        build(ax, xy)
+        built = time.perf_counter()
+        fig.canvas.draw()
+        drawn = time.perf_counter()
+        best_construct = min(best_construct, built - start)
+        best_draw = min(best_draw, drawn - built)
+    return {"construct": best_construct, "draw": best_draw}
+
+
+def environment():
+    import matplotlib
+    import numpy
+
+    return {
+        "python": platform.python_version(),
+        "matplotlib": matplotlib.__version__,
+        "numpy": numpy.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+    }
+
+
+def run_suite(primitives, counts=COUNTS, dpis=DPIS, repeat=3, on_case=None):
+    """Run every (primitive, count, dpi) case; return the results document."""
+    preload()
+    results = {}
+    for primitive in primitives:
+        for count in counts:
+            for dpi in dpis:
+                case = f"{primitive}/{count}/{dpi:g}"
+                results[case] = run_case(primitive, count, dpi, repeat)
+                if on_case is not None:
+                    on_case(case, results[case])
+    return {"environment": environment(), "results": results}
+
+
+def regressions(current, baseline, threshold, min_seconds):
+    """Cases whose draw time exceeds the baseline by more than *threshold*."""
+    failed = []
+    for case, result in current["results"].items():
+        before = baseline["results"].get(case)
+        if before is None or result["draw"] < min_seconds:
+            continue
+        ratio = result["draw"] / before["draw"] if before["draw"] else math.inf
+        if ratio > 1 + threshold:
+            failed.append((case, before["draw"], result["draw"], ratio))
+    return failed
+
+
+def configure(parser):
+    parser.add_argument("-k", "--filter", action="append", default=[], metavar="GLOB",
+                        help="only primitives matching GLOB (repeatable)")
+    parser.add_argument("--counts", type=int, nargs="+", default=list(COUNTS))
+    parser.add_argument("--dpis", type=float, nargs="+", default=list(DPIS))
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="runs per case; the fastest is kept (default: 3)")
+    parser.add_argument("--save", default=None,
+                        help="results file (default: .figcache/bench/latest.json)")
+    parser.add_argument("--compare", default=None, metavar="BASELINE",
+                        help="fail if any case is slower than this results file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown before failing (default: 0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=0.02,
+                        help="ignore cases drawing faster than this many seconds "
+                             "when comparing, as they are dominated by noise "
+                             "(default: 0.02)")
+
+
+def run(args):
+    patterns = [f"*{p}*" if not any(c in p for c in "*?[") else p for p in args.filter]
+    primitives = [name for name in PRIMITIVES
+                  if not patterns or any(fnmatch(name, p) for p in patterns)]
+    if not primitives:
+        print("no primitives matched")
+        return 1
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+
+    print(f"{'case':<28} {'construct':>10} {'draw':>10} {'per item':>10}"
+          + (f" {'vs base':>8}" if baseline else ""))
+
+    def report(case, result):
+        count = int(case.split("/")[1])
+        line = (f"{case:<28} {result['construct'] * 1000:8.1f}ms {result['draw'] * 1000:8.1f}ms "
+                f"{result['draw'] / count * 1e6:8.1f}us")
+        before = baseline["results"].get(case) if baseline else None
+        if before:
+            line += f" {result['draw'] / before['draw']:7.2f}x"
+        print(line, flush=True)
+
+    current = run_suite(primitives, args.counts, args.dpis, args.repeat, on_case=report)
+
+    save = Path(args.save) if args.save else REPO_ROOT / ".figcache" / "bench" / "latest.json"
+    save.parent.mkdir(parents=True, exist_ok=True)
+    save.write_text(json.dumps(current, indent=1))
+    print(f"\nresults written to {save}")
+
+    if baseline is None:
+        return 0
+    failed = regressions(current, baseline, args.threshold, args.min_time)
+    for case, before, after, ratio in failed:
+        print(f"REGRESSION {case}: {before * 1000:.1f}ms -> {after * 1000:.1f}ms ({ratio:.2f}x)",
+              file=sys.stderr)
+    return 1 if failed else 0
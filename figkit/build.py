@@ -0,0 +1,159 @@
+"""
+Discover every figure script in the repository and render them in parallel.
+
+    python -m figkit build                 # everything, one worker per CPU
+    python -m figkit build -j 4 'llava/*'  # a subset on four workers
+    python -m figkit build --out /tmp/figs --timeout 60 --baseline
+    python -m figkit build --explain       # say why each stale figure is rebuilt
+    python -m figkit build --force         # ignore the build cache
+
+Figures whose script, local modules, data inputs and matplotlib environment
+are unchanged since their last successful render are skipped (see
+``figkit.cache``).
+"""
+
+import subprocess
+import sys
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+
+from figkit.cache import BuildCache, environment
+from figkit.runner import REPO_ROOT, JobResult, WorkerPool, run_script, script_key
+
+# Directories that never contain figure scripts.
+EXCLUDED_DIRS = {"figkit", "__pycache__", "venv"}
+
+
+def python_files(root=REPO_ROOT):
+    """Every ``.py`` file under *root* outside ``EXCLUDED_DIRS`` and dot-dirs."""
+    root = Path(root)
+    for path in sorted(root.rglob("*.py")):
+        parts = path.relative_to(root).parts[:-1]
+        if not any(part in EXCLUDED_DIRS or part.startswith(".") for part in parts):
+            yield path
+
+
+def is_figure_script(path):
+    """A figure script is any ``.py`` file that calls ``savefig``."""
+    return "savefig" in Path(path).read_text(encoding="utf-8", errors="replace")
+
+
+def matches(key, patterns):
+    return not patterns or any(fnmatch(key, pattern) for pattern in patterns)
+
+
+def discover_scripts(root=REPO_ROOT, patterns=()):
+    """Return every figure script under *root*, sorted by key.
+
+    *patterns* are shell-style globs matched against the key
+    (``llava/fig_003``).
+    """
+    return [path for path in python_files(root)
+            if is_figure_script(path) and matches(script_key(path, root), patterns)]
+
+
+def build_all(scripts, output_root=None, workers=None, timeout=None, on_result=None):
+    """Render *scripts* on a ``WorkerPool``; return ``JobResult``s in input order.
+
+    *on_result* is called with each ``JobResult`` as soon as it finishes.
+    """
+    scripts = list(scripts)
+    output_root = str(Path(output_root or REPO_ROOT).resolve())
+    results = [None] * len(scripts)
+    pool = WorkerPool(workers=workers, timeout=timeout)
+    arglist = [(str(script), output_root) for script in scripts]
+    for outcome in pool.imap_unordered(run_script, arglist):
+        if outcome.ok:
+            result = outcome.value
+        else:
+            result = JobResult(key=script_key(scripts[outcome.index]), ok=False,
+                               seconds=outcome.seconds, error=outcome.error,
+                               timed_out=outcome.timed_out)
+        results[outcome.index] = result
+        if on_result is not None:
+            on_result(result)
+    return results
+
+
+def serial_baseline(scripts, output_root=None):
+    """Wall time of rendering *scripts* one after another, each in a cold interpreter."""
+    start = time.perf_counter()
+    for script in scripts:
+        cmd = [sys.executable, "-m", "figkit", "run", str(script)]
+        if output_root:
+            cmd += ["--out", str(output_root)]
+        subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True)
+    return time.perf_counter() - start
+
+
+def _print_result(result):
+    status = "ok" if result.ok else ("TIMEOUT" if result.timed_out else "FAIL")
+    print(f"  {status:<7} {result.seconds:7.2f}s  {result.key}", flush=True)
+
+
+def configure(parser):
+    parser.add_argument("patterns", nargs="*",
+                        help="glob(s) over figure keys, e.g. 'llava/*' (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=300.0,
+                        help="per-figure timeout in seconds (default: 300)")
+    parser.add_argument("--out", default=None,
+                        help="output root replacing /home/wangni/notion-figures "
+                             "(default: the repository root)")
+    parser.add_argument("--baseline", action="store_true",
+                        help="also time a serial cold-interpreter run for comparison")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every matched figure, ignoring the build cache")
+    parser.add_argument("--explain", action="store_true",
+                        help="print why each figure is (or is not) rebuilt")
+
+
+def run(args):
+    scripts = discover_scripts(REPO_ROOT, args.patterns)
+    if not scripts:
+        print("no figure scripts matched")
+        return 1
+
+    output_root = Path(args.out or REPO_ROOT).resolve()
+    cache = BuildCache(output_root)
+    env = environment()
+    stale = []
+    for script in scripts:
+        key = script_key(script)
+        reasons = ["--force"] if args.force else cache.reasons(key, script, env)
+        if reasons:
+            stale.append(script)
+        if args.explain:
+            print(f"{key}: " + ("; ".join(reasons) if reasons else "up to date"))
+
+    skipped = len(scripts) - len(stale)
+    print(f"Rendering {len(stale)} figure(s), {skipped} up to date")
+    if not stale:
+        return 0
+
+    start = time.perf_counter()
+    results = build_all(stale, output_root, workers=args.jobs, timeout=args.timeout,
+                        on_result=_print_result)
+    wall = time.perf_counter() - start
+
+    for script, result in zip(stale, results):
+        if result.ok:
+            cache.record(script, result, env)
+        else:
+            cache.forget(result.key)
+    cache.save()
+
+    failed = [r for r in results if not r.ok]
+    for result in failed:
+        print(f"\n── {result.key} ──\n{result.error.rstrip()}")
+
+    in_worker = sum(r.seconds for r in results)
+    print(f"\n{len(results) - len(failed)} ok, {len(failed)} failed")
+    print(f"wall time            {wall:8.2f}s")
+    print(f"sum of job times     {in_worker:8.2f}s  ({in_worker / wall:.1f}x)")
+    if args.baseline:
+        serial = serial_baseline(stale, output_root)
+        print(f"serial cold baseline {serial:8.2f}s  ({serial / wall:.1f}x)")
+    return 1 if failed else 0
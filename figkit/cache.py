@@ -0,0 +1,166 @@
+"""
+Content-hash build cache for incremental figure rebuilds.
+
+A figure is up to date when nothing that went into its last successful render
+has changed:
+
+  * the script's source,
+  * local modules it imports (resolved statically, e.g. ``figkit/diagram.py``),
+  * data files it read while rendering (recorded by ``runner.record_reads``),
+  * the matplotlib version and the default rcParams / matplotlibrc style,
+
+and every output it wrote still exists.  The manifest lives in
+``<output root>/.figcache/manifest.json``.
+"""
+
+import ast
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from figkit.runner import REPO_ROOT
+
+MANIFEST_VERSION = 1
+
+
+def file_digest(path):
+    """sha256 of a file's contents, or ``None`` if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def environment():
+    """Fingerprint of the rendering environment shared by every figure."""
+    import matplotlib
+
+    params = {k: v for k, v in matplotlib.rcParams.items() if k != "backend"}
+    rc_digest = hashlib.sha256(repr(sorted(params.items())).encode()).hexdigest()
+    return {"matplotlib": matplotlib.__version__, "rcparams": rc_digest}
+
+
+def _module_file(name, root):
+    base = root.joinpath(*name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def local_imports(script, root=REPO_ROOT):
+    """Repository modules *script* imports, followed transitively."""
+    root = Path(root).resolve()
+    seen, stack = set(), [Path(script).resolve()]
+    while stack:
+        path = stack.pop()
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+        except (OSError, SyntaxError):
+            continue
+        names = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names += [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names.append(node.module)
+                names += [f"{node.module}.{alias.name}" for alias in node.names]
+        for name in names:
+            parts = name.split(".")
+            # `import figkit.diagram` also executes figkit/__init__.py.
+            for i in range(1, len(parts) + 1):
+                found = _module_file(".".join(parts[:i]), root)
+                if found is not None and found not in seen:
+                    seen.add(found)
+                    stack.append(found)
+    return sorted(seen)
+
+
+def _rel(path, root):
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return str(path)
+
+
+class BuildCache:
+    """Manifest of the last successful render of each figure."""
+
+    def __init__(self, output_root, root=REPO_ROOT):
+        self.root = Path(root).resolve()
+        self.path = Path(output_root).resolve() / ".figcache" / "manifest.json"
+        self.entries = {}
+        self._digests = {}
+        if self.path.is_file():
+            data = json.loads(self.path.read_text())
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = data["figures"]
+
+    def _digest(self, rel):
+        if rel not in self._digests:
+            self._digests[rel] = file_digest(self.root / rel)
+        return self._digests[rel]
+
+    def _snapshot(self, script, inputs):
+        script = Path(script).resolve()
+        modules = [_rel(p, self.root) for p in local_imports(script, self.root)]
+        return {
+            "script": self._digest(_rel(script, self.root)),
+            "modules": {rel: self._digest(rel) for rel in modules},
+            "inputs": {rel: self._digest(rel) for rel in inputs},
+        }
+
+    def reasons(self, key, script, env):
+        """Why *key* needs rebuilding; an empty list means it is up to date."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return ["no previous successful build"]
+        reasons = []
+        if entry["env"]["matplotlib"] != env["matplotlib"]:
+            reasons.append(f"matplotlib {entry['env']['matplotlib']} -> {env['matplotlib']}")
+        if entry["env"]["rcparams"] != env["rcparams"]:
+            reasons.append("default rcParams / style changed")
+        now = self._snapshot(script, entry["inputs"])
+        if now["script"] != entry["script"]:
+            reasons.append("script source changed")
+        for rel in sorted(set(now["modules"]) | set(entry["modules"])):
+            if rel not in entry["modules"]:
+                reasons.append(f"new module dependency {rel}")
+            elif now["modules"].get(rel) != entry["modules"][rel]:
+                reasons.append(f"module changed: {rel}")
+        for rel, digest in now["inputs"].items():
+            if digest is None:
+                reasons.append(f"input missing: {rel}")
+            elif digest != entry["inputs"][rel]:
+                reasons.append(f"input changed: {rel}")
+        for output in entry["outputs"]:
+            if not os.path.exists(output):
+                reasons.append(f"output missing: {output}")
+        return reasons
+
+    def record(self, script, result, env):
+        """Store a successful ``JobResult`` for *script*."""
+        inputs = [_rel(p, self.root) for p in result.inputs]
+        entry = self._snapshot(script, inputs)
+        entry.update(env=env, outputs=result.outputs, seconds=round(result.seconds, 3))
+        self.entries[result.key] = entry
+
+    def refresh(self):
+        """Drop memoised file digests so the next check re-reads the tree."""
+        self._digests.clear()
+
+    def forget(self, key):
+        self.entries.pop(key, None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "figures": self.entries},
+                                  indent=1, sort_keys=True))
+        tmp.replace(self.path)
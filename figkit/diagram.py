@@ -0,0 +1,244 @@
+"""
+Batched diagram primitives: rounded boxes and arrows drawn as collections.
+
+The architecture diagrams add one ``FancyBboxPatch`` per box and one
+``annotate``/``FancyArrowPatch`` per arrow.  Each of those is a separate
+artist with its own graphics context and draw call.  A ``Diagram`` queues
+the same shapes instead and draws each z-order as one collection per kind,
+so a hundred boxes cost one ``draw_path_collection`` call:
+
+    from figkit.diagram import Diagram
+
+    d = Diagram(ax)
+    d.box(x, y, w, h, facecolor="#4FC3F7", edgecolor="#424242", linewidth=1.5,
+          boxstyle="round,pad=0.15")
+    d.arrow(x0, y0, x1, y1, color="#424242", lw=1.5)
+
+Geometry comes from matplotlib's own ``BoxStyle``, ``ConnectionStyle`` and
+``ArrowStyle``, so shapes are those the patches would draw.  Box outlines
+are built once in data coordinates; arrows are laid out in display space at
+draw time, like ``FancyArrowPatch``, so shrink, head size and line width stay
+in points whatever the dpi or layout.
+
+Labels are left to ``ax.text``: glyph rendering is per string whichever way
+it is batched.  Within one z-order, queued shapes draw in the order they
+were queued, at the position of the first one among the Axes' other artists.
+Shapes are clipped to the Axes like patches added with ``add_patch``.
+"""
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.collections import Collection, PathCollection
+from matplotlib.colors import to_rgba
+from matplotlib.patches import ArrowStyle, BoxStyle, ConnectionStyle
+from matplotlib.path import Path
+from matplotlib.transforms import IdentityTransform
+
+_QUAD = [Path.MOVETO, Path.CURVE3, Path.CURVE3]
+_OPEN = [Path.MOVETO, Path.LINETO, Path.LINETO]
+_CLOSED = [Path.MOVETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY]
+
+
+def _no_marker_blit(collection):
+    # A single-path Collection is drawn as a marker, snapped to whole pixels,
+    # which would shift a lone box or arrow from where its patch would be.
+    # A second (empty) url is enough to keep the ordinary path route.
+    collection.set_urls([None, None])
+
+
+def _rgba(color, alpha):
+    rgba = to_rgba(color)
+    return rgba if alpha is None else rgba[:3] + (alpha,)
+
+
+class _BoxLayer(PathCollection):
+    """Box outlines of one z-order, in data coordinates."""
+
+    def __init__(self, **kwargs):
+        super().__init__([], capstyle="butt", joinstyle="miter", **kwargs)
+        _no_marker_blit(self)
+        self.items = []
+        self._dirty = False
+
+    def add(self, path, face, edge, linewidth, linestyle):
+        self.items.append((path, face, edge, linewidth, linestyle))
+        self._dirty = True
+        self.stale = True
+
+    def draw(self, renderer):
+        if self._dirty:
+            paths, faces, edges, widths, styles = zip(*self.items)
+            self.set_paths(list(paths))
+            self.set_facecolor(faces)
+            self.set_edgecolor(edges)
+            self.set_linewidth(widths)
+            self.set_linestyle(list(styles))
+            self._dirty = False
+        if self.items:
+            super().draw(renderer)
+
+
+# Arrow styles whose geometry _straight_arrows reproduces: (begin, end) heads,
+# each None, "open" or "filled".
+_HEADS = {
+    "-": (None, None), "->": (None, "open"), "-|>": (None, "filled"),
+    "<-": ("open", None), "<|-": ("filled", None), "<->": ("open", "open"),
+    "<|-|>": ("filled", "filled"),
+}
+
+
+def _straight_arrows(ends, shrinkA, shrinkB, head_length, head_width, lw):
+    """Shaft and head vertices of straight ``_Curve`` arrows, for all arrows at once.
+
+    *ends* is (n, 2, 2) in display units; the other arguments are (n,) arrays
+    already scaled to pixels.  Follows ``ConnectionStyle.Arc3(rad=0)`` and
+    ``ArrowStyle._Curve.transmute``: the shaft is a quadratic with its
+    control point midway, pulled back so the line caps do not overshoot a
+    head's tip.
+    """
+    A, B = ends[:, 0], ends[:, 1]
+    length = np.hypot(*(B - A).T)
+    u = (B - A) / length[:, None]
+    A = A + u * shrinkA[:, None]
+    B = B - u * shrinkB[:, None]
+    C = (A + B) / 2
+
+    head_dist = np.hypot(head_length, head_width)
+    cos_t, sin_t = head_length / head_dist, head_width / head_dist
+    pad = (0.5 * lw / sin_t)[:, None]
+
+    def wedge(tip, w):
+        # w is the unit vector from the tip back along the shaft.
+        hx, hy = (w * head_dist[:, None]).T
+        side1 = np.column_stack([cos_t * hx + sin_t * hy, -sin_t * hx + cos_t * hy])
+        side2 = np.column_stack([cos_t * hx - sin_t * hy, sin_t * hx + cos_t * hy])
+        tip = tip + pad * w
+        return np.stack([tip + side1, tip, tip + side2], axis=1), tip
+
+    headA, tipA = wedge(A, u)
+    headB, tipB = wedge(B, -u)
+    return A, B, C, headA, tipA, headB, tipB
+
+
+class _ArrowLayer(Collection):
+    """Arrows of one z-order, laid out in display coordinates at draw time."""
+
+    def __init__(self, **kwargs):
+        # FancyArrowPatch, unlike other patches, defaults to round caps and joins.
+        super().__init__(capstyle="round", joinstyle="round", **kwargs)
+        self.set_transform(IdentityTransform())
+        _no_marker_blit(self)
+        self.items = []
+
+    def add(self, posA, posB, **props):
+        self.items.append((posA, posB, props))
+        self.stale = True
+
+    def _general(self, posA, posB, props, dpi_cor):
+        connector = props["connectionstyle"](
+            posA, posB, shrinkA=props["shrinkA"] * dpi_cor,
+            shrinkB=props["shrinkB"] * dpi_cor)
+        parts, fillable = props["arrowstyle"](
+            connector, props["mutation_scale"] * dpi_cor, props["linewidth"] * dpi_cor, 1)
+        if not np.iterable(fillable):
+            parts, fillable = [parts], [fillable]
+        return list(zip(parts, fillable))
+
+    def draw(self, renderer):
+        if not self.items or not self.get_visible():
+            return
+        dpi_cor = renderer.points_to_pixels(1.0)
+        ends = np.array([(posA, posB) for posA, posB, _ in self.items], float)
+        ends = self.axes.transData.transform(ends.reshape(-1, 2)).reshape(-1, 2, 2)
+
+        props = [item[2] for item in self.items]
+        column = lambda name: np.array([p[name] for p in props], float)
+        shrinkA, shrinkB = column("shrinkA") * dpi_cor, column("shrinkB") * dpi_cor
+        # Arrows too short for their shrink take matplotlib's general route.
+        straight = np.array([p["heads"] is not None for p in props])
+        straight &= np.hypot(*(ends[:, 1] - ends[:, 0]).T) > shrinkA + shrinkB
+        if straight.any():
+            scale = column("mutation_scale") * dpi_cor
+            A, B, C, headA, tipA, headB, tipB = _straight_arrows(
+                ends, shrinkA, shrinkB, column("head_length") * scale,
+                column("head_width") * scale, column("linewidth") * dpi_cor)
+
+        paths, faces, edges, widths, styles = [], [], [], [], []
+        for i, ((posA, posB), p) in enumerate(zip(ends, props)):
+            if straight[i]:
+                begin, end = p["heads"]
+                start = tipA[i] if begin else A[i]
+                stop = tipB[i] if end else B[i]
+                parts = [(Path([start, C[i], stop], _QUAD), False)]
+                for kind, head in ((begin, headA[i]), (end, headB[i])):
+                    if kind == "filled":
+                        parts.append((Path([*head, (0, 0)], _CLOSED), True))
+                    elif kind == "open":
+                        parts.append((Path(head, _OPEN), False))
+            else:
+                parts = self._general(posA, posB, p, dpi_cor)
+            for part, fill in parts:
+                paths.append(part)
+                faces.append(p["color"] if fill else (0, 0, 0, 0))
+                edges.append(p["color"])
+                widths.append(p["linewidth"])
+                styles.append(p["linestyle"])
+        self._paths = paths
+        self.set_facecolor(faces)
+        self.set_edgecolor(edges)
+        self.set_linewidth(widths)
+        self.set_linestyle(styles)
+        super().draw(renderer)
+
+
+class Diagram:
+    """Queue boxes and arrows on *ax*; each z-order draws as one collection per kind."""
+
+    def __init__(self, ax):
+        self.ax = ax
+        self._layers = {}
+
+    def _layer(self, cls, zorder):
+        layer = self._layers.get((cls, zorder))
+        if layer is None:
+            layer = cls(zorder=zorder)
+            self.ax.add_collection(layer, autolim=False)
+            self._layers[(cls, zorder)] = layer
+        return layer
+
+    def box(self, x, y, w, h, facecolor="none", edgecolor="black", linewidth=1.0,
+            linestyle="-", boxstyle="round,pad=0.1", alpha=None, zorder=1):
+        """A ``FancyBboxPatch((x, y), w, h, boxstyle=...)`` look-alike; returns its path."""
+        path = BoxStyle(boxstyle)(x, y, w, h, 1.0)
+        self._layer(_BoxLayer, zorder).add(
+            path, _rgba(facecolor, alpha), _rgba(edgecolor, alpha), linewidth, linestyle)
+        self.ax.update_datalim(path.vertices)
+        return path
+
+    def arrow(self, x0, y0, x1, y1, color="black", lw=1.0, style="->",
+              connectionstyle="arc3", linestyle="-", mutation_scale=None,
+              shrinkA=2.0, shrinkB=2.0, zorder=3):
+        """An arrow from (x0, y0) to (x1, y1), drawn like ``ax.annotate``'s.
+
+        Defaults follow ``annotate``: *mutation_scale* is the default font size
+        and arrows sit at the text z-order.  Pass ``zorder=1`` and
+        ``mutation_scale=...`` to stand in for an explicit ``FancyArrowPatch``.
+        """
+        if mutation_scale is None:
+            mutation_scale = mpl.rcParams["font.size"]
+        arrowstyle = ArrowStyle(style)
+        connection = ConnectionStyle(connectionstyle)
+        heads = _HEADS.get(style.split(",")[0].strip())
+        if not (isinstance(connection, ConnectionStyle.Arc3) and connection.rad == 0):
+            heads = None
+        self._layer(_ArrowLayer, zorder).add(
+            (x0, y0), (x1, y1), color=to_rgba(color), linewidth=lw,
+            arrowstyle=arrowstyle, connectionstyle=connection, heads=heads,
+            head_length=getattr(arrowstyle, "head_length", 0.0),
+            head_width=getattr(arrowstyle, "head_width", 0.0),
+            linestyle=linestyle, mutation_scale=mutation_scale,
+            shrinkA=shrinkA, shrinkB=shrinkB)
+
+    def connector(self, x0, y0, x1, y1, **kwargs):
+        """A headless connection line; keywords as for ``arrow``."""
+        self.arrow(x0, y0, x1, y1, style="-", **kwargs)
@@ -0,0 +1,235 @@
+"""
+Per-artist draw-time attribution for ``python -m figkit profile --artists``.
+
+While active, every ``Artist`` records the script line that created it, and
+every ``draw`` method is timed during ``savefig``.  Time is exclusive: an
+Axes is charged only for what its children do not account for.  Results are
+aggregated by (artist class, creating line) and by full draw stack, which
+exports to speedscope (https://www.speedscope.app) and to the folded-stack
+text format read by flamegraph.pl and inferno.
+
+The hook adds a Python call per artist draw, so phase timings taken with it
+enabled overstate the rasterize phase; use it to rank artists, not to time
+figures.
+"""
+
+import contextlib
+import functools
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from figkit.runner import REPO_ROOT
+
+FIGKIT_DIR = str(Path(__file__).resolve().parent)
+
+
+class DrawRecorder:
+    """Collects exclusive draw time per stack of artists."""
+
+    def __init__(self, root=REPO_ROOT):
+        self.root = str(Path(root).resolve())
+        self.active = False
+        self.stacks = defaultdict(float)
+        self.sites = defaultdict(lambda: [0.0, 0])
+        self._stack = []
+        self._local = {}
+
+    # ── creation sites ──
+    def _is_local(self, filename):
+        local = self._local.get(filename)
+        if local is None:
+            local = filename.startswith(self.root) and not filename.startswith(FIGKIT_DIR)
+            self._local[filename] = local
+        return local
+
+    def origin(self):
+        """``path:line`` of the innermost repository frame on the stack."""
+        frame = sys._getframe(2)
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if self._is_local(filename):
+                rel = filename[len(self.root):].lstrip("/\\")
+                return f"{rel}:{frame.f_lineno}"
+            frame = frame.f_back
+        return ""
+
+    # ── draw timing ──
+    def enter(self, artist):
+        now = time.perf_counter()
+        if self._stack:
+            top = self._stack[-1]
+            if top[0] is artist:
+                # A subclass draw calling super().draw(): same frame.
+                top[3] += 1
+                return
+            self._charge(now)
+        label = type(artist).__name__
+        origin = getattr(artist, "_figkit_origin", "")
+        self._stack.append([artist, label, origin, 1, now])
+
+    def exit(self, artist):
+        now = time.perf_counter()
+        top = self._stack[-1]
+        top[3] -= 1
+        if top[3]:
+            return
+        self._charge(now)
+        self._stack.pop()
+        self.sites[(top[1], top[2])][1] += 1
+        if self._stack:
+            self._stack[-1][4] = now
+
+    def _charge(self, now):
+        top = self._stack[-1]
+        elapsed = now - top[4]
+        top[4] = now
+        key = tuple(f"{label} @ {origin}" if origin else label
+                    for _, label, origin, _, _ in self._stack)
+        self.stacks[key] += elapsed
+        self.sites[(top[1], top[2])][0] += elapsed
+
+    def summary(self):
+        """Sites sorted by exclusive draw time, plus the raw stacks."""
+        sites = [{"class": cls, "origin": origin, "seconds": seconds, "count": count}
+                 for (cls, origin), (seconds, count) in self.sites.items()]
+        sites.sort(key=lambda site: site["seconds"], reverse=True)
+        stacks = [[list(stack), seconds] for stack, seconds in self.stacks.items()]
+        return {"sites": sites, "stacks": stacks}
+
+
+def _artist_classes():
+    from matplotlib.artist import Artist
+
+    seen, stack = [], [Artist]
+    while stack:
+        cls = stack.pop()
+        if cls not in seen:
+            seen.append(cls)
+            stack.extend(cls.__subclasses__())
+    return seen
+
+
+@contextlib.contextmanager
+def record_draws(recorder):
+    """Install creation-site and draw-time hooks on every Artist class."""
+    from matplotlib.artist import Artist
+    from matplotlib.figure import Figure
+
+    saved = []
+
+    def patch(owner, name, replacement):
+        saved.append((owner, name, owner.__dict__[name]))
+        setattr(owner, name, replacement)
+
+    original_init = Artist.__init__
+
+    @functools.wraps(original_init)
+    def init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self._figkit_origin = recorder.origin()
+
+    patch(Artist, "__init__", init)
+
+    def timed(draw):
+        @functools.wraps(draw)
+        def wrapper(self, *args, **kwargs):
+            if not recorder.active:
+                return draw(self, *args, **kwargs)
+            recorder.enter(self)
+            try:
+                return draw(self, *args, **kwargs)
+            finally:
+                recorder.exit(self)
+        return wrapper
+
+    for cls in _artist_classes():
+        if "draw" in cls.__dict__:
+            patch(cls, "draw", timed(cls.__dict__["draw"]))
+
+    original_savefig = Figure.savefig
+
+    @functools.wraps(original_savefig)
+    def savefig(self, *args, **kwargs):
+        recorder.active = True
+        try:
+            return original_savefig(self, *args, **kwargs)
+        finally:
+            recorder.active = False
+
+    patch(Figure, "savefig", savefig)
+    try:
+        yield recorder
+    finally:
+        for owner, name, original in reversed(saved):
+            setattr(owner, name, original)
+
+
+# ── Export ──────────────────────────────────────────────────────────────────
+
+def to_speedscope(stacks, name):
+    """A speedscope "sampled" profile with one weighted sample per stack."""
+    frames, index = [], {}
+    samples, weights = [], []
+    for stack, seconds in stacks:
+        sample = []
+        for label in stack:
+            if label not in index:
+                index[label] = len(frames)
+                frame = {"name": label}
+                _, _, origin = label.partition(" @ ")
+                if origin:
+                    file, _, line = origin.rpartition(":")
+                    frame.update(file=file, line=int(line))
+                frames.append(frame)
+            sample.append(index[label])
+        samples.append(sample)
+        weights.append(seconds * 1000)
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "figkit",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "milliseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+def to_folded(stacks):
+    """Folded stacks (``a;b;c <microseconds>``), one line per stack."""
+    lines = []
+    for stack, seconds in sorted(stacks):
+        frames = ";".join(label.replace(";", ",") for label in stack)
+        lines.append(f"{frames} {round(seconds * 1e6)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_exports(key, draw, directory):
+    """Write ``<key>.speedscope.json`` and ``<key>.folded``; return their paths."""
+    directory = Path(directory)
+    stem = key.replace("/", "__")
+    directory.mkdir(parents=True, exist_ok=True)
+    speedscope = directory / f"{stem}.speedscope.json"
+    folded = directory / f"{stem}.folded"
+    speedscope.write_text(json.dumps(to_speedscope(draw["stacks"], key)))
+    folded.write_text(to_folded(draw["stacks"]))
+    return speedscope, folded
+
+
+def format_sites(key, draw, top=10):
+    """The *top* most expensive (class, creating line) pairs for one figure."""
+    lines = [f"{key}: slowest artists by exclusive draw time"]
+    for site in draw["sites"][:top]:
+        origin = site["origin"] or "(matplotlib internal)"
+        lines.append(f"  {site['seconds'] * 1000:8.2f} ms  {site['count']:5d}x  "
+                     f"{site['class']:<22} {origin}")
+    return "\n".join(lines)
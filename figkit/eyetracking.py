@@ -0,0 +1,295 @@
+"""
+Word-level eye-tracking metrics from ZuCo fixation records, for all trials at once.
+
+ZuCo stores each subject's reading session as one ``results<SUBJECT>_<TASK>.mat``
+file with a ``sentenceData`` struct: per sentence its words, their screen
+bounding boxes (``wordbounds``: left, top, right, bottom) and every fixation
+(``allFixations``: x, y, duration in ms, in reading order).  ZuCo 1.0 files
+are MATLAB v5 (read with scipy); ZuCo 2.0 files are v7.3, i.e. HDF5 (read
+with h5py).  ``read_zuco`` reads either, or a directory of them, into one
+``Fixations`` table: one row per fixation, sorted by trial (a subject
+reading a sentence) and time, with the fixated word found by a broadcast
+hit test against the padded word boxes.
+
+``word_metrics`` reduces the table to the five word-level channels of
+zuco/fig_006 for every (trial, word), with fixations between words left
+out:
+
+    FFD         duration of the first fixation on the word
+    GD          gaze duration: the first run of consecutive fixations on it
+    GPT         go-past time: from first entering the word until a fixation
+                lands right of it, regressions to earlier words included
+    TRT         total reading time: every fixation on it
+    nFix        number of fixations on it
+
+Counts and totals are ``bincount`` over (trial, word) keys, runs come from a
+change mask and a ``cumsum``, and go-past ends are found for all words
+together by stepping every unresolved word one fixation ahead per pass:
+
+    from figkit.eyetracking import read_zuco, word_metrics
+
+    fixations = read_zuco("zuco/task1-SR/Matlab files/")
+    metrics = word_metrics(fixations)
+    metrics["GPT"]          # (trials, words) ms; NaN for unfixated words
+
+``bezier_arcs`` lays out quadratic-Bezier regression arcs for a whole
+scanpath in one array, to draw as a single ``LineCollection``.
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+METRICS = ("FFD", "GD", "GPT", "TRT", "nFix")
+_HDF5_SIGNATURE = b"\x89HDF\r\n\x1a\n"
+_HIT_TEST_CELLS = 16 << 20
+
+
+@dataclass
+class Fixations:
+    """Fixations of many trials, one row each, sorted by trial then time."""
+
+    trial: np.ndarray       # int32 per fixation
+    word: np.ndarray        # int32 word index in the sentence; -1 between words
+    duration: np.ndarray    # float64 ms
+    x: np.ndarray           # float64 screen pixels
+    y: np.ndarray
+    subject: np.ndarray     # int32 per trial, codes into subjects
+    sentence: np.ndarray    # int32 per trial, index into sentences
+    bounds: np.ndarray      # (trials, max words, 4) left, top, right, bottom; NaN padded
+    subjects: list
+    sentences: list         # word lists
+
+    def __len__(self):
+        return len(self.trial)
+
+    def trial_of(self, subject, sentence):
+        """Trial index of *subject* (name) reading *sentence* (index)."""
+        code = self.subjects.index(subject)
+        match = np.flatnonzero((self.subject == code) & (self.sentence == sentence))
+        if not len(match):
+            raise KeyError(f"{subject} has no fixations on sentence {sentence}")
+        return int(match[0])
+
+    def rows(self, trial):
+        """Slice of the fixation rows of *trial*."""
+        start, stop = np.searchsorted(self.trial, [trial, trial + 1])
+        return slice(start, stop)
+
+
+# ── Readers ──────────────────────────────────────────────────────────────
+
+
+def subject_name(path):
+    """Subject code of a ``results<SUBJECT>_<TASK>.mat`` file, else its stem."""
+    path = Path(path)
+    match = re.match(r"results([A-Za-z0-9]+)_", path.stem)
+    return match.group(1) if match else path.stem
+
+
+def is_v73(path):
+    """Whether a MATLAB file is v7.3, i.e. HDF5 behind a 512-byte header."""
+    with open(path, "rb") as f:
+        f.seek(512)
+        return f.read(len(_HDF5_SIGNATURE)) == _HDF5_SIGNATURE
+
+
+def _column(values):
+    return np.asarray(values, np.float64).ravel()
+
+
+def _mat_sentences(path):
+    """(words, bounds, x, y, duration) per sentence of a MATLAB v5 file."""
+    try:
+        from scipy.io import loadmat
+    except ImportError as exc:
+        raise ImportError(f"reading {path.name} requires scipy") from exc
+    data = loadmat(path, squeeze_me=True, struct_as_record=False)["sentenceData"]
+    for sentence in np.atleast_1d(data):
+        items = np.atleast_1d(sentence.word) if isinstance(sentence.word, np.ndarray) \
+            else [sentence.word]
+        words = [str(word.content) for word in items if hasattr(word, "content")] \
+            or str(sentence.content).split()
+        bounds = np.asarray(sentence.wordbounds, np.float64).reshape(-1, 4)
+        fixations = sentence.allFixations
+        if hasattr(fixations, "x"):
+            yield (words, bounds, _column(fixations.x), _column(fixations.y),
+                   _column(fixations.duration))
+        else:
+            yield words, bounds, np.empty(0), np.empty(0), np.empty(0)
+
+
+def _h5_string(f, ref):
+    return "".join(map(chr, np.asarray(f[ref]).ravel()))
+
+
+def _h5_sentences(path, words=True):
+    """(words, bounds, x, y, duration) per sentence of a MATLAB v7.3 (HDF5) file.
+
+    Every word is its own referenced dataset, so reading them dominates;
+    with *words* false they are skipped (and None).
+    """
+    try:
+        import h5py
+    except ImportError as exc:
+        raise ImportError(f"reading {path.name} requires h5py") from exc
+    with h5py.File(path, "r") as f:
+        data = f["sentenceData"]
+        for i in range(data["content"].shape[0]):
+            tokens = None
+            if words:
+                word_group = f[data["word"][i, 0]]
+                tokens = [_h5_string(f, ref) for ref in np.asarray(word_group["content"]).ravel()] \
+                    if isinstance(word_group, h5py.Group) and "content" in word_group \
+                    else _h5_string(f, data["content"][i, 0]).split()
+            # MATLAB is column-major: an (n, 4) matrix reads as (4, n).
+            bounds = np.asarray(f[data["wordbounds"][i, 0]], np.float64).T.reshape(-1, 4)
+            fixations = f[data["allFixations"][i, 0]]
+            if isinstance(fixations, h5py.Group) and "x" in fixations:
+                yield (tokens, bounds, _column(fixations["x"]), _column(fixations["y"]),
+                       _column(fixations["duration"]))
+            else:
+                yield tokens, bounds, np.empty(0), np.empty(0), np.empty(0)
+
+
+def _hit_words(x, y, trial, bounds):
+    """Index of the word box each fixation falls in; -1 for none."""
+    word = np.full(len(x), -1, np.int32)
+    step = max(1, _HIT_TEST_CELLS // max(bounds.shape[1], 1))
+    for start in range(0, len(x), step):
+        rows = slice(start, start + step)
+        box = bounds[trial[rows]]                                   # (n, words, 4)
+        px, py = x[rows, None], y[rows, None]
+        inside = (px >= box[..., 0]) & (px <= box[..., 2]) \
+            & (py >= box[..., 1]) & (py <= box[..., 3])
+        word[rows] = np.where(inside.any(axis=1), inside.argmax(axis=1), -1)
+    return word
+
+
+def _read_file(path, words=True):
+    return list(_h5_sentences(path, words) if is_v73(path) else _mat_sentences(path))
+
+
+def read_zuco(path, words=True):
+    """``Fixations`` of one ZuCo results file, or of every ``results*.mat`` in a directory.
+
+    Files of one directory are assumed to be one task, so their sentences
+    share indices.  With *words* false the words of v7.3 files, which
+    dominate their reads, are skipped (``sentences`` holds None).
+    """
+    path = Path(path)
+    files = sorted(path.glob("results*.mat")) if path.is_dir() else [path]
+    if not files:
+        raise ValueError(f"no results*.mat files in {path}")
+    # Sentences are shared, so only the first file's words are read.
+    records = [(subject_name(file), _read_file(file, words=words and not i))
+               for i, file in enumerate(files)]
+
+    sentences = [words for words, *_ in records[0][1]]
+    subject_names = sorted({name for name, _ in records})
+    max_words = max(len(bounds) for _, file in records for _, bounds, *_ in file)
+    trials = [(subject_names.index(name), i, sentence)
+              for name, file in records for i, sentence in enumerate(file)]
+
+    bounds = np.full((len(trials), max_words, 4), np.nan)
+    counts = np.empty(len(trials), np.int64)
+    for t, (_, _, (_, box, x, _, _)) in enumerate(trials):
+        bounds[t, :len(box)] = box
+        counts[t] = len(x)
+    x, y, duration = (np.concatenate([np.empty(0)] + [s[k] for _, _, s in trials])
+                      for k in (2, 3, 4))
+    trial = np.repeat(np.arange(len(trials), dtype=np.int32), counts)
+    return Fixations(
+        trial=trial, word=_hit_words(x, y, trial, bounds), duration=duration, x=x, y=y,
+        subject=np.array([s for s, _, _ in trials], np.int32),
+        sentence=np.array([i for _, i, _ in trials], np.int32),
+        bounds=bounds, subjects=subject_names, sentences=sentences)
+
+
+# ── Metrics ──────────────────────────────────────────────────────────────
+
+
+@dataclass
+class WordMetrics:
+    """(trials, max words) arrays of the five metrics; NaN (0 for nFix) where unfixated."""
+
+    FFD: np.ndarray
+    GD: np.ndarray
+    GPT: np.ndarray
+    TRT: np.ndarray
+    nFix: np.ndarray
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def stack(self):
+        """(5, trials, max words) float64, channels in ``METRICS`` order."""
+        return np.stack([np.asarray(self[name], np.float64) for name in METRICS])
+
+
+def _next_greater(values, queries):
+    """First index after each of *queries* holding a larger value; ``len(values)`` if none.
+
+    Every query steps one position per pass and drops out once resolved, so
+    the work is the total distance travelled rather than queries x length.
+    """
+    out = np.full(len(queries), len(values))
+    pending = np.arange(len(queries))
+    position = queries + 1
+    while len(pending):
+        inside = position < len(values)
+        pending, position = pending[inside], position[inside]
+        hit = values[position] > values[queries[pending]]
+        out[pending[hit]] = position[hit]
+        pending, position = pending[~hit], position[~hit] + 1
+    return out
+
+
+def word_metrics(fixations):
+    """FFD, GD, GPT, TRT and nFix of every (trial, word) of *fixations*."""
+    trials, width = fixations.bounds.shape[:2]
+    on = fixations.word >= 0
+    trial, duration = fixations.trial[on], fixations.duration[on]
+    # One key per (trial, word); it also orders words within a trial, so
+    # "right of the word" is simply "larger key" up to the trial's end.
+    key = trial.astype(np.int64) * width + fixations.word[on]
+    size = trials * width
+
+    nfix = np.bincount(key, minlength=size)
+    trt = np.bincount(key, duration, minlength=size)
+
+    run = np.cumsum(np.r_[True, key[1:] != key[:-1]]) - 1
+    run_total = np.bincount(run, duration)
+    words, first = np.unique(key, return_index=True)
+
+    trial_end = np.searchsorted(trial, np.arange(1, trials + 1))
+    stop = np.minimum(_next_greater(key, first), trial_end[trial[first]])
+    elapsed = np.r_[0.0, np.cumsum(duration)]
+
+    ffd, gd, gpt = (np.full(size, np.nan) for _ in range(3))
+    ffd[words] = duration[first]
+    gd[words] = run_total[run[first]]
+    gpt[words] = elapsed[stop] - elapsed[first]
+    trt[nfix == 0] = np.nan
+    shape = (trials, width)
+    return WordMetrics(FFD=ffd.reshape(shape), GD=gd.reshape(shape), GPT=gpt.reshape(shape),
+                       TRT=trt.reshape(shape), nFix=nfix.reshape(shape).astype(np.int32))
+
+
+# ── Scanpaths ────────────────────────────────────────────────────────────
+
+
+def bezier_arcs(x0, y0, x1, y1, lift, points=40):
+    """(k, points, 2) quadratic Beziers from (x0, y0) to (x1, y1) over a control point
+    *lift* above their midpoint; all arguments broadcast to k arcs.
+    """
+    x0, y0, x1, y1, lift = np.broadcast_arrays(*(np.asarray(v, np.float64)
+                                                for v in (x0, y0, x1, y1, lift)))
+    t = np.linspace(0, 1, points)
+    a, b, c = (1 - t) ** 2, 2 * (1 - t) * t, t ** 2
+    mx, my = (x0 + x1) / 2, (y0 + y1) / 2 + lift
+    xs = a * x0[..., None] + b * mx[..., None] + c * x1[..., None]
+    ys = a * y0[..., None] + b * my[..., None] + c * y1[..., None]
+    return np.stack([xs, ys], axis=-1)
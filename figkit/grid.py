@@ -0,0 +1,172 @@
+"""
+Rounded-cell grids: a 2-D array drawn as one collection of cells.
+
+Mask, design-matrix and encoding figures draw their grids cell by cell, each
+with its own ``FancyBboxPatch``, colormap lookup and label.  ``cell_grid``
+maps every value in one colormap call and draws every cell from a single
+template path offset to each cell centre:
+
+    from figkit.grid import cell_grid
+
+    cell_grid(ax, mask, cmap=ListedColormap(["#E8E8E8", "#4CAF50"]),
+              norm=Normalize(0, 1), size=0.9, boxstyle="round,pad=0.04",
+              labels=np.where(mask == 1, "✓", "✗"),
+              label_colors=np.where(mask == 1, "white", "#BBBBBB"),
+              fontsize=13, fontweight="bold")
+
+Cell (i, j) is centred at ``origin + (j * step[0], i * step[1])``, so with
+the default unit step and an inverted y-axis row 0 is at the top, as with
+``imshow``.  Cells match the patches they replace: the template is the
+same ``BoxStyle`` outline, so a grid is pixel-identical to the loop.
+
+Up to ``TEXT_LABEL_LIMIT`` labels are ordinary ``Text`` artists.  Larger
+grids draw their labels as glyph outlines (``TextPath``) in one more
+collection, one path per distinct string.  These are unhinted, so they look
+marginally softer than Text at small sizes.
+"""
+
+from dataclasses import dataclass
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.collections import PathCollection
+from matplotlib.colors import Normalize, to_rgba_array
+from matplotlib.font_manager import FontProperties
+from matplotlib.patches import BoxStyle
+from matplotlib.path import Path
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D, AffineDeltaTransform
+
+from figkit.diagram import _no_marker_blit
+
+TEXT_LABEL_LIMIT = 500
+
+
+@dataclass
+class CellGrid:
+    """The artists drawn by ``cell_grid``."""
+
+    cells: PathCollection
+    labels: object = None   # list of Text, a PathCollection, or None
+    centers: np.ndarray = None
+
+
+def _colors(colors, count):
+    """(count, 4) RGBA from a single color or an array of colors, one per cell."""
+    colors = np.asarray(colors)
+    if colors.dtype.kind in "fiu":
+        rgba = to_rgba_array(colors.reshape(-1, colors.shape[-1]))
+    else:
+        # Convert each distinct color name once.
+        unique, inverse = np.unique(colors.astype(str).ravel(), return_inverse=True)
+        rgba = to_rgba_array(list(unique))[inverse]
+    return np.array(np.broadcast_to(rgba, (count, 4)) if len(rgba) == 1 else rgba)
+
+
+def _template(shape, size, boxstyle):
+    w, h = size
+    if shape == "circle":
+        circle = Path.unit_circle()
+        return Path(circle.vertices * (w / 2), circle.codes)
+    return BoxStyle(boxstyle)(-w / 2, -h / 2, w, h, 1.0)
+
+
+def _glyph_labels(labels, centers, colors, transform, figure, zorder, text_kwargs):
+    """Labels as one collection of glyph outlines, centred on each cell."""
+    prop = FontProperties(size=text_kwargs.get("fontsize"),
+                          weight=text_kwargs.get("fontweight"),
+                          family=text_kwargs.get("fontfamily"),
+                          style=text_kwargs.get("fontstyle"))
+    glyphs = {}
+    for label in np.unique(labels):
+        path = TextPath((0, 0), label, prop=prop)
+        (x0, y0), (x1, y1) = path.get_extents().get_points()
+        glyphs[label] = path.transformed(Affine2D().translate(-(x0 + x1) / 2, -(y0 + y1) / 2))
+    # Glyphs are in points; scale them with the (savefig) dpi.
+    points = Affine2D().scale(1 / 72) + figure.dpi_scale_trans
+    collection = PathCollection(
+        [glyphs[label] for label in labels], offsets=centers, offset_transform=transform,
+        transform=points, facecolors=colors, edgecolors="none", linewidths=0,
+        zorder=zorder)
+    _no_marker_blit(collection)
+    return collection
+
+
+def cell_grid(parent, values=None, *, facecolors=None, cmap=None, norm=None,
+              origin=(0.0, 0.0), step=(1.0, 1.0), size=0.9, boxstyle="round,pad=0.04",
+              shape="box", edgecolor="#AAAAAA", linewidth=0.8, linestyle="-", alpha=None,
+              labels=None, label_colors="black", label_zorder=3, zorder=1,
+              transform=None, clip_on=True, **text_kwargs):
+    """Draw a grid of rounded cells on *parent* (an Axes, or a Figure).
+
+    Colors come from *facecolors* (one color, or one per cell) or else from
+    ``cmap(norm(values))``; non-finite values leave their cell out.  *size*
+    is the cell (width, height), or one number for square cells, and
+    *shape* is ``"box"`` (outlined with *boxstyle*) or ``"circle"``.
+    *labels* and *label_colors* are single values or arrays shaped like
+    the grid; empty labels are skipped.  Remaining keywords
+    (``fontsize``, ``fontweight``, ...) go to the labels.
+    """
+    if values is None and facecolors is None:
+        raise ValueError("cell_grid needs values or facecolors")
+    grid_shape = np.shape(values if values is not None else facecolors)[:2]
+    rows, cols = np.indices(grid_shape)
+    centers = np.column_stack([origin[0] + cols.ravel() * step[0],
+                               origin[1] + rows.ravel() * step[1]])
+
+    count = len(centers)
+    if facecolors is None:
+        values = np.asarray(values, float)
+        if cmap is None or isinstance(cmap, str):
+            cmap = mpl.colormaps[cmap or mpl.rcParams["image.cmap"]]
+        norm = norm if norm is not None else Normalize(np.nanmin(values), np.nanmax(values))
+        faces = to_rgba_array(cmap(norm(values.ravel())))
+    else:
+        faces = _colors(facecolors, count)
+    edges = _colors(edgecolor, count)
+    if alpha is not None:
+        faces[:, 3] = edges[:, 3] = alpha
+    keep = np.isfinite(np.asarray(values, float).ravel()) if values is not None \
+        else np.ones(count, bool)
+
+    figure = parent.get_figure(root=True)
+    is_axes = hasattr(parent, "transData")
+    if transform is None:
+        transform = parent.transData if is_axes else parent.transFigure
+    size = (size, size) if np.isscalar(size) else size
+
+    cells = PathCollection(
+        [_template(shape, size, boxstyle)], offsets=centers[keep],
+        offset_transform=transform, transform=AffineDeltaTransform(transform),
+        facecolors=faces[keep], edgecolors=edges[keep], linewidths=linewidth,
+        linestyles=linestyle, capstyle="butt", joinstyle="miter", zorder=zorder)
+    _no_marker_blit(cells)
+    if is_axes:
+        parent.add_collection(cells)
+    else:
+        parent.add_artist(cells)
+    cells.set_clip_on(clip_on)
+
+    result = CellGrid(cells=cells, centers=centers.reshape(*grid_shape, 2))
+    if labels is None:
+        return result
+    labels = np.broadcast_to(np.asarray(labels, str), grid_shape).ravel()
+    colors = _colors(label_colors, count)
+    shown = keep & (labels != "")
+    if shown.sum() > TEXT_LABEL_LIMIT:
+        result.labels = _glyph_labels(labels[shown], centers[shown], colors[shown],
+                                      transform, figure, label_zorder, text_kwargs)
+        if is_axes:
+            parent.add_collection(result.labels, autolim=False)
+        else:
+            parent.add_artist(result.labels)
+        result.labels.set_clip_on(clip_on)
+        return result
+
+    text_kwargs.setdefault("ha", "center")
+    text_kwargs.setdefault("va", "center")
+    result.labels = [
+        parent.text(x, y, label, color=tuple(color), transform=transform,
+                    zorder=label_zorder, **text_kwargs)
+        for (x, y), label, color in zip(centers[shown], labels[shown], colors[shown])]
+    return result
@@ -0,0 +1,162 @@
+"""
+Question labels for filings, computed from price series for all filings at once.
+
+Each filing yields three questions about the stock price around its date
+(see finance/fig_006):
+
+    return      r = P[t0+post] / P[t0] - 1                   Increase / Decrease
+    volatility  ratio = std(post returns) / std(pre returns)  Increase / Decrease / Stable
+    direction   s = slope of P[t0+1 .. t0+post] / its mean    Bullish / Bearish / Sideways
+
+where t0 is the last trading day on or before the filing date, "pre" is the
+*pre* closes up to and including t0 and "post" the *post* closes after it.
+
+Prices for every ticker live in one ``PriceSeries``: a contiguous buffer
+sorted by (ticker, date) with per-ticker offsets.  Filings are aligned with
+one ``searchsorted`` over a combined (ticker, day) key, window standard
+deviations come from cumulative sums of returns and squared returns, and
+the post-window regression is one small gather, so labelling is a fixed
+number of array passes however many filings there are:
+
+    from figkit.labels import PriceSeries, compute_labels
+
+    prices = PriceSeries.from_arrays(tickers, dates, closes)
+    labels = compute_labels(prices, filing_tickers, filing_dates, pre=60, post=5)
+    labels.answers("volatility")          # array of "Increase" / "Decrease" / "Stable"
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+ANSWERS = {
+    "return": ("Increase", "Decrease"),
+    "volatility": ("Increase", "Decrease", "Stable"),
+    "direction": ("Bullish", "Bearish", "Sideways"),
+}
+VOLATILITY_THRESHOLDS = (0.667, 1.5)
+SLOPE_THRESHOLD = 0.002
+
+
+@dataclass
+class PriceSeries:
+    """Daily closes of many tickers, concatenated in (ticker, date) order."""
+
+    tickers: np.ndarray     # sorted ticker labels
+    offsets: np.ndarray     # rows offsets[i]:offsets[i + 1] belong to tickers[i]
+    dates: np.ndarray       # datetime64[D]
+    close: np.ndarray       # float64
+
+    @classmethod
+    def from_arrays(cls, tickers, dates, close):
+        """Build from one row per (ticker, date) close, in any order."""
+        labels, codes = np.unique(np.asarray(tickers), return_inverse=True)
+        dates = np.asarray(dates, "datetime64[D]")
+        order = np.lexsort((dates, codes))
+        offsets = np.searchsorted(codes[order], np.arange(len(labels) + 1))
+        return cls(labels, offsets, dates[order], np.asarray(close, np.float64)[order])
+
+    def codes(self, tickers):
+        """Index into ``tickers`` of each of *tickers*; -1 for unknown ones."""
+        tickers = np.asarray(tickers)
+        if not len(self.tickers):
+            return np.full(len(tickers), -1)
+        codes = np.searchsorted(self.tickers, tickers).clip(0, len(self.tickers) - 1)
+        return np.where(self.tickers[codes] == tickers, codes, -1)
+
+    def windows(self, t0, pre, post):
+        """(len(t0), pre + post) closes from ``t0 - pre + 1`` to ``t0 + post``."""
+        return self.close[np.asarray(t0)[:, None] + np.arange(1 - pre, post + 1)]
+
+
+@dataclass
+class FilingLabels:
+    """Per-filing measures and labels; rows are the input filings."""
+
+    valid: np.ndarray       # window fits inside the ticker's series, prices finite
+    t0: np.ndarray          # row of P[t0] in the PriceSeries (-1 if not valid)
+    ret: np.ndarray         # endpoint return r
+    vol_pre: np.ndarray     # std of the pre-window daily returns
+    vol_post: np.ndarray    # std of the post-window daily returns
+    ratio: np.ndarray       # vol_post / vol_pre
+    slope: np.ndarray       # normalised post-window slope s, per day
+    labels: dict            # question -> int8 codes into ANSWERS[question]; -1 if not valid
+
+    @property
+    def magnitude(self):
+        """|r|, the size of the endpoint move."""
+        return np.abs(self.ret)
+
+    def answers(self, question):
+        """Answer strings for *question*; empty where the filing is not valid."""
+        names = np.array(ANSWERS[question] + ("",))
+        return names[self.labels[question]]
+
+
+def _window_sums(cumulative, stop, length):
+    """Sums of the *length* entries ending at (and including) each index *stop*."""
+    return cumulative[stop + 1] - cumulative[stop + 1 - length]
+
+
+def compute_labels(prices, tickers, dates, pre=60, post=5,
+                   volatility_thresholds=VOLATILITY_THRESHOLDS,
+                   slope_threshold=SLOPE_THRESHOLD):
+    """Label every filing (*tickers*, *dates*) against *prices*; returns ``FilingLabels``."""
+    codes = prices.codes(tickers)
+    days = np.asarray(dates, "datetime64[D]").view(np.int64)
+
+    # Align: one sorted key over (ticker, day) for every price row and filing.
+    span = np.int64(1) << 32
+    price_key = np.repeat(np.arange(len(prices.tickers), dtype=np.int64),
+                          np.diff(prices.offsets)) * span + prices.dates.view(np.int64)
+    t0 = np.searchsorted(price_key, codes * span + days, side="right") - 1
+    known = codes >= 0
+    first = np.where(known, prices.offsets[codes.clip(0)], 0)
+    end = np.where(known, prices.offsets[codes.clip(0) + 1], 0)
+    valid = known & (t0 - pre + 1 >= first) & (t0 + post < end)
+    t0 = np.where(valid, t0, pre - 1)   # a safe row, so gathers need no masking
+
+    # Daily returns, zeroed at ticker starts and where undefined; windows
+    # that touch an undefined return are marked invalid.  The NaN tail keeps
+    # the safe row's window in bounds for short series.
+    close = np.r_[prices.close, np.full(pre + post, np.nan)]
+    returns = np.zeros(len(close))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = close[1:] / close[:-1] - 1
+    returns[prices.offsets[:-1]] = 0.0
+    bad = ~np.isfinite(returns)
+    returns[bad] = 0.0
+    s1 = np.r_[0.0, np.cumsum(returns)]
+    s2 = np.r_[0.0, np.cumsum(returns * returns)]
+    nbad = np.r_[0, np.cumsum(bad)]
+
+    def window_std(stop, length):
+        mean = _window_sums(s1, stop, length) / length
+        return np.sqrt(np.maximum(_window_sums(s2, stop, length) / length - mean * mean, 0.0))
+
+    # Pre returns: t0-pre+2 .. t0 (pre - 1 of them); post: t0+1 .. t0+post.
+    vol_pre = window_std(t0, pre - 1)
+    vol_post = window_std(t0 + post, post)
+    valid &= (_window_sums(nbad, t0 + post, pre + post - 1) == 0) \
+        & np.isfinite(close[t0 - pre + 1]) & (close[t0] != 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = close[t0 + post] / close[t0] - 1
+        ratio = vol_post / vol_pre
+        # Least-squares slope of the post closes against 0..post-1.
+        x = np.arange(post) - (post - 1) / 2
+        window = close[t0[:, None] + np.arange(1, post + 1)]
+        slope = window @ (x / (x @ x)) / window.mean(axis=1)
+
+    low, high = volatility_thresholds
+    labels = {
+        "return": np.where(ret >= 0, 0, 1),
+        "volatility": np.where(ratio > high, 0, np.where(ratio < low, 1, 2)),
+        "direction": np.where(slope > slope_threshold, 0,
+                              np.where(slope < -slope_threshold, 1, 2)),
+    }
+    labels = {q: np.where(valid, codes_, -1).astype(np.int8) for q, codes_ in labels.items()}
+    nan = np.where(valid, 1.0, np.nan)
+    return FilingLabels(valid=valid, t0=np.where(valid, t0, -1), ret=ret * nan,
+                        vol_pre=vol_pre * nan, vol_post=vol_post * nan, ratio=ratio * nan,
+                        slope=slope * nan, labels=labels)
@@ -0,0 +1,238 @@
+"""
+Ground-truth labels for prediction-market questions, over many price histories at once.
+
+Each market's probability history yields the five question types of
+polymarkets/fig_006, split at the midpoint into a first (shown) and second
+(hidden) half:
+
+    past_trend            regression slope of the first half      increasing / decreasing / stable
+    future_trend          regression slope of the second half     increasing / decreasing / stable
+    volatility            std of first-half price changes         stable / volatile
+    resolution            final probability                       yes / no / ambiguous
+    confidence_evolution  mean |p - 0.5| of second vs first half  yes / no
+
+Histories differ in length, so they live in one ``MarketSeries``: a
+contiguous float64 buffer with offsets (market i is
+``values[offsets[i]:offsets[i + 1]]``).  Both halves of every market are
+spans of that buffer, and every per-half statistic is a ``reduceat`` sum
+over the spans, so labelling is a fixed number of passes over the buffer,
+done in ``CHUNK_BYTES`` blocks of whole markets to bound the temporaries:
+
+    from figkit.markets import MarketSeries, load_series, market_labels
+
+    series = MarketSeries.from_list(histories)    # or load_series("markets/")
+    labels = market_labels(series)
+    labels.answers("past_trend")                  # "increasing" / "decreasing" / "stable"
+    scores = accuracy(labels, {"resolution": predicted, ...})
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+CHUNK_BYTES = 64 << 20
+
+ANSWERS = {
+    "past_trend": ("increasing", "decreasing", "stable"),
+    "future_trend": ("increasing", "decreasing", "stable"),
+    "volatility": ("stable", "volatile"),
+    "resolution": ("yes", "no", "ambiguous"),
+    "confidence_evolution": ("yes", "no"),
+}
+TREND_EPSILON = 1e-4            # |slope| per step below which a half is stable
+VOLATILITY_THRESHOLD = 0.001    # std of first-half price changes
+RESOLUTION_THRESHOLDS = (0.05, 0.95)
+CONFIDENCE_GAIN = 1.05          # second-half confidence must beat the first by 5%
+
+
+@dataclass
+class MarketSeries:
+    """Probability histories of many markets in one buffer."""
+
+    values: np.ndarray      # float64, all histories back to back
+    offsets: np.ndarray     # int64, len(markets) + 1
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def __getitem__(self, i):
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    @classmethod
+    def from_list(cls, histories):
+        """Pack a list of 1-D histories."""
+        lengths = np.fromiter((len(h) for h in histories), np.int64, len(histories))
+        values = np.concatenate(histories).astype(np.float64, copy=False) if len(histories) \
+            else np.empty(0)
+        return cls(values, np.r_[0, np.cumsum(lengths)])
+
+    def save(self, directory):
+        """Write ``values.npy`` and ``offsets.npy`` into *directory*."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "values.npy", self.values)
+        np.save(directory / "offsets.npy", self.offsets)
+        return directory
+
+
+def load_series(path, mmap=True):
+    """Open a ``MarketSeries`` saved by ``save`` (memory-mapped), or from an ``.npz``."""
+    path = Path(path)
+    if path.suffix == ".npz":
+        with np.load(path) as data:
+            return MarketSeries(data["values"], data["offsets"])
+    mode = "r" if mmap else None
+    return MarketSeries(np.load(path / "values.npy", mmap_mode=mode),
+                        np.load(path / "offsets.npy", mmap_mode=mode))
+
+
+@dataclass
+class MarketLabels:
+    """Per-market measures and labels; rows are the markets."""
+
+    valid: np.ndarray           # at least two points in each half
+    slope_first: np.ndarray     # regression slope per step, first half
+    slope_second: np.ndarray
+    volatility: np.ndarray      # std of first-half price changes
+    final: np.ndarray           # last probability
+    confidence_first: np.ndarray    # mean |p - 0.5|
+    confidence_second: np.ndarray
+    labels: dict                # question -> int8 codes into ANSWERS[question]; -1 if not valid
+
+    def answers(self, question):
+        """Answer strings for *question*; empty where the market is not valid."""
+        names = np.array(ANSWERS[question] + ("",))
+        return names[self.labels[question]]
+
+    def counts(self, question):
+        """Markets per answer of *question*, in ``ANSWERS`` order."""
+        codes = self.labels[question]
+        return np.bincount(codes[codes >= 0], minlength=len(ANSWERS[question]))
+
+
+def _span_sums(values, starts, lengths):
+    """Sums of ``values[start:start + length]`` for spans that tile *values* in order."""
+    out = np.zeros(len(starts))
+    filled = lengths > 0
+    if filled.any():
+        out[filled] = np.add.reduceat(values, starts[filled])
+    return out
+
+
+def _half_measures(values, starts, stops):
+    """Slope, change std and mean |p - 0.5| of ``values[start:stop]`` per span.
+
+    Sums are per span (``reduceat``) rather than differences of one running
+    sum, and positions and changes are centred per span first, so nothing
+    cancels however long the buffer: a flat span has exactly zero slope and
+    volatility.
+    """
+    lengths = stops - starts
+    n = lengths.astype(np.float64)
+    span = np.repeat(np.arange(len(starts)), lengths)
+    x = np.arange(len(values)) - ((starts + stops - 1) / 2)[span]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = _span_sums(x * values, starts, lengths) / (n * (n * n - 1) / 12)
+
+    # Price changes inside each span: the change leaving a span's last point
+    # belongs to no span, so it is masked out.
+    inside = np.ones(len(values), bool)
+    inside[stops[lengths > 0] - 1] = False
+    change = np.r_[np.diff(values), 0.0] * inside
+    m = n - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = _span_sums(change, starts, lengths) / m
+        deviation = (change - mean[span]) * inside
+        std = np.sqrt(_span_sums(deviation * deviation, starts, lengths) / m)
+        confidence = _span_sums(np.abs(values - 0.5), starts, lengths) / n
+    return slope, std, confidence
+
+
+def _label_chunk(values, offsets):
+    """Measures of the markets in one chunk; *offsets* relative to *values*."""
+    starts, stops = offsets[:-1], offsets[1:]
+    middle = starts + (stops - starts) // 2
+    # Both halves of every market in one pass: spans interleaved first, second.
+    span_starts = np.stack([starts, middle], axis=1).ravel()
+    span_stops = np.stack([middle, stops], axis=1).ravel()
+    slope, std, confidence = (m.reshape(-1, 2) for m in
+                              _half_measures(values, span_starts, span_stops))
+    final = values[np.maximum(stops - 1, 0)] if len(values) else np.full(len(stops), np.nan)
+    return slope, std[:, 0], confidence, final
+
+
+def _chunks(offsets, chunk_bytes):
+    """(first, last) market ranges of about *chunk_bytes* of history each."""
+    step = max(chunk_bytes // 8, 1)
+    cuts = np.searchsorted(offsets, np.arange(0, offsets[-1], step), "right") - 1
+    edges = np.unique(np.r_[0, cuts, len(offsets) - 1])
+    return zip(edges[:-1], edges[1:])
+
+
+def market_labels(series, trend_epsilon=TREND_EPSILON,
+                  volatility_threshold=VOLATILITY_THRESHOLD,
+                  resolution_thresholds=RESOLUTION_THRESHOLDS,
+                  confidence_gain=CONFIDENCE_GAIN, chunk_bytes=CHUNK_BYTES):
+    """Label every market of *series*; returns ``MarketLabels``."""
+    offsets = np.asarray(series.offsets, np.int64)
+    count = len(offsets) - 1
+    slope = np.full((count, 2), np.nan)
+    confidence = np.full((count, 2), np.nan)
+    volatility = np.full(count, np.nan)
+    final = np.full(count, np.nan)
+    for first, last in _chunks(offsets, chunk_bytes):
+        base = offsets[first]
+        values = np.asarray(series.values[base:offsets[last]], np.float64)
+        rows = slice(first, last)
+        slope[rows], volatility[rows], confidence[rows], final[rows] = \
+            _label_chunk(values, offsets[first:last + 1] - base)
+
+    valid = np.diff(offsets) >= 4
+    low, high = resolution_thresholds
+
+    def trend(s):
+        return np.where(s > trend_epsilon, 0, np.where(s < -trend_epsilon, 1, 2))
+
+    labels = {
+        "past_trend": trend(slope[:, 0]),
+        "future_trend": trend(slope[:, 1]),
+        "volatility": np.where(volatility > volatility_threshold, 1, 0),
+        "resolution": np.where(final > high, 0, np.where(final < low, 1, 2)),
+        "confidence_evolution": np.where(confidence[:, 1] > confidence[:, 0] * confidence_gain,
+                                         0, 1),
+    }
+    labels = {q: np.where(valid, codes, -1).astype(np.int8) for q, codes in labels.items()}
+    nan = np.where(valid, 1.0, np.nan)
+    return MarketLabels(valid=valid, slope_first=slope[:, 0] * nan,
+                        slope_second=slope[:, 1] * nan, volatility=volatility * nan,
+                        final=final * nan, confidence_first=confidence[:, 0] * nan,
+                        confidence_second=confidence[:, 1] * nan, labels=labels)
+
+
+def accuracy(labels, predictions):
+    """Percent of valid markets answered correctly, per question and "overall".
+
+    *predictions* maps question types to answer strings (or int codes into
+    ``ANSWERS``), one per market.  "overall" pools every question answered.
+    """
+    scores, right, asked = {}, 0, 0
+    for question, predicted in predictions.items():
+        predicted = np.asarray(predicted)
+        if predicted.dtype.kind in "US":
+            names = np.array(ANSWERS[question])
+            order = np.argsort(names)
+            slot = np.searchsorted(names[order], predicted).clip(0, len(names) - 1)
+            predicted = np.where(names[order][slot] == predicted, order[slot], -2)
+        truth = labels.labels[question]
+        keep = truth >= 0
+        hits = int(np.count_nonzero(predicted[keep] == truth[keep]))
+        total = int(np.count_nonzero(keep))
+        scores[question] = 100 * hits / total if total else float("nan")
+        right, asked = right + hits, asked + total
+    scores["overall"] = 100 * right / asked if asked else float("nan")
+    return scores
@@ -0,0 +1,125 @@
+"""
+Cross-attention masks of interleaved media prompts, derived rather than drawn.
+
+A NoMask prompt interleaves one ``<image>`` (media) token per sensor channel
+with that channel's text, between a pre-prompt and a post-prompt:
+
+    [pre-prompt] <image> text of channel 1 ... <image> text of channel N [post-prompt]
+
+The gated cross-attention layers decide which media each text token sees
+from two vectors, as the model does.  ``media_locations`` marks the
+``<image>`` tokens; its cumulative sum is the token's *text time*, the
+number of media seen so far (0 in the pre-prompt, N in the post-prompt).
+Media j (1-based) is visible to a token when
+
+    eq      text_time == j      masked: only the media its block opened
+    ge      text_time >= j      causal unmasked: every media so far
+    full    always              full unmasked: the mask is skipped
+
+so pre-prompt tokens see nothing under ``eq`` and ``ge``.  Each media is
+``latents`` key tokens (the resampler output), and the whole
+(text tokens, N * latents) mask is one broadcast comparison of the
+text-time column against the media-time row, written straight into a
+bool array:
+
+    from figkit.masks import CHANNELS, cross_attention_mask, draw_mask, prompt_layout
+
+    layout = prompt_layout(CHANNELS, block=96, pre=64, post=256)
+    mask = cross_attention_mask(layout, "ge", latents=64)    # (2,551, 1,472) bool
+    draw_mask(ax, mask)                                       # one imshow
+
+With one token per segment (``prompt_layout(4)``) the rows are the
+segments themselves: the 6 x 4 masks of nomask/fig_002.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+# The 23 NGAFID sensor channels NoMask feeds as media, by subsystem.
+CHANNEL_GROUPS = {
+    "Electrical": ("volt1", "volt2", "amp1", "amp2"),
+    "Fuel": ("FQtyL", "FQtyR", "E1_FFlow"),
+    "Engine": ("E1_OilP", "E1_OilT", "E1_RPM"),
+    "Cylinder": ("CHT1", "CHT2", "CHT3", "CHT4", "EGT1", "EGT2", "EGT3", "EGT4"),
+    "Flight Params": ("IAS", "OAT", "AltB", "LatAc", "NormAc"),
+}
+CHANNELS = tuple(name for names in CHANNEL_GROUPS.values() for name in names)
+
+MODES = {"eq": np.equal, "ge": np.greater_equal, "full": None}
+
+
+@dataclass
+class PromptLayout:
+    """Token layout of one interleaved prompt."""
+
+    media_locations: np.ndarray  # bool per token; True at each <image> token
+    segment: np.ndarray          # int32 per token: 0 pre-prompt, 1..N blocks, N + 1 post-prompt
+    channels: tuple              # channel name per block
+
+    def __len__(self):
+        return len(self.media_locations)
+
+    @property
+    def media(self):
+        return len(self.channels)
+
+    @property
+    def text_time(self):
+        """Media seen so far, per token."""
+        return np.cumsum(self.media_locations, dtype=np.int32)
+
+    def spans(self):
+        """(starts, stops) token ranges of the N + 2 segments."""
+        edges = np.searchsorted(self.segment, np.arange(self.media + 3))
+        return edges[:-1], edges[1:]
+
+
+def prompt_layout(channels, block=0, pre=1, post=1):
+    """``PromptLayout`` of a prompt over *channels* (names, or a count).
+
+    Each channel's block is its ``<image>`` token followed by *block* text
+    tokens (a scalar, or one length per channel); *pre* and *post* are the
+    lengths of the pre- and post-prompt.
+    """
+    if isinstance(channels, int):
+        channels = tuple(f"Media {i}" for i in range(1, channels + 1))
+    channels = tuple(channels)
+    block = np.broadcast_to(np.asarray(block, np.int64), (len(channels),))
+    if pre < 0 or post < 0 or (block < 0).any():
+        raise ValueError("segment lengths must not be negative")
+    lengths = np.r_[pre, block + 1, post]
+    segment = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+    media_locations = np.zeros(len(segment), bool)
+    media_locations[np.cumsum(lengths)[:-2]] = True
+    return PromptLayout(media_locations, segment, channels)
+
+
+def cross_attention_mask(layout, mode="eq", latents=1):
+    """(tokens, media * latents) bool mask of *layout*; True where a token may attend.
+
+    *layout* is a ``PromptLayout`` or a text-time vector (media are then
+    numbered up to its maximum); *mode* is one of ``MODES``.
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown mask mode {mode!r} (use {', '.join(MODES)})")
+    if isinstance(layout, PromptLayout):
+        text_time, media = layout.text_time, layout.media
+    else:
+        text_time = np.asarray(layout)
+        media = int(text_time.max(initial=0))
+    shape = (len(text_time), media * latents)
+    if MODES[mode] is None:
+        return np.ones(shape, bool)
+    media_time = np.repeat(np.arange(1, media + 1, dtype=text_time.dtype), latents)
+    return MODES[mode](text_time[:, None], media_time, out=np.empty(shape, bool))
+
+
+def draw_mask(ax, mask, colors=("#E8E8E8", "#4CAF50"), **imshow_kwargs):
+    """``imshow`` a bool mask, blocked in ``colors[0]`` and allowed in ``colors[1]``."""
+    from matplotlib.colors import ListedColormap, Normalize
+
+    imshow_kwargs.setdefault("aspect", "auto")
+    imshow_kwargs.setdefault("interpolation", "nearest")
+    return ax.imshow(mask, cmap=ListedColormap(colors), norm=Normalize(0, 1),
+                     **imshow_kwargs)
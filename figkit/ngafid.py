@@ -0,0 +1,330 @@
+"""
+Flight and maintenance-issue aggregates of the NGAFID maintenance dataset, in one chunked pass.
+
+NGAFID ships a flight header table (one row per flight: ``Master Index``,
+``before_after``, ``date_diff``, ``flight_length`` in seconds, ``label``
+naming the maintenance issue, ...) for the whole corpus and for the 2-days
+subset, plus the sensor data (one row per second: ``id`` and one column per
+channel, ``E1 RPM``, ``E1 OilT``, ``IAS``, ``AltMSL``, ...).  The data run
+to tens of gigabytes, so nothing here loads a table whole.  Each file is cut
+into parts, byte ranges of about ``CHUNK_BYTES`` of a CSV (split at line
+ends) or row groups of a Parquet file, and every part becomes one task on a
+``WorkerPool``:
+
+    header part     -> ``FlightSummary``: sparse (category, length) histogram,
+                       issue and before/after counts
+    sensor data part -> the rows of the one sample flight, if any
+
+A ``FlightSummary`` is a mergeable partial aggregate: counts add, and the
+length histogram is keyed by whole seconds, so it is bounded by the
+distinct lengths, not the flights, and quartiles, whiskers and outliers
+come out exact.  Memory stays constant however large the files:
+
+    from figkit.ngafid import aggregate
+
+    result = aggregate({"2-Days Subset": "2days/flight_header.csv",
+                        "All Flights": "all_flights/flight_header.csv"},
+                       flight_data="2days/flight_data.parquet", sample_flight=1)
+    summary = result.summaries["2-Days Subset"]
+    summary.mean_length() / 60, summary.issue_counts(10)
+    result.sample["E1 RPM"]
+
+Issues are grouped into ``CATEGORIES`` by keywords in their names.  CSV
+parts are parsed with the ``csv`` module; Parquet needs pyarrow.
+"""
+
+import csv
+import io
+import multiprocessing
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from figkit.runner import WorkerPool
+
+CHUNK_BYTES = 64 << 20
+# Issue category -> keywords of issue names, first match wins.
+CATEGORIES = {
+    "Intake System": ("intake",),
+    "Baffle System": ("baffle",),
+    "Rocker/Valve Cover": ("rocker", "valve cover"),
+    "Cylinder Issues": ("cylinder", "compression"),
+    "Oil System": ("oil",),
+    "Ignition System": ("ignition", "magneto", "spark"),
+    "Critical Engine Issues": ("failure", "fire", "time out"),
+    "General Engine": ("engine",),
+}
+OTHER = "Other"
+# Sensor column -> (title, unit) of the sample-flight panels.
+SAMPLE_CHANNELS = {
+    "E1 RPM": ("E1 RPM", "RPM"),
+    "E1 OilT": ("E1 Oil Temperature", "°F"),
+    "E1 OilP": ("E1 Oil Pressure", "psi"),
+    "E1 FFlow": ("E1 Fuel Flow", "gph"),
+    "E1 CHT1": ("E1 CHT1", "°F"),
+    "E1 EGT1": ("E1 EGT1", "°F"),
+    "IAS": ("Indicated Airspeed", "knots"),
+    "AltMSL": ("Altitude MSL", "feet"),
+}
+_ID_COLUMNS = ("id", "Master Index")
+
+
+def category_of(issue):
+    """``CATEGORIES`` name of an issue name; ``OTHER`` if no keyword matches."""
+    issue = str(issue).lower()
+    for name, keywords in CATEGORIES.items():
+        if any(keyword in issue for keyword in keywords):
+            return name
+    return OTHER
+
+
+_CATEGORY_NAMES = list(CATEGORIES) + [OTHER]
+
+
+# ── Partial aggregates ───────────────────────────────────────────────────
+
+
+def _add_counts(total, labels, counts):
+    for label, count in zip(labels, counts):
+        total[label] = total.get(label, 0) + int(count)
+
+
+@dataclass
+class FlightSummary:
+    """Mergeable aggregate of flight header rows."""
+
+    flights: int = 0
+    length_total: float = 0.0   # seconds, summed exactly
+    length_keys: np.ndarray = field(       # category code * span + whole seconds, sorted
+        default_factory=lambda: np.empty(0, np.int64))
+    length_counts: np.ndarray = field(default_factory=lambda: np.empty(0, np.int64))
+    issues: dict = field(default_factory=dict)          # issue name -> flights
+    before_after: dict = field(default_factory=dict)    # before / after / same -> flights
+
+    _SPAN = np.int64(1) << 40
+
+    @classmethod
+    def of(cls, lengths, issues, before_after):
+        """Summary of one block of rows; NaN lengths are counted but not binned."""
+        lengths = np.asarray(lengths, np.float64)
+        names, inverse = np.unique(np.asarray(issues, str), return_inverse=True)
+        codes = np.array([_CATEGORY_NAMES.index(category_of(n)) for n in names],
+                         np.int64)[inverse]
+        known = np.isfinite(lengths)
+        keys, counts = np.unique(codes[known] * cls._SPAN
+                                 + np.rint(lengths[known]).astype(np.int64),
+                                 return_counts=True)
+        summary = cls(flights=len(lengths), length_total=float(lengths[known].sum()),
+                      length_keys=keys, length_counts=counts)
+        _add_counts(summary.issues, names, np.bincount(inverse, minlength=len(names)))
+        _add_counts(summary.before_after, *np.unique(np.asarray(before_after, str),
+                                                     return_counts=True))
+        return summary
+
+    def merge(self, other):
+        """Fold in the summary of other rows; returns self."""
+        keys, inverse = np.unique(np.r_[self.length_keys, other.length_keys],
+                                  return_inverse=True)
+        self.length_counts = np.bincount(inverse, np.r_[self.length_counts,
+                                                        other.length_counts]).astype(np.int64)
+        self.length_keys = keys
+        self.flights += other.flights
+        self.length_total += other.length_total
+        for mine, theirs in ((self.issues, other.issues),
+                             (self.before_after, other.before_after)):
+            _add_counts(mine, theirs, theirs.values())
+        return self
+
+    # ── queries ──
+
+    def lengths(self, category=None):
+        """(seconds, flights) of each distinct flight length, of one category or all."""
+        codes, seconds = np.divmod(self.length_keys, self._SPAN)
+        keep = np.ones(len(codes), bool) if category is None \
+            else codes == _CATEGORY_NAMES.index(category)
+        values, inverse = np.unique(seconds[keep], return_inverse=True)
+        return values, np.bincount(inverse, self.length_counts[keep], len(values)) \
+            .astype(np.int64)
+
+    def mean_length(self):
+        counted = self.length_counts.sum()
+        return self.length_total / counted if counted else float("nan")
+
+    def quantiles(self, q, category=None):
+        """Length quantiles (seconds), interpolated like ``np.percentile``; NaN if none."""
+        values, counts = self.lengths(category)
+        if not len(values):
+            return np.full(np.shape(q), np.nan)
+        position = np.asarray(q, np.float64) * (counts.sum() - 1)
+        low = np.floor(position).astype(np.int64)
+        cumulative = np.cumsum(counts)
+        below = values[np.searchsorted(cumulative, low, side="right")]
+        above = values[np.searchsorted(cumulative, np.minimum(low + 1, cumulative[-1] - 1),
+                                       side="right")]
+        return below + (position - low) * (above - below)
+
+    def box_stats(self, category=None, whis=1.5, scale=1.0):
+        """``Axes.bxp`` statistics of the lengths (divided by *scale*) of *category*.
+
+        A category without flight lengths gets NaN statistics, an empty box.
+        """
+        values, counts = self.lengths(category)
+        q1, median, q3 = self.quantiles([0.25, 0.5, 0.75], category)
+        low, high = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+        inside = (values >= low) & (values <= high)
+        outside = ~inside
+        whislo, whishi = (values[inside].min(), values[inside].max()) if inside.any() \
+            else (np.nan, np.nan)
+        return {"label": category or "All", "med": median / scale,
+                "q1": q1 / scale, "q3": q3 / scale,
+                "whislo": whislo / scale, "whishi": whishi / scale,
+                "fliers": np.repeat(values[outside], counts[outside]) / scale}
+
+    def category_counts(self):
+        """{category: flights}, largest first."""
+        totals = {}
+        for issue, count in self.issues.items():
+            totals[category_of(issue)] = totals.get(category_of(issue), 0) + count
+        return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+    def issue_counts(self, top=None):
+        """{issue: flights}, largest first, the *top* ones only if given."""
+        ranked = sorted(self.issues.items(), key=lambda item: (-item[1], item[0]))
+        return dict(ranked[:top])
+
+
+# ── Readers ──────────────────────────────────────────────────────────────
+
+
+def _parts(path, chunk_bytes):
+    """Task arguments covering *path*: (start, stop) byte ranges or row groups."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as parquet
+        except ImportError as exc:
+            raise ImportError(f"reading {path.name} requires pyarrow") from exc
+        return [(group, None) for group in range(parquet.ParquetFile(path).num_row_groups)]
+    size = path.stat().st_size
+    edges = list(range(0, size, max(chunk_bytes, 1))) + [size]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _csv_part(path, start, stop):
+    """Rows of the CSV *path* that start in bytes [start, stop), as {column: list}."""
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8-sig")]))
+        if start > 0:
+            # A line belongs to the part its first byte falls in.
+            f.seek(start - 1)
+            f.readline()
+        begin = max(f.tell(), start)
+        block = f.read(max(stop - begin, 0))
+        if block and not block.endswith(b"\n"):
+            block += f.readline()
+    columns = {name: [] for name in header}
+    appenders = [columns[name].append for name in header]
+    for row in csv.reader(io.StringIO(block.decode("utf-8"))):
+        for append, value in zip(appenders, row):
+            append(value)
+    return columns
+
+
+def _read_part(path, part, columns):
+    """{column: array} of the wanted *columns* present in one part of *path*."""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as parquet
+        source = parquet.ParquetFile(path)
+        names = [name for name in columns if name in source.schema_arrow.names]
+        table = source.read_row_group(part[0], columns=names)
+        return {name: table.column(name).to_numpy(zero_copy_only=False) for name in names}
+    data = _csv_part(path, *part)
+    return {name: np.asarray(data[name]) for name in columns if name in data}
+
+
+def _numbers(values):
+    """float64 of CSV strings; empty fields are NaN."""
+    values = np.asarray(values)
+    if values.dtype.kind in "US":
+        values = np.where(values == "", "nan", values)
+    return values.astype(np.float64)
+
+
+def _summarize_part(path, part):
+    data = _read_part(path, part, ("flight_length", "label", "before_after"))
+    lengths = _numbers(data["flight_length"])
+    return FlightSummary.of(lengths, data.get("label", np.full(len(lengths), "")),
+                            data.get("before_after", np.full(len(lengths), "")))
+
+
+def _sample_part(path, part, flight):
+    """Sensor rows of *flight* in one part: {column: array}, possibly empty."""
+    data = _read_part(path, part, _ID_COLUMNS + tuple(SAMPLE_CHANNELS))
+    ids = next((data[name] for name in _ID_COLUMNS if name in data), None)
+    if ids is None:
+        raise KeyError(f"{Path(path).name} has no flight id column ({', '.join(_ID_COLUMNS)})")
+    rows = _numbers(ids) == flight
+    return {name: _numbers(values[rows]) for name, values in data.items()
+            if name in SAMPLE_CHANNELS}
+
+
+# ── Pass ─────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Aggregate:
+    """Everything the maintenance/visualizations figures need."""
+
+    summaries: dict             # dataset name -> FlightSummary
+    sample: dict                # sensor column -> values of the sample flight, in time order
+    sample_flight: object = None
+
+
+def _run_part(kind, path, part, flight):
+    if kind == "header":
+        return _summarize_part(path, part)
+    return _sample_part(path, part, flight)
+
+
+def aggregate(headers, flight_data=None, sample_flight=None, workers=None,
+              chunk_bytes=CHUNK_BYTES):
+    """Summarise every header file of *headers* ({name: path}) in one pass.
+
+    With *flight_data*, the rows of flight *sample_flight* are collected
+    from it in the same pass.  Parts run on a ``WorkerPool`` of *workers*
+    processes (default: CPU count; ``1``, or a daemonic caller, runs them
+    in this process).
+    """
+    tasks = [("header", name, str(path), part)
+             for name, path in headers.items() for part in _parts(path, chunk_bytes)]
+    if flight_data is not None and sample_flight is not None:
+        tasks += [("sample", None, str(flight_data), part)
+                  for part in _parts(flight_data, chunk_bytes)]
+    arglist = [(kind, path, part, sample_flight) for kind, _, path, part in tasks]
+
+    results = [None] * len(tasks)
+    workers = max(1, workers or os.cpu_count() or 1)
+    # Daemonic processes (figure build workers) cannot start a pool of their own.
+    if workers == 1 or len(tasks) == 1 or multiprocessing.current_process().daemon:
+        results = [_run_part(*args) for args in arglist]
+    else:
+        for outcome in WorkerPool(workers=min(workers, len(tasks))).imap_unordered(
+                _run_part, arglist):
+            if not outcome.ok:
+                raise RuntimeError(f"{tasks[outcome.index][2]} part {outcome.index} failed:\n"
+                                   f"{outcome.error}")
+            results[outcome.index] = outcome.value
+
+    summaries = {name: FlightSummary() for name in headers}
+    pieces = []
+    for (kind, name, _, _), result in zip(tasks, results):
+        if kind == "header":
+            summaries[name].merge(result)
+        else:
+            pieces.append(result)
+    sample = {name: np.concatenate([piece[name] for piece in pieces if name in piece])
+              for name in SAMPLE_CHANNELS if any(name in piece for piece in pieces)}
+    return Aggregate(summaries=summaries, sample=sample, sample_flight=sample_flight)
@@ -0,0 +1,378 @@
+"""
+Parameter counts and training memory of the figure architectures, worked out from their shapes.
+
+The parameter-budget figures (alignment/fig_006, maintenance/fig_002,
+polymarkets/fig_003, itformer/fig_008, genomics/fig_008, sdft/fig_007)
+quote module sizes.  Every size here is exact arithmetic on layer shapes,
+the same count ``sum(p.numel() for p in module.parameters())`` would give
+for the reference implementation.  No model is built, so counting a 7B
+decoder takes microseconds.  Each function returns ``{part: count}``
+for one module:
+
+    decoder(LLMS["Llama-3.2-1B"])                  frozen LLM: embeddings, layers, norm, lm_head
+    perceiver_resampler(dim, depth, latents)       Flamingo Perceiver resampler
+    gated_cross_attention(dim, dim_visual, layers) Flamingo gated xattn-dense blocks
+    instruction_resampler(dim, latents, d_text, d_out)  IGR: LIT, conditioning, ITA, projection
+    patch_encoder(patch, dim)                      Conv1D patch tokenizer, optionally with transformer layers
+    atpe(d_model), anchor_injector(...), temporal_cross_attention(...)   TPA components
+    projector(d_in, d_out), lora_decoder(llm, rank)
+
+``Budget`` collects named modules and works out the training memory:
+
+    from figkit.params import LLMS, Budget, activation_bytes, decoder, perceiver_resampler
+
+    budget = Budget()
+    budget.add("Perceiver", perceiver_resampler(896, depth=2, latents=64))
+    budget.add("LLM", decoder(LLMS["Qwen2.5-0.5B"]), trainable=False)
+    budget.trainable, budget.total                     # 16,584,960  510,617,728
+    print(budget.memory("float32", optimizer="adam",
+                        activations=activation_bytes(LLMS["Qwen2.5-0.5B"], tokens=512)))
+
+Weights take ``params x itemsize`` of the weight dtype.  Gradients are
+held for trainable parameters only, in the same dtype.  Optimizer states
+are ``OPTIMIZER_STATES[optimizer]`` copies of the trainable parameters in
+*optimizer_dtype*.  Activations are the one estimate, using the per-layer
+count of Korthikanti et al. (2022).
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class LLMConfig:
+    """Shape of a decoder-only LLM (Llama / Qwen2 layout: GQA, SwiGLU, RMSNorm)."""
+
+    vocab: int
+    hidden: int
+    layers: int
+    heads: int
+    kv_heads: int
+    intermediate: int
+    tied: bool = True           # lm_head shares the input embeddings
+    qkv_bias: bool = False      # Qwen2 has biases on q, k and v
+
+    @property
+    def head_dim(self):
+        return self.hidden // self.heads
+
+    @property
+    def kv_dim(self):
+        return self.kv_heads * self.head_dim
+
+
+# Published configs of the LLMs the figures use.
+LLMS = {
+    "Llama-3.2-1B": LLMConfig(128256, 2048, 16, 32, 8, 8192),
+    "Llama-3.2-3B": LLMConfig(128256, 3072, 28, 24, 8, 8192),
+    "Qwen2.5-0.5B": LLMConfig(151936, 896, 24, 14, 2, 4864, qkv_bias=True),
+    "Qwen2.5-7B": LLMConfig(152064, 3584, 28, 28, 4, 18944, tied=False, qkv_bias=True),
+}
+
+DTYPE_BYTES = {"float32": 4, "float16": 2, "bfloat16": 2, "int8": 1, "int4": 0.5}
+OPTIMIZER_STATES = {"sgd": 0, "momentum": 1, "adam": 2, "adamw": 2}
+
+
+# ── Layers ───────────────────────────────────────────────────────────────
+
+
+def linear(d_in, d_out, bias=True):
+    return d_in * d_out + (d_out if bias else 0)
+
+
+def layer_norm(dim, bias=True):
+    """LayerNorm (scale and shift); ``bias=False`` for RMSNorm."""
+    return dim * (2 if bias else 1)
+
+
+def embedding(count, dim):
+    return count * dim
+
+
+def attention(dim, heads, dim_head=None, dim_kv=None, kv_heads=None, bias=False,
+              out_bias=None):
+    """q, k, v and output projections.
+
+    Keys and values come from *dim_kv* inputs (cross-attention) and
+    *kv_heads* heads (grouped-query attention); *out_bias* defaults to *bias*.
+    """
+    dim_head = dim_head or dim // heads
+    inner, kv_inner = heads * dim_head, (kv_heads or heads) * dim_head
+    out_bias = bias if out_bias is None else out_bias
+    return (linear(dim, inner, bias) + 2 * linear(dim_kv or dim, kv_inner, bias)
+            + linear(inner, dim, out_bias))
+
+
+def feed_forward(dim, inner, gated=False, bias=False):
+    """Two-layer MLP; *gated* adds the third (gate) projection of SwiGLU."""
+    if gated:
+        return 2 * linear(dim, inner, bias) + linear(inner, dim, bias)
+    return linear(dim, inner, bias) + linear(inner, dim, bias)
+
+
+def transformer_layer(dim, heads, ff):
+    """``nn.TransformerEncoderLayer(dim, heads, ff)``."""
+    return (attention(dim, heads, bias=True) + feed_forward(dim, ff, bias=True)
+            + 2 * layer_norm(dim))
+
+
+# ── Modules ──────────────────────────────────────────────────────────────
+
+
+def decoder(llm):
+    """A decoder-only LLM of ``LLMConfig`` *llm*."""
+    layer = (attention(llm.hidden, llm.heads, llm.head_dim, kv_heads=llm.kv_heads,
+                       bias=llm.qkv_bias, out_bias=False)
+             + feed_forward(llm.hidden, llm.intermediate, gated=True)
+             + 2 * layer_norm(llm.hidden, bias=False))
+    parts = {"embeddings": embedding(llm.vocab, llm.hidden),
+             "layers": llm.layers * layer,
+             "norm": layer_norm(llm.hidden, bias=False)}
+    if not llm.tied:
+        parts["lm_head"] = linear(llm.hidden, llm.vocab, bias=False)
+    return parts
+
+
+def patch_encoder(patch, dim, channels=1, positions=0, layers=0, heads=8, ff=None):
+    """Conv1D patch tokenizer (kernel = stride = *patch*) with learned positions and LayerNorm.
+
+    With *layers*, transformer encoder layers follow (TransformerCNNEncoder).
+    """
+    parts = {"conv": linear(channels * patch, dim), "norm": layer_norm(dim)}
+    if positions:
+        parts["positions"] = embedding(positions, dim)
+    if layers:
+        parts["layers"] = layers * transformer_layer(dim, heads, ff or 4 * dim)
+    return parts
+
+
+def projector(d_in, d_out, hidden=None, norm=False):
+    """Linear projection, or a two-layer MLP through *hidden* units; *norm* adds an input LayerNorm."""
+    parts = {"norm": layer_norm(d_in)} if norm else {}
+    if hidden:
+        parts["proj"] = linear(d_in, hidden) + linear(hidden, d_out)
+    else:
+        parts["proj"] = linear(d_in, d_out)
+    return parts
+
+
+def perceiver_resampler(dim, depth, latents=64, heads=8, dim_head=64, ff_mult=4, d_in=None,
+                        media=0):
+    """Flamingo Perceiver resampler, with a *d_in* -> *dim* input projection if they differ.
+
+    Each layer normalises media and latents, attends from the latents
+    to both, then applies a LayerNorm-GELU feed-forward (``ff_mult=0``
+    leaves it out).  *media* adds learned media-time embeddings.
+    """
+    layer = 2 * layer_norm(dim) + attention(dim, heads, dim_head)
+    if ff_mult:
+        layer += layer_norm(dim) + feed_forward(dim, ff_mult * dim)
+    parts = {"latents": embedding(latents, dim), "layers": depth * layer,
+             "norm": layer_norm(dim)}
+    if d_in and d_in != dim:
+        parts["proj_in"] = linear(d_in, dim, bias=False)
+    if media:
+        parts["media_time"] = embedding(media, dim)
+    return parts
+
+
+def gated_cross_attention(dim, dim_visual, layers, heads=8, dim_head=64, ff_mult=4):
+    """*layers* Flamingo gated xattn-dense blocks; ``ff_mult=0`` leaves out the feed-forward."""
+    parts = {"attention": layers * (layer_norm(dim)
+                                    + attention(dim, heads, dim_head, dim_kv=dim_visual)),
+             "gates": layers * (2 if ff_mult else 1)}
+    if ff_mult:
+        parts["feed_forward"] = layers * (layer_norm(dim) + feed_forward(dim, ff_mult * dim))
+    return parts
+
+
+def instruction_resampler(dim, latents, d_text, d_out, heads=8, stages=2):
+    """Instruction-guided resampler (IGR).
+
+    Learnable instruction tokens (LIT) self-attend jointly with the
+    projected text query, then *stages* instruct-time-attention (ITA)
+    cross-attentions read the patches.  A final projection maps to *d_out*.
+    """
+    block = layer_norm(dim) + attention(dim, heads)
+    return {"latents": embedding(latents, dim),
+            "text_proj": linear(d_text, dim, bias=False),
+            "conditioning": block,
+            "ita": stages * block,
+            "proj": linear(dim, d_out)}
+
+
+def atpe(d_model):
+    """ATPE: the sinusoid has no parameters, ``time_proj`` is Linear(d_model, d_model)."""
+    return {"time_proj": linear(d_model, d_model)}
+
+
+def anchor_injector(d_model, d_llm):
+    """Temporal anchor injection: ``anchor_proj`` (Linear + GELU + LayerNorm) and a tanh gate."""
+    return {"anchor_proj": linear(d_model, d_llm) + layer_norm(d_llm), "gate": 1}
+
+
+def temporal_cross_attention(dim, heads, dim_head=None, dim_kv=None):
+    """Temporally-biased cross-attention: query LayerNorm, attention, bias slope alpha, gate."""
+    return {"norm": layer_norm(dim), "attention": attention(dim, heads, dim_head, dim_kv),
+            "alpha": 1, "gate": 1}
+
+
+def lora(d_in, d_out, rank):
+    """LoRA adapter of a (d_in, d_out) weight: A (d_in, rank) and B (rank, d_out)."""
+    return rank * (d_in + d_out)
+
+
+def lora_decoder(llm, rank, targets=("q", "v")):
+    """LoRA adapters of rank *rank* on the *targets* projections of every layer of *llm*."""
+    h = llm.hidden
+    shapes = {"q": (h, llm.heads * llm.head_dim), "k": (h, llm.kv_dim),
+              "v": (h, llm.kv_dim), "o": (llm.heads * llm.head_dim, h),
+              "gate": (h, llm.intermediate), "up": (h, llm.intermediate),
+              "down": (llm.intermediate, h)}
+    unknown = set(targets) - set(shapes)
+    if unknown:
+        raise ValueError(f"unknown LoRA targets {sorted(unknown)} (use {', '.join(shapes)})")
+    return {"lora": llm.layers * sum(lora(*shapes[name], rank) for name in targets)}
+
+
+# ── Memory ───────────────────────────────────────────────────────────────
+
+
+def itemsize(dtype):
+    """Bytes per element of *dtype*, a ``DTYPE_BYTES`` name or anything ``np.dtype`` takes."""
+    if isinstance(dtype, str) and dtype in DTYPE_BYTES:
+        return DTYPE_BYTES[dtype]
+    return np.dtype(dtype).itemsize
+
+
+def activation_bytes(llm, tokens, batch=1, dtype="float32", training=True, flash=True):
+    """Estimated activation memory of *llm* on *batch* sequences of *tokens*.
+
+    Training keeps about ``34 s b h`` bytes per layer at 16 bits for the
+    backward pass, plus ``5 a s^2 b`` for the attention scores unless
+    *flash* attention recomputes them (Korthikanti et al., 2022).  A
+    forward pass keeps the KV cache and one layer's working set.
+    """
+    s, b, h = tokens, batch, llm.hidden
+    if training:
+        per_layer = 17 * s * b * h + (0 if flash else 2.5 * llm.heads * s * s * b)
+        return int(llm.layers * per_layer * itemsize(dtype))
+    kv_cache = 2 * llm.layers * llm.kv_dim * s * b
+    return int((kv_cache + 17 * s * b * h) * itemsize(dtype))
+
+
+def format_params(count, digits=1):
+    """``1.2B``, ``494.0M``, ``16.5K``; counts under a thousand as they are."""
+    for unit, scale in (("B", 1e9), ("M", 1e6), ("K", 1e3)):
+        if count >= scale:
+            return f"{count / scale:.{digits}f}{unit}"
+    return f"{count:,}"
+
+
+def format_bytes(nbytes, digits=1):
+    """Decimal units: ``6.2 GB``, ``268.4 MB``."""
+    for unit, scale in (("GB", 1e9), ("MB", 1e6), ("KB", 1e3)):
+        if nbytes >= scale:
+            return f"{nbytes / scale:.{digits}f} {unit}"
+    return f"{nbytes:,.0f} B"
+
+
+@dataclass
+class Component:
+    """One named module of a budget."""
+
+    name: str
+    parts: dict                 # part -> parameter count
+    trainable: bool = True
+
+    @property
+    def params(self):
+        return sum(self.parts.values())
+
+
+@dataclass
+class MemoryReport:
+    """Training (or inference) memory of a ``Budget``; sizes in bytes."""
+
+    weights: dict               # component name -> bytes
+    gradients: int
+    optimizer: int
+    activations: int = 0
+
+    @property
+    def total(self):
+        return sum(self.weights.values()) + self.gradients + self.optimizer + self.activations
+
+    def __str__(self):
+        width = max([len("activations"), *map(len, self.weights)])
+        lines = [f"  {name:<{width}}  {format_bytes(size)}"
+                 for name, size in self.weights.items()]
+        lines += [f"  {'gradients':<{width}}  {format_bytes(self.gradients)}",
+                  f"  {'optimizer':<{width}}  {format_bytes(self.optimizer)}",
+                  f"  {'activations':<{width}}  {format_bytes(self.activations)}"]
+        return "\n".join([f"total {format_bytes(self.total)}"] + lines)
+
+
+@dataclass
+class Budget:
+    """Named modules of a model, trainable or frozen."""
+
+    components: list = field(default_factory=list)
+
+    def add(self, name, parts, trainable=True):
+        """Add a module; *parts* is ``{part: count}`` as the module functions return, or a count."""
+        if name in self:
+            raise ValueError(f"duplicate component {name!r}")
+        if not isinstance(parts, dict):
+            parts = {name: int(parts)}
+        self.components.append(Component(name, dict(parts), trainable))
+        return self.components[-1]
+
+    def __contains__(self, name):
+        return any(c.name == name for c in self.components)
+
+    def __getitem__(self, name):
+        for component in self.components:
+            if component.name == name:
+                return component
+        raise KeyError(f"no component {name!r} (have {', '.join(c.name for c in self.components)})")
+
+    def __iter__(self):
+        return iter(self.components)
+
+    @property
+    def total(self):
+        return sum(c.params for c in self.components)
+
+    @property
+    def trainable(self):
+        return sum(c.params for c in self.components if c.trainable)
+
+    @property
+    def frozen(self):
+        return self.total - self.trainable
+
+    def memory(self, dtype="float32", optimizer="adam", optimizer_dtype="float32",
+               activations=0, training=True):
+        """``MemoryReport`` with weights in *dtype* and *optimizer* states in *optimizer_dtype*.
+
+        Without *training* (a frozen teacher, inference) there are no
+        gradients or optimizer states.
+        """
+        if optimizer not in OPTIMIZER_STATES:
+            raise ValueError(f"unknown optimizer {optimizer!r} "
+                             f"(use {', '.join(OPTIMIZER_STATES)})")
+        size = itemsize(dtype)
+        weights = {c.name: int(c.params * size) for c in self.components}
+        if not training:
+            return MemoryReport(weights, 0, 0, activations)
+        states = OPTIMIZER_STATES[optimizer] * itemsize(optimizer_dtype)
+        return MemoryReport(weights, int(self.trainable * size), int(self.trainable * states),
+                            activations)
+
+    def __str__(self):
+        width = max((len(c.name) for c in self.components), default=0)
+        lines = [f"  {c.name:<{width}}  {c.params:>15,}  "
+                 f"{'trainable' if c.trainable else 'frozen'}" for c in self.components]
+        return "\n".join([f"{self.total:,} parameters, {self.trainable:,} trainable"] + lines)
@@ -0,0 +1,146 @@
+"""
+Patches of multichannel signals as strided views, with per-patch statistics in batch.
+
+A patch encoder (Conv1D with kernel ``patch`` and stride ``stride``) cuts
+each channel of a (C, T) signal into N = 1 + (T - patch) // stride patches;
+samples after the last whole patch are dropped.  ``unfold`` returns those
+(C, N, patch) patches as a view of the signal, a ``sliding_window_view``
+stepped by *stride* along the patch axis, so no sample is copied however
+long the recording, and a memory-mapped signal stays on disk:
+
+    from figkit.patches import patch_report, patch_stats, unfold
+
+    patches = unfold(leads, 50)                 # (12, 100, 50) view of (12, 5000)
+    stats = patch_stats(leads, 50)              # {"mean": (12, 100) array, "std": ...}
+    print(patch_report(leads.shape, 50, d_enc=256, latents=64))
+
+``patch_stats`` reduces every patch of every channel along the last axis
+of that view, ``CHUNK_BYTES`` of patches at a time, so the float64
+temporaries stay bounded; overlapping patches (stride < patch) are read
+where they lie rather than duplicated.  ``patch_report`` works out patch
+and token counts and the memory of each stage from the shapes alone.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+CHUNK_BYTES = 64 << 20
+STATS = ("mean", "std", "min", "max")
+
+
+def patch_count(length, patch, stride=None):
+    """Whole patches of *patch* samples every *stride* (default: *patch*) in *length*."""
+    stride = stride or patch
+    if patch < 1 or stride < 1:
+        raise ValueError(f"patch and stride must be positive (got {patch}, {stride})")
+    return 0 if length < patch else 1 + (length - patch) // stride
+
+
+def unfold(signal, patch, stride=None):
+    """(C, N, patch) view of the patches of a (C, T) (or (T,)) *signal*; nothing is copied."""
+    stride = stride or patch
+    signal = np.asanyarray(signal)
+    if patch_count(signal.shape[-1], patch, stride) == 0:
+        return np.empty(signal.shape[:-1] + (0, patch), signal.dtype)
+    return sliding_window_view(signal, patch, axis=-1)[..., ::stride, :]
+
+
+def patch_stats(signal, patch, stride=None, stats=STATS, chunk_bytes=CHUNK_BYTES):
+    """Per-patch *stats* (names from ``STATS``) of *signal*, each a (C, N) float64 array."""
+    unknown = set(stats) - set(STATS)
+    if unknown:
+        raise ValueError(f"unknown patch statistics {sorted(unknown)} (use {', '.join(STATS)})")
+    patches = unfold(signal, patch, stride)
+    lead, n = patches.shape[:-2], patches.shape[-2]
+    out = {name: np.empty(lead + (n,)) for name in stats}
+    step = max(1, chunk_bytes // (8 * patch * max(1, int(np.prod(lead)))))
+    for start in range(0, n, step):
+        block = patches[..., start:start + step, :]
+        rows = (Ellipsis, slice(start, start + step))
+        if "mean" in out:
+            out["mean"][rows] = block.mean(axis=-1, dtype=np.float64)
+        if "std" in out:
+            out["std"][rows] = block.std(axis=-1, dtype=np.float64)
+        if "min" in out:
+            out["min"][rows] = block.min(axis=-1)
+        if "max" in out:
+            out["max"][rows] = block.max(axis=-1)
+    return out
+
+
+# ── Report ───────────────────────────────────────────────────────────────
+
+
+def _size(nbytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if nbytes < 1024 or unit == "GB":
+            return f"{nbytes:,.0f} {unit}" if unit == "B" else f"{nbytes:,.1f} {unit}"
+        nbytes /= 1024
+
+
+@dataclass
+class PatchReport:
+    """Patch counts and memory of one patching config; sizes in bytes."""
+
+    channels: int
+    length: int             # samples per channel
+    patch: int
+    stride: int
+    patches: int            # N, per channel
+    dropped: int            # trailing samples in no patch
+    itemsize: int
+    d_enc: int = None       # encoder width, for the embedding sizes
+    latents: int = None     # pooled tokens K
+
+    @property
+    def tokens(self):
+        """Patch embeddings over all channels, C x N."""
+        return self.channels * self.patches
+
+    @property
+    def signal_bytes(self):
+        return self.channels * self.length * self.itemsize
+
+    @property
+    def unfolded_bytes(self):
+        """What a copied (C, N, patch) array would take; the view takes none."""
+        return self.tokens * self.patch * self.itemsize
+
+    @property
+    def embedding_bytes(self):
+        return self.tokens * self.d_enc * self.itemsize if self.d_enc else None
+
+    @property
+    def pooled_bytes(self):
+        return self.latents * self.d_enc * self.itemsize if self.d_enc and self.latents \
+            else None
+
+    def __str__(self):
+        lines = [
+            f"{self.channels} x {self.length:,} samples, patch {self.patch} stride "
+            f"{self.stride}: {self.patches:,} patches per channel, {self.tokens:,} tokens"
+            + (f", {self.dropped} trailing samples dropped" if self.dropped else ""),
+            f"  signal      {_size(self.signal_bytes)}",
+            f"  patches     view, 0 B copied ({_size(self.unfolded_bytes)} if copied)",
+        ]
+        if self.d_enc:
+            lines.append(f"  embeddings  {self.tokens:,} x {self.d_enc}  "
+                         f"{_size(self.embedding_bytes)}")
+        if self.pooled_bytes:
+            lines.append(f"  pooled      {self.latents} x {self.d_enc}  "
+                         f"{_size(self.pooled_bytes)}")
+        return "\n".join(lines)
+
+
+def patch_report(shape, patch, stride=None, dtype=np.float32, d_enc=None, latents=None):
+    """``PatchReport`` of patching a signal of *shape* ((C, T) or (T,)) stored as *dtype*."""
+    stride = stride or patch
+    channels, length = (1, shape[0]) if len(shape) == 1 else (int(np.prod(shape[:-1])),
+                                                               shape[-1])
+    n = patch_count(length, patch, stride)
+    covered = (n - 1) * stride + patch if n else 0
+    return PatchReport(channels=channels, length=length, patch=patch, stride=stride,
+                       patches=n, dropped=length - covered,
+                       itemsize=np.dtype(dtype).itemsize, d_enc=d_enc, latents=latents)
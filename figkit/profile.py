@@ -0,0 +1,268 @@
+"""
+Per-phase render profiler.
+
+    python -m figkit profile                       # every figure
+    python -m figkit profile 'alignment/*' --json alignment.json
+
+Each figure runs in its own cold interpreter so import cost and peak RSS are
+its own.  Wall time is split into exclusive phases:
+
+    import      modules imported for the first time (numpy, matplotlib, ...)
+    construct   the script's own code building artists
+    layout      tight_layout / constrained layout and bbox_inches='tight'
+                measurement passes (``Figure.get_tightbbox`` and the
+                ``Figure.draw`` on a draw-disabled renderer before it)
+    rasterize   ``Figure.draw`` into the Agg canvas
+    encode      PNG encoding (``matplotlib.image.imsave``)
+    save_other  the rest of ``savefig`` (canvas and renderer setup, I/O)
+
+Artist counts by type are taken from each figure at ``savefig`` time.
+Results are written as JSON (default ``<out>/.figcache/profile.json``) and
+summarised in a table sorted by total cost.
+
+``--artists`` additionally times every artist's ``draw`` during ``savefig``
+and exports speedscope / folded-stack flamegraphs (see ``figkit.drawtime``).
+"""
+
+import builtins
+import contextlib
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from figkit import drawtime
+from figkit.build import discover_scripts
+from figkit.runner import REPO_ROOT, WorkerPool, run_script, script_key
+
+PHASES = ["import", "construct", "layout", "rasterize", "encode", "save_other"]
+
+
+class PhaseTimer:
+    """Accumulates exclusive wall time per phase; nested phases pause their parent."""
+
+    def __init__(self):
+        self.totals = defaultdict(float)
+        self._stack = []
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        now = time.perf_counter()
+        if self._stack:
+            self.totals[self._stack[-1][0]] += now - self._stack[-1][1]
+        self._stack.append([name, now])
+        try:
+            yield
+        finally:
+            now = time.perf_counter()
+            done, start = self._stack.pop()
+            self.totals[done] += now - start
+            if self._stack:
+                self._stack[-1][1] = now
+
+
+def _timed(timer, name, fn):
+    def wrapper(*args, **kwargs):
+        with timer.phase(name):
+            return fn(*args, **kwargs)
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+
+@contextlib.contextmanager
+def _patched(targets):
+    saved = [(owner, attr, getattr(owner, attr)) for owner, attr, _ in targets]
+    for owner, attr, replacement in targets:
+        setattr(owner, attr, replacement)
+    try:
+        yield
+    finally:
+        for owner, attr, original in saved:
+            setattr(owner, attr, original)
+
+
+@contextlib.contextmanager
+def instrument(timer, artists):
+    """Attribute matplotlib work to phases and count artists at each savefig."""
+    import matplotlib.image
+    import matplotlib.layout_engine as engines
+    from matplotlib.backend_bases import RendererBase
+    from matplotlib.figure import Figure
+
+    original_import = builtins.__import__
+    original_savefig = Figure.savefig
+    original_draw = Figure.draw
+    original_draw_disabled = RendererBase._draw_disabled
+    measuring = [0]
+
+    def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and name in sys.modules:
+            return original_import(name, globals, locals, fromlist, level)
+        with timer.phase("import"):
+            return original_import(name, globals, locals, fromlist, level)
+
+    def savefig(self, *args, **kwargs):
+        artists.update(type(artist).__name__ for artist in self.findobj())
+        with timer.phase("save_other"):
+            return original_savefig(self, *args, **kwargs)
+
+    # bbox_inches='tight' and the layout engines measure the figure with a
+    # draw on a renderer whose drawing methods are disabled; that is layout.
+    @contextlib.contextmanager
+    def draw_disabled(self):
+        measuring[0] += 1
+        try:
+            with original_draw_disabled(self):
+                yield
+        finally:
+            measuring[0] -= 1
+
+    def draw(self, *args, **kwargs):
+        with timer.phase("layout" if measuring[0] else "rasterize"):
+            return original_draw(self, *args, **kwargs)
+
+    targets = [
+        (builtins, "__import__", timed_import),
+        (Figure, "savefig", savefig),
+        (Figure, "tight_layout", _timed(timer, "layout", Figure.tight_layout)),
+        (Figure, "get_tightbbox", _timed(timer, "layout", Figure.get_tightbbox)),
+        (RendererBase, "_draw_disabled", draw_disabled),
+        (Figure, "draw", draw),
+        (matplotlib.image, "imsave", _timed(timer, "encode", matplotlib.image.imsave)),
+    ]
+    for cls in (engines.TightLayoutEngine, engines.ConstrainedLayoutEngine):
+        targets.append((cls, "execute", _timed(timer, "layout", cls.execute)))
+    with _patched(targets):
+        yield
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def profile_script(script, output_root=None, root=REPO_ROOT, draw_times=False):
+    """Render *script* in this (ideally fresh) process and return its profile.
+
+    With *draw_times*, the profile also carries a ``"draw"`` entry from
+    ``figkit.drawtime``.
+    """
+    timer = PhaseTimer()
+    artists = Counter()
+    start = time.perf_counter()
+    with timer.phase("import"):
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot  # noqa: F401
+        import numpy  # noqa: F401
+    recorder = drawtime.DrawRecorder(root) if draw_times else None
+    with contextlib.ExitStack() as stack:
+        if recorder is not None:
+            stack.enter_context(drawtime.record_draws(recorder))
+        stack.enter_context(instrument(timer, artists))
+        stack.enter_context(timer.phase("construct"))
+        result = run_script(script, output_root, root)
+    total = time.perf_counter() - start
+    profile = {
+        "key": result.key,
+        "ok": result.ok,
+        "error": result.error,
+        "total": total,
+        "phases": {name: timer.totals.get(name, 0.0) for name in PHASES},
+        "peak_rss_mb": _peak_rss_mb(),
+        "artists": dict(artists.most_common()),
+        "outputs": result.outputs,
+    }
+    if recorder is not None:
+        profile["draw"] = recorder.summary()
+    return profile
+
+
+def profile_all(scripts, output_root=None, workers=1, timeout=None, draw_times=False):
+    """Profile each script in a fresh cold worker; return profiles in input order."""
+    scripts = list(scripts)
+    output_root = str(Path(output_root or REPO_ROOT).resolve())
+    pool = WorkerPool(workers=workers, timeout=timeout, max_tasks=1, warm=False)
+    profiles = [None] * len(scripts)
+    arglist = [(str(script), output_root, str(REPO_ROOT), draw_times) for script in scripts]
+    for outcome in pool.imap_unordered(profile_script, arglist):
+        profiles[outcome.index] = outcome.value if outcome.ok else {
+            "key": script_key(scripts[outcome.index]), "ok": False,
+            "error": outcome.error, "total": outcome.seconds,
+            "phases": {}, "peak_rss_mb": None, "artists": {}, "outputs": [],
+        }
+    return profiles
+
+
+def format_table(profiles):
+    """Human summary, most expensive figure first."""
+    header = f"{'figure':<30} {'total':>7} " + " ".join(f"{p:>10}" for p in PHASES)
+    header += f" {'RSS MB':>7} {'artists':>8}"
+    lines = [header, "-" * len(header)]
+    for prof in sorted(profiles, key=lambda p: p["total"], reverse=True):
+        if not prof["ok"]:
+            lines.append(f"{prof['key']:<30} {prof['total']:7.2f} FAILED")
+            continue
+        phases = " ".join(f"{prof['phases'][p]:10.3f}" for p in PHASES)
+        rss = prof["peak_rss_mb"]
+        rss = f"{rss:7.0f}" if rss is not None else f"{'?':>7}"
+        lines.append(f"{prof['key']:<30} {prof['total']:7.2f} {phases} {rss} "
+                     f"{sum(prof['artists'].values()):8d}")
+    totals = {p: sum(prof["phases"].get(p, 0.0) for prof in profiles) for p in PHASES}
+    grand = sum(prof["total"] for prof in profiles)
+    lines.append("-" * len(header))
+    lines.append(f"{'all':<30} {grand:7.2f} " + " ".join(f"{totals[p]:10.3f}" for p in PHASES))
+    return "\n".join(lines)
+
+
+def configure(parser):
+    parser.add_argument("patterns", nargs="*",
+                        help="glob(s) over figure keys (default: all)")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="profile this many figures at once (default: 1, "
+                             "so timings do not compete for CPU)")
+    parser.add_argument("--timeout", type=float, default=300.0,
+                        help="per-figure timeout in seconds (default: 300)")
+    parser.add_argument("--out", default=None,
+                        help="output root for rendered figures (default: repo root)")
+    parser.add_argument("--json", default=None,
+                        help="where to write the JSON profile "
+                             "(default: <out>/.figcache/profile.json)")
+    parser.add_argument("--artists", action="store_true",
+                        help="time each artist's draw and export flamegraphs")
+    parser.add_argument("--flame-dir", default=None,
+                        help="where --artists writes .speedscope.json / .folded files "
+                             "(default: <out>/.figcache/flame)")
+    parser.add_argument("--top", type=int, default=10,
+                        help="artists listed per figure with --artists (default: 10)")
+
+
+def run(args):
+    scripts = discover_scripts(REPO_ROOT, args.patterns)
+    if not scripts:
+        print("no figure scripts matched")
+        return 1
+    output_root = Path(args.out or REPO_ROOT).resolve()
+    profiles = profile_all(scripts, output_root, workers=args.jobs, timeout=args.timeout,
+                           draw_times=args.artists)
+
+    json_path = Path(args.json) if args.json else output_root / ".figcache" / "profile.json"
+    json_path.parent.mkdir(parents=True, exist_ok=True)
+    json_path.write_text(json.dumps(profiles, indent=1))
+
+    print(format_table(profiles))
+    if args.artists:
+        flame_dir = Path(args.flame_dir or output_root / ".figcache" / "flame")
+        for prof in profiles:
+            if prof["ok"]:
+                drawtime.write_exports(prof["key"], prof["draw"], flame_dir)
+                print("\n" + drawtime.format_sites(prof["key"], prof["draw"], args.top))
+        print(f"\nFlamegraphs written to {flame_dir}")
+    print(f"\nJSON profile written to {json_path}")
+    return 0 if all(prof["ok"] for prof in profiles) else 1
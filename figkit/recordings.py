@@ -0,0 +1,336 @@
+"""
+Physiological recordings (WFDB, EDF) read through memory maps.
+
+The ECG/EEG/accelerometer figures need a few seconds of a real recording,
+and a recording is often gigabytes.  ``open_recording`` parses only the
+header and maps the sample data, so opening costs milliseconds whatever the
+file size; samples are read from disk when a window of them is asked for:
+
+    from figkit.recordings import open_recording
+
+    rec = open_recording("ptb-xl/records500/00000/00001_hr")   # .hea or .edf
+    leads = rec.window(2.0, 12.0, channels=["I", "II", "V1"])  # (3, 5000) mV
+
+Each ``Channel`` keeps the stored integers as ``digital``, a read-only view
+into the map (zero-copy for WFDB formats 16, 32, 61, 80 and 160 and for
+EDF), and converts to physical units, ``(digital - baseline) / gain``, only
+for the samples indexed.  WFDB formats 212 and 24 pack samples across byte
+boundaries; their windows are unpacked on read, touching only the bytes
+the window covers.  EDF stores each signal in per-record blocks, so its
+``digital`` view is (records, samples_per_record) and a window copies just
+the records it overlaps.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+# WFDB formats stored as plain little- or big-endian integers, with the
+# offset subtracted to give the digital value.
+_WFDB_PLAIN = {"16": ("<i2", 0), "32": ("<i4", 0), "61": (">i2", 0),
+               "80": ("u1", 128), "160": ("<u2", 32768)}
+# Packed formats: (bytes, samples) per group.
+_WFDB_PACKED = {"212": (3, 2), "24": (3, 1)}
+_WFDB_SIGNAL = re.compile(r"(\d+)(?:x(\d+))?(?::(\d+))?(?:\+(\d+))?$")
+_WFDB_GAIN = re.compile(r"([-+\d.eE]+)(?:\(([-+\d]+)\))?(?:/(.*))?$")
+_DEFAULT_GAIN = 200.0
+
+
+class Channel:
+    """One signal of a recording: digital samples on disk, physical units on read."""
+
+    def __init__(self, name, fs, gain, baseline, units, digital, read=None):
+        self.name = name
+        self.fs = fs
+        self.gain = gain
+        self.baseline = baseline
+        self.units = units
+        self.digital = digital
+        self._read = read or (lambda start, stop: digital[start:stop])
+
+    def __len__(self):
+        return self.n_samples
+
+    def __repr__(self):
+        return f"Channel({self.name!r}, fs={self.fs:g}, n_samples={self.n_samples})"
+
+    @property
+    def n_samples(self):
+        return len(self.digital) if self.digital.ndim == 1 else self.digital.size
+
+    def read_digital(self, start=0, stop=None):
+        """Stored integers of samples ``start:stop``, as read from disk."""
+        start, stop, _ = slice(start, stop).indices(self.n_samples)
+        return self._read(start, max(start, stop))
+
+    def __getitem__(self, index):
+        """Samples ``index`` (a slice) in physical units, as float32."""
+        if not isinstance(index, slice):
+            raise TypeError(f"channels are indexed with slices, not {type(index).__name__}")
+        start, stop, step = index.indices(self.n_samples)
+        values = self.read_digital(start, stop)[::step].astype(np.float32)
+        values -= self.baseline
+        values /= self.gain
+        return values
+
+    def window(self, start, stop):
+        """Samples from *start* to *stop* seconds, in physical units."""
+        return self[self.sample(start):self.sample(stop)]
+
+    def sample(self, seconds):
+        """Index of the sample at *seconds*, clipped to the recording."""
+        return int(min(max(round(seconds * self.fs), 0), self.n_samples))
+
+
+@dataclass
+class Recording:
+    """A multichannel recording opened by ``read_wfdb`` or ``read_edf``."""
+
+    path: Path
+    channels: list
+    start: datetime = None
+    annotations: list = field(default_factory=list)   # EDF+ channels, not decoded
+
+    def __repr__(self):
+        return (f"Recording({self.path.name!r}, {len(self.channels)} channels, "
+                f"{self.duration:g} s)")
+
+    @property
+    def names(self):
+        return [channel.name for channel in self.channels]
+
+    @property
+    def duration(self):
+        """Length in seconds of the longest channel."""
+        return max((c.n_samples / c.fs for c in self.channels), default=0.0)
+
+    def channel(self, key):
+        """The channel at index *key*, or named *key* (exact, then case-insensitive)."""
+        if isinstance(key, (int, np.integer)):
+            return self.channels[key]
+        names = self.names
+        if key in names:
+            return self.channels[names.index(key)]
+        folded = [name.casefold() for name in names]
+        if key.casefold() in folded:
+            return self.channels[folded.index(key.casefold())]
+        raise KeyError(f"{self.path.name} has no channel {key!r} (has {names})")
+
+    __getitem__ = channel
+
+    def window(self, start, stop, channels=None):
+        """(C, N) float32 array of *channels* (default: all) from *start* to *stop* s.
+
+        The channels must share a sampling rate.
+        """
+        selected = [self.channel(key) for key in (channels if channels is not None
+                                                  else range(len(self.channels)))]
+        rates = {c.fs for c in selected}
+        if len(rates) > 1:
+            raise ValueError(f"channels sample at different rates {sorted(rates)}; "
+                             "read them one at a time with Channel.window")
+        windows = [c.window(start, stop) for c in selected]
+        length = min((len(w) for w in windows), default=0)
+        return np.stack([w[:length] for w in windows]) if windows \
+            else np.empty((0, 0), np.float32)
+
+
+# ── WFDB ────────────────────────────────────────────────────────────────────
+
+def _wfdb_lines(path):
+    with open(path, encoding="latin-1") as f:
+        return [line.split("#", 1)[0].strip() for line in f
+                if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _wfdb_start(fields):
+    if len(fields) < 2:
+        return None
+    for fmt in ("%H:%M:%S.%f %d/%m/%Y", "%H:%M:%S %d/%m/%Y"):
+        try:
+            return datetime.strptime(" ".join(fields[:2]), fmt)
+        except ValueError:
+            pass
+    return None
+
+
+def _unpack(raw, fmt, start, stop, n_signals, column):
+    """Digital samples ``start:stop`` of one signal in a packed (212, 24) file."""
+    group_bytes, group_samples = _WFDB_PACKED[fmt]
+    first, last = start * n_signals, stop * n_signals
+    g0, g1 = first // group_samples, -(-last // group_samples)
+    chunk = np.asarray(raw[g0 * group_bytes:g1 * group_bytes], np.int32)
+    chunk = chunk[:len(chunk) // group_bytes * group_bytes].reshape(-1, group_bytes)
+    if fmt == "212":
+        flat = np.empty((len(chunk), 2), np.int32)
+        flat[:, 0] = chunk[:, 0] | (chunk[:, 1] & 0x0F) << 8
+        flat[:, 1] = chunk[:, 2] | (chunk[:, 1] & 0xF0) << 4
+        flat = flat.ravel()
+        flat[flat >= 2048] -= 4096
+    else:
+        flat = chunk[:, 0] | chunk[:, 1] << 8 | chunk[:, 2] << 16
+        flat[flat >= 1 << 23] -= 1 << 24
+    flat = flat[first - g0 * group_samples:last - g0 * group_samples]
+    return flat.reshape(-1, n_signals)[:, column]
+
+
+class _PackedSamples:
+    """Array-like stand-in for a packed signal: length, slicing and the raw bytes."""
+
+    ndim = 1
+
+    def __init__(self, raw, frames, read):
+        self.raw = raw
+        self._frames = frames
+        self._read = read
+
+    def __len__(self):
+        return self._frames
+
+    @property
+    def size(self):
+        return self._frames
+
+    def __getitem__(self, index):
+        start, stop, step = index.indices(self._frames)
+        return self._read(start, max(start, stop))[::step]
+
+
+def read_wfdb(path):
+    """Open a WFDB record from its ``.hea`` header (or the record path without it).
+
+    Signal files are found next to the header.  Multi-segment records and
+    multi-frequency signals (``x`` samples per frame) are not supported.
+    """
+    path = Path(path)
+    header = path if path.suffix == ".hea" else path.with_name(path.name + ".hea")
+    lines = _wfdb_lines(header)
+    record = lines[0].split()
+    if "/" in record[0]:
+        raise ValueError(f"{header.name}: multi-segment records are not supported")
+    n_signals = int(record[1])
+    fs = float(re.split(r"[/(]", record[2])[0]) if len(record) > 2 else 250.0
+    n_samples = int(record[3]) if len(record) > 3 else None
+
+    specs = []
+    for line in lines[1:1 + n_signals]:
+        fields = line.split()
+        fmt, spf, _, offset = _WFDB_SIGNAL.match(fields[1]).groups()
+        if spf not in (None, "1"):
+            raise ValueError(f"{header.name}: {spf} samples per frame are not supported")
+        gain, baseline, units = _DEFAULT_GAIN, None, "mV"
+        if len(fields) > 2:
+            g, b, u = _WFDB_GAIN.match(fields[2]).groups()
+            gain = float(g) or _DEFAULT_GAIN
+            baseline = int(b) if b is not None else None
+            units = u or units
+        zero = int(fields[4]) if len(fields) > 4 else 0
+        name = " ".join(fields[8:]) if len(fields) > 8 else f"sig{len(specs)}"
+        specs.append((fields[0], fmt, int(offset or 0), gain,
+                      baseline if baseline is not None else zero, units, name))
+
+    # Signals sharing a file are interleaved in it, one frame per sample time.
+    files = {}
+    for spec in specs:
+        files.setdefault(spec[0], []).append(spec)
+    channels = {}
+    for filename, group in files.items():
+        fmt, offset = group[0][1], group[0][2]
+        if any(spec[1] != fmt for spec in group):
+            raise ValueError(f"{header.name}: mixed formats in {filename} are not supported")
+        data = header.with_name(filename)
+        if fmt in _WFDB_PLAIN:
+            dtype, shift = _WFDB_PLAIN[fmt]
+            frames = (data.stat().st_size - offset) // (np.dtype(dtype).itemsize * len(group))
+            frames = min(frames, n_samples) if n_samples else frames
+            raw = np.memmap(data, dtype, "r", offset, (frames, len(group)))
+            for column, spec in enumerate(group):
+                view = raw[:, column]
+                read = (lambda start, stop, view=view, shift=shift:
+                        view[start:stop].astype(np.int32) - shift) if shift else None
+                channels[spec] = Channel(spec[6], fs, spec[3], spec[4], spec[5], view, read)
+        elif fmt in _WFDB_PACKED:
+            group_bytes, group_samples = _WFDB_PACKED[fmt]
+            raw = np.memmap(data, np.uint8, "r", offset)
+            frames = len(raw) // group_bytes * group_samples // len(group)
+            frames = min(frames, n_samples) if n_samples else frames
+            for column, spec in enumerate(group):
+                def read(start, stop, raw=raw, fmt=fmt, column=column, width=len(group)):
+                    return _unpack(raw, fmt, start, stop, width, column)
+                # No zero-copy view exists for packed samples; expose the bytes.
+                digital = _PackedSamples(raw, frames, read)
+                channels[spec] = Channel(spec[6], fs, spec[3], spec[4], spec[5], digital, read)
+        else:
+            raise ValueError(f"{header.name}: WFDB format {fmt} is not supported "
+                             f"(use {', '.join([*_WFDB_PLAIN, *_WFDB_PACKED])})")
+    return Recording(path=header, channels=[channels[spec] for spec in specs],
+                     start=_wfdb_start(record[4:]))
+
+
+# ── EDF ─────────────────────────────────────────────────────────────────────
+
+def _edf_fields(block, count, width):
+    return [block[i * width:(i + 1) * width].decode("latin-1").strip()
+            for i in range(count)]
+
+
+def read_edf(path):
+    """Open an EDF or EDF+ file; EDF+ annotation channels are listed, not decoded."""
+    path = Path(path)
+    with open(path, "rb") as f:
+        fixed = f.read(256)
+        header_bytes = int(fixed[184:192])
+        n_signals = int(fixed[252:256])
+        block = f.read(header_bytes - 256)
+    n_records = int(fixed[236:244])
+    record_seconds = float(fixed[244:252]) or 1.0
+    columns, offset = {}, 0
+    for name, width in (("label", 16), ("transducer", 80), ("units", 8), ("pmin", 8),
+                        ("pmax", 8), ("dmin", 8), ("dmax", 8), ("prefilter", 80),
+                        ("samples", 8), ("reserved", 32)):
+        columns[name] = _edf_fields(block[offset:], n_signals, width)
+        offset += width * n_signals
+
+    samples = [int(n) for n in columns["samples"]]
+    record = np.dtype([(f"s{i}", "<i2", (n,)) for i, n in enumerate(samples)])
+    available = (path.stat().st_size - header_bytes) // record.itemsize
+    n_records = available if n_records < 0 else min(n_records, available)
+    records = np.memmap(path, record, "r", header_bytes, (n_records,))
+
+    channels, annotations = [], []
+    for i, (label, n) in enumerate(zip(columns["label"], samples)):
+        if label == "EDF Annotations":
+            annotations.append(label)
+            continue
+        pmin, pmax = float(columns["pmin"][i]), float(columns["pmax"][i])
+        dmin, dmax = float(columns["dmin"][i]), float(columns["dmax"][i])
+        gain = (dmax - dmin) / (pmax - pmin) if pmax != pmin else 1.0
+        view = records[f"s{i}"]
+
+        def read(start, stop, view=view, n=n):
+            first, last = start // n, -(-stop // n)
+            return view[first:last].reshape(-1)[start - first * n:stop - first * n]
+
+        channels.append(Channel(label, n / record_seconds, gain, dmin - pmin * gain,
+                                columns["units"][i], view, read))
+
+    start = None
+    try:
+        start = datetime.strptime((fixed[168:176] + fixed[176:184]).decode("latin-1"),
+                                  "%d.%m.%y%H.%M.%S")
+    except ValueError:
+        pass
+    return Recording(path=path, channels=channels, start=start, annotations=annotations)
+
+
+def open_recording(path):
+    """Open *path* with ``read_edf`` (``.edf``/``.rec``) or ``read_wfdb`` (otherwise)."""
+    path = Path(path)
+    if path.suffix.lower() in (".edf", ".rec"):
+        return read_edf(path)
+    if path.suffix.lower() == ".bdf":
+        raise ValueError(f"{path.name}: BDF (24-bit EDF) is not supported")
+    return read_wfdb(path.with_suffix("") if path.suffix == ".dat" else path)
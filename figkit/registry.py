@@ -0,0 +1,266 @@
+"""
+Figure registry: list, import and render figures by key without running them all.
+
+Every figure script is registered under its path key (``llava/fig_003``).
+Listing reads metadata from the script's syntax tree only, so it never
+imports matplotlib or executes a script:
+
+    >>> from figkit import registry
+    >>> [spec.key for spec in registry.figures(["llava/*"])]
+    ['llava/fig_003', 'llava/fig_004', ...]
+    >>> fig = registry.get("llava/fig_003").build()
+
+A script opts into the native API by defining, at module level,
+
+    FIGURE = {"size": (18, 7.5), "dpi": 200, "output": "/home/wangni/...",
+              "savefig": {...}, "data": [...], "params": {...}}
+
+    def build(params=None):
+        ...
+        return fig
+
+and keeping its ``savefig`` call under ``if __name__ == "__main__":``.
+``FIGURE`` must be a literal; ``params`` lists the defaults ``build`` accepts.
+Scripts without ``build`` are still registered: their ``build`` executes the
+script with ``savefig`` intercepted and returns the figure it would have saved.
+"""
+
+import ast
+import importlib.util
+import runpy
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from figkit.build import discover_scripts
+from figkit.runner import REPO_ROOT, redirect_path, run_script, script_key
+
+# Calls whose first string argument names a data file the figure reads.
+_READERS = {"open", "load", "loadtxt", "genfromtxt", "read_csv", "read_parquet", "memmap"}
+
+
+@dataclass
+class FigureSpec:
+    """Static description of one registered figure."""
+
+    key: str
+    path: Path
+    title: str = ""
+    size: tuple = None
+    dpi: float = None
+    output: str = None
+    savefig: dict = field(default_factory=dict)
+    data: list = field(default_factory=list)
+    params: dict = field(default_factory=dict)
+    native: bool = False
+
+    def build(self, params=None):
+        """Construct and return the figure without saving it."""
+        if self.native:
+            return _load_module(self).build(params)
+        if params:
+            raise ValueError(f"{self.key} has no build() and takes no parameters")
+        return _capture_figure(self.path)
+
+    def render(self, output_root=None, params=None):
+        """Save the figure under *output_root*; return the written paths."""
+        output_root = Path(output_root or REPO_ROOT).resolve()
+        if not self.native:
+            if params:
+                raise ValueError(f"{self.key} has no build() and takes no parameters")
+            result = run_script(self.path, output_root)
+            if not result.ok:
+                raise RuntimeError(f"{self.key} failed:\n{result.error}")
+            return result.outputs
+
+        import matplotlib
+        import matplotlib.pyplot as plt
+
+        out = Path(redirect_path(self.output, output_root))
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with matplotlib.rc_context():
+            fig = self.build(params)
+            try:
+                fig.savefig(out, dpi=self.dpi, **self.savefig)
+            finally:
+                plt.close(fig)
+        return [str(out)]
+
+
+# ── Static metadata ─────────────────────────────────────────────────────────
+
+def _literal(node, names):
+    if isinstance(node, ast.Name) and node.id in names:
+        return names[node.id]
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return None
+
+
+def _call_name(node):
+    func = node.func
+    if isinstance(func, ast.Attribute):
+        return func.attr
+    if isinstance(func, ast.Name):
+        return func.id
+    return None
+
+
+def inspect_script(path, root=REPO_ROOT):
+    """Build a ``FigureSpec`` for *path* by reading its syntax tree."""
+    path = Path(path).resolve()
+    tree = ast.parse(path.read_text(encoding="utf-8"), str(path))
+    doc = ast.get_docstring(tree) or ""
+    title = next((line.strip() for line in doc.splitlines() if line.strip()), "")
+    spec = FigureSpec(key=script_key(path, root), path=path, title=title)
+
+    # Module-level string/number constants, for `out_path = "..."` indirection.
+    names = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                and isinstance(node.targets[0], ast.Name):
+            value = _literal(node.value, {})
+            if value is not None:
+                names[node.targets[0].id] = value
+        elif isinstance(node, ast.FunctionDef) and node.name == "build":
+            spec.native = True
+
+    meta = names.get("FIGURE")
+    if spec.native and isinstance(meta, dict):
+        spec.size = tuple(meta["size"]) if meta.get("size") else None
+        spec.dpi = meta.get("dpi")
+        spec.output = meta.get("output")
+        spec.savefig = dict(meta.get("savefig", {}))
+        spec.data = list(meta.get("data", []))
+        spec.params = dict(meta.get("params", {}))
+        return spec
+    spec.native = False
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        name = _call_name(node)
+        kwargs = {kw.arg: kw.value for kw in node.keywords if kw.arg}
+        if spec.size is None and "figsize" in kwargs:
+            size = _literal(kwargs["figsize"], names)
+            spec.size = tuple(size) if size else None
+        if name == "savefig":
+            if node.args and spec.output is None:
+                spec.output = _literal(node.args[0], names)
+            if "dpi" in kwargs and spec.dpi is None:
+                spec.dpi = _literal(kwargs["dpi"], names)
+        elif name in _READERS and node.args:
+            target = _literal(node.args[0], names)
+            if isinstance(target, str) and not target.endswith(".png"):
+                spec.data.append(target)
+    return spec
+
+
+def figures(patterns=(), root=REPO_ROOT):
+    """``FigureSpec`` for every figure whose key matches *patterns*."""
+    return [inspect_script(path, root) for path in discover_scripts(root, patterns)]
+
+
+def get(key, root=REPO_ROOT):
+    """The ``FigureSpec`` registered under *key*."""
+    path = Path(root) / f"{key}.py"
+    if not path.is_file():
+        raise KeyError(key)
+    return inspect_script(path, root)
+
+
+# ── Building ────────────────────────────────────────────────────────────────
+
+_modules = {}
+
+
+def _load_module(spec):
+    """Import a native figure script once and reuse it for later builds."""
+    mtime = spec.path.stat().st_mtime_ns
+    cached = _modules.get(spec.key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    name = "figkit_figures." + spec.key.replace("/", ".").replace("-", "_")
+    module_spec = importlib.util.spec_from_file_location(name, spec.path)
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    _modules[spec.key] = (mtime, module)
+    return module
+
+
+def _capture_figure(path):
+    """Run a legacy script, returning the figure it saves instead of writing it."""
+    import matplotlib
+    from matplotlib.figure import Figure
+
+    captured = []
+    original = Figure.savefig
+
+    def savefig(self, *args, **kwargs):
+        captured.append(self)
+
+    Figure.savefig = savefig
+    try:
+        with matplotlib.rc_context():
+            runpy.run_path(str(path), run_name="__main__")
+    finally:
+        Figure.savefig = original
+    if not captured:
+        raise RuntimeError(f"{path} did not call savefig")
+    return captured[-1]
+
+
+# ── CLI ─────────────────────────────────────────────────────────────────────
+
+def _parse_params(pairs):
+    params = {}
+    for pair in pairs:
+        name, _, value = pair.partition("=")
+        try:
+            params[name] = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            params[name] = value
+    return params
+
+
+def configure_list(parser):
+    parser.add_argument("patterns", nargs="*", help="glob(s) over figure keys")
+
+
+def run_list(args):
+    for spec in figures(args.patterns):
+        size = "x".join(f"{v:g}" for v in spec.size) if spec.size else "?"
+        dpi = f"{spec.dpi:g}" if spec.dpi else "?"
+        kind = "build" if spec.native else "script"
+        print(f"{spec.key:<32} {kind:<6} {size:>10} @ {dpi:<4} {spec.title}")
+    return 0
+
+
+def configure_render(parser):
+    parser.add_argument("patterns", nargs="+", help="glob(s) over figure keys")
+    parser.add_argument("--out", default=None,
+                        help="output root (default: the repository root)")
+    parser.add_argument("-p", "--param", action="append", default=[], metavar="NAME=VALUE",
+                        help="build() parameter; values are Python literals")
+
+
+def run_render(args):
+    from figkit.runner import preload
+
+    preload()
+    params = _parse_params(args.param)
+    failed = 0
+    for spec in figures(args.patterns):
+        if params and not spec.native:
+            print(f"{spec.key}: skipped, no build() to take parameters", file=sys.stderr)
+            continue
+        try:
+            outputs = spec.render(args.out, params or None)
+        except Exception as exc:
+            print(f"{spec.key}: {type(exc).__name__}: {exc}", file=sys.stderr)
+            failed += 1
+            continue
+        for output in outputs:
+            print(f"{spec.key} -> {output}")
+    return 1 if failed else 0
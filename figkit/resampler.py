@@ -0,0 +1,266 @@
+"""
+Perceiver and instruction-guided resamplers in numpy, and a cache of their attention maps.
+
+The resampler figures (genomics/fig_003, itformer/fig_006) show latent
+cross-attention as a schematic.  ``Resampler`` runs the real computation on
+the CPU: M learned latents attend, layer after layer, to the N input
+patches (and to themselves, as in Flamingo), each layer a cross-attention
+and a feed-forward block with pre-norm residuals.  With ``text`` weights it
+is an instruction-guided resampler (IGR): before the first layer the
+latents self-attend jointly with the embedded text query, so what they
+pick out of the patches depends on the question.
+
+Patch sequences can be long, so keys and values are never held whole.
+They are projected a chunk of ``chunk_keys`` patches at a time and folded
+into an online softmax (running max, normaliser and weighted sum per
+latent and head), so memory is one chunk whatever N.  Recording maps is a
+second pass over the same chunks with the final normalisers, each chunk's
+weights summed straight into ``bins`` key blocks:
+
+    from figkit.resampler import Resampler, cache_runs, load_runs
+
+    perceiver = Resampler.init(d_in=128, dim=512, latents=64, layers=6, heads=8)
+    igr = Resampler.init(d_in=128, dim=512, latents=25, layers=6, heads=8, d_text=384)
+    out, maps = perceiver(patches, record=True, bins=256)    # maps: (layers, heads, M, bins)
+
+    cache_runs("ecg_maps.npz", {"perceiver": perceiver, "igr": igr}, patches,
+               {"q1": q1_embedding, "q2": q2_embedding})
+    cache = load_runs("ecg_maps.npz")
+    cache.runs["igr/q1"]                  # (layers, heads, M, bins) float32
+
+A map entry is the attention mass a latent puts on a block of patches;
+the rest of each row went to the latents themselves.  The cache is one
+compressed ``.npz``, float16 maps plus JSON metadata, so figures plot cached
+runs without recomputing them.  Weights come from ``Resampler.init``
+(seeded) or from an ``.npz`` exported from a trained model (``load``; the
+key names are those ``save`` writes).
+"""
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+CHUNK_BYTES = 64 << 20
+LAYER_KEYS = ("wq", "wk", "wv", "wo", "ff1", "ff2")
+_EPS = 1e-5
+
+
+def _norm(x):
+    """Layer norm without affine parameters, float32."""
+    x = np.asarray(x, np.float32)
+    mean = x.mean(axis=-1, keepdims=True)
+    return (x - mean) / np.sqrt(x.var(axis=-1, keepdims=True) + _EPS)
+
+
+def _gelu(x):
+    return 0.5 * x * (1 + np.tanh(0.7978845608 * (x + 0.044715 * x ** 3)))
+
+
+def _split(x, heads):
+    """(n, dim) -> (heads, n, dim / heads)."""
+    return x.reshape(len(x), heads, -1).transpose(1, 0, 2)
+
+
+def _merge(x):
+    """(heads, n, d) -> (n, heads * d)."""
+    return x.transpose(1, 0, 2).reshape(x.shape[1], -1)
+
+
+def _bin_into(out, weights, start, n_keys):
+    """Add (heads, M, c) *weights* of keys ``start:start + c`` into their key blocks."""
+    bins = out.shape[-1]
+    block = (np.arange(start, start + weights.shape[-1]) * bins) // n_keys
+    firsts = np.r_[0, np.flatnonzero(np.diff(block)) + 1]
+    out[..., block[firsts]] += np.add.reduceat(weights, firsts, axis=-1)
+
+
+class _OnlineSoftmax:
+    """Softmax-weighted sum of values over key chunks, one latent row per query."""
+
+    def __init__(self, q):
+        heads, m, d = q.shape
+        self.q = q / np.sqrt(d)
+        self.max = np.full((heads, m, 1), -np.inf, np.float32)
+        self.total = np.zeros((heads, m, 1), np.float32)
+        self.acc = np.zeros((heads, m, d), np.float32)
+
+    def add(self, k, v):
+        scores = self.q @ k.transpose(0, 2, 1)
+        new_max = np.maximum(self.max, scores.max(axis=-1, keepdims=True))
+        scale = np.exp(self.max - new_max)
+        p = np.exp(scores - new_max)
+        self.total = self.total * scale + p.sum(axis=-1, keepdims=True)
+        self.acc = self.acc * scale + p @ v
+        self.max = new_max
+
+    def weights(self, k):
+        """Final softmax weights of keys *k*, once every chunk has been added."""
+        return np.exp(self.q @ k.transpose(0, 2, 1) - self.max) / self.total
+
+    def result(self):
+        return self.acc / self.total
+
+
+@dataclass
+class Resampler:
+    """Weights of a Perceiver resampler; an IGR when ``text`` weights are present."""
+
+    proj_in: np.ndarray     # (d_in, dim)
+    latents: np.ndarray     # (M, dim)
+    layers: list            # per layer, a dict of LAYER_KEYS arrays
+    heads: int
+    text: dict = None       # IGR conditioning: proj (d_text, dim) and wq / wk / wv / wo
+    chunk_bytes: int = CHUNK_BYTES
+
+    @property
+    def dim(self):
+        return self.latents.shape[1]
+
+    @classmethod
+    def init(cls, d_in, dim=512, latents=64, layers=6, heads=8, d_text=None, seed=0):
+        """Randomly initialised weights (scaled normal), reproducible by *seed*."""
+        if dim % heads:
+            raise ValueError(f"dim {dim} is not divisible by {heads} heads")
+        rng = np.random.default_rng(seed)
+
+        def weight(n_in, n_out):
+            return (rng.standard_normal((n_in, n_out)) / np.sqrt(n_in)).astype(np.float32)
+
+        shapes = {"wq": (dim, dim), "wk": (dim, dim), "wv": (dim, dim), "wo": (dim, dim),
+                  "ff1": (dim, 4 * dim), "ff2": (4 * dim, dim)}
+        return cls(
+            proj_in=weight(d_in, dim),
+            latents=rng.standard_normal((latents, dim)).astype(np.float32),
+            layers=[{key: weight(*shapes[key]) for key in LAYER_KEYS} for _ in range(layers)],
+            heads=heads,
+            text=None if d_text is None else {
+                "proj": weight(d_text, dim),
+                **{key: weight(dim, dim) for key in ("wq", "wk", "wv", "wo")}})
+
+    def save(self, path):
+        """Write the weights to an ``.npz``: ``proj_in``, ``latents``, ``layer<i>.<key>``, ``text.<key>``."""
+        arrays = {"proj_in": self.proj_in, "latents": self.latents,
+                  "heads": np.array(self.heads)}
+        for i, layer in enumerate(self.layers):
+            arrays.update({f"layer{i}.{key}": layer[key] for key in LAYER_KEYS})
+        arrays.update({f"text.{key}": value for key, value in (self.text or {}).items()})
+        np.savez(path, **arrays)
+        return Path(path)
+
+    @classmethod
+    def load(cls, path):
+        """Weights from an ``.npz`` laid out as ``save`` writes it."""
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        count = len({name.split(".")[0] for name in arrays if name.startswith("layer")})
+        missing = [f"layer{i}.{key}" for i in range(count) for key in LAYER_KEYS
+                   if f"layer{i}.{key}" not in arrays]
+        if missing:
+            raise KeyError(f"{Path(path).name} is missing {', '.join(missing)}")
+        text = {name[5:]: value for name, value in arrays.items() if name.startswith("text.")}
+        return cls(proj_in=arrays["proj_in"], latents=arrays["latents"],
+                   layers=[{key: arrays[f"layer{i}.{key}"] for key in LAYER_KEYS}
+                           for i in range(count)],
+                   heads=int(arrays["heads"]), text=text or None)
+
+    def _chunk_keys(self, m):
+        return max(1, self.chunk_bytes // (4 * (self.heads * m + 3 * self.dim)))
+
+    def _condition(self, latents, query):
+        """IGR: latents self-attend jointly with the embedded query tokens."""
+        w = self.text
+        tokens = _norm(np.concatenate([latents, np.asarray(query, np.float32) @ w["proj"]]))
+        q, k, v = (_split(tokens @ w[key], self.heads) for key in ("wq", "wk", "wv"))
+        scores = q @ k.transpose(0, 2, 1) / np.sqrt(q.shape[-1])
+        scores = np.exp(scores - scores.max(axis=-1, keepdims=True))
+        attended = _merge(scores / scores.sum(axis=-1, keepdims=True) @ v) @ w["wo"]
+        return latents + attended[:len(latents)]
+
+    def __call__(self, inputs, query=None, record=False, bins=512):
+        """Resample (N, d_in) *inputs* to (M, dim) latents.
+
+        *query* (T, d_text) embeds the text question; it conditions an IGR
+        and is ignored by a plain Perceiver.  With *record*, also returns
+        per-layer maps, (layers, heads, M, min(bins, N)) float32.
+        """
+        n = len(inputs)
+        latents = self.latents.astype(np.float32)
+        if self.text is not None and query is not None:
+            latents = self._condition(latents, query)
+        step = self._chunk_keys(len(latents))
+        maps = np.zeros((len(self.layers), self.heads, len(latents), min(bins, n)),
+                        np.float32) if record else None
+
+        def chunk(start):
+            return _norm(np.asarray(inputs[start:start + step], np.float32) @ self.proj_in)
+
+        for i, layer in enumerate(self.layers):
+            normed = _norm(latents)
+            attention = _OnlineSoftmax(_split(normed @ layer["wq"], self.heads))
+            for start in range(0, n, step):
+                x = chunk(start)
+                attention.add(_split(x @ layer["wk"], self.heads),
+                              _split(x @ layer["wv"], self.heads))
+            attention.add(_split(normed @ layer["wk"], self.heads),
+                          _split(normed @ layer["wv"], self.heads))
+            if record:
+                for start in range(0, n, step):
+                    keys = _split(chunk(start) @ layer["wk"], self.heads)
+                    _bin_into(maps[i], attention.weights(keys), start, n)
+            latents = latents + _merge(attention.result()) @ layer["wo"]
+            latents = latents + _gelu(_norm(latents) @ layer["ff1"]) @ layer["ff2"]
+        out = _norm(latents)
+        return (out, maps) if record else out
+
+
+# ── Cache ────────────────────────────────────────────────────────────────
+
+
+@dataclass
+class AttentionCache:
+    """Cached attention maps of named runs."""
+
+    runs: dict                              # name -> (layers, heads, M, bins) float32
+    meta: dict = field(default_factory=dict)
+
+    def layer_map(self, run, layer=-1):
+        """(M, bins) map of one layer of *run*, averaged over heads."""
+        return self.runs[run][layer].mean(axis=0)
+
+
+def save_runs(path, runs, **meta):
+    """Write ``{name: maps}`` as float16 into one compressed ``.npz``, with *meta* as JSON."""
+    arrays = {f"run.{name}": np.asarray(maps, np.float16) for name, maps in runs.items()}
+    np.savez_compressed(path, meta=np.array(json.dumps(meta)), **arrays)
+    return Path(path)
+
+
+def load_runs(path):
+    """``AttentionCache`` of a file written by ``save_runs`` or ``cache_runs``."""
+    with np.load(path) as data:
+        runs = {name[4:]: data[name].astype(np.float32) for name in data.files
+                if name.startswith("run.")}
+        meta = json.loads(str(data["meta"])) if "meta" in data.files else {}
+    return AttentionCache(runs, meta)
+
+
+def cache_runs(path, models, inputs, queries=None, bins=512, **meta):
+    """Run every model of *models* on *inputs* and cache the maps as ``<model>/<query>``.
+
+    *queries* maps names to (T, d_text) embeddings.  A plain Perceiver
+    ignores the query, so it is run once and cached under every name.
+    """
+    queries = queries or {"none": None}
+    runs = {}
+    for model_name, model in models.items():
+        if model.text is None:
+            _, maps = model(inputs, record=True, bins=bins)
+            runs.update({f"{model_name}/{name}": maps for name in queries})
+            continue
+        for name, query in queries.items():
+            _, runs[f"{model_name}/{name}"] = model(inputs, query, record=True, bins=bins)
+    meta.setdefault("patches", len(inputs))
+    meta.setdefault("queries", list(queries))
+    return save_runs(path, runs, **meta)
@@ -0,0 +1,356 @@
+"""
+Execute figure scripts, either in-process or on a pool of warm workers.
+
+Every figure script saves to a hardcoded ``/home/wangni/notion-figures/...``
+path.  ``run_script`` executes a script with ``Figure.savefig`` patched so
+those paths land under a configurable output root instead, and isolates the
+script's rcParams changes and open figures from whatever runs next in the
+same process.
+
+``WorkerPool`` keeps a fixed number of worker processes alive with
+matplotlib, numpy and the font cache already imported, so each job only pays
+for its own script.  A job that exceeds its timeout or crashes its worker is
+reported as failed and the worker is replaced; other jobs are unaffected.
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import runpy
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from multiprocessing.connection import wait
+from pathlib import Path
+
+LEGACY_ROOT = "/home/wangni/notion-figures"
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules every worker imports once at startup.
+PRELOAD_MODULES = ["numpy", "matplotlib", "matplotlib.pyplot", "figkit.runner"]
+
+
+@dataclass
+class JobResult:
+    """Outcome of rendering one figure script."""
+
+    key: str
+    ok: bool
+    seconds: float = 0.0
+    outputs: list = field(default_factory=list)
+    error: str = ""
+    timed_out: bool = False
+    log: str = ""
+    inputs: list = field(default_factory=list)
+
+
+def script_key(script, root=REPO_ROOT):
+    """Registry-style key for a script, e.g. ``llava/fig_003``."""
+    rel = Path(script).resolve().relative_to(Path(root).resolve())
+    return rel.with_suffix("").as_posix()
+
+
+def preload():
+    """Import matplotlib, numpy and the font cache into this process."""
+    os.environ.setdefault("MPLBACKEND", "Agg")
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.figure
+    import matplotlib.font_manager
+    import matplotlib.pyplot  # noqa: F401
+    import numpy  # noqa: F401
+    # The first text draw builds the font lookup, loads glyph faces and
+    # constructs the mathtext grammar; pay for that here rather than inside
+    # the first job.
+    matplotlib.font_manager.findfont(matplotlib.font_manager.FontProperties())
+    fig = matplotlib.figure.Figure(figsize=(1, 1))
+    fig.text(0.1, 0.5, "warm-up", fontweight="bold")
+    fig.text(0.1, 0.1, r"$\alpha_1^2$")
+    fig.savefig(io.BytesIO(), format="png")
+
+
+def redirect_path(fname, output_root):
+    """Map a legacy ``/home/wangni/notion-figures/...`` path under *output_root*."""
+    if not isinstance(fname, (str, os.PathLike)):
+        return fname
+    path = os.fspath(fname)
+    if path == LEGACY_ROOT or path.startswith(LEGACY_ROOT + "/"):
+        rel = os.path.relpath(path, LEGACY_ROOT)
+        return os.path.join(os.fspath(output_root), rel)
+    return fname
+
+
+# Files opened for reading while a script runs; see ``record_reads``.
+_opened = None
+_audit_installed = False
+
+
+def _audit(event, args):
+    if event != "open" or _opened is None:
+        return
+    path, mode = args[0], args[1]
+    if not isinstance(path, (str, bytes)):
+        return
+    if mode is None:
+        if args[2] & (os.O_WRONLY | os.O_RDWR):
+            return
+    elif any(flag in mode for flag in "wax+"):
+        return
+    _opened.add(os.fsdecode(path))
+
+
+@contextlib.contextmanager
+def record_reads():
+    """Collect the paths of all files opened for reading inside the block."""
+    global _opened, _audit_installed
+    if not _audit_installed:
+        sys.addaudithook(_audit)
+        _audit_installed = True
+    opened = set()
+    _opened = opened
+    try:
+        yield opened
+    finally:
+        _opened = None
+
+
+def data_inputs(opened, root, exclude=()):
+    """Filter recorded reads down to non-code files that live under *root*."""
+    root = Path(root).resolve()
+    exclude = {Path(p).resolve() for p in exclude}
+    inputs = set()
+    for name in opened:
+        path = Path(name).resolve()
+        if path.suffix in (".py", ".pyc") or path in exclude or not path.is_file():
+            continue
+        if root in path.parents and ".figcache" not in path.parts:
+            inputs.add(str(path))
+    return sorted(inputs)
+
+
+@contextlib.contextmanager
+def redirect_savefig(output_root, outputs, overrides=None):
+    """Patch ``Figure.savefig`` to redirect legacy paths and record outputs.
+
+    *overrides* are keyword arguments forced onto every ``savefig`` call,
+    e.g. ``{"dpi": 100}`` for quick previews.
+    """
+    from matplotlib.figure import Figure
+
+    original = Figure.savefig
+
+    def savefig(self, fname, *args, **kwargs):
+        kwargs.update(overrides or {})
+        fname = redirect_path(fname, output_root)
+        if isinstance(fname, (str, os.PathLike)):
+            Path(fname).parent.mkdir(parents=True, exist_ok=True)
+            outputs.append(os.fspath(fname))
+        return original(self, fname, *args, **kwargs)
+
+    Figure.savefig = savefig
+    try:
+        yield
+    finally:
+        Figure.savefig = original
+
+
+def run_script(script, output_root=None, root=REPO_ROOT, savefig_overrides=None):
+    """Run one figure script in this process and return a ``JobResult``.
+
+    rcParams are restored and all figures closed afterwards, so the same
+    process can go on to run the next script.  Data files the script reads
+    from inside *root* are reported in ``JobResult.inputs``.
+    """
+    import matplotlib
+    import matplotlib.pyplot as plt
+
+    script = Path(script).resolve()
+    output_root = Path(output_root or root).resolve()
+    outputs, opened = [], set()
+    log = io.StringIO()
+    saved_argv = sys.argv
+    ok, error = True, ""
+    start = time.perf_counter()
+    try:
+        with matplotlib.rc_context(), redirect_savefig(output_root, outputs, savefig_overrides), \
+                record_reads() as opened, \
+                contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            sys.argv = [str(script)]
+            runpy.run_path(str(script), run_name="__main__")
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            ok, error = False, f"SystemExit({exc.code!r})"
+    except Exception:
+        ok, error = False, traceback.format_exc()
+    finally:
+        sys.argv = saved_argv
+        plt.close("all")
+    seconds = time.perf_counter() - start
+    inputs = data_inputs(opened, root, exclude=[script, *outputs])
+    return JobResult(key=script_key(script, root), ok=ok, seconds=seconds,
+                     outputs=outputs, error=error, log=log.getvalue(), inputs=inputs)
+
+
+# ── Worker pool ─────────────────────────────────────────────────────────────
+
+@dataclass
+class TaskOutcome:
+    """What the pool reports for one submitted task."""
+
+    index: int
+    value: object = None
+    error: str = ""
+    timed_out: bool = False
+    seconds: float = 0.0
+
+    @property
+    def ok(self):
+        return not self.error and not self.timed_out
+
+
+def _worker_main(conn, max_tasks, warm):
+    if warm:
+        preload()
+    done = 0
+    while max_tasks is None or done < max_tasks:
+        try:
+            task = conn.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+        fn, args = task
+        try:
+            reply = (True, fn(*args))
+        except Exception:
+            reply = (False, traceback.format_exc())
+        try:
+            conn.send(reply)
+        except Exception:
+            conn.send((False, traceback.format_exc()))
+        done += 1
+    conn.close()
+
+
+def _context(warm):
+    if warm and "forkserver" in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload(PRELOAD_MODULES)
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+class _Worker:
+    def __init__(self, ctx, max_tasks, warm):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, max_tasks, warm),
+                                   daemon=True)
+        self.process.start()
+        child.close()
+        self.index = None
+        self.started = 0.0
+        self.done = 0
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            with contextlib.suppress(OSError):
+                self.conn.send(None)
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """A fixed-size pool of warm worker processes.
+
+    ``fn`` passed to :meth:`imap_unordered` must be importable by the
+    workers (a module-level function) and its arguments picklable.
+
+    Args:
+        workers: number of worker processes (defaults to the CPU count).
+        timeout: per-task timeout in seconds; ``None`` disables it.
+        max_tasks: recycle a worker after this many tasks; ``1`` gives every
+            task a fresh process.
+        warm: preload matplotlib and numpy in each worker.  ``False`` starts
+            workers as cold interpreters, for measuring import cost.
+    """
+
+    def __init__(self, workers=None, timeout=None, max_tasks=None, warm=True):
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.timeout = timeout
+        self.max_tasks = max_tasks
+        self.warm = warm
+        os.environ.setdefault("MPLBACKEND", "Agg")
+        self._ctx = _context(warm)
+
+    def imap_unordered(self, fn, arglist):
+        """Run ``fn(*args)`` for each entry of *arglist*; yield ``TaskOutcome``."""
+        pending = list(enumerate(arglist))
+        pending.reverse()
+        idle, busy, live = [], {}, 0
+        try:
+            while pending or busy:
+                while pending and (idle or live < self.workers):
+                    if idle:
+                        worker = idle.pop()
+                    else:
+                        worker = _Worker(self._ctx, self.max_tasks, self.warm)
+                        live += 1
+                    worker.index, args = pending.pop()
+                    worker.started = time.perf_counter()
+                    worker.conn.send((fn, args))
+                    busy[worker.conn] = worker
+
+                wait_for = None
+                if self.timeout is not None:
+                    now = time.perf_counter()
+                    wait_for = max(0.0, min(w.started + self.timeout - now
+                                            for w in busy.values()))
+                ready = wait(list(busy), timeout=wait_for)
+                now = time.perf_counter()
+
+                for conn in ready:
+                    worker = busy.pop(conn)
+                    seconds = now - worker.started
+                    try:
+                        ok, value = conn.recv()
+                    except (EOFError, OSError):
+                        worker.process.join(timeout=1)
+                        yield TaskOutcome(
+                            worker.index, seconds=seconds,
+                            error=f"worker died (exit code {worker.process.exitcode})")
+                        worker.stop(kill=True)
+                        live -= 1
+                        continue
+                    if ok:
+                        yield TaskOutcome(worker.index, value=value, seconds=seconds)
+                    else:
+                        yield TaskOutcome(worker.index, error=value, seconds=seconds)
+                    worker.done += 1
+                    if self.max_tasks is not None and worker.done >= self.max_tasks:
+                        worker.stop()
+                        live -= 1
+                    else:
+                        idle.append(worker)
+
+                if self.timeout is not None:
+                    for conn, worker in list(busy.items()):
+                        seconds = now - worker.started
+                        if seconds >= self.timeout:
+                            del busy[conn]
+                            worker.stop(kill=True)
+                            live -= 1
+                            yield TaskOutcome(worker.index, timed_out=True, seconds=seconds,
+                                              error=f"timed out after {self.timeout:g}s")
+        finally:
+            for worker in idle:
+                worker.stop()
+            for worker in busy.values():
+                worker.stop(kill=True)
+
@@ -0,0 +1,192 @@
+"""
+Time-series traces of any length: decimated to the pixel width at draw time.
+
+The waveform figures plot each channel with its own ``ax.plot`` over every
+sample.  That is fine for the 40-150 point icons, but a real ECG lead at
+500 Hz is millions of samples, and Agg's cost grows with every vertex
+whether or not it lands on a new pixel.  ``traces`` draws all channels of a
+recording as one ``LineCollection`` and, at each draw, reduces every
+channel to about two points per pixel column it spans:
+
+    from figkit.traces import traces
+
+    traces(ax, leads, span=(0, 10), baseline=np.arange(12) * -1.5,
+           scale=0.5, colors=LEAD_COLORS, linewidths=0.8)
+
+``method="minmax"`` (the default) keeps each column's minimum and maximum
+in their original order, so the drawn envelope is the one the full trace
+would produce.  ``method="lttb"`` (Largest-Triangle-Three-Buckets) keeps
+one point per bucket, chosen to preserve the visual shape; it suits
+smooth traces that should read as lines rather than envelopes.
+
+*y* is one channel (N,) or several (C, N), and may be a ``np.memmap``.
+Samples lie at *x* (shared by all channels), evenly across *span*, or at
+their indices.  Decimation is cached per pixel width, so the extra
+``bbox_inches="tight"`` pass costs nothing; each new width costs one pass
+over the samples.  Traces no longer than twice their pixel width are drawn
+as they are.
+"""
+
+import math
+
+import matplotlib as mpl
+import numpy as np
+from matplotlib.collections import LineCollection
+
+
+def _buckets(n, count):
+    """(size, full): equal buckets of *size* samples, *full* of them whole."""
+    size = max(1, math.ceil(n / count))
+    return size, n // size
+
+
+def minmax_indices(y, count):
+    """Indices of each bucket's min and max, in sample order; (C, 2 * buckets).
+
+    *y* is (C, N).  Samples are split into *count* equal buckets (the last
+    one possibly shorter).
+    """
+    channels, n = y.shape
+    size, full = _buckets(n, count)
+    parts = []
+    if full:
+        blocks = y[:, :full * size].reshape(channels, full, size)
+        offsets = np.arange(full) * size
+        parts.append((blocks.argmin(axis=2) + offsets, blocks.argmax(axis=2) + offsets))
+    if full * size < n:
+        tail = y[:, full * size:]
+        parts.append((tail.argmin(axis=1)[:, None] + full * size,
+                      tail.argmax(axis=1)[:, None] + full * size))
+    low = np.concatenate([p[0] for p in parts], axis=1)
+    high = np.concatenate([p[1] for p in parts], axis=1)
+    pairs = np.stack([np.minimum(low, high), np.maximum(low, high)], axis=2)
+    return pairs.reshape(channels, -1)
+
+
+def lttb_indices(x, y, count):
+    """Largest-Triangle-Three-Buckets: *count* indices per channel; (C, count).
+
+    *x* is (N,), shared by the (C, N) channels of *y*.  The first and last
+    samples are always kept; the rest are split into ``count - 2`` buckets
+    and each keeps the sample forming the largest triangle with the point
+    kept before it and the mean of the next bucket.  The loop runs over
+    buckets, with all channels and samples of a bucket at once.
+    """
+    channels, n = y.shape
+    if count >= n or count < 3:
+        return np.broadcast_to(np.arange(n), (channels, n))
+    edges = np.linspace(1, n - 1, count - 1).astype(np.int64)
+    x = np.asarray(x, np.float64)
+    sums = np.add.reduceat(y[:, 1:n - 1], edges[:-1] - 1, axis=1, dtype=np.float64)
+    widths = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / widths
+    mean_y = sums / widths
+    # The last bucket looks ahead to the final sample.
+    mean_x = np.r_[mean_x[1:], x[n - 1]]
+    mean_y = np.concatenate([mean_y[:, 1:], np.asarray(y[:, n - 1:], np.float64)], axis=1)
+
+    chosen = np.empty((channels, count), np.int64)
+    chosen[:, 0], chosen[:, -1] = 0, n - 1
+    rows = np.arange(channels)
+    prev = np.zeros(channels, np.int64)
+    for b in range(count - 2):
+        lo, hi = edges[b], edges[b + 1]
+        ax_, ay = x[prev][:, None], np.asarray(y[rows, prev], np.float64)[:, None]
+        cx, cy = mean_x[b], mean_y[:, b:b + 1]
+        area = np.abs((ax_ - cx) * (y[:, lo:hi] - ay) - (ax_ - x[lo:hi]) * (cy - ay))
+        prev = area.argmax(axis=1) + lo
+        chosen[:, b + 1] = prev
+    return chosen
+
+
+class TraceCollection(LineCollection):
+    """Channels of a time series, decimated to the pixel width at draw time."""
+
+    def __init__(self, y, x=None, span=None, baseline=0.0, scale=1.0, method="minmax",
+                 **kwargs):
+        if method not in ("minmax", "lttb"):
+            raise ValueError(f"method must be 'minmax' or 'lttb', not {method!r}")
+        super().__init__([], **kwargs)
+        self.y = y if np.ndim(y) == 2 else np.asarray(y)[None]
+        channels, n = self.y.shape
+        self.x = np.asarray(x, float) if x is not None else None
+        if x is not None:
+            self._span = (self.x.min(), self.x.max())
+        elif span is not None:
+            self._span = (float(span[0]), float(span[1]))
+        else:
+            self._span = (0.0, float(n - 1))
+        self.baseline = np.broadcast_to(np.asarray(baseline, float), (channels,))
+        self.scale = np.broadcast_to(np.asarray(scale, float), (channels,))
+        self.method = method
+        self._cache = None
+
+    def _positions(self, index):
+        if self.x is not None:
+            return self.x[index]
+        x0, x1 = self._span
+        n = self.y.shape[1]
+        return x0 + index * ((x1 - x0) / (n - 1) if n > 1 else 0.0)
+
+    def data_limits(self):
+        """((x0, x1), (y0, y1)) of the full traces, in data coordinates."""
+        low = np.nanmin(self.y, axis=1) * self.scale + self.baseline
+        high = np.nanmax(self.y, axis=1) * self.scale + self.baseline
+        return self._span, (np.minimum(low, high).min(), np.maximum(low, high).max())
+
+    def _pixels(self):
+        x0, x1 = self._span
+        ends = self.get_transform().transform([(x0, 0.0), (x1, 0.0)])
+        return max(1, math.ceil(abs(ends[1, 0] - ends[0, 0])))
+
+    def _segments(self, pixels):
+        channels, n = self.y.shape
+        if n <= 2 * pixels:
+            index = np.broadcast_to(np.arange(n), (channels, n))
+        elif self.method == "minmax":
+            index = minmax_indices(self.y, pixels)
+        else:
+            x = self.x if self.x is not None else self._positions(np.arange(n))
+            index = lttb_indices(x, self.y, 2 * pixels)
+        rows = np.arange(channels)[:, None]
+        values = np.asarray(self.y[rows, index], float)
+        return np.stack([self._positions(index),
+                         values * self.scale[:, None] + self.baseline[:, None]], axis=2)
+
+    def draw(self, renderer):
+        if not self.get_visible():
+            return
+        pixels = self._pixels()
+        if self._cache is None or self._cache[0] != pixels:
+            self._cache = (pixels, self._segments(pixels))
+            self.set_segments(self._cache[1])
+        super().draw(renderer)
+
+
+def traces(parent, y, x=None, *, span=None, baseline=0.0, scale=1.0, method="minmax",
+           colors=None, linewidths=None, linestyles="-", alpha=None, zorder=2,
+           transform=None, **kwargs):
+    """Draw the channels of *y* on *parent* (an Axes, or a Figure) as one collection.
+
+    Each channel is drawn at ``baseline + scale * y``; both may be one value
+    or one per channel, as may *colors* and *linewidths*.  Caps and joins
+    follow ``ax.plot``'s defaults.  Returns the ``TraceCollection``.
+    """
+    is_axes = hasattr(parent, "transData")
+    if transform is None:
+        transform = parent.transData if is_axes else parent.transFigure
+    if linewidths is None:
+        linewidths = mpl.rcParams["lines.linewidth"]
+    collection = TraceCollection(
+        y, x, span, baseline, scale, method, colors=colors, linewidths=linewidths,
+        linestyles=linestyles, alpha=alpha, zorder=zorder, transform=transform,
+        capstyle=mpl.rcParams["lines.solid_capstyle"],
+        joinstyle=mpl.rcParams["lines.solid_joinstyle"], **kwargs)
+    if is_axes:
+        (x0, x1), (y0, y1) = collection.data_limits()
+        parent.add_collection(collection, autolim=False)
+        parent.update_datalim([(x0, y0), (x1, y1)])
+        parent.autoscale_view()
+    else:
+        parent.add_artist(collection)
+    return collection
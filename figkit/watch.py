@@ -0,0 +1,130 @@
+"""
+Warm-interpreter watch mode: re-render a figure as soon as its script is saved.
+
+    python -m figkit watch                    # every figure
+    python -m figkit watch 'llm-judge/*'      # only matching keys
+
+matplotlib, numpy and the font cache are imported once when the watcher
+starts.  Each change re-executes only the edited script, in a fresh
+namespace with rcParams restored afterwards, so a save-to-PNG round trip
+costs the script's own drawing time and nothing else.  Previews are written
+with fast zlib compression (identical pixels, larger files); pass
+``--png-compression 6`` for release-size output.  For very large canvases
+(llm-judge/fig_005 is 4800x2100 px at 200 dpi) ``--dpi 100`` quarters the
+rasterisation and encoding work.  Previews never count as builds: a
+re-rendered figure is dropped from the build cache, so the next
+``python -m figkit build`` writes it again with the release settings.
+
+Editing a shared module such as ``figkit/diagram.py`` re-renders every
+watched figure that imports it.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+from figkit.build import discover_scripts, is_figure_script, matches, python_files
+from figkit.cache import BuildCache, local_imports
+from figkit.runner import REPO_ROOT, preload, run_script, script_key
+
+FIGKIT_DIR = Path(__file__).resolve().parent
+
+
+def _is_script(path):
+    return path.parent != FIGKIT_DIR and is_figure_script(path)
+
+
+def _mtimes(root):
+    mtimes = {}
+    # figkit itself is not a figure directory, but its shared modules
+    # (figkit/diagram.py) are figure dependencies.
+    for path in [*python_files(root), *sorted(FIGKIT_DIR.glob("*.py"))]:
+        try:
+            mtimes[path] = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            pass
+    return mtimes
+
+
+def _purge_local_modules(keep, root):
+    """Forget repository modules imported by scripts so edits take effect."""
+    root = str(Path(root).resolve())
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None) or ""
+        if name not in keep and path.startswith(root):
+            del sys.modules[name]
+
+
+def _targets(changed, patterns, root):
+    targets = set()
+    for path in changed:
+        if _is_script(path):
+            if matches(script_key(path, root), patterns):
+                targets.add(path)
+            continue
+        for script in discover_scripts(root, patterns):
+            if path in local_imports(script, root):
+                targets.add(script)
+    return sorted(targets)
+
+
+def watch(patterns=(), output_root=None, interval=0.1, root=REPO_ROOT,
+          compress_level=1, dpi=None):
+    """Poll the tree every *interval* seconds and re-render changed figures."""
+    preload()
+    overrides = {"pil_kwargs": {"compress_level": compress_level}}
+    if dpi is not None:
+        overrides["dpi"] = dpi
+    keep = set(sys.modules)
+    output_root = Path(output_root or root).resolve()
+    cache = BuildCache(output_root, root)
+    known = _mtimes(root)
+    count = len(discover_scripts(root, patterns))
+    print(f"Watching {count} figure script(s); Ctrl-C to stop", flush=True)
+
+    while True:
+        time.sleep(interval)
+        current = _mtimes(root)
+        changed = [path for path, mtime in current.items() if known.get(path) != mtime]
+        known = current
+        if not changed:
+            continue
+
+        detected = time.perf_counter()
+        if any(not _is_script(path) for path in changed):
+            _purge_local_modules(keep, root)
+        cache.refresh()
+        for script in _targets(changed, patterns, root):
+            result = run_script(script, output_root, root, overrides)
+            elapsed = (time.perf_counter() - detected) * 1000
+            # Previews overwrite the release PNGs with other savefig settings,
+            # so the next ``figkit build`` must render the figure again.
+            cache.forget(result.key)
+            cache.save()
+            if result.ok:
+                outputs = ", ".join(result.outputs) or "no output"
+                print(f"{result.key}: {elapsed:.0f} ms -> {outputs}", flush=True)
+            else:
+                print(f"{result.key}: FAILED\n{result.error.rstrip()}", flush=True)
+
+
+def configure(parser):
+    parser.add_argument("patterns", nargs="*",
+                        help="glob(s) over figure keys to watch (default: all)")
+    parser.add_argument("--out", default=None,
+                        help="output root (default: the repository root)")
+    parser.add_argument("--interval", type=float, default=0.1,
+                        help="polling interval in seconds (default: 0.1)")
+    parser.add_argument("--png-compression", type=int, default=1, choices=range(10),
+                        metavar="0-9", help="PNG zlib level for previews (default: 1)")
+    parser.add_argument("--dpi", type=float, default=None,
+                        help="override the script's dpi for quicker previews")
+
+
+def run(args):
+    try:
+        watch(args.patterns, args.out, args.interval, compress_level=args.png_compression,
+              dpi=args.dpi)
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,400 @@
+"""
+Subject-split z-score normalisation of ZuCo word metrics, streamed subject by subject.
+
+The ZuCo pipeline of zuco/fig_007 splits subjects (not sentences) into
+train, val and test, then z-scores each of the five word-level channels
+(``METRICS``) with statistics from the train subjects only.  Loading every
+session, concatenating and calling ``mean``/``std`` holds the whole corpus
+in memory and reads it twice.  Here each subject is one task on a
+``WorkerPool``:
+
+    read + metrics   the subject's results files -> ``word_metrics``, flattened
+                     to (words, 5) float32 in a scratch ``.npy``
+    moments          for train subjects, per-channel count, mean and sum of
+                     squared deviations of that block (NaN left out)
+    normalise        once the partial ``Moments`` are merged, each subject's
+                     block is z-scored straight into its slice of one
+                     memory-mapped ``values.npy``
+
+Partial moments combine exactly with the parallel form of Welford's update
+(Chan et al.), so the statistics take one pass over the data in any order
+and the parent only ever holds five numbers per channel:
+
+    from figkit.zscore import normalize_zuco, load_normalized
+
+    report = normalize_zuco(["task1-SR/Matlab files", "task1-NR/Matlab files"],
+                            "zuco-normalized/", workers=8)
+    report.moments.mean, report.moments.std     # train statistics per channel
+    report.throughput("normalize")              # words/s per worker
+
+    data = load_normalized("zuco-normalized/")  # memory-mapped
+    data.trial(0)                               # (words, 5) z-scores; NaN where unfixated
+    data.values[data.split_rows("train")]
+
+Sources are split independently (ZuCo 1.0 and 2.0 each keep their own
+8/2/2-style split) and trials are written grouped by split, so each split
+is one contiguous block.  ``report.json`` in the output directory records
+the split, statistics and per-stage timings; zuco/fig_007 reads it.
+"""
+
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from figkit.eyetracking import METRICS, is_v73, read_zuco, subject_name, word_metrics
+from figkit.runner import WorkerPool
+
+SPLITS = ("train", "val", "test")
+STAGES = ("read_v5", "read_v73", "metrics", "moments", "normalize")
+
+
+# ── Moments ──────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Moments:
+    """Running per-channel count, mean and sum of squared deviations (M2)."""
+
+    count: np.ndarray       # float64 per channel: finite values seen
+    mean: np.ndarray
+    m2: np.ndarray
+
+    @classmethod
+    def empty(cls, channels=len(METRICS)):
+        return cls(np.zeros(channels), np.zeros(channels), np.zeros(channels))
+
+    @classmethod
+    def of(cls, values):
+        """Moments of a (rows, channels) block, NaN left out."""
+        values = np.asarray(values, np.float64)
+        finite = np.isfinite(values)
+        count = finite.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(finite, values, 0.0).sum(axis=0) / count
+        mean = np.nan_to_num(mean)
+        deviation = np.where(finite, values - mean, 0.0)
+        return cls(count, mean, np.einsum("ij,ij->j", deviation, deviation))
+
+    def merge(self, other):
+        """Combine with the moments of disjoint data; returns self."""
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            share = np.where(n > 0, other.count / n, 0.0)
+        self.mean = self.mean + delta * share
+        self.m2 = self.m2 + other.m2 + delta * delta * self.count * share
+        self.count = n
+        return self
+
+    def update(self, values):
+        """Fold in a (rows, channels) block; returns self."""
+        return self.merge(Moments.of(values))
+
+    @property
+    def variance(self):
+        """Population variance per channel; NaN for channels never seen."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self.m2 / self.count, np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+
+# ── Split ────────────────────────────────────────────────────────────────
+
+
+def split_counts(subjects):
+    """(train, val, test) subject counts: a fifth each held out, e.g. 8/2/2 of 12, 10/3/3 of 16."""
+    held = subjects // 5 if subjects >= 5 else (subjects - 1) // 2
+    return subjects - 2 * held, held, held
+
+
+def split_subjects(subjects, counts=None, seed=0):
+    """{subject: split name} for *subjects*, shuffled deterministically by *seed*.
+
+    *counts* are (train, val, test) numbers of subjects; the default is
+    ``split_counts``.
+    """
+    names = sorted(set(subjects))
+    counts = split_counts(len(names)) if counts is None else tuple(counts)
+    if sum(counts) != len(names):
+        raise ValueError(f"split counts {counts} do not add up to {len(names)} subjects")
+    order = np.random.default_rng(seed).permutation(len(names))
+    codes = np.repeat(np.arange(len(SPLITS)), counts)
+    return {names[i]: SPLITS[code] for i, code in zip(order, codes)}
+
+
+# ── Report ───────────────────────────────────────────────────────────────
+
+
+@dataclass
+class Stage:
+    """Work done in one pipeline stage, summed over workers."""
+
+    items: int = 0          # fixations for the reads, words otherwise
+    bytes: int = 0          # file bytes read, or array bytes written
+    seconds: float = 0.0    # busy time summed over tasks
+
+    def add(self, items, nbytes, seconds):
+        self.items += int(items)
+        self.bytes += int(nbytes)
+        self.seconds += seconds
+
+
+@dataclass
+class NormalizeReport:
+    """What ``normalize_zuco`` did, and how fast."""
+
+    directory: str
+    subjects: list              # (source index, subject) in output order
+    splits: list                # split name per entry of subjects
+    sources: list
+    moments: Moments
+    workers: int
+    wall: float                 # seconds, end to end
+    stages: dict = field(default_factory=lambda: {name: Stage() for name in STAGES})
+
+    def throughput(self, stage):
+        """Items per second of busy time in *stage*, i.e. per worker."""
+        stage = self.stages[stage]
+        return stage.items / stage.seconds if stage.seconds else float("nan")
+
+    def bandwidth(self, stage):
+        """Bytes per second of busy time in *stage*."""
+        stage = self.stages[stage]
+        return stage.bytes / stage.seconds if stage.seconds else float("nan")
+
+    def to_json(self):
+        return {
+            "directory": self.directory, "subjects": self.subjects, "splits": self.splits,
+            "sources": self.sources, "workers": self.workers, "wall": self.wall,
+            "metrics": list(METRICS), "count": self.moments.count.tolist(),
+            "mean": self.moments.mean.tolist(), "m2": self.moments.m2.tolist(),
+            "std": self.moments.std.tolist(),
+            "stages": {name: asdict(stage) for name, stage in self.stages.items()},
+        }
+
+
+def load_report(path):
+    """``NormalizeReport`` from an output directory or its ``report.json``."""
+    path = Path(path)
+    data = json.loads((path / "report.json" if path.is_dir() else path).read_text())
+    moments = Moments(*(np.asarray(data[key], np.float64) for key in ("count", "mean", "m2")))
+    return NormalizeReport(
+        directory=data["directory"], subjects=[tuple(s) for s in data["subjects"]],
+        splits=data["splits"], sources=data["sources"], moments=moments,
+        workers=data["workers"], wall=data["wall"],
+        stages={name: Stage(**stage) for name, stage in data["stages"].items()})
+
+
+# ── Workers ──────────────────────────────────────────────────────────────
+
+
+def _measure_subject(files, scratch, train):
+    """Read, measure and (for train) take moments of one subject's files.
+
+    Writes the subject's (words, 5) float32 block to *scratch* and returns
+    its per-trial file index, sentence and word count, its moments (or
+    None) and per-stage (items, bytes, seconds).
+    """
+    blocks, trial_file, trial_sentence, trial_words = [], [], [], []
+    stages = {name: [0, 0, 0.0] for name in STAGES}
+
+    for index, file in enumerate(files):
+        start = time.perf_counter()
+        fixations = read_zuco(file, words=False)
+        read = "read_v73" if is_v73(file) else "read_v5"
+        stages[read][0] += len(fixations)
+        stages[read][1] += os.path.getsize(file)
+        stages[read][2] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        metrics = word_metrics(fixations).stack()               # (5, trials, width)
+        present = np.isfinite(fixations.bounds[..., 0])         # real words, in order
+        blocks.append(metrics.transpose(1, 2, 0)[present].astype(np.float32))
+        trial_file.append(np.full(len(present), index, np.int32))
+        trial_sentence.append(fixations.sentence)
+        trial_words.append(present.sum(axis=1))
+        stages["metrics"][0] += int(present.sum())
+        stages["metrics"][2] += time.perf_counter() - start
+
+    values = np.concatenate(blocks) if blocks else np.empty((0, len(METRICS)), np.float32)
+    np.save(scratch, values)
+    stages["metrics"][1] += values.nbytes
+
+    moments = None
+    if train:
+        start = time.perf_counter()
+        moments = Moments.of(values)
+        stages["moments"] = [len(values), values.nbytes, time.perf_counter() - start]
+    return (np.concatenate(trial_file), np.concatenate(trial_sentence),
+            np.concatenate(trial_words), moments, stages)
+
+
+def _normalize_subject(scratch, output, row, mean, std):
+    """z-score one subject's scratch block into rows *row*.. of *output*; drop the scratch."""
+    start = time.perf_counter()
+    values = np.load(scratch, mmap_mode="r")
+    out = np.load(output, mmap_mode="r+")
+    out[row:row + len(values)] = (values - mean) / std
+    out.flush()
+    del out
+    nbytes = values.nbytes
+    rows = len(values)
+    del values
+    os.remove(scratch)
+    return rows, nbytes, time.perf_counter() - start
+
+
+def _run(pool, fn, arglist):
+    """Results of ``fn(*args)`` per entry of *arglist*, in order; inline without a pool."""
+    if pool is None:
+        return [fn(*args) for args in arglist]
+    results = [None] * len(arglist)
+    for outcome in pool.imap_unordered(fn, arglist):
+        if not outcome.ok:
+            raise RuntimeError(f"{fn.__name__} failed on task {outcome.index}:\n"
+                               f"{outcome.error or 'timed out'}")
+        results[outcome.index] = outcome.value
+    return results
+
+
+# ── Pipeline ─────────────────────────────────────────────────────────────
+
+
+def normalize_zuco(sources, directory, counts=None, seed=0, workers=None):
+    """Split, z-score and write the word metrics of the ZuCo *sources*.
+
+    Each source is a directory of ``results*.mat`` files (or one file);
+    its subjects are split with ``split_subjects(..., counts, seed)``.
+    *workers* defaults to the CPU count; ``1`` runs in this process.
+    Writes ``values.npy`` (words, 5) float32, ``offsets.npy`` (trials + 1),
+    per-trial ``subject.npy``, ``file.npy``, ``sentence.npy`` and
+    ``split.npy`` (int8 codes into ``SPLITS``), ``files.json`` and
+    ``report.json`` into *directory*; returns the ``NormalizeReport``.
+    """
+    started = time.perf_counter()
+    directory = Path(directory)
+    scratch = directory / "scratch"
+    scratch.mkdir(parents=True, exist_ok=True)
+    sources = [Path(source) for source in sources]
+
+    # Group each source's files by subject, split the subjects and order
+    # them train, val, test so every split is one contiguous block.
+    tasks = []
+    for s, source in enumerate(sources):
+        files = sorted(source.glob("results*.mat")) if source.is_dir() else [source]
+        if not files:
+            raise ValueError(f"no results*.mat files in {source}")
+        by_subject = {}
+        for file in files:
+            by_subject.setdefault(subject_name(file), []).append(file)
+        assignment = split_subjects(by_subject, counts, seed)
+        tasks += [(SPLITS.index(split), s, name, by_subject[name])
+                  for name, split in assignment.items()]
+    tasks.sort(key=lambda task: (task[0], task[1], task[2]))
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    pool = WorkerPool(workers=min(workers, len(tasks))) if workers > 1 else None
+
+    measured = _run(pool, _measure_subject,
+                    [(files, str(scratch / f"{i}.npy"), split == 0)
+                     for i, (split, _, _, files) in enumerate(tasks)])
+
+    report = NormalizeReport(
+        directory=str(directory), subjects=[(s, name) for _, s, name, _ in tasks],
+        splits=[SPLITS[split] for split, *_ in tasks], sources=[str(s) for s in sources],
+        moments=Moments.empty(), workers=workers, wall=0.0)
+    for *_, moments, stages in measured:
+        if moments is not None:
+            report.moments.merge(moments)
+        for name, work in stages.items():
+            report.stages[name].add(*work)
+    if not report.moments.count.all():
+        raise ValueError("train subjects leave a channel without a single value")
+
+    # Per-trial index, then one memory-mapped output the workers fill in place.
+    file_names = [[str(f) for f in files] for *_, files in tasks]
+    trial_words = [words for _, _, words, _, _ in measured]
+    offsets = np.r_[0, np.cumsum(np.concatenate(trial_words))].astype(np.int64)
+    subject_rows = np.r_[0, np.cumsum([words.sum() for words in trial_words])].astype(np.int64)
+    per_trial = np.array([len(words) for words in trial_words])
+    np.save(directory / "offsets.npy", offsets)
+    np.save(directory / "subject.npy", np.repeat(np.arange(len(tasks), dtype=np.int32),
+                                                 per_trial))
+    np.save(directory / "file.npy", np.concatenate([file for file, *_ in measured]))
+    np.save(directory / "sentence.npy",
+            np.concatenate([sentence for _, sentence, *_ in measured]).astype(np.int32))
+    np.save(directory / "split.npy", np.repeat(np.array([split for split, *_ in tasks],
+                                                        np.int8), per_trial))
+    (directory / "files.json").write_text(json.dumps(file_names, indent=1))
+    np.lib.format.open_memmap(directory / "values.npy", mode="w+", dtype=np.float32,
+                              shape=(int(offsets[-1]), len(METRICS)))
+
+    mean = report.moments.mean.astype(np.float32)
+    std = np.where(report.moments.std > 0, report.moments.std, 1.0).astype(np.float32)
+    written = _run(pool, _normalize_subject,
+                   [(str(scratch / f"{i}.npy"), str(directory / "values.npy"),
+                     int(subject_rows[i]), mean, std) for i in range(len(tasks))])
+    for work in written:
+        report.stages["normalize"].add(*work)
+    scratch.rmdir()
+
+    report.wall = time.perf_counter() - started
+    (directory / "report.json").write_text(json.dumps(report.to_json(), indent=1))
+    return report
+
+
+# ── Output ───────────────────────────────────────────────────────────────
+
+
+@dataclass
+class NormalizedZuco:
+    """z-scored word metrics written by ``normalize_zuco``; one row per word."""
+
+    values: np.ndarray      # (words, 5) float32, channels in METRICS order
+    offsets: np.ndarray     # trial t is rows offsets[t]:offsets[t + 1]
+    subject: np.ndarray     # int32 per trial, index into subjects
+    file: np.ndarray        # int32 per trial, index into that subject's files
+    sentence: np.ndarray    # int32 per trial
+    split: np.ndarray       # int8 per trial, codes into SPLITS
+    subjects: list          # (source index, subject name)
+    files: list             # file paths per subject
+    mean: np.ndarray        # train statistics the values were normalised with
+    std: np.ndarray
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def trial(self, t):
+        return self.values[self.offsets[t]:self.offsets[t + 1]]
+
+    def split_rows(self, name):
+        """Row slice of the values of split *name*."""
+        trials = np.flatnonzero(self.split == SPLITS.index(name))
+        if not len(trials):
+            return slice(0, 0)
+        return slice(int(self.offsets[trials[0]]), int(self.offsets[trials[-1] + 1]))
+
+    def raw(self, rows=slice(None)):
+        """The metrics in their original units."""
+        return self.values[rows] * self.std + self.mean
+
+
+def load_normalized(path, mmap=True):
+    """Open the output directory of ``normalize_zuco`` (memory-mapped)."""
+    path = Path(path)
+    mode = "r" if mmap else None
+    report = load_report(path)
+    columns = {name: np.load(path / f"{name}.npy", mmap_mode=mode)
+               for name in ("values", "offsets", "subject", "file", "sentence", "split")}
+    return NormalizedZuco(**columns, subjects=report.subjects,
+                          files=json.loads((path / "files.json").read_text()),
+                          mean=report.moments.mean.astype(np.float32),
+                          std=np.where(report.moments.std > 0, report.moments.std, 1.0)
+                          .astype(np.float32))
@@ -1,12 +1,22 @@
 """
 fig_004: Company Coverage — Geographic Distribution
 Grouped horizontal bar chart showing 14 companies across 6 European countries.
+Set INDEX to count the filings of a real filings index instead.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.filings import load_index  # noqa: E402
+
+# A filings index (figkit.filings) to count, instead of the table below.
+INDEX = None
+
 # ---------------------------------------------------------------------------
 # Data (from STAGE6_FINANCIAL_REPORTS.md sections 3.2 and 4.2)
 # ---------------------------------------------------------------------------
@@ -39,9 +49,6 @@ companies = {
     ],
 }
 
-# Sort countries by number of companies (descending), then alphabetically
-countries_sorted = sorted(companies.keys(), key=lambda c: (-len(companies[c]), c))
-
 # ---------------------------------------------------------------------------
 # Colour palette — one colour per country
 # ---------------------------------------------------------------------------
@@ -53,48 +60,48 @@ country_colors = {
     "Finland":  "#5B9279",   # sage green
     "Norway":   "#7B6D8D",   # muted purple
 }
+# Countries beyond the six above cycle through these.
+extra_colors = ["#8C6A4F", "#3E7CB1", "#B5651D", "#6B8E23", "#A05195", "#2F4B7C"]
 
 # ---------------------------------------------------------------------------
-# Build flat lists for plotting
+# One row per company: name, country, filing count
 # ---------------------------------------------------------------------------
-bar_labels = []       # "Company Name"
-bar_filings = []      # filing counts
-bar_colors = []       # colour per bar
-bar_country = []      # country label (for grouping)
-
-group_boundaries = [] # y-positions where country groups start
-group_labels = []     # country names for left labels
-group_centers = []    # y-center for each group label
+if INDEX:
+    index = load_index(INDEX)
+    bar_labels = np.array(index.companies)
+    bar_filings = index.counts("company")
+    bar_country = np.array(index.countries)[index.company_country()]
+else:
+    rows = [(name, country, filings)
+            for country, entries in companies.items() for name, filings in entries]
+    bar_labels, bar_country, bar_filings = (np.array(column) for column in zip(*rows))
+
+# Group by country: countries by number of companies (descending), then
+# alphabetically; companies keep their order within a country.
+countries, country_of, group_sizes = np.unique(bar_country, return_inverse=True,
+                                               return_counts=True)
+rank = np.empty(len(countries), int)
+rank[np.lexsort((countries, -group_sizes))] = np.arange(len(countries))
+order = np.argsort(rank[country_of], kind="stable")
+bar_labels, bar_country, bar_filings = bar_labels[order], bar_country[order], bar_filings[order]
+bar_group = rank[country_of][order]
+countries_sorted = list(countries[np.argsort(rank)])
+for i, country in enumerate(c for c in countries_sorted if c not in country_colors):
+    country_colors[country] = extra_colors[i % len(extra_colors)]
+bar_colors = [country_colors[c] for c in bar_country]
 
-y = 0
 gap = 0.6  # gap between country groups
+y_positions = np.arange(len(bar_labels)) + gap * bar_group
+
+# Per-group first/last row, company count and total filings
+group_first = np.searchsorted(bar_group, np.arange(len(countries_sorted)))
+group_last = np.r_[group_first[1:], len(bar_group)] - 1
+group_counts = group_last - group_first + 1
+group_totals = np.bincount(bar_group, weights=bar_filings).astype(int)
+group_centers = (y_positions[group_first] + y_positions[group_last]) / 2
 
-for ci, country in enumerate(countries_sorted):
-    if ci > 0:
-        y += gap
-    start_y = y
-    for name, filings in companies[country]:
-        bar_labels.append(name)
-        bar_filings.append(filings)
-        bar_colors.append(country_colors[country])
-        bar_country.append(country)
-        y += 1
-    end_y = y - 1
-    group_centers.append((start_y + end_y) / 2)
-    group_labels.append(country)
-    group_boundaries.append((start_y, end_y))
-
-y_positions = []
-idx = 0
-y = 0
-for ci, country in enumerate(countries_sorted):
-    if ci > 0:
-        y += gap
-    for _ in companies[country]:
-        y_positions.append(y)
-        y += 1
-
-y_positions = np.array(y_positions)
+# Text offsets below were set for the STAGE6 counts; scale them with the data.
+unit = bar_filings.max() / 2254
 
 # ---------------------------------------------------------------------------
 # Figure
@@ -112,52 +119,43 @@ bars = ax.barh(
 
 # Company name + filing count labels
 for yp, val, label, color in zip(y_positions, bar_filings, bar_labels, bar_colors):
-    if val >= 800:
+    if val >= 800 * unit:
         # Company name inside the bar
         ax.text(
-            30, yp, label,
+            30 * unit, yp, label,
             va="center", ha="left", fontsize=9.5, fontweight="600",
             color="white", zorder=5,
         )
         # Filing count just outside the bar
         ax.text(
-            val + 40, yp, f"{val:,}",
+            val + 40 * unit, yp, f"{val:,}",
             va="center", ha="left", fontsize=9.5, fontweight="500",
             color="#333333",
         )
     else:
         # Short bar: company name + count outside
         ax.text(
-            val + 40, yp, f"{val:,}  —  {label}",
+            val + 40 * unit, yp, f"{val:,}  —  {label}",
             va="center", ha="left", fontsize=9.5, fontweight="500",
             color="#333333",
         )
 
 # Country group labels on the left + summary stats
-for ci, country in enumerate(countries_sorted):
-    n = len(companies[country])
-    total = sum(f for _, f in companies[country])
-    center = group_centers[ci]
+for country, n, total, center in zip(countries_sorted, group_counts, group_totals,
+                                     group_centers):
     ax.text(
-        -120, center,
+        -120 * unit, center,
         f"{country}\n({n} {'company' if n == 1 else 'companies'}, {total:,} filings)",
         va="center", ha="right", fontsize=10.5, fontweight="bold",
         color=country_colors[country],
     )
 
 # Faint horizontal separator lines between groups
-for ci in range(1, len(countries_sorted)):
-    prev_end = group_boundaries[ci - 1][1]
-    curr_start = group_boundaries[ci][0]
-    # separator in the gap
-    sep_y_pos = (y_positions[sum(len(companies[countries_sorted[j]])
-                for j in range(ci)) - 1] +
-                y_positions[sum(len(companies[countries_sorted[j]])
-                for j in range(ci))]) / 2
+for sep_y_pos in (y_positions[group_first[1:]] + y_positions[group_last[:-1]]) / 2:
     ax.axhline(sep_y_pos, color="#DDDDDD", linewidth=0.8, linestyle="--", zorder=1)
 
 # Axis formatting
-ax.set_xlim(0, max(bar_filings) + 700)
+ax.set_xlim(0, max(bar_filings) + 700 * unit)
 ax.set_ylim(min(y_positions) - 0.6, max(y_positions) + 0.6)
 ax.invert_yaxis()
 
@@ -181,7 +179,8 @@ fig.suptitle(
     x=0.5, y=0.97,
 )
 ax.set_title(
-    "14 European real estate companies across 6 countries — filing counts per company",
+    f"{len(bar_labels)} European real estate companies across {len(countries_sorted)} "
+    "countries — filing counts per company",
     fontsize=10.5, color="#666666", pad=14,
 )
 
@@ -3,12 +3,23 @@ fig_006: Question Types and Label Computation
 Three-panel diagram illustrating the three question types derived from each filing.
 """
 
+import os
+import sys
+
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from matplotlib.patches import FancyBboxPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.labels import PriceSeries, compute_labels  # noqa: E402
+from figkit.traces import traces  # noqa: E402
+
+# Set to an .npz with tickers, dates, close (one row per daily close) and
+# filing_tickers, filing_dates to draw real filings picked from their labels.
+PRICES = None
+
 # ── Colour palette ──────────────────────────────────────────────────────────
 GREEN  = "#2E8B57"   # increase / bullish
 RED    = "#C0392B"   # decrease / bearish
@@ -36,7 +47,43 @@ pre3 = 20 + np.cumsum(np.random.randn(60) * 0.2)
 post3 = pre3[-1] + np.cumsum(np.random.randn(5) * 0.2 - 0.5)
 
 
-def draw_price_chart(ax, pre, post, annotation_fn):
+def schematic_labels():
+    """The three walks as tickers with one filing each, on day 59."""
+    walks = [np.concatenate([pre1, post1_up]), np.concatenate([pre2, post2]),
+             np.concatenate([pre3, post3])]
+    days = np.datetime64("2024-01-01") + np.arange(65)
+    prices = PriceSeries.from_arrays(np.repeat(["1", "2", "3"], 65),
+                                     np.tile(days, 3), np.concatenate(walks))
+    return prices, compute_labels(prices, ["1", "2", "3"], [days[59]] * 3, pre=60, post=5)
+
+
+def pick(values, candidates, quantile):
+    """Row of *candidates* whose value is nearest the *quantile* of them."""
+    rows = np.flatnonzero(candidates)
+    target = np.quantile(values[rows], quantile)
+    return rows[np.argmin(np.abs(values[rows] - target))]
+
+
+def real_labels(path):
+    """Filings from *path*: a clear increase, a volatility jump and a bearish slope."""
+    data = np.load(path)
+    prices = PriceSeries.from_arrays(data["tickers"], data["dates"], data["close"])
+    labels = compute_labels(prices, data["filing_tickers"], data["filing_dates"],
+                            pre=60, post=5)
+    rows = [pick(labels.ret, labels.labels["return"] == 0, 0.9),
+            pick(labels.ratio, labels.labels["volatility"] == 0, 0.9),
+            pick(labels.slope, labels.labels["direction"] == 1, 0.1)]
+    picked = compute_labels(prices, data["filing_tickers"][rows],
+                            data["filing_dates"][rows], pre=60, post=5)
+    return prices, picked
+
+
+prices, labels = schematic_labels() if PRICES is None else real_labels(PRICES)
+windows = prices.windows(labels.t0, 60, 5)
+(pre1, post1_up), (pre2, post2), (pre3, post3) = [(w[:60], w[60:]) for w in windows]
+
+
+def draw_price_chart(ax, pre, post, annotation_fn, row):
     """Draw a mini price chart with pre/post shading."""
     all_prices = np.concatenate([pre, post])
     ymin, ymax = all_prices.min(), all_prices.max()
@@ -51,10 +98,10 @@ def draw_price_chart(ax, pre, post, annotation_fn):
                     color="#FFF9C4", alpha=0.5, zorder=0)
 
     # Price line
-    ax.plot(days_pre, pre, color="#666666", linewidth=1.1, zorder=2)
-    ax.plot(np.concatenate([[days_pre[-1]], days_post]),
-            np.concatenate([[pre[-1]], post]),
-            color="#333333", linewidth=1.6, zorder=2)
+    traces(ax, pre, days_pre, colors="#666666", linewidths=1.1, zorder=2)
+    traces(ax, np.concatenate([[pre[-1]], post]),
+           np.concatenate([[days_pre[-1]], days_post]),
+           colors="#333333", linewidths=1.6, zorder=2)
 
     # Filing date marker
     ax.axvline(x=59.5, color="#E67E22", linewidth=1.4, linestyle="--", zorder=3)
@@ -76,29 +123,25 @@ def draw_price_chart(ax, pre, post, annotation_fn):
             fontsize=6.5, ha="center", va="bottom", color="#888888", style="italic")
 
     # Annotation callback
-    annotation_fn(ax, pre, post, ymin, ymax, yrng)
+    annotation_fn(ax, pre, post, ymin, ymax, yrng, row)
 
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
 
 
-def annotate_return(ax, pre, post, ymin, ymax, yrng):
+def annotate_return(ax, pre, post, ymin, ymax, yrng, row):
     p0, p5 = pre[-1], post[-1]
     ax.annotate("", xy=(64, p5), xytext=(60, p0),
                 arrowprops=dict(arrowstyle="->", color=GREEN, lw=2.2))
-    ret = (p5 - p0) / p0
+    ret = labels.ret[row]
     ax.text(64.5, (p0 + p5) / 2, f"r = {ret:+.1%}",
             fontsize=8, color=GREEN, fontweight="bold", ha="left", va="center",
             bbox=dict(boxstyle="round,pad=0.25", fc="white", ec=GREEN, alpha=0.9))
 
 
-def annotate_volatility(ax, pre, post, ymin, ymax, yrng):
-    pre_returns = np.diff(pre) / pre[:-1]
-    full_post = np.concatenate([[pre[-1]], post])
-    post_returns = np.diff(full_post) / full_post[:-1]
-    pre_vol = np.std(pre_returns)
-    post_vol = np.std(post_returns)
-    ratio = post_vol / pre_vol
+def annotate_volatility(ax, pre, post, ymin, ymax, yrng, row):
+    pre_vol, post_vol = labels.vol_pre[row], labels.vol_post[row]
+    ratio = labels.ratio[row]
 
     # σ_pre bracket
     mid_pre = np.mean(pre[-10:])
@@ -121,14 +164,13 @@ def annotate_volatility(ax, pre, post, ymin, ymax, yrng):
             bbox=dict(boxstyle="round,pad=0.25", fc="white", ec=RED, alpha=0.9))
 
 
-def annotate_direction(ax, pre, post, ymin, ymax, yrng):
+def annotate_direction(ax, pre, post, ymin, ymax, yrng, row):
     x = np.arange(len(post))
-    coeffs = np.polyfit(x, post, 1)
-    slope = coeffs[0]
     mean_p = np.mean(post)
-    norm_slope = slope / mean_p
+    norm_slope = labels.slope[row]
+    slope = norm_slope * mean_p
 
-    fit_y = np.polyval(coeffs, x)
+    fit_y = mean_p + slope * (x - x.mean())
     ax.plot(days_post, fit_y, color=RED, linewidth=2.2, linestyle="-", zorder=4)
 
     # Place label above regression line, centered in the post region
@@ -208,7 +250,7 @@ for col, p in enumerate(panels):
                   fontsize=8.5, ha="center", va="bottom", color="#888888",
                   style="italic")
 
-    draw_price_chart(ax_chart, p["pre"], p["post"], p["annotate"])
+    draw_price_chart(ax_chart, p["pre"], p["post"], p["annotate"], col)
 
     for spine in ax_chart.spines.values():
         spine.set_edgecolor(p["border"])
@@ -1,8 +1,12 @@
 """
 fig_008: Time-Based Dataset Split Visualization
 Shows chronological train/val/test split with filing density histogram.
+Set INDEX to draw the splits and filing density of a real filings index.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import matplotlib.dates as mdates
@@ -10,6 +14,13 @@ import numpy as np
 from datetime import datetime, timedelta
 import matplotlib.patheffects as pe
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.filings import FilingsIndex, load_index  # noqa: E402
+
+# A filings index (figkit.filings) with assigned splits, instead of the
+# verified counts and simulated filing dates below.
+INDEX = None
+
 # --- Data from verified facts ---
 # Train: 2001-01-09 to 2023-03-21, 14,104 samples (80%)
 # Val:   2023-03-21 to 2024-07-08,  1,763 samples (10%)
@@ -25,6 +36,14 @@ test_end = datetime(2026, 1, 30)
 train_samples = 14_104
 val_samples = 1_763
 test_samples = 1_764
+n_companies, n_countries = 14, 6
+
+if INDEX:
+    index = load_index(INDEX)
+    first, last = (d.astype("datetime64[s]").astype(datetime) for d in index.date_range("split"))
+    (train_start, val_start, test_start), (train_end, val_end, test_end) = first, last
+    train_samples, val_samples, test_samples = index.counts("split")
+    n_companies, n_countries = len(index.companies), len(index.countries)
 total_samples = train_samples + val_samples + test_samples
 
 # Colors
@@ -45,19 +64,24 @@ c_green = "#059669"
 c_green_light = "#ECFDF5"
 
 # --- Simulate filing density over time ---
-np.random.seed(42)
-all_start = datetime(2001, 1, 1)
-all_end = datetime(2026, 2, 1)
-total_days = (all_end - all_start).days
+if not INDEX:
+    np.random.seed(42)
+    all_start = np.datetime64("2001-01-01")
+    total_days = (np.datetime64("2026-02-01") - all_start).astype(int)
 
-n_filings = total_samples
-t = np.random.beta(2.5, 1.8, size=n_filings)
-filing_days = np.sort(t * total_days)
-filing_dates = [all_start + timedelta(days=int(d)) for d in filing_days]
+    t = np.random.beta(2.5, 1.8, size=total_samples)
+    filing_days = np.sort(t * total_days).astype(int)
+    index = FilingsIndex.from_records(np.zeros(total_samples), np.zeros(total_samples),
+                                      all_start + filing_days)
 
 # --- Date axis limits ---
 xlim_left = datetime(2000, 1, 1)
 xlim_right = datetime(2027, 3, 1)
+if INDEX:
+    # Widen to whole years around every filing
+    low, high = index.date.min().astype(datetime), index.date.max().astype(datetime)
+    xlim_left = min(xlim_left, datetime(low.year - 1, 1, 1))
+    xlim_right = max(xlim_right, datetime(high.year + 1, 3, 1))
 
 # --- Create figure with 3 rows ---
 fig = plt.figure(figsize=(14, 6.8))
@@ -108,10 +132,12 @@ mid_t = mid_date(train_start, train_end)
 ax_band.text(mid_t, band_mid_y + 0.12, "Train", fontsize=18, fontweight="bold",
              color=c_train_dark, ha="center", va="center",
              path_effects=[pe.withStroke(linewidth=3, foreground="white")])
-ax_band.text(mid_t, band_mid_y - 0.03, f"{train_samples:,} samples  (80%)", fontsize=12,
+ax_band.text(mid_t, band_mid_y - 0.03,
+             f"{train_samples:,} samples  ({train_samples / total_samples:.0%})", fontsize=12,
              color=c_train, ha="center", va="center",
              path_effects=[pe.withStroke(linewidth=2, foreground="white")])
-ax_band.text(mid_t, band_mid_y - 0.17, "2001-01-09  \u2192  2023-03-21", fontsize=9.5,
+ax_band.text(mid_t, band_mid_y - 0.17, f"{train_start:%Y-%m-%d}  \u2192  {train_end:%Y-%m-%d}",
+             fontsize=9.5,
              color=c_text_light, ha="center", va="center",
              path_effects=[pe.withStroke(linewidth=2, foreground="white")])
 
@@ -120,7 +146,8 @@ mid_v = mid_date(val_start, val_end)
 ax_band.text(mid_v, band_mid_y + 0.08, "Val", fontsize=13, fontweight="bold",
              color=c_val_dark, ha="center", va="center",
              path_effects=[pe.withStroke(linewidth=3, foreground="white")])
-ax_band.text(mid_v, band_mid_y - 0.10, f"{val_samples:,}\n(10%)", fontsize=9,
+ax_band.text(mid_v, band_mid_y - 0.10, f"{val_samples:,}\n({val_samples / total_samples:.0%})",
+             fontsize=9,
              color=c_val_dark, ha="center", va="center",
              path_effects=[pe.withStroke(linewidth=2, foreground="white")])
 
@@ -129,19 +156,21 @@ mid_te = mid_date(test_start, test_end)
 ax_band.text(mid_te, band_mid_y + 0.08, "Test", fontsize=13, fontweight="bold",
              color=c_test_dark, ha="center", va="center",
              path_effects=[pe.withStroke(linewidth=3, foreground="white")])
-ax_band.text(mid_te, band_mid_y - 0.10, f"{test_samples:,}\n(10%)", fontsize=9,
+ax_band.text(mid_te, band_mid_y - 0.10,
+             f"{test_samples:,}\n({test_samples / total_samples:.0%})", fontsize=9,
              color=c_test_dark, ha="center", va="center",
              path_effects=[pe.withStroke(linewidth=2, foreground="white")])
 
 # Boundary date labels above the bands
 # Stagger the middle two labels vertically to avoid overlap
 boundary_info = [
-    (train_start, "2001-01-09", "left",   0.90),
-    (train_end,   "2023-03-21", "right",  0.90),
-    (test_start,  "2024-07-09", "left",   0.82),
-    (test_end,    "2026-01-30", "left",   0.90),
+    (train_start, "left",   0.90),
+    (train_end,   "right",  0.90),
+    (test_start,  "left",   0.82),
+    (test_end,    "left",   0.90),
 ]
-for bdate, label, ha, y_pos in boundary_info:
+for bdate, ha, y_pos in boundary_info:
+    label = f"{bdate:%Y-%m-%d}"
     # Vertical dashed line
     ax_band.axvline(bdate, ymin=0.0, ymax=1.0, color=c_border,
                     linestyle="--", linewidth=1.0, alpha=0.8)
@@ -183,29 +212,16 @@ ax_hist.xaxis_date()
 ax_hist.xaxis.set_major_locator(mdates.YearLocator(2))
 ax_hist.xaxis.set_major_formatter(mdates.DateFormatter("%Y"))
 
-# Create histogram bins (yearly)
-bin_edges = [datetime(y, 1, 1) for y in range(2001, 2027)]
-bin_edges_num = [mdates.date2num(d) for d in bin_edges]
-filing_dates_num = [mdates.date2num(d) for d in filing_dates]
-counts, _ = np.histogram(filing_dates_num, bins=bin_edges_num)
-
-# Color each bar by which split it belongs to
-bar_colors = []
-for i, year in enumerate(range(2001, 2026)):
-    yr_mid = datetime(year, 7, 1)
-    if yr_mid < val_start:
-        bar_colors.append(c_train)
-    elif yr_mid < test_start:
-        bar_colors.append(c_val)
-    else:
-        bar_colors.append(c_test)
-
-for i in range(len(counts)):
-    left = bin_edges_num[i]
-    width = bin_edges_num[i + 1] - bin_edges_num[i]
-    ax_hist.bar(left, counts[i], width=width * 0.88, align="edge",
-                color=bar_colors[i], alpha=0.6, edgecolor="white",
-                linewidth=0.5)
+# Yearly histogram bins, each bar coloured by the split its mid-year falls in
+edges, counts = index.histogram("Y")
+bin_edges_num = mdates.date2num(edges.astype("datetime64[D]"))
+yr_mid = (edges[:-1].astype("datetime64[M]") + 6).astype("datetime64[D]")
+split_of = np.searchsorted(np.array([val_start, test_start], "datetime64[D]"), yr_mid,
+                           side="right")
+bar_colors = np.array([c_train, c_val, c_test])[split_of]
+
+ax_hist.bar(bin_edges_num[:-1], counts, width=np.diff(bin_edges_num) * 0.88, align="edge",
+            color=bar_colors, alpha=0.6, edgecolor="white", linewidth=0.5)
 
 # Y-axis label
 ax_hist.set_ylabel("Filings\nper Year", fontsize=10, color=c_text, rotation=0,
@@ -229,7 +245,8 @@ for bdate in [train_end, test_start]:
 fig.suptitle("Time-Based Dataset Split \u2014 Chronological Train / Val / Test",
              fontsize=16, fontweight="bold", color=c_text, y=0.97)
 fig.text(0.5, 0.93,
-         f"Total: {total_samples:,} European real estate filings from 14 companies (6 countries)",
+         f"Total: {total_samples:,} European real estate filings from {n_companies} companies "
+         f"({n_countries} countries)",
          fontsize=10.5, color=c_text_light, ha="center")
 
 # ============================================================
@@ -1,14 +1,16 @@
 """Generate a Transformer architecture diagram (Vaswani et al., 2017)."""
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 import numpy as np
 
+from figkit.diagram import Diagram
+
 fig, ax = plt.subplots(1, 1, figsize=(14, 20))
 ax.set_xlim(0, 14)
 ax.set_ylim(0, 22)
 ax.axis('off')
 fig.patch.set_facecolor('white')
+diagram = Diagram(ax)
 
 # ── Color palette ──
 C_EMBED   = '#4FC3F7'  # light blue
@@ -25,16 +27,14 @@ C_DEC_BG  = '#FFF3E0'  # decoder background
 C_TEXT    = '#212121'
 
 def draw_box(x, y, w, h, text, color, fontsize=10, bold=False):
-    box = FancyBboxPatch((x, y), w, h, boxstyle="round,pad=0.15",
-                          facecolor=color, edgecolor='#424242', linewidth=1.5)
-    ax.add_patch(box)
+    diagram.box(x, y, w, h, boxstyle="round,pad=0.15",
+                facecolor=color, edgecolor='#424242', linewidth=1.5)
     weight = 'bold' if bold else 'normal'
     ax.text(x + w/2, y + h/2, text, ha='center', va='center',
             fontsize=fontsize, color=C_TEXT, fontweight=weight, wrap=True)
 
 def draw_arrow(x1, y1, x2, y2, color='#424242', style='->', lw=1.5):
-    ax.annotate('', xy=(x2, y2), xytext=(x1, y1),
-                arrowprops=dict(arrowstyle=style, color=color, lw=lw))
+    diagram.arrow(x1, y1, x2, y2, style=style, color=color, lw=lw)
 
 def draw_residual(x_start, y_start, x_end, y_end, side='right', box_w=2.8):
     """Draw a residual (skip) connection arc on the given side."""
@@ -44,10 +44,10 @@ def draw_residual(x_start, y_start, x_end, y_end, side='right', box_w=2.8):
     else:
         offset = box_w / 2 + 0.5
         mid_x = x_start - offset
-    ax.annotate('', xy=(x_end, y_end), xytext=(x_start, y_start),
-                arrowprops=dict(arrowstyle='->', color='#9E9E9E', lw=1.2,
-                                connectionstyle=f'arc3,rad={"0.4" if side == "right" else "-0.4"}',
-                                linestyle='dashed'))
+    # Drawn above the box labels the arc crosses.
+    diagram.arrow(x_start, y_start, x_end, y_end, style='->', color='#9E9E9E', lw=1.2,
+                  connectionstyle=f'arc3,rad={"0.4" if side == "right" else "-0.4"}',
+                  linestyle='dashed', zorder=3.5)
 
 # ── Layout constants ──
 ENC_X = 2.6    # encoder center x
@@ -61,9 +61,8 @@ SMALL_H = 0.6
 # ══════════════════════════════════════
 
 # Encoder background
-enc_bg = FancyBboxPatch((0.8, 5.2), 4.8, 10.2, boxstyle="round,pad=0.3",
-                         facecolor=C_ENC_BG, edgecolor='#90CAF9', linewidth=2, linestyle='--')
-ax.add_patch(enc_bg)
+diagram.box(0.8, 5.2, 4.8, 10.2, boxstyle="round,pad=0.3",
+            facecolor=C_ENC_BG, edgecolor='#90CAF9', linewidth=2, linestyle='--')
 ax.text(3.2, 15.15, 'ENCODER  (x N)', ha='center', va='center',
         fontsize=13, fontweight='bold', color='#1565C0')
 
@@ -111,9 +110,8 @@ draw_arrow(ENC_X, y_an2 + BOX_H, ENC_X, y_enc_out)
 # ══════════════════════════════════════
 
 # Decoder background
-dec_bg = FancyBboxPatch((7.0, 5.2), 4.8, 13.0, boxstyle="round,pad=0.3",
-                         facecolor=C_DEC_BG, edgecolor='#FFCC80', linewidth=2, linestyle='--')
-ax.add_patch(dec_bg)
+diagram.box(7.0, 5.2, 4.8, 13.0, boxstyle="round,pad=0.3",
+            facecolor=C_DEC_BG, edgecolor='#FFCC80', linewidth=2, linestyle='--')
 ax.text(9.4, 17.95, 'DECODER  (x N)', ha='center', va='center',
         fontsize=13, fontweight='bold', color='#E65100')
 
@@ -203,9 +201,8 @@ legend_items = [
 ]
 for i, (color, label) in enumerate(legend_items):
     lx = 2.5 + i * 2.8
-    box = FancyBboxPatch((lx, legend_y), 0.5, 0.35, boxstyle="round,pad=0.05",
-                          facecolor=color, edgecolor='#424242', linewidth=1)
-    ax.add_patch(box)
+    diagram.box(lx, legend_y, 0.5, 0.35, boxstyle="round,pad=0.05",
+                facecolor=color, edgecolor='#424242', linewidth=1)
     ax.text(lx + 0.65, legend_y + 0.18, label, fontsize=9, va='center', color=C_TEXT)
 
 # Dashed line legend
@@ -1,30 +1,45 @@
 """
 Figure 002: DNA to Time Series Encoding
 Shows how a short DNA sequence (ACGTACGT) is encoded into 5 parallel channels
-representing biophysical properties.
+representing biophysical properties.  Set FASTA to encode a region of a real
+sequence instead; regions longer than CELL_LIMIT are drawn as colour strips
+with windowed GC and purine fractions overlaid.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
-from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.colors import LinearSegmentedColormap, ListedColormap, Normalize
+from matplotlib.ticker import MaxNLocator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figkit.dna import encode, read_sequence, windowed_content  # noqa: E402
+from figkit.grid import cell_grid  # noqa: E402
 
 # --- Data from codebase (GenomicsLRBDataset.py) ---
 sequence = "ACGTACGT"
 
+# A FASTA file to encode instead (its first record), and the region shown.
+FASTA = None
+REGION = (0, 8)
+# Longer sequences are drawn as strips rather than one labelled cell per base,
+# averaged down to at most STRIP_COLUMNS columns.
+CELL_LIMIT = 64
+STRIP_COLUMNS = 2048
+
+if FASTA:
+    sequence = read_sequence(FASTA, start=REGION[0], stop=REGION[1]).tobytes().decode()
+
 # Encoding values per channel, per base
 # Channel 0: Base Identity  (A=1, C=2, G=3, T=4)
 # Channel 1: Purine/Pyrimidine (Purine=1, Pyrimidine=0)
 # Channel 2: Amino/Keto (Amino=1, Keto=0)
 # Channel 3: Hydrogen Bonds (A-T=2, G-C=3)
 # Channel 4: GC Content (G/C=1, A/T=0)
-
-encoding = {
-    'A': [1.0, 1.0, 1.0, 2.0, 0.0],
-    'C': [2.0, 0.0, 1.0, 3.0, 1.0],
-    'G': [3.0, 1.0, 0.0, 3.0, 1.0],
-    'T': [4.0, 0.0, 0.0, 2.0, 0.0],
-}
+# (N and other symbols encode as 0 in every channel.)
 
 channel_names = [
     "Ch 0: Base Identity",
@@ -42,14 +57,20 @@ channel_value_labels = [
     {1.0: "G/C=1", 0.0: "A/T=0"},
 ]
 
-# Build encoding matrix: shape (5, 8)
+# Encoding matrix: shape (5, n_bases)
 n_channels = 5
 n_bases = len(sequence)
-matrix = np.zeros((n_channels, n_bases))
-for j, base in enumerate(sequence):
-    vals = encoding[base]
-    for i in range(n_channels):
-        matrix[i, j] = vals[i]
+matrix = encode(sequence).astype(float)
+as_cells = n_bases <= CELL_LIMIT
+
+
+def block_mean(values, bins=STRIP_COLUMNS):
+    """Mean of *values* over at most *bins* near-equal blocks along axis 0."""
+    bins = min(bins, len(values))
+    edges = np.arange(bins) * len(values) // bins
+    counts = np.diff(np.r_[edges, len(values)])
+    return np.add.reduceat(values, edges, axis=0) / counts.reshape(-1, *[1] * (values.ndim - 1))
+
 
 # --- Colors ---
 base_colors = {'A': '#2ca02c', 'C': '#1f77b4', 'G': '#bcbd22', 'T': '#d62728'}
@@ -86,21 +107,27 @@ ax_dna.axis('off')
 
 # Draw each base as a colored box with letter
 box_width = 0.85
-for j, base in enumerate(sequence):
-    color = base_colors[base]
-    rect = mpatches.FancyBboxPatch(
-        (j - box_width / 2, 0.15), box_width, 0.7,
-        boxstyle="round,pad=0.05",
-        facecolor=color, edgecolor='#333333', linewidth=1.2, alpha=0.85
+if as_cells:
+    cell_grid(
+        ax_dna, facecolors=[[base_colors.get(base.upper(), '#999999') for base in sequence]],
+        origin=(0, 0.50), size=(box_width, 0.7), boxstyle="round,pad=0.05",
+        edgecolor='#333333', linewidth=1.2, alpha=0.85,
+        labels=[list(sequence)], label_colors='white',
+        fontsize=22, fontweight='bold', fontfamily='monospace'
     )
-    ax_dna.add_patch(rect)
-    ax_dna.text(j, 0.50, base, ha='center', va='center',
-                fontsize=22, fontweight='bold', color='white',
-                fontfamily='monospace')
+    positions = range(n_bases)
+else:
+    # One colour per base (grey for N), averaged into a single strip.
+    base_cmap = ListedColormap(['#999999'] + [base_colors[b] for b in 'ACGT'])
+    strip = block_mean(base_cmap(matrix[0].astype(int)))
+    ax_dna.imshow(strip[np.newaxis], aspect='auto', interpolation='nearest', alpha=0.85,
+                  extent=(-0.5, n_bases - 0.5, 0.15, 0.85))
+    ticks = MaxNLocator(8, integer=True).tick_values(REGION[0], REGION[0] + n_bases - 1)
+    positions = [int(t) - REGION[0] for t in ticks if 0 <= t - REGION[0] < n_bases]
 
 # Position labels
-for j in range(n_bases):
-    ax_dna.text(j, -0.05, str(j), ha='center', va='top',
+for j in positions:
+    ax_dna.text(j, -0.05, str(REGION[0] + j), ha='center', va='top',
                 fontsize=9, color='#666666')
 
 ax_dna.text(-0.5, 0.50, "DNA\nSequence", ha='right', va='center',
@@ -120,6 +147,10 @@ ax_arrow.text(0.5, 0.5, "encode", ha='center', va='center',
               transform=ax_arrow.transAxes)
 
 # --- Channel panels: step plots with heatmap coloring ---
+if not as_cells:
+    # Windowed purine and GC fractions, overlaid on their channels.
+    tracks = windowed_content(sequence, window=max(1, n_bases // 200))
+    fractions = {1: tracks.purine, 4: tracks.gc}
 for ch_idx in range(n_channels):
     ax = fig.add_subplot(gs[ch_idx + 2])
     values = matrix[ch_idx]
@@ -131,29 +162,28 @@ for ch_idx in range(n_channels):
         f'ch{ch_idx}', channel_palettes[ch_idx], N=256
     )
 
-    # Draw colored bars for each position
-    for j in range(n_bases):
-        val = values[j]
-        # Normalize value for color mapping
-        if vmax > vmin:
-            norm_val = (val - vmin) / (vmax - vmin)
-        else:
-            norm_val = 0.5
-        color = cmap(norm_val)
-
-        rect = mpatches.FancyBboxPatch(
-            (j - 0.42, 0.05), 0.84, 0.9,
-            boxstyle="round,pad=0.03",
-            facecolor=color, edgecolor='#aaaaaa', linewidth=0.8
+    # Draw colored bars for each position, with the value inside each cell
+    if vmax > vmin:
+        norm_vals = (values - vmin) / (vmax - vmin)
+    else:
+        norm_vals = np.full_like(values, 0.5)
+    if as_cells:
+        cell_grid(
+            ax, norm_vals[np.newaxis], cmap=cmap, norm=Normalize(0, 1),
+            origin=(0, 0.50), size=(0.84, 0.9), boxstyle="round,pad=0.03",
+            edgecolor='#aaaaaa', linewidth=0.8,
+            labels=np.char.mod('%.0f', values[np.newaxis]),
+            # Choose text color for contrast
+            label_colors=np.where(norm_vals > 0.55, 'white', '#222222')[np.newaxis],
+            fontsize=13, fontweight='bold', fontfamily='monospace'
         )
-        ax.add_patch(rect)
-
-        # Value text inside each cell
-        # Choose text color for contrast
-        text_color = 'white' if norm_val > 0.55 else '#222222'
-        ax.text(j, 0.50, f"{val:.0f}", ha='center', va='center',
-                fontsize=13, fontweight='bold', color=text_color,
-                fontfamily='monospace')
+    else:
+        ax.imshow(block_mean(norm_vals)[np.newaxis], cmap=cmap, norm=Normalize(0, 1),
+                  aspect='auto', interpolation='nearest',
+                  extent=(-0.5, n_bases - 0.5, 0.05, 0.95))
+        if ch_idx in fractions:
+            ax.plot(tracks.starts + (tracks.window - 1) / 2,
+                    0.05 + 0.9 * fractions[ch_idx], color='#222222', lw=1.0)
 
     ax.set_xlim(-0.5, n_bases - 0.5)
     ax.set_ylim(0, 1)
@@ -168,11 +198,13 @@ for ch_idx in range(n_channels):
             transform=ax.transData)
 
     # Value legend on the right
-    unique_vals = sorted(set(values))
+    unique_vals = np.unique(values)
     legend_parts = []
     for uv in unique_vals:
         if uv in channel_value_labels[ch_idx]:
             legend_parts.append(channel_value_labels[ch_idx][uv])
+    if not as_cells and ch_idx in fractions:
+        legend_parts.append(f"line: per {tracks.window} bp")
     legend_text = "  ".join(legend_parts)
     ax.text(n_bases - 0.3, 0.50, legend_text, ha='left', va='center',
             fontsize=9, color='#555555', transform=ax.transData)
@@ -13,6 +13,9 @@ Architecture specs (Section 7.1, Section 12):
 - Output: 64 fixed tokens for gated cross-attention
 """
 
+import os
+import sys
+
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
@@ -20,6 +23,14 @@ import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figkit.resampler import load_runs  # noqa: E402
+
+# Attention maps cached by figkit.resampler.cache_runs, drawn beside each
+# layer (heads averaged), and the run to draw; None: the first in the cache.
+ATTENTION = None
+RUN = None
+
 # ── Color palette ──────────────────────────────────────────────────────
 C_BG        = '#FFFFFF'
 C_INPUT     = '#4A90D9'   # Blue for input patches
@@ -34,8 +45,10 @@ C_DIM_TEXT  = '#555555'
 C_ARROW     = '#888888'
 C_LIGHT_BG  = '#F9F7F3'
 
-fig, ax = plt.subplots(1, 1, figsize=(11, 15), facecolor=C_BG)
-ax.set_xlim(0, 11)
+# A cached run gets a column of per-layer maps to the right of the diagram
+width = 14.6 if ATTENTION else 11
+fig, ax = plt.subplots(1, 1, figsize=(width, 15), facecolor=C_BG)
+ax.set_xlim(0, width)
 ax.set_ylim(0, 15)
 ax.set_aspect('equal')
 ax.axis('off')
@@ -206,6 +219,32 @@ for i in range(n_layers):
                     arrowprops=dict(arrowstyle='->', color=C_LATENT,
                                    lw=1.5, linestyle='-'))
 
+# ══════════════════════════════════════════════════════════════════════
+# CACHED ATTENTION MAPS (one per layer, aligned with it)
+# ══════════════════════════════════════════════════════════════════════
+if ATTENTION:
+    cache = load_runs(ATTENTION)
+    run = RUN or next(iter(cache.runs))
+    maps = cache.runs[run].mean(axis=1)          # (layers, latents, bins)
+    # Near-uniform maps would read as one flat colour from zero
+    vmin, vmax = np.percentile(maps, [1, 99.5])
+    for i, amap in enumerate(maps[:n_layers]):
+        y = first_layer_y + i * (layer_h + layer_gap)
+        inset = ax.inset_axes((11.1, y + 0.05, 3.2, layer_h - 0.1), transform=ax.transData)
+        inset.imshow(amap, cmap='Reds', vmin=vmin, vmax=vmax, aspect='auto',
+                     interpolation='nearest')
+        inset.set_xticks([])
+        inset.set_yticks([])
+        for spine in inset.spines.values():
+            spine.set_edgecolor(C_CROSS)
+            spine.set_linewidth(0.8)
+    patches = cache.meta.get('patches', maps.shape[-1])
+    ax.text(12.7, first_layer_y + n_layers * (layer_h + layer_gap) + 0.05,
+            f'Cross-attention per layer\n{maps.shape[1]} latents × {patches:,} patches',
+            fontsize=9, ha='center', va='bottom', color=C_CROSS, fontweight='bold')
+    ax.text(12.7, first_layer_y - 0.1, f'cached run: {run}  ·  heads averaged',
+            fontsize=8, ha='center', va='top', color=C_DIM_TEXT, style='italic')
+
 # ══════════════════════════════════════════════════════════════════════
 # CROSS-ATTENTION FEED ARROWS (from input to each layer)
 # ══════════════════════════════════════════════════════════════════════
@@ -1,13 +1,32 @@
 """
 Fig 008: Training Parameter Configuration
 Visual summary of trainable vs frozen parameters in the OpenTSLM-Flamingo model.
+Parameter counts are computed from the architecture config by figkit.params.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figkit.params import (LLMS, Budget, decoder, format_params,  # noqa: E402
+                           gated_cross_attention, patch_encoder, perceiver_resampler)
+
+# ── Architecture ───────────────────────────────────────────────────────────
+LLM = 'Qwen2.5-0.5B'
+llm_parts = decoder(LLMS[LLM])
+budget = Budget()
+budget.add('CNN Encoder', patch_encoder(4, 128, positions=1024))
+budget.add('Perceiver Resampler', perceiver_resampler(512, depth=6, latents=64, d_in=128))
+budget.add('Gated Cross-Attn',
+           gated_cross_attention(LLMS[LLM].hidden, 512, layers=LLMS[LLM].layers))
+budget.add('Input Embeddings', llm_parts.pop('embeddings'))
+budget.add(LLM, llm_parts, trainable=False)
+
 # ── Configuration ──────────────────────────────────────────────────────────
 fig, ax = plt.subplots(figsize=(14, 7.5))
 ax.set_xlim(0, 14)
@@ -35,7 +54,7 @@ ax.text(7, 7.15, 'OpenTSLM-Flamingo: Trainable vs Frozen Components',
 
 # ── Helper Functions ───────────────────────────────────────────────────────
 def draw_component_box(ax, x, y, w, h, label, sublabel, is_trainable,
-                       lr_text=None, detail_lines=None):
+                       lr_text=None, detail_lines=None, params=None):
     """Draw a component box with training status coloring."""
     fill = BLUE_TRAIN_LIGHT if is_trainable else GRAY_FROZEN_LIGHT
     edge = BLUE_TRAIN_EDGE if is_trainable else GRAY_FROZEN_EDGE
@@ -80,6 +99,12 @@ def draw_component_box(ax, x, y, w, h, label, sublabel, is_trainable,
                     fontsize=7.5, ha='center', va='center', color='#6B7280',
                     fontstyle='italic')
 
+    # Parameter count
+    if params:
+        ax.text(x + w / 2, y + 0.68, f'{format_params(params)} params',
+                fontsize=9, fontweight='bold', ha='center', va='center',
+                color=edge)
+
     # Learning rate label
     if lr_text:
         ax.text(x + w / 2, y + 0.18, f'lr = {lr_text}',
@@ -122,28 +147,32 @@ draw_component_box(ax, x_positions[0], y_base, box_w, box_h,
                    'CNN Encoder', 'Conv1D + PosEmbed + LN',
                    is_trainable=True, lr_text='2e-4',
                    detail_lines=['patch_size=4, embed_dim=128',
-                                 'Output: [B, 1024, 128]'])
+                                 'Output: [B, 1024, 128]'],
+                   params=budget['CNN Encoder'].params)
 
 # 2. Perceiver Resampler
 draw_component_box(ax, x_positions[1], y_base, box_w, box_h,
                    'Perceiver Resampler', '6 layers, 64 latent tokens',
                    is_trainable=True, lr_text='1e-4',
                    detail_lines=['8 heads × 64 dim/head',
-                                 'Output: [B, 64, 512]'])
+                                 'Output: [B, 64, 512]'],
+                   params=budget['Perceiver Resampler'].params)
 
 # 3. Gated Cross-Attention
 draw_component_box(ax, x_positions[2], y_base, box_w, box_h,
                    'Gated Cross-Attn', 'Inserted in each LLM layer',
                    is_trainable=True, lr_text='1e-4',
                    detail_lines=['tanh gate (α), learned',
-                                 'Q: LLM states, K/V: Perceiver'])
+                                 'Q: LLM states, K/V: Perceiver'],
+                   params=budget['Gated Cross-Attn'].params)
 
 # 4. Frozen LLM
 draw_component_box(ax, x_positions[3], y_base, box_w, box_h,
                    'Qwen2.5-0.5B LLM', 'Decoder-only backbone',
                    is_trainable=False, lr_text=None,
                    detail_lines=['Self-attn + FFN: frozen',
-                                 'All weights fixed'])
+                                 'All weights fixed'],
+                   params=budget[LLM].params)
 
 # ── Draw Arrows ────────────────────────────────────────────────────────────
 arrow_y = y_base + box_h / 2
@@ -183,8 +212,8 @@ embed_box = FancyBboxPatch((x_positions[3] + 0.15, embed_y - 0.22),
                            linestyle='--')
 ax.add_patch(embed_box)
 ax.text(x_positions[3] + box_w / 2, embed_y,
-        'Input Embeddings: TRAINABLE',
-        fontsize=7.5, fontweight='bold', ha='center', va='center',
+        f"Input Embeddings: TRAINABLE\n{format_params(budget['Input Embeddings'].params)} params",
+        fontsize=7, linespacing=1.1, fontweight='bold', ha='center', va='center',
         color=BLUE_TRAIN_EDGE)
 
 # Arrow from input embeddings to LLM
@@ -219,6 +248,8 @@ ax.text(legend_x + 7.1, legend_y, 'Frozen (weights fixed, no gradient)',
 summary_x = 7.0
 summary_y = 0.18
 ax.text(summary_x, summary_y,
+        f'Trainable: {format_params(budget.trainable)} of {format_params(budget.total)} params '
+        f'({100 * budget.trainable / budget.total:.0f}%)  |  '
         'Training config:  batch_size=4  |  early_stop=5 epochs  |  Encoder lr=2e-4  |  Projector lr=1e-4',
         fontsize=8.5, ha='center', va='center', color='#6B7280',
         fontstyle='italic')
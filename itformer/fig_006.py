@@ -4,11 +4,23 @@ fig_006: Perceiver Resampler vs Instruction-Guided Resampler (IGR)
 Side-by-side comparison showing query-agnostic vs query-conditioned compression.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.resampler import load_runs  # noqa: E402
+
+# Attention maps cached by figkit.resampler.cache_runs: the example outputs
+# become the last layer's cross-attention (heads averaged) of these runs,
+# one per question.
+ATTENTION = None
+RUNS = {"perceiver": ("perceiver/q1", "perceiver/q2"), "igr": ("igr/q1", "igr/q2")}
+
 # ─── Color palette ───────────────────────────────────────────────────────────
 # Left panel (Perceiver): muted/grey tones
 GREY_DARK = "#5a5a5a"
@@ -66,6 +78,18 @@ def draw_arrow(ax, x1, y1, x2, y2, color=BLACK, style='->', lw=1.3,
     return arrow
 
 
+def draw_attention_map(ax, x, y, w, h, amap, cmap, edgecolor, vmin, vmax):
+    """Draw a cached attention map in place of a w x h box centred at (x, y)."""
+    inset = ax.inset_axes((x - w / 2, y - h / 2, w, h), transform=ax.transData, zorder=2)
+    inset.imshow(amap, cmap=cmap, vmin=vmin, vmax=vmax, aspect='auto',
+                 interpolation='nearest')
+    inset.set_xticks([])
+    inset.set_yticks([])
+    for spine in inset.spines.values():
+        spine.set_edgecolor(edgecolor)
+        spine.set_linewidth(1.2)
+
+
 def draw_time_series_snippet(ax, x_center, y_center, w=0.7, h=0.22, color='#555', seed=42):
     """Draw a small time-series waveform icon."""
     rng = np.random.RandomState(seed)
@@ -284,34 +308,53 @@ ax.text(q2_x, y_q2, 'Q2: "What is the heart rate?"', ha='center', va='center',
 
 # --- Left: Same output ---
 left_out_x = 5.8
-draw_rounded_box(ax, left_out_x, y_q1, 1.2, 0.35, "Z (same)",
-                 GREY_LIGHT, GREY_MED, fontsize=8, textcolor=GREY_DARK, fontweight='bold')
-draw_rounded_box(ax, left_out_x, y_q2, 1.2, 0.35, "Z (same)",
-                 GREY_LIGHT, GREY_MED, fontsize=8, textcolor=GREY_DARK, fontweight='bold')
+right_out_x = 8.3
+if ATTENTION:
+    cache = load_runs(ATTENTION)
+    maps = {model: [cache.layer_map(run) for run in runs] for model, runs in RUNS.items()}
+    limits = np.percentile(np.concatenate([m.ravel() for pair in maps.values() for m in pair]),
+                           [1, 99.5])
+    change = {model: np.abs(a - b).max() / a.mean() for model, (a, b) in maps.items()}
+    for y_q, amap in zip((y_q1, y_q2), maps["perceiver"]):
+        draw_attention_map(ax, left_out_x, y_q, 1.2, 0.35, amap, 'Greys', GREY_DARK, *limits)
+    for y_q, amap, color in zip((y_q1, y_q2), maps["igr"], (ORANGE, PURPLE)):
+        draw_attention_map(ax, right_out_x, y_q, 1.5, 0.35, amap, 'Blues', color, *limits)
+else:
+    draw_rounded_box(ax, left_out_x, y_q1, 1.2, 0.35, "Z (same)",
+                     GREY_LIGHT, GREY_MED, fontsize=8, textcolor=GREY_DARK, fontweight='bold')
+    draw_rounded_box(ax, left_out_x, y_q2, 1.2, 0.35, "Z (same)",
+                     GREY_LIGHT, GREY_MED, fontsize=8, textcolor=GREY_DARK, fontweight='bold')
 
 # Draw equals sign between them
 ax.text(left_out_x + 0.78, y_ex, "=", ha='center', va='center',
         fontsize=14, fontweight='bold', color='#b71c1c')
 
-# Label
-ax.text(left_out_x, y_ex - 0.45, "Perceiver", ha='center', va='center',
+# Label (below the maps when they fill the output boxes)
+label_y = y_ex - (0.72 if ATTENTION else 0.45)
+ax.text(left_out_x, label_y, "Perceiver", ha='center', va='center',
         fontsize=8, color=GREY_DARK, style='italic')
 
 # --- Right: Different outputs ---
-right_out_x = 8.3
-draw_rounded_box(ax, right_out_x, y_q1, 1.5, 0.35, "Z' (rhythm-focused)",
-                 ORANGE_LIGHT, ORANGE, fontsize=8, textcolor=ORANGE, fontweight='bold')
-draw_rounded_box(ax, right_out_x, y_q2, 1.5, 0.35, "Z' (rate-focused)",
-                 PURPLE_LIGHT, PURPLE, fontsize=8, textcolor=PURPLE, fontweight='bold')
+if not ATTENTION:
+    draw_rounded_box(ax, right_out_x, y_q1, 1.5, 0.35, "Z' (rhythm-focused)",
+                     ORANGE_LIGHT, ORANGE, fontsize=8, textcolor=ORANGE, fontweight='bold')
+    draw_rounded_box(ax, right_out_x, y_q2, 1.5, 0.35, "Z' (rate-focused)",
+                     PURPLE_LIGHT, PURPLE, fontsize=8, textcolor=PURPLE, fontweight='bold')
 
 # Draw not-equals sign between them
 ax.text(right_out_x + 0.85, y_ex, "≠", ha='center', va='center',
         fontsize=14, fontweight='bold', color=GREEN)
 
 # Label
-ax.text(right_out_x, y_ex - 0.45, "IGR", ha='center', va='center',
+ax.text(right_out_x, label_y, "IGR", ha='center', va='center',
         fontsize=8, color=BLUE_DARK, fontweight='bold', style='italic')
 
+# Largest change of the cached attention between the two questions
+if ATTENTION:
+    for x, model in ((left_out_x, "perceiver"), (right_out_x, "igr")):
+        ax.text(x, y_ex - 0.92, f"max |ΔA| between questions: {change[model]:.0%} of mean",
+                ha='center', va='center', fontsize=7.5, color=GREY_DARK)
+
 # Arrows from TS to outputs
 draw_arrow(ax, ts_x + 0.80, y_q1, left_out_x - 0.95, y_q1, color=GREY_MED, lw=0.8)
 draw_arrow(ax, ts_x + 0.80, y_q2, left_out_x - 0.95, y_q2, color=GREY_MED, lw=0.8)
@@ -3,11 +3,31 @@ fig_005: Multivariate Time Series Processing Pipeline
 Shows how 12-lead ECG flows through shared patch encoder → C×N embeddings → Perceiver pooling (K=64).
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.collections import LineCollection
 from matplotlib.patches import FancyBboxPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figkit.patches import patch_report, patch_stats  # noqa: E402
+from figkit.recordings import open_recording  # noqa: E402
+from figkit.traces import traces  # noqa: E402
+
+# A 12-lead WFDB (.hea) or EDF recording to draw instead of the synthetic
+# leads, with its patch grid, and the span (s) shown; None: to the end.
+RECORD = None
+RECORD_START = 0.0
+RECORD_SECONDS = None
+# Patch encoder config: Conv1D kernel and stride (samples), width, pooled tokens.
+PATCH = 50
+STRIDE = None
+D_ENC = 512
+LATENTS = 64
+
 # ---------- colour palette ----------
 LEAD_COLORS = [
     '#E63946',  '#F4845F',  '#F7B267',  '#A8DADC',
@@ -26,6 +46,20 @@ BORDER_DARK = '#2C3E50'
 ARROW_COLOR = '#555555'
 DIM_COLOR = '#777777'
 
+if RECORD:
+    recording = open_recording(RECORD)
+    stop = recording.duration if RECORD_SECONDS is None else RECORD_START + RECORD_SECONDS
+    leads = recording.window(RECORD_START, stop, LEAD_NAMES)
+    fs = recording.channel(LEAD_NAMES[0]).fs
+    length_text = f'L = {leads.shape[1]} samples ({leads.shape[1] / fs:g} s × {fs:g} Hz)'
+else:
+    leads = None
+    length_text = 'L = 5000 samples (10 s × 500 Hz)'
+report = patch_report(leads.shape if RECORD else (12, 5000), PATCH, STRIDE,
+                      d_enc=D_ENC, latents=LATENTS)
+if RECORD:
+    print(report)
+
 fig, ax = plt.subplots(figsize=(18, 12.5))
 ax.set_xlim(0, 18)
 ax.set_ylim(1.5, 15.5)
@@ -65,7 +99,7 @@ def bracket(x, y_top, y_bot, text, side='left'):
 ax.text(9, 15.0, 'Multivariate Time Series Processing Pipeline',
         ha='center', va='center', fontsize=17, fontweight='bold',
         color='#1B2631', zorder=10)
-ax.text(9, 14.55, '12-lead ECG example  ·  Shared Encoder  ·  Shared Perceiver Pooling (K = 64)',
+ax.text(9, 14.55, f'12-lead ECG example  ·  Shared Encoder  ·  Shared Perceiver Pooling (K = {LATENTS})',
         ha='center', va='center', fontsize=11, color='#555555', zorder=10)
 
 # ═══════════════════════════════════════════════════════
@@ -80,7 +114,7 @@ subheader_y = 13.55
 ax.text(col1_cx, header_y, 'Input: 12-Lead ECG',
         ha='center', va='center', fontsize=11.5, fontweight='bold',
         color='#1B2631', zorder=6)
-ax.text(col1_cx, subheader_y, 'L = 5000 samples (10 s × 500 Hz)',
+ax.text(col1_cx, subheader_y, length_text,
         ha='center', va='center', fontsize=8.5, color=DIM_COLOR,
         fontstyle='italic', zorder=6)
 
@@ -111,12 +145,42 @@ for i, (cy, color, name) in enumerate(zip(chan_ys, LEAD_COLORS, LEAD_NAMES)):
     ax.add_patch(box)
     ax.text(chan_x + 0.32, cy + chan_h / 2, name, ha='center', va='center',
             fontsize=8.5, fontweight='bold', color=color, zorder=4)
-    # mini waveform
+
+# mini waveforms, all 12 leads in one collection
+if RECORD:
+    waves = leads.copy()
+    waves -= np.median(waves, axis=1, keepdims=True)
+    waves *= 0.25 / np.abs(waves).max(axis=1, keepdims=True).clip(1e-6)
+else:
     t = np.linspace(0, 2 * np.pi, 60)
-    wave = 0.14 * np.sin(t * (2 + 0.3 * i)) + 0.05 * np.random.randn(60)
-    wx = np.linspace(chan_x + 0.60, chan_x + chan_w - 0.10, 60)
-    wy = cy + chan_h / 2 + wave
-    ax.plot(wx, wy, color=color, lw=1.0, zorder=3)
+    waves = 0.14 * np.sin(np.outer(2 + 0.3 * np.arange(12), t)) + 0.05 * np.random.randn(12, 60)
+traces(ax, waves, span=(chan_x + 0.60, chan_x + chan_w - 0.10),
+       baseline=np.array(chan_ys) + chan_h / 2, colors=LEAD_COLORS, linewidths=1.0,
+       zorder=3)
+
+# Patch grid of the recording: per-patch std, each lead scaled to its own
+# maximum, as one image of 5 rows per lead (4 under the box, 1 for the gap)
+if RECORD:
+    wave_span = (chan_x + 0.60, chan_x + chan_w - 0.10)
+    activity = patch_stats(leads, PATCH, STRIDE, stats=('std',))['std']
+    activity /= activity.max(axis=1, keepdims=True).clip(1e-12)
+    grid = np.full((12, 5, report.patches), np.nan)
+    grid[:, :4] = activity[:, None, :]
+    # The grid stops where the last whole patch does; a dropped tail stays bare
+    covered = wave_span[0] + (wave_span[1] - wave_span[0]) \
+        * (report.length - report.dropped) / report.length
+    ax.imshow(grid.reshape(60, -1), cmap='Greys', vmin=0, vmax=2.5, alpha=0.55,
+              interpolation='nearest', aspect='auto', origin='upper', zorder=2.5,
+              extent=(wave_span[0], covered, chan_ys[-1] - chan_gap, chan_ys[0] + chan_h))
+    # Patch edges, while they are still wider than a line
+    if report.patches <= 200:
+        edges = wave_span[0] + (wave_span[1] - wave_span[0]) \
+            * np.arange(1, report.patches) * report.stride / report.length
+        ys = np.array(chan_ys)
+        segments = np.stack(np.broadcast_arrays(
+            edges[None, :, None], ys[:, None, None] + np.array([0.0, chan_h])), axis=-1)
+        ax.add_collection(LineCollection(segments.reshape(-1, 2, 2), colors='white',
+                                         linewidths=0.4, zorder=2.6))
 
 # Left bracket
 bracket(chan_x - 0.08, chan_ys[0] + chan_h, chan_ys[-1],
@@ -198,10 +262,10 @@ ax.text(pool_x + pool_w / 2, pool_y + pool_h - 0.82,
         fontsize=10, color='#7D3C00', zorder=5)
 
 details = [
-    'K = 64 learnable query vectors',
+    f'K = {LATENTS} learnable query vectors',
     'Cross-attention:  Q attends to C×N KV',
-    'Input:  C×N = 12×100 patch embeddings',
-    'Output:  64 tokens,  dim = d_enc',
+    f'Input:  C×N = {report.channels}×{report.patches} patch embeddings',
+    f'Output:  {LATENTS} tokens,  dim = d_enc',
 ]
 for j, line in enumerate(details):
     ax.text(pool_x + pool_w / 2, pool_y + pool_h - 1.35 - j * 0.40,
@@ -226,14 +290,14 @@ ax.text(mlp_x + mlp_w / 2, mlp_y + mlp_h - 0.62,
         '2-layer MLP + GELU (LLaVA 1.5)', ha='center', va='center',
         fontsize=10, color='#145A32', zorder=5)
 ax.text(mlp_x + mlp_w / 2, mlp_y + mlp_h - 0.93,
-        'Output: K = 64 tokens, dim = d_LLM', ha='center', va='center',
+        f'Output: K = {LATENTS} tokens, dim = d_LLM', ha='center', va='center',
         fontsize=9, color='#145A32', fontstyle='italic', zorder=5)
 
 # Arrow: pool → MLP
 arrow_line(pool_x + pool_w / 2, pool_y - 0.02,
            mlp_x + mlp_w / 2, mlp_y + mlp_h + 0.02)
 ax.text(pool_x + pool_w + 0.15, (pool_y + mlp_y + mlp_h) / 2,
-        '64 × d_enc', ha='left', va='center',
+        f'{LATENTS} × d_enc', ha='left', va='center',
         fontsize=9.5, color=DIM_COLOR, fontstyle='italic', zorder=6)
 
 # ═══════════════════════════════════════════════════════
@@ -264,7 +328,7 @@ ax.text(llm_x + llm_w / 2, llm_y + llm_h - 1.23,
 arrow_line(mlp_x + mlp_w / 2, mlp_y - 0.02,
            llm_x + llm_w / 2, llm_y + llm_h + 0.02)
 ax.text(mlp_x + mlp_w + 0.15, (mlp_y + llm_y + llm_h) / 2,
-        '64 × d_LLM', ha='left', va='center',
+        f'{LATENTS} × d_LLM', ha='left', va='center',
         fontsize=9.5, color=DIM_COLOR, fontstyle='italic', zorder=6)
 
 # Text tokens box and arrow (from left)
@@ -297,10 +361,10 @@ ax.annotate('', xy=(llm_x - 0.02, llm_y + llm_h / 2),
 # ═══════════════════════════════════════════════════════
 sx = 16.2
 summary_items = [
-    ('Input',          'C × L\n12 × 5000'),
-    ('After Patching', 'C × N × d_enc\n12 × 100 × d_enc'),
-    ('After Pooling',  'K × d_enc\n64 × d_enc'),
-    ('After MLP',      'K × d_LLM\n64 × d_LLM'),
+    ('Input',          f'C × L\n{report.channels} × {report.length}'),
+    ('After Patching', f'C × N × d_enc\n{report.channels} × {report.patches} × d_enc'),
+    ('After Pooling',  f'K × d_enc\n{LATENTS} × d_enc'),
+    ('After MLP',      f'K × d_LLM\n{LATENTS} × d_LLM'),
 ]
 
 sy_start = 11.5
@@ -4,10 +4,16 @@ Visual matrix showing the six ablation studies (A1-A6) and which
 architectural component or training choice each one isolates.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.grid import cell_grid  # noqa: E402
+
 # ── Data from Section 5.3 of architecture_plan.md ──────────────────────
 
 ablation_ids = ["A1", "A2", "A3", "A4", "A5", "A6"]
@@ -140,13 +146,19 @@ for j in range(n_cols):
         linespacing=1.15
     )
 
-# Draw data cells
-for i in range(n_rows):
-    y = (n_rows - 1 - i) * cell_h  # rows go top to bottom
+# Draw data cells, rows top to bottom
+is_ablated = ablation_matrix == 1
+grid = cell_grid(
+    ax_grid, facecolors=np.where(is_ablated, color_ablated, color_default),
+    origin=(cell_w / 2, (n_rows - 0.5) * cell_h), step=(cell_w, -cell_h),
+    size=(cell_w, cell_h), boxstyle="round,pad=0.02",
+    edgecolor=color_grid_line, linewidth=0.8, alpha=0.95
+)
 
-    # Row label (A1, A2, ...)
+# Row labels (A1, A2, ...)
+for i, (_, y) in enumerate(grid.centers[:, 0]):
     ax_grid.text(
-        -row_label_w / 2, y + cell_h / 2,
+        -row_label_w / 2, y,
         ablation_ids[i],
         ha="center", va="center",
         fontsize=14, fontweight="bold",
@@ -154,41 +166,18 @@ for i in range(n_rows):
         fontfamily="monospace"
     )
 
-    for j in range(n_cols):
-        x = j * cell_w
-        is_ablated = ablation_matrix[i, j] == 1
-        bg_color = color_ablated if is_ablated else color_default
-
-        rect = mpatches.FancyBboxPatch(
-            (x, y), cell_w, cell_h,
-            boxstyle="round,pad=0.02",
-            facecolor=bg_color,
-            edgecolor=color_grid_line,
-            linewidth=0.8,
-            alpha=0.95
-        )
-        ax_grid.add_patch(rect)
-
-        # Cell text: show actual value
-        if is_ablated:
-            cell_text = ablated_values[j]
-            text_weight = "bold"
-            text_color = "#B85450"
-            text_size = 8.5
-        else:
-            cell_text = default_values[j]
-            text_weight = "normal"
-            text_color = "#4A7A4C"
-            text_size = 8.5
-
-        ax_grid.text(
-            x + cell_w / 2, y + cell_h / 2,
-            cell_text,
-            ha="center", va="center",
-            fontsize=text_size, fontweight=text_weight,
-            color=text_color,
-            linespacing=1.1
-        )
+# Cell text: show actual value; ablated cells in bold red
+cell_texts = np.where(is_ablated, ablated_values, default_values)
+for (x, y), cell_text, ablated in zip(grid.centers.reshape(-1, 2), cell_texts.ravel(),
+                                      is_ablated.ravel()):
+    ax_grid.text(
+        x, y,
+        cell_text,
+        ha="center", va="center",
+        fontsize=8.5, fontweight="bold" if ablated else "normal",
+        color="#B85450" if ablated else "#4A7A4C",
+        linespacing=1.1
+    )
 
 # ── Draw descriptions panel on ax_desc ──────────────────────────────────
 
@@ -8,11 +8,16 @@ Detailed data flow diagram from input to policy update:
 Shows the reference policy branch for KL computation.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.diagram import Diagram  # noqa: E402
+
 # ── Color palette ─────────────────────────────────────────────────────────────
 COL_INPUT      = "#6366F1"   # indigo — input data
 COL_INPUT_EDGE = "#4338CA"
@@ -40,19 +45,18 @@ COL_FANOUT_EDGE = "#C4B5FD"
 fig, ax = plt.subplots(figsize=(24, 10.5), dpi=200)
 fig.patch.set_facecolor("white")
 ax.set_facecolor("white")
+diagram = Diagram(ax)
 
 # ── Helper: draw a rounded box with text ─────────────────────────────────────
-def draw_box(ax, cx, cy, w, h, label, sublabel=None, fc="#3B82F6", ec="#1E40AF",
+def draw_box(d, cx, cy, w, h, label, sublabel=None, fc="#3B82F6", ec="#1E40AF",
              tc="#FFFFFF", fontsize=11, sublabel_fontsize=8.5, zorder=5,
              icon=None, icon_fontsize=16, boxstyle="round,pad=0.08"):
-    """Draw a rounded rectangle centered at (cx, cy)."""
-    box = FancyBboxPatch(
-        (cx - w/2, cy - h/2), w, h,
-        boxstyle=boxstyle,
-        facecolor=fc, edgecolor=ec, linewidth=2.0,
-        zorder=zorder,
-    )
-    ax.add_patch(box)
+    """Draw a rounded rectangle centered at (cx, cy) on diagram *d*."""
+    ax = d.ax
+    d.box(cx - w/2, cy - h/2, w, h,
+          boxstyle=boxstyle,
+          facecolor=fc, edgecolor=ec, linewidth=2.0,
+          zorder=zorder)
 
     text_y = cy + (0.12 if sublabel else 0) + (0.0 if icon is None else -0.05)
     if icon is not None:
@@ -67,22 +71,14 @@ def draw_box(ax, cx, cy, w, h, label, sublabel=None, fc="#3B82F6", ec="#1E40AF",
         ax.text(cx, text_y - 0.32, sublabel, ha="center", va="center",
                 fontsize=sublabel_fontsize, color=tc, alpha=0.88,
                 zorder=zorder+1)
-    return box
 
 
-def draw_arrow(ax, x0, y0, x1, y1, color=COL_ARROW, lw=2.0, style="-|>",
-               connectionstyle=None, linestyle="-", zorder=3, mutation_scale=16):
-    """Draw an arrow from (x0,y0) to (x1,y1)."""
-    props = dict(
-        arrowstyle=style,
-        color=color,
-        lw=lw,
-        mutation_scale=mutation_scale,
-        linestyle=linestyle,
-    )
-    if connectionstyle:
-        props["connectionstyle"] = connectionstyle
-    ax.annotate("", xy=(x1, y1), xytext=(x0, y0), arrowprops=props, zorder=zorder)
+def draw_arrow(d, x0, y0, x1, y1, color=COL_ARROW, lw=2.0, style="-|>",
+               connectionstyle="arc3", linestyle="-", zorder=3, mutation_scale=16):
+    """Draw an arrow from (x0,y0) to (x1,y1) on diagram *d*."""
+    d.arrow(x0, y0, x1, y1, style=style, color=color, lw=lw,
+            mutation_scale=mutation_scale, linestyle=linestyle,
+            connectionstyle=connectionstyle, zorder=zorder)
 
 
 def draw_label_on_arrow(ax, x, y, text, fontsize=8.5, color=COL_TEXT_MED, zorder=6,
@@ -122,12 +118,12 @@ SMALL_H = 0.7
 INPUT_Y_TS  = Y_MAIN + 0.75
 INPUT_Y_TXT = Y_MAIN - 0.75
 
-draw_box(ax, X_INPUT_TS, INPUT_Y_TS, BOX_W, SMALL_H,
+draw_box(diagram, X_INPUT_TS, INPUT_Y_TS, BOX_W, SMALL_H,
          "Time-Series", sublabel=None,
          fc=COL_INPUT, ec=COL_INPUT_EDGE, tc=COL_TEXT_WHITE,
          fontsize=10.5, icon="/\\/\\", icon_fontsize=10)
 
-draw_box(ax, X_INPUT_TXT, INPUT_Y_TXT, BOX_W, SMALL_H,
+draw_box(diagram, X_INPUT_TXT, INPUT_Y_TXT, BOX_W, SMALL_H,
          "Text Prompt", sublabel=None,
          fc=COL_INPUT, ec=COL_INPUT_EDGE, tc=COL_TEXT_WHITE,
          fontsize=10.5, icon="Aa", icon_fontsize=11)
@@ -151,10 +147,10 @@ draw_label_on_arrow(ax, merge_x + 0.55, Y_MAIN + 0.28, "$x_i$", fontsize=11,
                     color=COL_TEXT_DARK)
 
 # Arrow from merge to policy
-draw_arrow(ax, merge_x + 0.3, Y_MAIN, X_POLICY - BOX_W/2, Y_MAIN)
+draw_arrow(diagram, merge_x + 0.3, Y_MAIN, X_POLICY - BOX_W/2, Y_MAIN)
 
 # ── 2. OpenTSLM Policy (pi_theta) ────────────────────────────────────────────
-draw_box(ax, X_POLICY, Y_MAIN, BOX_W, BOX_H * 1.2,
+draw_box(diagram, X_POLICY, Y_MAIN, BOX_W, BOX_H * 1.2,
          "OpenTSLM", sublabel="Policy  $\\pi_\\theta$",
          fc=COL_POLICY, ec=COL_POLICY_EDGE, tc=COL_TEXT_WHITE,
          fontsize=13, sublabel_fontsize=10.5)
@@ -170,31 +166,30 @@ fan_region_x0 = X_GEN_FAN - gen_box_w/2 - fan_pad
 fan_region_x1 = X_GEN_FAN + gen_box_w/2 + fan_pad
 fan_region_y0 = gen_y_positions[-1] - gen_box_h/2 - fan_pad
 fan_region_y1 = gen_y_positions[0] + gen_box_h/2 + fan_pad
-fan_bg = FancyBboxPatch(
-    (fan_region_x0, fan_region_y0),
+diagram.box(
+    fan_region_x0, fan_region_y0,
     fan_region_x1 - fan_region_x0,
     fan_region_y1 - fan_region_y0,
     boxstyle="round,pad=0.15",
     facecolor=COL_FANOUT_BG, edgecolor=COL_FANOUT_EDGE,
     linewidth=1.5, linestyle="--", zorder=1,
 )
-ax.add_patch(fan_bg)
 ax.text((fan_region_x0 + fan_region_x1)/2, fan_region_y1 + 0.15,
         "K = 4 responses", ha="center", va="bottom",
         fontsize=10.5, fontweight="bold", color=COL_GEN_EDGE, zorder=6)
 
 # Four response boxes
 for k, gy in enumerate(gen_y_positions):
-    draw_box(ax, X_GEN_FAN, gy, gen_box_w, gen_box_h,
+    draw_box(diagram, X_GEN_FAN, gy, gen_box_w, gen_box_h,
              f"Response {k+1}", sublabel=None,
              fc=COL_GEN, ec=COL_GEN_EDGE, tc=COL_TEXT_WHITE,
              fontsize=9.5, zorder=5)
     # Arrow from policy to each response (fan-out)
-    draw_arrow(ax, X_POLICY + BOX_W/2, Y_MAIN,
+    draw_arrow(diagram, X_POLICY + BOX_W/2, Y_MAIN,
                X_GEN_FAN - gen_box_w/2, gy,
                color=COL_GEN_EDGE, lw=1.5, style="-|>")
     # Arrow from each response to judge (fan-in)
-    draw_arrow(ax, X_GEN_FAN + gen_box_w/2, gy,
+    draw_arrow(diagram, X_GEN_FAN + gen_box_w/2, gy,
                X_JUDGE - BOX_W/2, Y_MAIN,
                color=COL_JUDGE_EDGE, lw=1.5, style="-|>")
 
@@ -203,13 +198,13 @@ draw_label_on_arrow(ax, (X_POLICY + BOX_W/2 + X_GEN_FAN - gen_box_w/2)/2,
                     Y_MAIN + 1.7, "sample K=4", fontsize=11, color=COL_GEN_EDGE)
 
 # ── 4. LLM Judge ────────────────────────────────────────────────────────────
-draw_box(ax, X_JUDGE, Y_MAIN, BOX_W + 0.2, BOX_H * 1.2,
+draw_box(diagram, X_JUDGE, Y_MAIN, BOX_W + 0.2, BOX_H * 1.2,
          "LLM Judge", sublabel="GPT-4o / 70B",
          fc=COL_JUDGE, ec=COL_JUDGE_EDGE, tc=COL_TEXT_WHITE,
          fontsize=13, sublabel_fontsize=9.5)
 
 # Arrow from judge to scores
-draw_arrow(ax, X_JUDGE + (BOX_W+0.2)/2, Y_MAIN, X_SCORES - SMALL_W/2 - 0.6, Y_MAIN)
+draw_arrow(diagram, X_JUDGE + (BOX_W+0.2)/2, Y_MAIN, X_SCORES - SMALL_W/2 - 0.6, Y_MAIN)
 
 # ── 5. Scores breakdown ─────────────────────────────────────────────────────
 # Show the three scoring dimensions
@@ -221,21 +216,20 @@ score_edges  = ["#FCA5A5", "#FCD34D", "#A5B4FC"]
 score_text_c = ["#991B1B", "#92400E", "#3730A3"]
 
 # Background for score group
-score_bg = FancyBboxPatch(
-    (X_SCORES - 1.1, Y_MAIN - 1.3),
+diagram.box(
+    X_SCORES - 1.1, Y_MAIN - 1.3,
     2.2, 2.6,
     boxstyle="round,pad=0.12",
     facecolor="#FFF7ED", edgecolor="#FDBA74",
     linewidth=1.2, linestyle="--", zorder=1,
 )
-ax.add_patch(score_bg)
 ax.text(X_SCORES, Y_MAIN + 1.55, "Scores (0-5)", ha="center", va="bottom",
         fontsize=9.5, fontweight="bold", color=COL_JUDGE_EDGE, zorder=6)
 
 for j, (sy, slbl, sw, sc, se, stc) in enumerate(
         zip(score_y_offsets, score_labels, score_weights, score_colors, score_edges,
             score_text_c)):
-    draw_box(ax, X_SCORES, Y_MAIN + sy, SMALL_W + 0.2, 0.5,
+    draw_box(diagram, X_SCORES, Y_MAIN + sy, SMALL_W + 0.2, 0.5,
              slbl, sublabel=None,
              fc=sc, ec=se, tc=stc,
              fontsize=9, zorder=5)
@@ -246,38 +240,38 @@ for j, (sy, slbl, sw, sc, se, stc) in enumerate(
             bbox=dict(facecolor="white", edgecolor="none", pad=1.5, alpha=0.85))
 
 # ── 6. Reward computation & normalization ────────────────────────────────────
-draw_box(ax, X_NORM, Y_MAIN, BOX_W, BOX_H * 1.2,
+draw_box(diagram, X_NORM, Y_MAIN, BOX_W, BOX_H * 1.2,
          "Normalize", sublabel="$\\hat{r} = (r - \\mu_G) / \\sigma_G$",
          fc=COL_REWARD, ec=COL_REWARD_EDGE, tc=COL_TEXT_WHITE,
          fontsize=12, sublabel_fontsize=11)
 
 # Arrow from scores to normalize
 arrow_scores_start = X_SCORES + SMALL_W/2 + 1.05
-draw_arrow(ax, arrow_scores_start, Y_MAIN, X_NORM - BOX_W/2, Y_MAIN)
+draw_arrow(diagram, arrow_scores_start, Y_MAIN, X_NORM - BOX_W/2, Y_MAIN)
 draw_label_on_arrow(ax, (arrow_scores_start + X_NORM - BOX_W/2)/2,
                     Y_MAIN + 0.3, "$r = \\Sigma w_i \\cdot s_i$", fontsize=11,
                     color=COL_REWARD_EDGE)
 
 # ── 7. GRPO Loss ─────────────────────────────────────────────────────────────
-draw_box(ax, X_LOSS, Y_MAIN, BOX_W, BOX_H * 1.2,
+draw_box(diagram, X_LOSS, Y_MAIN, BOX_W, BOX_H * 1.2,
          "GRPO Loss", sublabel="$\\mathrm{clip}(\\rho) \\cdot \\hat{A} - \\beta \\cdot KL$",
          fc=COL_LOSS, ec=COL_LOSS_EDGE, tc=COL_TEXT_WHITE,
          fontsize=13, sublabel_fontsize=9.5)
 
 # Arrow from normalize to loss
-draw_arrow(ax, X_NORM + BOX_W/2, Y_MAIN, X_LOSS - BOX_W/2, Y_MAIN)
+draw_arrow(diagram, X_NORM + BOX_W/2, Y_MAIN, X_LOSS - BOX_W/2, Y_MAIN)
 draw_label_on_arrow(ax, (X_NORM + BOX_W/2 + X_LOSS - BOX_W/2)/2,
                     Y_MAIN + 0.3, "advantages $\\hat{A}$", fontsize=11,
                     color=COL_LOSS_EDGE)
 
 # ── 8. Gradient Update ───────────────────────────────────────────────────────
-draw_box(ax, X_GRAD, Y_MAIN, BOX_W - 0.2, BOX_H * 1.2,
+draw_box(diagram, X_GRAD, Y_MAIN, BOX_W - 0.2, BOX_H * 1.2,
          "Update $\\theta$", sublabel="$\\nabla$ GRPO loss",
          fc=COL_LOSS, ec=COL_LOSS_EDGE, tc=COL_TEXT_WHITE,
          fontsize=13, sublabel_fontsize=9.5)
 
 # Arrow from loss to gradient
-draw_arrow(ax, X_LOSS + BOX_W/2, Y_MAIN, X_GRAD - (BOX_W-0.2)/2, Y_MAIN)
+draw_arrow(diagram, X_LOSS + BOX_W/2, Y_MAIN, X_GRAD - (BOX_W-0.2)/2, Y_MAIN)
 
 # ── 9. Feedback loop (gradient back to policy) ──────────────────────────────
 # Segmented path going BELOW the main flow: Update → down → left → up → Policy
@@ -294,19 +288,10 @@ ax.plot([grad_bottom_x, policy_bottom_x],
         [feedback_y + 0.25, feedback_y + 0.25],
         color=COL_LOSS_EDGE, lw=2.2, linestyle="--", zorder=2)
 # Vertical line up to Policy (with arrowhead)
-ax.annotate(
-    "",
-    xy=(policy_bottom_x, Y_MAIN - BOX_H*1.2/2),
-    xytext=(policy_bottom_x, feedback_y + 0.25),
-    arrowprops=dict(
-        arrowstyle="-|>",
-        color=COL_LOSS_EDGE,
-        lw=2.2,
-        mutation_scale=18,
-        linestyle="--",
-    ),
-    zorder=2,
-)
+draw_arrow(diagram, policy_bottom_x, feedback_y + 0.25,
+           policy_bottom_x, Y_MAIN - BOX_H*1.2/2,
+           color=COL_LOSS_EDGE, lw=2.2, mutation_scale=18, linestyle="--",
+           zorder=2)
 draw_label_on_arrow(ax, (X_POLICY + X_GRAD)/2, feedback_y + 0.25,
                     "update encoder, projector, LoRA weights",
                     fontsize=9, color=COL_LOSS_EDGE)
@@ -316,13 +301,13 @@ draw_label_on_arrow(ax, (X_POLICY + X_GRAD)/2, feedback_y + 0.25,
 # ══════════════════════════════════════════════════════════════════════════════
 
 # Reference policy box
-draw_box(ax, X_POLICY, Y_REF, BOX_W, BOX_H,
+draw_box(diagram, X_POLICY, Y_REF, BOX_W, BOX_H,
          "Ref. Policy", sublabel="$\\pi_{ref}$  (frozen SFT)",
          fc=COL_REF, ec=COL_REF_EDGE, tc=COL_TEXT_WHITE,
          fontsize=11, sublabel_fontsize=9)
 
 # Dashed arrow from input merge to reference policy
-draw_arrow(ax, merge_x + 0.3, Y_MAIN - 0.15, X_POLICY - BOX_W/2, Y_REF + 0.15,
+draw_arrow(diagram, merge_x + 0.3, Y_MAIN - 0.15, X_POLICY - BOX_W/2, Y_REF + 0.15,
            color=COL_REF_ARROW, lw=1.8, style="-|>", linestyle="--",
            connectionstyle="arc3,rad=0.25")
 
@@ -333,35 +318,35 @@ LOG_BOX_W = 2.5
 LOG_BOX_H = 0.65
 
 # log pi_theta(y|x) — from main policy
-draw_box(ax, log_prob_x, log_prob_main_y, LOG_BOX_W, LOG_BOX_H,
+draw_box(diagram, log_prob_x, log_prob_main_y, LOG_BOX_W, LOG_BOX_H,
          "$\\log \\pi_\\theta(y|x)$", sublabel=None,
          fc="#DBEAFE", ec=COL_POLICY_EDGE, tc=COL_TEXT_DARK,
          fontsize=10.5)
 
 # log pi_ref(y|x) — from reference policy
-draw_box(ax, log_prob_x, Y_REF, LOG_BOX_W, LOG_BOX_H,
+draw_box(diagram, log_prob_x, Y_REF, LOG_BOX_W, LOG_BOX_H,
          "$\\log \\pi_{ref}(y|x)$", sublabel=None,
          fc="#E2E8F0", ec=COL_REF_EDGE, tc=COL_TEXT_DARK,
          fontsize=10.5)
 
 # Arrow from main policy down to log pi_theta
-draw_arrow(ax, X_POLICY + BOX_W/2, Y_MAIN - 0.25,
+draw_arrow(diagram, X_POLICY + BOX_W/2, Y_MAIN - 0.25,
            log_prob_x - LOG_BOX_W/2, log_prob_main_y + 0.1,
            color=COL_POLICY_EDGE, lw=1.5, style="-|>", linestyle="--",
            connectionstyle="arc3,rad=0.12")
 
 # Arrow from ref policy to log pi_ref
-draw_arrow(ax, X_POLICY + BOX_W/2, Y_REF,
+draw_arrow(diagram, X_POLICY + BOX_W/2, Y_REF,
            log_prob_x - LOG_BOX_W/2, Y_REF,
            color=COL_REF_ARROW, lw=1.8, style="-|>", linestyle="--")
 
 # Arrows from both log probs to GRPO Loss for KL computation
-draw_arrow(ax, log_prob_x + LOG_BOX_W/2, Y_REF,
+draw_arrow(diagram, log_prob_x + LOG_BOX_W/2, Y_REF,
            X_LOSS - BOX_W/2, Y_MAIN - 0.35,
            color=COL_REF_ARROW, lw=1.8, style="-|>", linestyle="--",
            connectionstyle="arc3,rad=-0.12")
 
-draw_arrow(ax, log_prob_x + LOG_BOX_W/2, log_prob_main_y,
+draw_arrow(diagram, log_prob_x + LOG_BOX_W/2, log_prob_main_y,
            X_LOSS - BOX_W/2, Y_MAIN - 0.15,
            color=COL_POLICY_EDGE, lw=1.5, style="-|>", linestyle="--",
            connectionstyle="arc3,rad=-0.08")
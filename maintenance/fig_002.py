@@ -1,18 +1,41 @@
 """
 fig_002: Parameter Distribution — Trainable vs. Frozen
 Donut chart showing parameter budget breakdown for OpenTSLM-Aviation.
+Parameter counts are computed from the architecture config by figkit.params.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
-# --- Data from spec ---
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.params import (LLMS, Budget, decoder, format_params,  # noqa: E402
+                           gated_cross_attention, patch_encoder, perceiver_resampler)
+
+# --- Architecture (fig_001_architecture) ---
+LLM = "Qwen2.5-0.5B"
+D_ENC = 128             # CNN patch embedding width, patch = 4
+MAX_PATCHES = 8192      # learned positions: flights up to 32,768 samples
+d_llm = LLMS[LLM].hidden
+budget = Budget()
+budget.add(LLM, decoder(LLMS[LLM]), trainable=False)
+# One block per LM layer, heads spanning the LM width
+budget.add("Gated Cross-Attention",
+           gated_cross_attention(d_llm, d_llm, layers=LLMS[LLM].layers,
+                                 heads=LLMS[LLM].heads))
+# 2 layers of 8 x 32-dim heads, no feed-forward
+budget.add("Perceiver Resampler", perceiver_resampler(d_llm, depth=2, latents=64, dim_head=32,
+                                                      ff_mult=0, d_in=D_ENC))
+budget.add("CNN Encoder", patch_encoder(4, D_ENC, positions=MAX_PATCHES))
+
+# --- Data ---
 components = [
-    ("Qwen2.5-0.5B\n(Frozen)", 500, "frozen"),
-    ("Gated Cross-Attention\n(Trainable)", 240, "trainable"),
-    ("Perceiver Resampler\n(Trainable)", 2, "trainable"),
-    ("CNN Encoder\n(Trainable)", 1, "trainable"),
+    (f"{c.name}\n({'Trainable' if c.trainable else 'Frozen'})", c.params / 1e6,
+     "trainable" if c.trainable else "frozen")
+    for c in budget
 ]
 
 labels_raw = [c[0] for c in components]
@@ -43,7 +66,7 @@ center_x, center_y = -0.15, 0.0
 wedges, texts, autotexts = ax.pie(
     sizes,
     labels=None,
-    autopct=lambda pct: f"{pct:.1f}%" if pct > 2 else "",
+    autopct=lambda pct: f"{pct:.1f}%" if pct > 5 else "",
     startangle=140,
     colors=colors,
     pctdistance=0.78,
@@ -59,7 +82,7 @@ for at in autotexts:
     at.set_color("white")
 
 # --- Center text ---
-ax.text(center_x, center_y + 0.08, f"~{total}M", ha="center", va="center",
+ax.text(center_x, center_y + 0.08, f"~{format_params(budget.total, 0)}", ha="center", va="center",
         fontsize=24, fontweight="bold", color="#222222", family="sans-serif")
 ax.text(center_x, center_y - 0.14, "Total Params", ha="center", va="center",
         fontsize=10, color="#777777", family="sans-serif")
@@ -70,10 +93,8 @@ table_y_start = 0.75
 row_height = 0.36
 
 component_info = [
-    ("Qwen2.5-0.5B", "Frozen", "~500M", frozen_color),
-    ("Gated Cross-Attention", "Trainable", "~240M", trainable_colors[0]),
-    ("Perceiver Resampler", "Trainable", "~2M", trainable_colors[1]),
-    ("CNN Encoder", "Trainable", "~1M", trainable_colors[2]),
+    (c.name, "Trainable" if c.trainable else "Frozen", f"~{format_params(c.params)}", color)
+    for c, color in zip(budget, colors)
 ]
 
 for i, (name, tag, param_str, color) in enumerate(component_info):
@@ -89,7 +110,7 @@ for i, (name, tag, param_str, color) in enumerate(component_info):
 
     # Tag + param count
     pct = sizes[i] / total * 100
-    ax.text(table_x + 0.12, y - 0.12, f"{tag}  ·  {param_str}  ({pct:.1f}%)",
+    ax.text(table_x + 0.12, y - 0.12, f"{tag}  ·  {param_str}  ({pct:.2g}%)",
             fontsize=9, color="#777777", va="center", ha="left",
             transform=ax.transData, clip_on=False)
 
@@ -112,10 +133,11 @@ ax.barh(bar_y, trainable_w, left=bar_left + frozen_w, height=0.18,
         color=trainable_colors[0], edgecolor="white", linewidth=1)
 
 # Labels on the bar
-ax.text(bar_left + frozen_w / 2, bar_y, f"Frozen: {total_frozen}M ({total_frozen/total*100:.0f}%)",
+ax.text(bar_left + frozen_w / 2, bar_y,
+        f"Frozen: {format_params(budget.frozen, 0)} ({total_frozen/total*100:.0f}%)",
         ha="center", va="center", fontsize=9, fontweight="bold", color="white")
 ax.text(bar_left + frozen_w + trainable_w / 2, bar_y,
-        f"Trainable: {total_trainable}M ({total_trainable/total*100:.0f}%)",
+        f"Trainable: {format_params(budget.trainable, 0)} ({total_trainable/total*100:.0f}%)",
         ha="center", va="center", fontsize=9, fontweight="bold", color="white")
 
 # --- Title ---
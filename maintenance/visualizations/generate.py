@@ -0,0 +1,197 @@
+"""
+NGAFID dataset overview: regenerates the five PNGs in maintenance/visualizations/.
+
+    flight_length_analysis.png   flight length histogram and per-category box plots
+    issue_categories_pie.png     maintenance issue categories
+    sample_time_series.png       eight sensor channels of one flight
+    temporal_distribution.png    flights before / after maintenance, per dataset
+    top_maintenance_issues.png   ten most frequent issues, per dataset
+
+Every number comes from one chunked pass of figkit.ngafid.aggregate over the
+flight header files (and the sensor data, for the sample flight), run on a
+worker pool.  Point SUBSET / ALL_FLIGHTS / FLIGHT_DATA at the NGAFID files or
+pass them on the command line:
+
+    python maintenance/visualizations/generate.py \\
+        --subset 2days/flight_header.csv --all all_flights/flight_header.csv \\
+        --flight-data 2days/flight_data.parquet --flight 1
+
+Without any header file there is nothing to draw, and the script exits.
+"""
+
+import argparse
+import os
+import sys
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from figkit.ngafid import SAMPLE_CHANNELS, aggregate  # noqa: E402
+
+# NGAFID files (CSV or Parquet); None leaves a dataset out.
+SUBSET = None           # 2days/flight_header.csv
+ALL_FLIGHTS = None      # all_flights/flight_header.csv
+FLIGHT_DATA = None      # sensor data with an id column
+SAMPLE_FLIGHT = 1
+WORKERS = None          # default: CPU count
+
+OUT_DIR = "/home/wangni/notion-figures/maintenance/visualizations"
+
+# seaborn "whitegrid" look, without seaborn.
+plt.rcParams.update({
+    "axes.facecolor": "white", "axes.edgecolor": "#CCCCCC", "axes.grid": True,
+    "grid.color": "#CCCCCC", "grid.linewidth": 0.8, "axes.axisbelow": True,
+    "xtick.bottom": False, "ytick.left": False, "font.size": 11,
+    "axes.titleweight": "bold", "axes.titlesize": 14, "axes.labelsize": 12,
+})
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--subset", default=SUBSET, help="2-days subset flight header file")
+    parser.add_argument("--all", default=ALL_FLIGHTS, help="all-flights flight header file")
+    parser.add_argument("--flight-data", default=FLIGHT_DATA, help="sensor data file")
+    parser.add_argument("--flight", type=float, default=SAMPLE_FLIGHT, help="sample flight id")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    return parser.parse_args()
+
+
+def save(fig, name):
+    out = f"{OUT_DIR}/{name}.png"
+    fig.savefig(out, dpi=200, bbox_inches="tight", facecolor="white")
+    plt.close(fig)
+    print(f"Saved: {out}")
+
+
+def flight_length_analysis(name, summary):
+    fig, (ax_hist, ax_box) = plt.subplots(2, 1, figsize=(12, 10))
+    seconds, flights = summary.lengths()
+    minutes = seconds / 60
+    ax_hist.hist(minutes, bins=50, weights=flights, color="steelblue", alpha=0.7,
+                 edgecolor="black")
+    mean, median = summary.mean_length() / 60, summary.quantiles(0.5) / 60
+    ax_hist.axvline(mean, color="red", linestyle="--", linewidth=2.5,
+                    label=f"Mean: {mean:.1f} min")
+    ax_hist.axvline(median, color="green", linestyle="--", linewidth=2.5,
+                    label=f"Median: {median:.1f} min")
+    ax_hist.set_title(f"Flight Length Distribution ({name})")
+    ax_hist.set_xlabel("Flight Length (minutes)")
+    ax_hist.set_ylabel("Number of Flights")
+    ax_hist.legend(loc="upper right")
+
+    top = list(summary.category_counts())[:5]
+    ax_box.bxp([summary.box_stats(category, scale=60) for category in top],
+               patch_artist=True, widths=0.5,
+               boxprops=dict(facecolor="lightblue", edgecolor="black", linewidth=1.2),
+               medianprops=dict(color="darkgoldenrod"),
+               flierprops=dict(marker="o", markerfacecolor="none", markersize=6))
+    ax_box.set_title("Flight Length by Top 5 Issue Categories")
+    ax_box.set_xlabel("Issue Category")
+    ax_box.set_ylabel("Flight Length (minutes)")
+    plt.setp(ax_box.get_xticklabels(), rotation=15, ha="right")
+    fig.tight_layout()
+    save(fig, "flight_length_analysis")
+
+
+def issue_categories_pie(summary):
+    counts = summary.category_counts()
+    total = sum(counts.values())
+    shares = [100 * count / total for count in counts.values()]
+    fig, ax = plt.subplots(figsize=(12, 10))
+    colors = plt.cm.Set3(np.arange(len(counts)) % 12)
+    # Names go in the legend: thin slices leave no room for them on the pie.
+    wedges, _, percents = ax.pie(
+        list(counts.values()), colors=colors, startangle=90, counterclock=False,
+        autopct=lambda pct: f"{pct:.1f}%" if pct >= 3 else "",
+        wedgeprops=dict(edgecolor="white", linewidth=1.5), textprops=dict(fontsize=12))
+    plt.setp(percents, fontweight="bold", fontsize=11)
+    ax.legend(wedges, [f"{name} ({share:.1f}%)" for name, share in zip(counts, shares)],
+              loc="center left", bbox_to_anchor=(1.02, 0.5), frameon=False, fontsize=12)
+    ax.set_title("Maintenance Issue Categories Distribution", fontsize=16, pad=20)
+    save(fig, "issue_categories_pie")
+
+
+def sample_time_series(flight, sample):
+    fig, axes = plt.subplots(4, 2, figsize=(16, 12))
+    for ax, (column, (title, unit)) in zip(axes.flat, SAMPLE_CHANNELS.items()):
+        ax.set_title(title, fontsize=12)
+        ax.set_xlabel("Timestep")
+        ax.set_ylabel(f"{title} ({unit})")
+        values = sample.get(column)
+        if values is None or not len(values):
+            ax.text(0.5, 0.5, "not in data", transform=ax.transAxes, ha="center",
+                    color="#888888")
+            continue
+        ax.plot(values, color="steelblue", linewidth=1.2)
+        finite = values[np.isfinite(values)]
+        ax.text(0.02, 0.97, f"Mean: {finite.mean():.1f}\nMin: {finite.min():.1f}\n"
+                f"Max: {finite.max():.1f}", transform=ax.transAxes, va="top", fontsize=9,
+                bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.5))
+    fig.suptitle(f"Sample Flight Time Series Data (Flight ID: {flight:g})",
+                 fontsize=16, fontweight="bold")
+    fig.tight_layout()
+    save(fig, "sample_time_series")
+
+
+def temporal_distribution(summaries):
+    fig, axes = plt.subplots(1, len(summaries), figsize=(7 * len(summaries), 5),
+                             squeeze=False)
+    palettes = [plt.cm.Set2(np.arange(0, 3)), plt.cm.Set2(np.arange(2, 5))]
+    for ax, palette, (name, summary) in zip(axes[0], palettes * len(summaries),
+                                            summaries.items()):
+        counts = dict(sorted(summary.before_after.items(), key=lambda item: -item[1]))
+        total = sum(counts.values())
+        labels = [f"{label.capitalize()}\nMaintenance" if label in ("before", "after")
+                  else label.capitalize() for label in counts]
+        bars = ax.bar(labels, list(counts.values()), color=palette[:len(counts)])
+        for bar, count in zip(bars, counts.values()):
+            ax.annotate(f"{count:,}\n({100 * count / total:.1f}%)",
+                        (bar.get_x() + bar.get_width() / 2, bar.get_height()),
+                        xytext=(0, 4), textcoords="offset points", ha="center", va="bottom")
+        ax.set_ylim(0, max(counts.values()) * 1.18)
+        ax.grid(axis="x", visible=False)
+        ax.set_title(f"Temporal Distribution - {name}")
+        ax.set_ylabel("Number of Flights")
+    fig.tight_layout()
+    save(fig, "temporal_distribution")
+
+
+def top_maintenance_issues(summaries):
+    fig, axes = plt.subplots(1, len(summaries), figsize=(9 * len(summaries), 7),
+                             squeeze=False)
+    for ax, color, (name, summary) in zip(axes[0], ["steelblue", "coral"] * len(summaries),
+                                          summaries.items()):
+        counts = summary.issue_counts(10)
+        labels = [issue if len(issue) <= 40 else issue[:37] + "..." for issue in counts]
+        rows = np.arange(len(counts))[::-1]
+        ax.barh(rows, list(counts.values()), color=color)
+        ax.set_yticks(rows, labels, fontsize=10)
+        for row, count in zip(rows, counts.values()):
+            ax.annotate(f"{count:,}", (count, row), xytext=(4, 0), textcoords="offset points",
+                        va="center", fontsize=10)
+        ax.set_xlim(0, max(counts.values()) * 1.12)
+        ax.set_title(f"Top 10 Issues - {name}")
+        ax.set_xlabel("Number of Flights")
+    fig.tight_layout()
+    save(fig, "top_maintenance_issues")
+
+
+args = parse_args()
+headers = {name: path for name, path in (("2-Days Subset", args.subset),
+                                         ("All Flights", args.all)) if path}
+if not headers:
+    print("No NGAFID flight header given (SUBSET / ALL_FLIGHTS or --subset / --all); "
+          "nothing to draw.")
+    sys.exit(0)
+
+result = aggregate(headers, args.flight_data, args.flight, workers=args.workers)
+first_name, first = next(iter(result.summaries.items()))
+flight_length_analysis(first_name, first)
+issue_categories_pie(first)
+if result.sample:
+    sample_time_series(args.flight, result.sample)
+temporal_distribution(result.summaries)
+top_maintenance_issues(result.summaries)
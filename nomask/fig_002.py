@@ -1,44 +1,30 @@
 """
 fig_002: Masked vs. Causal Unmasked vs. Full Unmasked Attention Patterns
-Side-by-side heatmap grids comparing three attention conditions for a 4-channel example.
+Side-by-side heatmap grids comparing three attention conditions for a 4-channel example,
+or (``-p channels=23``) the token-level masks of a real NGAFID prompt, one image per panel.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
-from matplotlib.colors import ListedColormap
+from matplotlib.colors import ListedColormap, Normalize
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figkit.grid import cell_grid  # noqa: E402
+from figkit.masks import CHANNELS, cross_attention_mask, draw_mask, prompt_layout  # noqa: E402
 
 # ---------- Data from spec (Section 4.2 / 5.3) ----------
 # Rows: Pre-prompt, Block 1, Block 2, Block 3, Block 4, Post-prompt
 # Cols: Media 1, Media 2, Media 3, Media 4
 # 1 = can attend, 0 = blocked
-
-masked = np.array([
-    [0, 0, 0, 0],  # Pre-prompt (zeroed)
-    [1, 0, 0, 0],  # Block 1 (eq 1)
-    [0, 1, 0, 0],  # Block 2 (eq 2)
-    [0, 0, 1, 0],  # Block 3 (eq 3)
-    [0, 0, 0, 1],  # Block 4 (eq 4)
-    [0, 0, 0, 1],  # Post-prompt (text_time=4, eq only last)
-])
-
-causal_unmasked = np.array([
-    [0, 0, 0, 0],  # Pre-prompt (zeroed)
-    [1, 0, 0, 0],  # Block 1 (ge 1)
-    [1, 1, 0, 0],  # Block 2 (ge 2)
-    [1, 1, 1, 0],  # Block 3 (ge 3)
-    [1, 1, 1, 1],  # Block 4 (ge 4)
-    [1, 1, 1, 1],  # Post-prompt (ge all)
-])
-
-full_unmasked = np.array([
-    [1, 1, 1, 1],  # Pre-prompt (no mask)
-    [1, 1, 1, 1],  # Block 1
-    [1, 1, 1, 1],  # Block 2
-    [1, 1, 1, 1],  # Block 3
-    [1, 1, 1, 1],  # Block 4
-    [1, 1, 1, 1],  # Post-prompt
-])
+# One token per segment, so text_time = [0, 1, 2, 3, 4, 4]: the pre-prompt is
+# zeroed and the post-prompt (text_time=4) sees only the last media under eq.
+example = prompt_layout(4)
+masked, causal_unmasked, full_unmasked = (
+    cross_attention_mask(example, mode).astype(int) for mode in ('eq', 'ge', 'full'))
 
 row_labels = ['Pre-prompt', 'Block 1', 'Block 2', 'Block 3', 'Block 4', 'Post-prompt']
 col_labels = ['Media 1\n(volt1)', 'Media 2\n(amp1)', 'Media 3\n(OilT)', 'Media 4\n(RPM)']
@@ -54,118 +40,162 @@ color_blocked = '#E8E8E8'   # light gray
 color_allowed = '#4CAF50'   # green
 cmap = ListedColormap([color_blocked, color_allowed])
 
-# ---------- Figure setup ----------
-fig, axes = plt.subplots(1, 3, figsize=(15.5, 6.0))
-fig.patch.set_facecolor('white')
-plt.subplots_adjust(left=0.09, right=0.91, top=0.78, bottom=0.08, wspace=0.35)
-
-nrows, ncols = 6, 4
-
-for ax_idx, (ax, mat, title) in enumerate(zip(axes, matrices, panel_titles)):
-    ax.set_xlim(-0.5, ncols - 0.5)
-    ax.set_ylim(nrows - 0.5, -0.5)
-    ax.set_aspect('equal')
-    ax.set_title(title, fontsize=12, fontweight='bold', pad=14)
-
-    # Draw cells
-    for i in range(nrows):
-        for j in range(ncols):
-            val = mat[i, j]
-            fc = color_allowed if val == 1 else color_blocked
-            ec = '#AAAAAA'
-            lw = 0.8
-
-            rect = mpatches.FancyBboxPatch(
-                (j - 0.45, i - 0.45), 0.9, 0.9,
-                boxstyle="round,pad=0.04",
-                facecolor=fc, edgecolor=ec, linewidth=lw,
+FIGURE = {
+    "size": (15.5, 6.0),
+    "dpi": 200,
+    "output": "/home/wangni/notion-figures/nomask/fig_002.png",
+    "savefig": {"bbox_inches": "tight", "facecolor": "white"},
+    "params": {"channels": None, "block": 96, "pre": 64, "post": 256, "latents": 64},
+}
+
+
+def token_masks(params):
+    """Token-level masks of a prompt over the first ``channels`` NGAFID channels.
+
+    Each channel is an <image> token plus ``block`` text tokens and ``latents``
+    media tokens; ``pre`` and ``post`` are the pre- and post-prompt lengths.
+    """
+    layout = prompt_layout(CHANNELS[:params['channels']], block=params['block'],
+                           pre=params['pre'], post=params['post'])
+    latents = params['latents']
+    mats = [cross_attention_mask(layout, mode, latents) for mode in ('eq', 'ge', 'full')]
+    starts, stops = layout.spans()
+    rows = (starts + stops - 1) / 2
+    cols = (np.arange(layout.media) + 0.5) * latents - 0.5
+    return layout, mats, rows, ['Pre-prompt', *layout.channels, 'Post-prompt'], cols
+
+
+def build(params=None):
+    """Construct the three-panel mask comparison.
+
+    By default the 4-channel example is drawn cell by cell; ``channels`` (1 to
+    ``len(CHANNELS)``) draws the token-level masks of a real NGAFID prompt instead.
+    """
+    params = {**FIGURE['params'], **(params or {})}
+    tokens = params['channels'] is not None
+    if tokens and not 1 <= params['channels'] <= len(CHANNELS):
+        raise ValueError(f"channels must be between 1 and {len(CHANNELS)}, "
+                         f"not {params['channels']}")
+    # ---------- Figure setup ----------
+    fig, axes = plt.subplots(1, 3, figsize=FIGURE['size'])
+    fig.patch.set_facecolor('white')
+    # Rotated channel labels need more headroom than the example's
+    plt.subplots_adjust(left=0.09, right=0.91, top=0.72 if tokens else 0.78, bottom=0.08,
+                        wspace=0.35)
+
+    if tokens:
+        layout, mats, row_ticks, rlabels, col_ticks = token_masks(params)
+        clabels = layout.channels
+        nrows, ncols = mats[0].shape
+        post_start = layout.spans()[0][-1]
+        # Annotation offsets scale with the post-prompt band and one channel's columns
+        unit_x, unit_y = params['latents'], nrows - post_start
+    else:
+        mats, rlabels, clabels = matrices, row_labels, col_labels
+        nrows, ncols = 6, 4
+        row_ticks, col_ticks = range(nrows), range(ncols)
+        post_start, unit_x, unit_y = nrows - 1, 1, 1
+    post_row = post_start + (unit_y - 1) / 2
+
+    for ax_idx, (ax, mat, title) in enumerate(zip(axes, mats, panel_titles)):
+        ax.set_xlim(-0.5, ncols - 0.5)
+        ax.set_ylim(nrows - 0.5, -0.5)
+        ax.set_title(title, fontsize=12, fontweight='bold', pad=14)
+
+        if tokens:
+            # Every token pair in one image
+            draw_mask(ax, mat, colors=(color_blocked, color_allowed))
+        else:
+            ax.set_aspect('equal')
+            # Draw cells, with a checkmark or cross in each
+            cell_grid(
+                ax, mat, cmap=cmap, norm=Normalize(0, 1),
+                size=0.9, boxstyle="round,pad=0.04", edgecolor='#AAAAAA', linewidth=0.8,
+                labels=np.where(mat == 1, '✓', '✗'),
+                label_colors=np.where(mat == 1, 'white', '#BBBBBB'),
+                fontsize=13, fontweight='bold',
             )
-            ax.add_patch(rect)
-
-            # Checkmark or cross
-            if val == 1:
-                ax.text(j, i, '✓', ha='center', va='center',
-                        fontsize=13, fontweight='bold', color='white')
-            else:
-                ax.text(j, i, '✗', ha='center', va='center',
-                        fontsize=13, fontweight='bold', color='#BBBBBB')
-
-    # Bold border around the post-prompt row (row index 5)
-    post_row = nrows - 1
-    rect_border = mpatches.FancyBboxPatch(
-        (-0.5, post_row - 0.5), ncols, 1.0,
-        boxstyle="round,pad=0.02",
-        facecolor='none', edgecolor='#D32F2F', linewidth=2.5,
-        linestyle='-', zorder=5,
+
+        # Bold border around the post-prompt rows
+        rect_border = mpatches.FancyBboxPatch(
+            (-0.5, post_start - 0.5), ncols, unit_y,
+            boxstyle="round,pad=0.02",
+            facecolor='none', edgecolor='#D32F2F', linewidth=2.5,
+            linestyle='-', zorder=5,
+        )
+        ax.add_patch(rect_border)
+
+        # Y-axis labels (row labels) — only for the leftmost panel
+        ax.set_yticks(row_ticks)
+        if ax_idx == 0:
+            ax.set_yticklabels(rlabels, fontsize=6.5 if tokens else 10.5)
+            # Bold the post-prompt label
+            ax.get_yticklabels()[-1].set_fontweight('bold')
+            ax.get_yticklabels()[-1].set_color('#D32F2F')
+        else:
+            ax.set_yticklabels([])
+
+        # X-axis labels (column labels)
+        ax.set_xticks(col_ticks)
+        if tokens:
+            ax.set_xticklabels(clabels, fontsize=6.5, rotation=90)
+        else:
+            ax.set_xticklabels(clabels, fontsize=9.5, ha='center')
+        ax.xaxis.set_ticks_position('top')
+        ax.xaxis.set_label_position('top')
+
+        # Remove spines
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        ax.tick_params(length=0)
+
+    # ---------- Annotation arrow pointing to post-prompt row ----------
+    # Place on the rightmost panel
+    ax_right = axes[2]
+    # Arrow from outside the panel pointing to the post-prompt row
+    ax_right.annotate(
+        'Critical:\ndiagnosis\ngeneration\npoint',
+        xy=(ncols - 0.5 + 0.15 * unit_x, post_row),  # arrow tip at post-prompt row, right edge
+        xytext=(ncols - 0.5 + 1.4 * unit_x, post_row - 0.8 * unit_y),  # text position
+        fontsize=9.5, fontweight='bold', color='#D32F2F',
+        ha='left', va='center',
+        arrowprops=dict(
+            arrowstyle='->', color='#D32F2F', lw=2.0,
+            connectionstyle='arc3,rad=-0.15',
+        ),
+        annotation_clip=False,
+        zorder=10,
     )
-    ax.add_patch(rect_border)
-
-    # Y-axis labels (row labels) — only for the leftmost panel
-    ax.set_yticks(range(nrows))
-    if ax_idx == 0:
-        formatted_labels = []
-        for lbl in row_labels:
-            if lbl == 'Post-prompt':
-                formatted_labels.append(lbl)
-            else:
-                formatted_labels.append(lbl)
-        ax.set_yticklabels(row_labels, fontsize=10.5)
-        # Bold the post-prompt label
-        ax.get_yticklabels()[-1].set_fontweight('bold')
-        ax.get_yticklabels()[-1].set_color('#D32F2F')
-    else:
-        ax.set_yticklabels([])
-
-    # X-axis labels (column labels)
-    ax.set_xticks(range(ncols))
-    ax.set_xticklabels(col_labels, fontsize=9.5, ha='center')
-    ax.xaxis.set_ticks_position('top')
-    ax.xaxis.set_label_position('top')
-
-    # Remove spines
-    for spine in ax.spines.values():
-        spine.set_visible(False)
-    ax.tick_params(length=0)
-
-# ---------- Annotation arrow pointing to post-prompt row ----------
-# Place on the rightmost panel
-ax_right = axes[2]
-# Arrow from outside the panel pointing to the post-prompt row
-ax_right.annotate(
-    'Critical:\ndiagnosis\ngeneration\npoint',
-    xy=(ncols - 0.5 + 0.15, nrows - 1),  # arrow tip at post-prompt row, right edge
-    xytext=(ncols + 0.9, nrows - 1.8),     # text position
-    fontsize=9.5, fontweight='bold', color='#D32F2F',
-    ha='left', va='center',
-    arrowprops=dict(
-        arrowstyle='->', color='#D32F2F', lw=2.0,
-        connectionstyle='arc3,rad=-0.15',
-    ),
-    annotation_clip=False,
-    zorder=10,
-)
-
-# ---------- Legend ----------
-legend_elements = [
-    mpatches.Patch(facecolor=color_allowed, edgecolor='#888', label='Attends (allowed)'),
-    mpatches.Patch(facecolor=color_blocked, edgecolor='#888', label='Blocked'),
-    mpatches.Patch(facecolor='none', edgecolor='#D32F2F', linewidth=2,
-                   label='Post-prompt row (diagnosis)'),
-]
-fig.legend(
-    handles=legend_elements, loc='lower center', ncol=3,
-    fontsize=10, frameon=True, fancybox=True, edgecolor='#CCCCCC',
-    bbox_to_anchor=(0.48, -0.01),
-)
-
-# ---------- Main title ----------
-fig.suptitle(
-    'Masked vs. Causal Unmasked Attention Patterns',
-    fontsize=15, fontweight='bold', y=0.97,
-)
-
-# ---------- Save ----------
-out_path = '/home/wangni/notion-figures/nomask/fig_002.png'
-fig.savefig(out_path, dpi=200, bbox_inches='tight', facecolor='white')
-plt.close(fig)
-print(f'Figure saved to {out_path}')
+
+    # ---------- Legend ----------
+    legend_elements = [
+        mpatches.Patch(facecolor=color_allowed, edgecolor='#888', label='Attends (allowed)'),
+        mpatches.Patch(facecolor=color_blocked, edgecolor='#888', label='Blocked'),
+        mpatches.Patch(facecolor='none', edgecolor='#D32F2F', linewidth=2,
+                       label='Post-prompt row (diagnosis)'),
+    ]
+    fig.legend(
+        handles=legend_elements, loc='lower center', ncol=3,
+        fontsize=10, frameon=True, fancybox=True, edgecolor='#CCCCCC',
+        bbox_to_anchor=(0.48, -0.01),
+    )
+
+    # ---------- Main title ----------
+    fig.suptitle(
+        'Masked vs. Causal Unmasked Attention Patterns',
+        fontsize=15, fontweight='bold', y=0.97,
+    )
+    if tokens:
+        fig.text(0.5, 0.915, f'{layout.media} NGAFID channels: {nrows:,} text tokens x '
+                 f'{ncols:,} media tokens ({params["latents"]} latents per channel)',
+                 ha='center', fontsize=11, color='#555555')
+
+    return fig
+
+
+if __name__ == '__main__':
+    fig = build()
+    out_path = FIGURE['output']
+    fig.savefig(out_path, dpi=FIGURE['dpi'], **FIGURE['savefig'])
+    plt.close(fig)
+    print(f'Figure saved to {out_path}')
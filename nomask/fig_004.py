@@ -4,22 +4,22 @@ Radial grouped visualization of the 23 NGAFID sensor channels organized by type,
 showing cross-channel relationships that motivate the NoMask design.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyArrowPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.masks import CHANNEL_GROUPS  # noqa: E402
+
 # ============================================================
 # Data from verified facts
 # ============================================================
-groups = [
-    ("Electrical",    ["volt1", "volt2", "amp1", "amp2"]),
-    ("Fuel",          ["FQtyL", "FQtyR", "E1_FFlow"]),
-    ("Engine",        ["E1_OilP", "E1_OilT", "E1_RPM"]),
-    ("Cylinder",      ["CHT1", "CHT2", "CHT3", "CHT4",
-                       "EGT1", "EGT2", "EGT3", "EGT4"]),
-    ("Flight Params", ["IAS", "OAT", "AltB", "LatAc", "NormAc"]),
-]
+# The same 23 channels, in the same order, as the media of the NoMask masks
+groups = list(CHANNEL_GROUPS.items())
 
 colors = {
     "Electrical":    "#3A86FF",
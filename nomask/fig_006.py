@@ -5,11 +5,17 @@ Causal Unmasked, Full Unmasked) showing key parameter differences, mask behavior
 and expected trade-offs side by side.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.grid import cell_grid  # noqa: E402
+
 # ---------- colour palette ----------
 COL_MASKED = "#2B6CB0"
 COL_CAUSAL = "#DD8C1A"
@@ -120,7 +126,7 @@ top_y = 0.920
 def draw_grid_fig(col_info, x0, grid_top, grid_h):
     """Draw the 5x4 attention grid using figure-level patches and text.
 
-    Draws all cell patches first, then all text on top to prevent overlap.
+    Cells are one collection; labels and symbols are drawn on top of them.
     """
     c = col_info["color"]
     mat = col_info["matrix"]
@@ -142,27 +148,17 @@ def draw_grid_fig(col_info, x0, grid_top, grid_h):
     cell_w = inner_w / 4
     cell_h = inner_h / 5
 
-    # --- Pass 1: Draw all cell patches ---
-    for i in range(5):
-        for j in range(4):
-            cx = inner_x + j * cell_w
-            cy = inner_y_top - (i + 1) * cell_h
-
-            cell_pad = 0.003
-            if mat[i, j] == 1:
-                fc = c
-                ec = c
-            else:
-                fc = "#F7FAFC"
-                ec = "#CBD5E0"
-
-            rect = FancyBboxPatch(
-                (cx + cell_pad, cy + cell_pad),
-                cell_w - 2 * cell_pad, cell_h - 2 * cell_pad,
-                boxstyle="round,pad=0.003", linewidth=0.8,
-                edgecolor=ec, facecolor=fc,
-                transform=fig.transFigure, clip_on=False, zorder=2)
-            fig.patches.append(rect)
+    # --- Pass 1: Draw all cells, with their checkmarks / crosses on top ---
+    cell_pad = 0.003
+    on = mat == 1
+    cell_grid(
+        fig, facecolors=np.where(on, c, "#F7FAFC"), edgecolor=np.where(on, c, "#CBD5E0"),
+        origin=(inner_x + cell_w / 2, inner_y_top - cell_h / 2), step=(cell_w, -cell_h),
+        size=(cell_w - 2 * cell_pad, cell_h - 2 * cell_pad),
+        boxstyle="round,pad=0.003", linewidth=0.8, clip_on=False, zorder=2,
+        labels=np.where(on, "\u2713", "\u2717"),
+        label_colors=np.where(on, "white", "#CBD5E0"), label_zorder=10,
+        fontsize=13, fontweight="bold")
 
     # Dashed highlight for post-prompt row (last row, index 4)
     hl_y_bottom = inner_y_top - 5 * cell_h
@@ -194,24 +190,6 @@ def draw_grid_fig(col_info, x0, grid_top, grid_h):
                  bbox=dict(boxstyle="round,pad=0.2", facecolor="white",
                            edgecolor="none", alpha=0.95))
 
-    # Cell symbols (checkmarks / crosses)
-    for i in range(5):
-        for j in range(4):
-            cx = inner_x + j * cell_w
-            cy = inner_y_top - (i + 1) * cell_h
-
-            if mat[i, j] == 1:
-                symb = "\u2713"
-                symb_c = "white"
-            else:
-                symb = "\u2717"
-                symb_c = "#CBD5E0"
-
-            fig.text(cx + cell_w / 2, cy + cell_h / 2, symb,
-                     fontsize=13, fontweight="bold", color=symb_c,
-                     ha="center", va="center",
-                     transform=fig.transFigure, zorder=10)
-
 
 def draw_column(col_info, x0):
     """Draw one complete condition column."""
@@ -4,11 +4,17 @@ Split diagram showing how 'cylinder compression issue' diagnosis benefits
 from cross-channel attention (unmasked) vs. limited single-channel view (masked).
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import FancyArrowPatch, FancyBboxPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.traces import traces  # noqa: E402
+
 # ── Colour palette ──────────────────────────────────────────────────
 BG_WHITE = "#FFFFFF"
 PANEL_BG_LEFT = "#F5F5F8"
@@ -28,19 +34,16 @@ BLOCK_BORDER = "#888888"
 def draw_waveform(ax, cx, cy, w=0.38, h=0.12, color="#333333",
                   alpha=1.0, style="normal"):
     n = 40
-    x = np.linspace(cx - w / 2, cx + w / 2, n)
     if style == "diverge":
-        y1 = cy + h * 0.5 * np.sin(np.linspace(0, 3 * np.pi, n)) * np.linspace(0.3, 1.0, n)
-        y2 = cy - h * 0.5 * np.sin(np.linspace(0, 3 * np.pi, n)) * np.linspace(0.3, 1.0, n)
-        ax.plot(x, y1, color=color, lw=1.2, alpha=alpha, zorder=5)
-        ax.plot(x, y2, color=color, lw=1.2, alpha=alpha, zorder=5)
+        wave = np.sin(np.linspace(0, 3 * np.pi, n)) * np.linspace(0.3, 1.0, n)
+        y = np.stack([wave, -wave]) * 0.5
     elif style == "unstable":
         rng = np.random.RandomState(42)
-        y = cy + h * 0.6 * np.sin(np.linspace(0, 6 * np.pi, n)) * rng.uniform(0.4, 1.0, n)
-        ax.plot(x, y, color=color, lw=1.2, alpha=alpha, zorder=5)
+        y = 0.6 * np.sin(np.linspace(0, 6 * np.pi, n)) * rng.uniform(0.4, 1.0, n)
     else:
-        y = cy + h * 0.5 * np.sin(np.linspace(0, 4 * np.pi, n))
-        ax.plot(x, y, color=color, lw=1.2, alpha=alpha, zorder=5)
+        y = 0.5 * np.sin(np.linspace(0, 4 * np.pi, n))
+    traces(ax, y, span=(cx - w / 2, cx + w / 2), baseline=cy, scale=h,
+           colors=color, linewidths=1.2, alpha=alpha, zorder=5)
 
 
 def draw_channel_box(ax, x, y, w, h, label, color, alpha=1.0,
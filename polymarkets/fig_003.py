@@ -2,29 +2,43 @@
 """
 fig_003: Parameter Distribution — Frozen vs Trainable
 Horizontal stacked bar chart with breakdown of trainable components.
+Parameter counts are computed from the architecture config by figkit.params.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
-# --- Data from verified facts ---
-# Total: 10.5B parameters
-# Frozen: 7B (Qwen 2.5-7B LLM body)
-# Trainable: ~3.5B split across components
-total_params = 10.5  # billions
-frozen_params = 7.0
-trainable_params = 3.5
-
-# Trainable component breakdown (approximate splits based on architecture)
-# Components: CNN Encoder, Perceiver Resampler, Gated Cross-Attention layers, LLM Input Embeddings
-# Gated cross-attention at every decoder layer dominates trainable params
-trainable_components = {
-    "Gated Cross-Attention\nLayers": 2.4,
-    "Perceiver\nResampler": 0.6,
-    "LLM Input\nEmbeddings": 0.4,
-    "CNN\nEncoder": 0.1,
-}
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.params import (LLMS, Budget, decoder, format_params,  # noqa: E402
+                           gated_cross_attention, patch_encoder, perceiver_resampler)
+
+# --- Architecture (gen_fig_001) ---
+# Frozen: Qwen 2.5-7B LLM body; its input embeddings are trained.
+# Gated cross-attention at every decoder layer dominates trainable params;
+# a 3x dense feed-forward gives the ~3.5B trainable of gen_fig_001.
+LLM = "Qwen2.5-7B"
+XATTN_FF_MULT = 3
+llm_parts = decoder(LLMS[LLM])
+d_llm = LLMS[LLM].hidden
+budget = Budget()
+budget.add("Gated Cross-Attention\nLayers",
+           gated_cross_attention(d_llm, d_llm, layers=LLMS[LLM].layers,
+                                 ff_mult=XATTN_FF_MULT))
+budget.add("Perceiver\nResampler", perceiver_resampler(d_llm, depth=6, latents=64, d_in=128))
+budget.add("LLM Input\nEmbeddings", llm_parts.pop("embeddings"))
+budget.add("CNN\nEncoder", patch_encoder(4, 128, positions=1024))
+budget.add("LLM body", llm_parts, trainable=False)
+
+# --- Data ---
+total_params = budget.total / 1e9  # billions
+frozen_params = budget.frozen / 1e9
+trainable_params = budget.trainable / 1e9
+
+trainable_components = {c.name: c.params for c in budget if c.trainable}
 
 # --- Colors ---
 frozen_color = "#9CA8B8"       # muted gray
@@ -59,11 +73,11 @@ ax1.barh(0, trainable_params, height=bar_height, left=frozen_params,
 
 # Labels inside bars
 ax1.text(frozen_params / 2, 0,
-         f"Frozen  |  7.0B  ({frozen_pct:.0f}%)",
+         f"Frozen  |  {format_params(budget.frozen)}  ({frozen_pct:.0f}%)",
          ha="center", va="center", fontsize=11.5, fontweight="bold",
          color="white")
 ax1.text(frozen_params + trainable_params / 2, 0,
-         f"Trainable  |  3.5B  ({trainable_pct:.0f}%)",
+         f"Trainable  |  {format_params(budget.trainable)}  ({trainable_pct:.0f}%)",
          ha="center", va="center", fontsize=10.5, fontweight="bold",
          color="white")
 
@@ -72,7 +86,7 @@ ax1.set_xlim(0, total_params)
 ax1.set_ylim(-0.38, 0.38)
 ax1.set_yticks([])
 ax1.set_xlabel("Parameters (Billions)", fontsize=10, labelpad=6)
-ax1.set_xticks(np.arange(0, 11.5, 1))
+ax1.set_xticks(np.arange(0, total_params + 0.5, 1))
 ax1.tick_params(axis="x", labelsize=9)
 ax1.spines["top"].set_visible(False)
 ax1.spines["right"].set_visible(False)
@@ -91,14 +105,15 @@ fig.text(0.06, 0.88,
 # BOTTOM BAR: Trainable breakdown by component
 # ============================================================
 # Section label
-fig.text(0.06, 0.42, "Trainable Parameter Breakdown (~3.5B)",
+fig.text(0.06, 0.42, f"Trainable Parameter Breakdown (~{format_params(budget.trainable)})",
          fontsize=12, fontweight="bold", color="#1E293B")
 
 left = 0
 comp_names = list(trainable_components.keys())
-comp_values = list(trainable_components.values())
+comp_counts = list(trainable_components.values())
+comp_values = [n / 1e9 for n in comp_counts]
 
-for i, (name, val) in enumerate(zip(comp_names, comp_values)):
+for i, (name, val, count) in enumerate(zip(comp_names, comp_values, comp_counts)):
     ax2.barh(0, val, height=bar_height, left=left,
              color=component_colors[i], edgecolor="white", linewidth=0.8)
 
@@ -107,17 +122,17 @@ for i, (name, val) in enumerate(zip(comp_names, comp_values)):
 
     if val >= 0.5:
         # Label inside bar
-        ax2.text(cx, 0, f"{name}\n{val}B ({pct:.0f}%)",
+        ax2.text(cx, 0, f"{name}\n{format_params(count)} ({pct:.0f}%)",
                  ha="center", va="center", fontsize=9, fontweight="600",
                  color="white", linespacing=1.2)
     elif val >= 0.3:
         # Label inside bar, smaller font
-        ax2.text(cx, 0, f"{name}\n{val}B ({pct:.0f}%)",
+        ax2.text(cx, 0, f"{name}\n{format_params(count)} ({pct:.0f}%)",
                  ha="center", va="center", fontsize=7.5, fontweight="600",
                  color="white", linespacing=1.1)
     else:
         # Place label above for narrow segments
-        ax2.annotate(f"{name}\n{val}B ({pct:.0f}%)",
+        ax2.annotate(f"{name}\n{format_params(count)} ({pct:.0f}%)",
                      xy=(cx, bar_height / 2), xytext=(cx - 0.05, 0.52),
                      ha="center", va="bottom", fontsize=8, fontweight="500",
                      color="#334155", linespacing=1.1,
@@ -130,7 +145,7 @@ ax2.set_xlim(0, trainable_params * 1.01)
 ax2.set_ylim(-0.38, 0.80)
 ax2.set_yticks([])
 ax2.set_xlabel("Trainable Parameters (Billions)", fontsize=10, labelpad=6)
-ax2.set_xticks(np.arange(0, 4.0, 0.5))
+ax2.set_xticks(np.arange(0, trainable_params, 0.5))
 ax2.tick_params(axis="x", labelsize=9)
 ax2.spines["top"].set_visible(False)
 ax2.spines["right"].set_visible(False)
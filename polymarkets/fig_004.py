@@ -1,11 +1,31 @@
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figkit.markets import MarketSeries, accuracy, market_labels  # noqa: E402
+
+# Set to an .npz of an evaluation run to score it here: the markets' price
+# histories (values, offsets) and each model's predicted answers per question
+# type ("flamingo.resolution", "baseline.past_trend", ...).
+EVALUATION = None
+QUESTIONS = ['resolution', 'volatility', 'confidence_evolution', 'past_trend', 'future_trend']
+
 # Data from verified facts
 tasks = ['Resolution', 'Volatility', 'Conf.\nEvolution', 'Past\nTrend', 'Future\nTrend', 'Overall']
 flamingo_acc = [100, 100, 80, 67, 53, 76]
 baseline_acc = [70, 70, 60, 33, 33, 50]
 
+if EVALUATION is not None:
+    run = np.load(EVALUATION)
+    labels = market_labels(MarketSeries(run['values'], run['offsets']))
+    flamingo_acc, baseline_acc = [
+        [round(score) for score in accuracy(
+            labels, {q: run[f'{model}.{q}'] for q in QUESTIONS}).values()]
+        for model in ('flamingo', 'baseline')]
+
 x = np.arange(len(tasks))
 bar_width = 0.32
 
@@ -3,18 +3,62 @@ fig_005: Betting PnL Backtester: OpenTSLM vs Baseline
 Multi-panel comparison of betting performance metrics.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.backtest import backtest, read_columns  # noqa: E402
+
+# Set to a bet log and a market resolution table (.npz or .parquet, see
+# figkit.backtest) to backtest real bets instead of the schematic log.
+BETS = None
+MARKETS = None
+
 # ---------------------------------------------------------------------------
-# Data from verified facts (betting_comparison.json, spec section 10)
+# Data: backtested bet log
 # ---------------------------------------------------------------------------
 models = ["OpenTSLM", "Baseline"]
-pnl = [22.30, -2447.94]
-bets_placed = [24, 100]
-win_rate = [100.0, 2.0]
-roi = [1.25, -97.9]
+
+
+def schematic_log():
+    """A bet log over 100 markets matching betting_comparison.json (spec section 10).
+
+    The baseline stakes $25 on every market and wins 2; OpenTSLM bets on 24
+    of them, all won, for $22.30 on $1,784 staked.
+    """
+    rng = np.random.default_rng(5)
+    n_markets = 100
+    outcome = rng.integers(0, 2, n_markets)
+    baseline_wins = np.zeros(n_markets, bool)
+    baseline_wins[[37, 81]] = True
+    selected = np.sort(rng.choice(n_markets, 24, replace=False))
+    gains = rng.uniform(0.5, 1.5, 24)
+    gains *= 22.30 / gains.sum()
+    stake = np.full(24, 1784.0 / 24)
+    bets = {
+        "model": np.repeat(models, [24, n_markets]),
+        "market": np.concatenate([selected, np.arange(n_markets)]),
+        "time": np.concatenate([selected, np.arange(n_markets)]),
+        "side": np.concatenate([outcome[selected],
+                                np.where(baseline_wins, outcome, 1 - outcome)]),
+        "price": np.concatenate([stake / (stake + gains),
+                                 np.full(n_markets, 1 / 1.0412)]),
+        "stake": np.concatenate([stake, np.full(n_markets, 25.0)]),
+    }
+    return bets, {"market": np.arange(n_markets), "outcome": outcome}
+
+
+bets, markets = schematic_log() if BETS is None else (read_columns(BETS), read_columns(MARKETS))
+result = backtest(bets, markets, policies=("logged",), models=models)
+summary = result.summary("logged")
+pnl = summary["pnl"]
+bets_placed = summary["bets"]
+win_rate = summary["win_rate"]
+roi = summary["roi"]
 
 # ---------------------------------------------------------------------------
 # Style constants
@@ -37,11 +81,12 @@ plt.rcParams.update({
 # ---------------------------------------------------------------------------
 # Figure layout — single 4-column gridspec for uniform panel sizing
 # ---------------------------------------------------------------------------
-fig = plt.figure(figsize=(18, 6), facecolor="white")
+fig = plt.figure(figsize=(24, 6), facecolor="white")
 
-# PnL gets ~1.8x the width of each metric panel; metric panels are equal
-gs = fig.add_gridspec(1, 4, width_ratios=[1.8, 1, 1, 1.15], wspace=0.40,
-                      left=0.06, right=0.96, top=0.82, bottom=0.12)
+# PnL gets ~1.8x the width of each metric panel; metric panels are equal;
+# the equity curves take the right-hand end
+gs = fig.add_gridspec(1, 5, width_ratios=[1.8, 1, 1, 1.15, 2.4], wspace=0.40,
+                      left=0.05, right=0.97, top=0.82, bottom=0.12)
 
 # ========================== PANEL 1: PnL Bar Chart ==========================
 ax_pnl = fig.add_subplot(gs[0, 0])
@@ -77,18 +122,18 @@ ax_pnl.set_title("PnL Comparison", fontsize=14, fontweight="bold",
 ax_pnl.yaxis.set_major_formatter(mticker.FuncFormatter(
     lambda x, _: f"${x:,.0f}"))
 ax_pnl.tick_params(axis="both", labelsize=11, colors=DARK_TEXT)
-ax_pnl.set_ylim(-3200, 400)
+ax_pnl.set_ylim(min(-3200, 1.3 * pnl.min()), max(400, 1.3 * pnl.max()))
 ax_pnl.set_xlim(-0.6, 1.6)
 ax_pnl.grid(axis="y", alpha=0.25, zorder=1)
 
 # ========================== PANELS 2-4: Key Metrics ==========================
 metrics = [
     {"title": "Bets Placed", "values": bets_placed, "fmt": "{:.0f}", "suffix": "",
-     "ylim": (0, 120), "col": 1},
+     "ylim": (0, 1.2 * bets_placed.max()), "col": 1},
     {"title": "Win Rate", "values": win_rate, "fmt": "{:.0f}", "suffix": "%",
      "ylim": (0, 120), "col": 2},
     {"title": "ROI", "values": roi, "fmt": "{:+.1f}", "suffix": "%",
-     "ylim": (-120, 20), "col": 3},
+     "ylim": (min(-120, 1.2 * roi.min()), max(20, 1.2 * roi.max())), "col": 3},
 ]
 
 for m in metrics:
@@ -129,13 +174,42 @@ for m in metrics:
         ax.yaxis.set_major_formatter(mticker.FuncFormatter(
             lambda x, _, s=m["suffix"]: f"{x:.0f}{s}"))
 
+# ========================== PANEL 5: Equity Curves ==========================
+ax_eq = fig.add_subplot(gs[0, 4])
+
+for model, clr in zip(models, [GREEN, RED]):
+    t, equity = result.curve(model, "logged")
+    # The schematic log only reproduces the JSON totals; its bet order, and
+    # so the drawdown, is invented.  Quote drawdowns for real bet logs only.
+    label = model
+    if BETS is not None:
+        drawdown = result.max_drawdown[0, models.index(model)]
+        label = f"{model}  (max drawdown ${drawdown:,.0f})"
+    ax_eq.step(np.r_[t[:1], t], np.r_[0, equity], where="post", color=clr,
+               linewidth=2, zorder=3, label=label)
+    sign = "+" if equity[-1] > 0 else ""
+    ax_eq.annotate(f"{sign}${equity[-1]:,.2f}", xy=(t[-1], equity[-1]),
+                   xytext=(6, 0), textcoords="offset points", ha="left", va="center",
+                   fontsize=10, fontweight="bold", color=clr, annotation_clip=False)
+
+ax_eq.axhline(0, color=GREY, linewidth=0.8, zorder=2)
+ax_eq.set_title("Equity Curves" if BETS is not None else "Equity Curves (schematic)",
+                fontsize=12, fontweight="bold", color=DARK_TEXT, pad=10)
+ax_eq.set_xlabel("Bet time", fontsize=10, color=DARK_TEXT)
+ax_eq.set_ylabel("Cumulative PnL ($)", fontsize=10, color=DARK_TEXT)
+ax_eq.yaxis.set_major_formatter(mticker.FuncFormatter(lambda x, _: f"${x:,.0f}"))
+ax_eq.tick_params(axis="both", labelsize=9, colors=GREY)
+ax_eq.grid(alpha=0.2, zorder=1)
+ax_eq.legend(loc="lower left", fontsize=9, frameon=False)
+
 # ---------------------------------------------------------------------------
 # Suptitle & subtitle
 # ---------------------------------------------------------------------------
 fig.suptitle("Betting PnL Backtester: OpenTSLM vs Baseline",
              fontsize=16, fontweight="bold", color=DARK_TEXT, y=0.98)
 fig.text(0.5, 0.92,
-         "Selective strategy (24 bets) vs indiscriminate strategy (100 bets)",
+         f"Selective strategy ({bets_placed[0]} bets) vs "
+         f"indiscriminate strategy ({bets_placed[1]} bets)",
          ha="center", fontsize=11, color=GREY, style="italic")
 
 # ---------------------------------------------------------------------------
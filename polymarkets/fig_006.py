@@ -4,12 +4,23 @@ fig_006: Question Type Taxonomy and Ground Truth Methods
 Tree/taxonomy diagram showing 5 question types organized into 3 categories.
 """
 
+import os
+import sys
+
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 from matplotlib.patches import FancyBboxPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.markets import (ANSWERS, CONFIDENCE_GAIN, RESOLUTION_THRESHOLDS,  # noqa: E402
+                            VOLATILITY_THRESHOLD, load_series, market_labels)
+
+# Set to a market price-history store (see figkit.markets.load_series) to
+# label it and show each answer's share on its chip.
+MARKETS = None
+
 # ─── Colour palette ───────────────────────────────────────────────────
 CAT_TREND = "#3B82F6"   # blue
 CAT_STATE = "#10B981"   # green
@@ -31,6 +42,21 @@ TEXT_DARK  = "#111827"
 TEXT_MID   = "#374151"
 TEXT_LIGHT = "#6B7280"
 
+# ─── Ground-truth labels (real markets only) ─────────────────────────
+labels = None
+n_questions, n_points = 22521, 720
+if MARKETS is not None:
+    series = load_series(MARKETS)
+    labels = market_labels(series)
+    n_questions = 5 * int(labels.valid.sum())
+    n_points = int(np.median(series.lengths))
+
+
+def answer_shares(question):
+    """Share of the labelled markets getting each answer of *question*."""
+    counts = labels.counts(question)
+    return dict(zip(ANSWERS[question], counts / max(counts.sum(), 1)))
+
 # ─── Canvas ───────────────────────────────────────────────────────────
 W, H = 22, 13
 fig, ax = plt.subplots(figsize=(W, H), dpi=200)
@@ -70,7 +96,7 @@ def conn_elbow(x1, y1, x2, y2, color="#9CA3AF", lw=1.5):
 # ─── Title ────────────────────────────────────────────────────────────
 ax.text(W/2, H - 0.55, "Question Type Taxonomy & Ground Truth Methods",
         ha="center", va="center", fontsize=18, fontweight="bold", color=TEXT_DARK)
-ax.text(W/2, H - 1.05, "5 question types across 3 categories  ·  22,521 generated questions  ·  rule-based ground truth",
+ax.text(W/2, H - 1.05, f"5 question types across 3 categories  ·  {n_questions:,} generated questions  ·  rule-based ground truth",
         ha="center", va="center", fontsize=11, color=TEXT_LIGHT)
 
 # ─── Root node ────────────────────────────────────────────────────────
@@ -130,7 +156,7 @@ leaves = [
         "question": '"Was the prediction market\nstable or volatile?"',
         "answers": ["stable", "volatile"],
         "method": "Std dev of price changes",
-        "detail": "std(Δp) > 0.001 → volatile\nelse → stable",
+        "detail": f"std(Δp) > {VOLATILITY_THRESHOLD:g} → volatile\nelse → stable",
         "series_part": "First half",
     },
     {
@@ -139,7 +165,8 @@ leaves = [
         "question": '"Based on final probability,\ndid the event happen?"',
         "answers": ["yes", "no", "ambiguous"],
         "method": "Final probability threshold",
-        "detail": "p > 0.95 → yes\np < 0.05 → no\nelse → ambiguous",
+        "detail": (f"p > {RESOLUTION_THRESHOLDS[1]:g} → yes\n"
+                   f"p < {RESOLUTION_THRESHOLDS[0]:g} → no\nelse → ambiguous"),
         "series_part": "Full series (final prob)",
     },
     {
@@ -148,7 +175,7 @@ leaves = [
         "question": '"Did the market become\nmore confident?"',
         "answers": ["yes", "no"],
         "method": 'Mean |p − 0.5| comparison\nacross both halves',
-        "detail": "conf = mean(|p − 0.5|)\nconf₂ > conf₁ × 1.05 → yes",
+        "detail": f"conf = mean(|p − 0.5|)\nconf₂ > conf₁ × {CONFIDENCE_GAIN:g} → yes",
         "series_part": "Both halves compared",
     },
 ]
@@ -204,9 +231,13 @@ for i, leaf in enumerate(leaves):
     total_cw = sum(len(a) * 0.12 + 0.36 for a in answers) + chip_spacing * (len(answers) - 1)
     chip_y = ay_label - 0.42
     cx_run = leaf_cx - total_cw / 2
+    shares = answer_shares(leaf["type"]) if labels is not None else {}
     for ans in answers:
         cw = len(ans) * 0.12 + 0.36
         draw_chip(cx_run + cw / 2, chip_y, ans, CHIP_BG.get(ans, "#E5E7EB"), fs=8)
+        if ans in shares:
+            ax.text(cx_run + cw / 2, chip_y - 0.27, f"{shares[ans]:.0%}",
+                    ha="center", va="center", fontsize=7, color=TEXT_LIGHT)
         cx_run += cw + chip_spacing
 
     # Ground truth label
@@ -248,7 +279,7 @@ for label, color in items:
             fontsize=9.5, color=TEXT_MID)
     lx_r += 4.5
 
-ax.text(W - 0.5, leg_y, "Ground truth: rule-based computation on 720-point time series",
+ax.text(W - 0.5, leg_y, f"Ground truth: rule-based computation on {n_points}-point time series",
         ha="right", va="center", fontsize=8.5, color=TEXT_LIGHT, style="italic")
 
 plt.tight_layout(pad=0.3)
@@ -7,13 +7,20 @@ Structured infographic with three rows:
   Bottom: 6 ablation configurations as a matrix
 """
 
+import os
+import sys
+
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+from matplotlib.colors import to_rgba
 from matplotlib.patches import FancyBboxPatch
 from matplotlib.lines import Line2D
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.traces import traces  # noqa: E402
+
 # ── Global style ──────────────────────────────────────────────────────
 plt.rcParams.update({
     "font.family": "sans-serif",
@@ -164,35 +171,31 @@ for i, ds in enumerate(datasets):
             y_w[m] = -0.08
             m = (t > 0.36+beat_off) & (t < 0.48+beat_off)
             y_w[m] = 0.22 * np.sin(np.pi * (t[m] - 0.36 - beat_off) / 0.12)
-        xs = cx - icon_w/2 + t * icon_w
-        ys = icon_cy + y_w * icon_h * 0.5
-        fig.lines.append(Line2D(xs, ys, color=ds["color"], linewidth=1.5,
-                                 transform=fig.transFigure, zorder=3))
+        traces(fig, y_w, span=(cx - icon_w/2, cx + icon_w/2), baseline=icon_cy,
+               scale=icon_h * 0.5, colors=ds["color"], linewidths=1.5, zorder=3)
 
     elif ds["mod"] == "EEG":
         t = np.linspace(0, 1, 120)
         y_w = (np.sin(2*np.pi*3.5*t) * 0.35
                + 0.20 * np.sin(2*np.pi*8*t + 0.7)
                + 0.10 * np.sin(2*np.pi*13*t + 1.2))
-        xs = cx - icon_w/2 + t * icon_w
-        ys = icon_cy + y_w * icon_h * 0.5
-        fig.lines.append(Line2D(xs, ys, color=ds["color"], linewidth=1.5,
-                                 transform=fig.transFigure, zorder=3))
+        traces(fig, y_w, span=(cx - icon_w/2, cx + icon_w/2), baseline=icon_cy,
+               scale=icon_h * 0.5, colors=ds["color"], linewidths=1.5, zorder=3)
 
     elif ds["mod"] == "Accel":
         rng = np.random.RandomState(42)
         t = np.linspace(0, 1, 80)
         colors_ax = [ds["color"], "#5DC96A", "#1E6B2E"]
         alphas = [0.95, 0.65, 0.40]
-        for ax_i, (c_ax, al) in enumerate(zip(colors_ax, alphas)):
-            y_w = (np.sin(2*np.pi*2.5*t + ax_i*1.3) * 0.5
-                   + 0.25 * rng.randn(80))
-            y_w = y_w / (np.abs(y_w).max() + 1e-9) * 0.38
-            shift = (ax_i - 1) * 0.18
-            xs = cx - icon_w/2 + t * icon_w
-            ys = icon_cy + (y_w + shift) * icon_h * 0.5
-            fig.lines.append(Line2D(xs, ys, color=c_ax, linewidth=1.2,
-                                     alpha=al, transform=fig.transFigure, zorder=3))
+        ax_i = np.arange(3)[:, None]
+        y_w = (np.sin(2*np.pi*2.5*t + ax_i*1.3) * 0.5
+               + 0.25 * rng.randn(3, 80))
+        y_w = y_w / (np.abs(y_w).max(axis=1, keepdims=True) + 1e-9) * 0.38
+        shift = (np.arange(3) - 1) * 0.18
+        traces(fig, y_w, span=(cx - icon_w/2, cx + icon_w/2),
+               baseline=icon_cy + shift * icon_h * 0.5, scale=icon_h * 0.5,
+               colors=[to_rgba(c_ax, al) for c_ax, al in zip(colors_ax, alphas)],
+               linewidths=1.2, zorder=3)
 
     # ── Dataset name ──
     name_y = icon_cy - 0.030
@@ -3,16 +3,22 @@ fig_004: SDFT-OpenTSLM Integration: Student vs Teacher Data Flow
 Two parallel vertical tracks (student=blue, teacher=orange/gold) converging at KL loss.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figkit.diagram import Diagram  # noqa: E402
+
 fig, ax = plt.subplots(figsize=(14, 16))
 ax.set_xlim(0, 14)
 ax.set_ylim(0, 16)
 ax.axis('off')
 fig.patch.set_facecolor('white')
+diagram = Diagram(ax)
 
 # --- Color Palette ---
 STUDENT_BG = '#D6E4F0'
@@ -31,16 +37,16 @@ TS_BG = '#D4EDDA'
 TS_BORDER = '#28774E'
 
 # --- Helper: rounded box with centered text ---
-def draw_box(ax, cx, cy, w, h, text, bg, border, fontsize=11, fontweight='bold',
+def draw_box(d, cx, cy, w, h, text, bg, border, fontsize=11, fontweight='bold',
              textcolor='black', linestyle='-', linewidth=2.0, alpha=1.0, zorder=3,
              multiline=False):
-    box = FancyBboxPatch(
-        (cx - w/2, cy - h/2), w, h,
+    ax = d.ax
+    d.box(
+        cx - w/2, cy - h/2, w, h,
         boxstyle="round,pad=0.15",
         facecolor=bg, edgecolor=border,
         linewidth=linewidth, linestyle=linestyle, alpha=alpha, zorder=zorder
     )
-    ax.add_patch(box)
     if multiline:
         ax.text(cx, cy, text, ha='center', va='center', fontsize=fontsize,
                 fontweight=fontweight, color=textcolor, zorder=zorder+1,
@@ -48,20 +54,17 @@ def draw_box(ax, cx, cy, w, h, text, bg, border, fontsize=11, fontweight='bold',
     else:
         ax.text(cx, cy, text, ha='center', va='center', fontsize=fontsize,
                 fontweight=fontweight, color=textcolor, zorder=zorder+1)
-    return box
 
-def draw_arrow(ax, x1, y1, x2, y2, color='#333', lw=2.0, style='->', linestyle='-',
+def draw_arrow(d, x1, y1, x2, y2, color='#333', lw=2.0, style='->', linestyle='-',
                connectionstyle='arc3,rad=0', zorder=2, shrinkA=8, shrinkB=8):
-    arrow = FancyArrowPatch(
-        (x1, y1), (x2, y2),
-        arrowstyle=style, color=color,
-        linewidth=lw, linestyle=linestyle,
+    d.arrow(
+        x1, y1, x2, y2,
+        style=style, color=color,
+        lw=lw, linestyle=linestyle,
         connectionstyle=connectionstyle,
         shrinkA=shrinkA, shrinkB=shrinkB,
         zorder=zorder, mutation_scale=18
     )
-    ax.add_patch(arrow)
-    return arrow
 
 # ============================================================
 # Layout constants
@@ -103,22 +106,22 @@ ax.text(RIGHT_X, Y_LABELS, 'Teacher Path', ha='center', va='center',
 # Student Path boxes
 # ============================================================
 # Prompt
-draw_box(ax, LEFT_X, Y_PROMPT, BOX_W, PROMPT_H,
+draw_box(diagram, LEFT_X, Y_PROMPT, BOX_W, PROMPT_H,
          'Standard Prompt\n(task instruction only)',
          STUDENT_BG, STUDENT_BORDER, fontsize=11, textcolor=STUDENT_DARK, multiline=True)
 
 # Encoder
-draw_box(ax, LEFT_X, Y_ENCODER, BOX_W, BOX_H,
+draw_box(diagram, LEFT_X, Y_ENCODER, BOX_W, BOX_H,
          'Encoder + Projector',
          STUDENT_BG, STUDENT_BORDER, fontsize=11, textcolor=STUDENT_DARK)
 
 # LLM
-draw_box(ax, LEFT_X, Y_LLM, BOX_W, BOX_H,
+draw_box(diagram, LEFT_X, Y_LLM, BOX_W, BOX_H,
          'LLM (Frozen)',
          STUDENT_BG, STUDENT_BORDER, fontsize=11, textcolor=STUDENT_DARK)
 
 # Logits P
-draw_box(ax, LEFT_X, Y_LOGITS, BOX_W, BOX_H,
+draw_box(diagram, LEFT_X, Y_LOGITS, BOX_W, BOX_H,
          'Logits  P  (on-policy)',
          STUDENT_BG, STUDENT_BORDER, fontsize=12, textcolor=STUDENT_DARK)
 
@@ -126,69 +129,69 @@ draw_box(ax, LEFT_X, Y_LOGITS, BOX_W, BOX_H,
 # Teacher Path boxes
 # ============================================================
 # Prompt (augmented)
-draw_box(ax, RIGHT_X, Y_PROMPT, BOX_W, PROMPT_H,
+draw_box(diagram, RIGHT_X, Y_PROMPT, BOX_W, PROMPT_H,
          'Augmented Prompt\n(task instruction +\ngolden CoT demo)',
          TEACHER_BG, TEACHER_BORDER, fontsize=11, textcolor=TEACHER_DARK, multiline=True)
 
 # Encoder
-draw_box(ax, RIGHT_X, Y_ENCODER, BOX_W, BOX_H,
+draw_box(diagram, RIGHT_X, Y_ENCODER, BOX_W, BOX_H,
          'Encoder + Projector',
          TEACHER_BG, TEACHER_BORDER, fontsize=11, textcolor=TEACHER_DARK)
 
 # LLM
-draw_box(ax, RIGHT_X, Y_LLM, BOX_W, BOX_H,
+draw_box(diagram, RIGHT_X, Y_LLM, BOX_W, BOX_H,
          'LLM (Frozen)',
          TEACHER_BG, TEACHER_BORDER, fontsize=11, textcolor=TEACHER_DARK)
 
 # Logits Q
-draw_box(ax, RIGHT_X, Y_LOGITS, BOX_W, BOX_H,
+draw_box(diagram, RIGHT_X, Y_LOGITS, BOX_W, BOX_H,
          'Logits  Q  (demo-conditioned)',
          TEACHER_BG, TEACHER_BORDER, fontsize=12, textcolor=TEACHER_DARK)
 
 # ============================================================
 # Shared Time Series Data block (between columns)
 # ============================================================
-draw_box(ax, CENTER_X, Y_TS, 3.0, 0.8,
+draw_box(diagram, CENTER_X, Y_TS, 3.0, 0.8,
          'Time Series Data',
          TS_BG, TS_BORDER, fontsize=11, textcolor='#1B4332')
 
 # Arrows from time series to both encoders
-draw_arrow(ax, CENTER_X - 0.8, Y_TS - 0.4, LEFT_X + 0.3, Y_ENCODER + 0.4,
+draw_arrow(diagram, CENTER_X - 0.8, Y_TS - 0.4, LEFT_X + 0.3, Y_ENCODER + 0.4,
            color=TS_BORDER, lw=2.0, connectionstyle='arc3,rad=0.15')
-draw_arrow(ax, CENTER_X + 0.8, Y_TS - 0.4, RIGHT_X - 0.3, Y_ENCODER + 0.4,
+draw_arrow(diagram, CENTER_X + 0.8, Y_TS - 0.4, RIGHT_X - 0.3, Y_ENCODER + 0.4,
            color=TS_BORDER, lw=2.0, connectionstyle='arc3,rad=-0.15')
 
 # ============================================================
 # Vertical flow arrows (Student)
 # ============================================================
-draw_arrow(ax, LEFT_X, Y_PROMPT - PROMPT_H/2, LEFT_X, Y_ENCODER + BOX_H/2,
+draw_arrow(diagram, LEFT_X, Y_PROMPT - PROMPT_H/2, LEFT_X, Y_ENCODER + BOX_H/2,
            color=STUDENT_BORDER, lw=2.2)
-draw_arrow(ax, LEFT_X, Y_ENCODER - BOX_H/2, LEFT_X, Y_LLM + BOX_H/2,
+draw_arrow(diagram, LEFT_X, Y_ENCODER - BOX_H/2, LEFT_X, Y_LLM + BOX_H/2,
            color=STUDENT_BORDER, lw=2.2)
-draw_arrow(ax, LEFT_X, Y_LLM - BOX_H/2, LEFT_X, Y_LOGITS + BOX_H/2,
+draw_arrow(diagram, LEFT_X, Y_LLM - BOX_H/2, LEFT_X, Y_LOGITS + BOX_H/2,
            color=STUDENT_BORDER, lw=2.2)
 
 # ============================================================
 # Vertical flow arrows (Teacher)
 # ============================================================
-draw_arrow(ax, RIGHT_X, Y_PROMPT - PROMPT_H/2, RIGHT_X, Y_ENCODER + BOX_H/2,
+draw_arrow(diagram, RIGHT_X, Y_PROMPT - PROMPT_H/2, RIGHT_X, Y_ENCODER + BOX_H/2,
            color=TEACHER_BORDER, lw=2.2)
-draw_arrow(ax, RIGHT_X, Y_ENCODER - BOX_H/2, RIGHT_X, Y_LLM + BOX_H/2,
+draw_arrow(diagram, RIGHT_X, Y_ENCODER - BOX_H/2, RIGHT_X, Y_LLM + BOX_H/2,
            color=TEACHER_BORDER, lw=2.2)
-draw_arrow(ax, RIGHT_X, Y_LLM - BOX_H/2, RIGHT_X, Y_LOGITS + BOX_H/2,
+draw_arrow(diagram, RIGHT_X, Y_LLM - BOX_H/2, RIGHT_X, Y_LOGITS + BOX_H/2,
            color=TEACHER_BORDER, lw=2.2)
 
 # ============================================================
 # KL Divergence Loss block (centered, bottom)
 # ============================================================
-draw_box(ax, CENTER_X, Y_LOSS, 4.4, 1.1,
+draw_box(diagram, CENTER_X, Y_LOSS, 4.4, 1.1,
          'KL Divergence Loss\nKL( P  ||  Q )',
          LOSS_BG, LOSS_BORDER, fontsize=13, textcolor=LOSS_DARK, linewidth=2.5, multiline=True)
 
 # Arrows from logits to KL loss
-draw_arrow(ax, LEFT_X, Y_LOGITS - BOX_H/2, CENTER_X - 0.5, Y_LOSS + 0.55,
+draw_arrow(diagram, LEFT_X, Y_LOGITS - BOX_H/2, CENTER_X - 0.5, Y_LOSS + 0.55,
            color=STUDENT_BORDER, lw=2.5, connectionstyle='arc3,rad=0.2')
-draw_arrow(ax, RIGHT_X, Y_LOGITS - BOX_H/2, CENTER_X + 0.5, Y_LOSS + 0.55,
+draw_arrow(diagram, RIGHT_X, Y_LOGITS - BOX_H/2, CENTER_X + 0.5, Y_LOSS + 0.55,
            color=TEACHER_BORDER, lw=2.5, connectionstyle='arc3,rad=-0.2')
 
 # P and Q labels near arrows going into KL block
@@ -203,7 +206,7 @@ ax.text(RIGHT_X - 0.6, Y_LOGITS - 0.85, 'Q', fontsize=13, fontweight='bold',
 # EMA arrow (student -> teacher), dotted, curved
 # ============================================================
 ema_y = Y_LLM
-draw_arrow(ax, LEFT_X + BOX_W/2, ema_y + 0.15, RIGHT_X - BOX_W/2, ema_y + 0.15,
+draw_arrow(diagram, LEFT_X + BOX_W/2, ema_y + 0.15, RIGHT_X - BOX_W/2, ema_y + 0.15,
            color=EMA_COLOR, lw=2.5, linestyle='--',
            connectionstyle='arc3,rad=-0.35', style='->')
 
@@ -245,7 +248,7 @@ ax.annotate(
 # ============================================================
 # Loss output arrow (downward from KL block)
 # ============================================================
-draw_arrow(ax, CENTER_X, Y_LOSS - 0.55, CENTER_X, Y_LOSS - 1.4,
+draw_arrow(diagram, CENTER_X, Y_LOSS - 0.55, CENTER_X, Y_LOSS - 1.4,
            color=LOSS_BORDER, lw=2.5, style='->', shrinkB=2)
 ax.text(CENTER_X, Y_LOSS - 1.65, 'Backprop to Student',
         ha='center', va='center', fontsize=10, fontweight='bold', color=LOSS_DARK,
@@ -267,22 +270,20 @@ ax.text(CENTER_X, 3.3, note_text,
 # Light background panels for each column
 # ============================================================
 # Student panel
-student_panel = FancyBboxPatch(
-    (LEFT_X - BOX_W/2 - 0.3, Y_LOGITS - BOX_H/2 - 0.25),
+diagram.box(
+    LEFT_X - BOX_W/2 - 0.3, Y_LOGITS - BOX_H/2 - 0.25,
     BOX_W + 0.6, (Y_LABELS + 0.35) - (Y_LOGITS - BOX_H/2 - 0.25),
     boxstyle="round,pad=0.2", facecolor=STUDENT_BG, edgecolor=STUDENT_BORDER,
     linewidth=1.0, alpha=0.15, zorder=0
 )
-ax.add_patch(student_panel)
 
 # Teacher panel
-teacher_panel = FancyBboxPatch(
-    (RIGHT_X - BOX_W/2 - 0.3, Y_LOGITS - BOX_H/2 - 0.25),
+diagram.box(
+    RIGHT_X - BOX_W/2 - 0.3, Y_LOGITS - BOX_H/2 - 0.25,
     BOX_W + 0.6, (Y_LABELS + 0.35) - (Y_LOGITS - BOX_H/2 - 0.25),
     boxstyle="round,pad=0.2", facecolor=TEACHER_BG, edgecolor=TEACHER_BORDER,
     linewidth=1.0, alpha=0.15, zorder=0
 )
-ax.add_patch(teacher_panel)
 
 # ============================================================
 # Save
@@ -1,34 +1,68 @@
 """
 fig_007: Memory Layout — Student and Teacher Model Components
 Side-by-side stacked bar chart comparing memory footprint breakdown.
+Parameter counts and memory are computed from the architecture config by figkit.params.
 """
 
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 import numpy as np
 
-# ---------- Data from Fact §4.9 ----------
-# Frozen LLM: ~6 GB float32 each
-# Trainable encoder: ~2M params → ~8 MB fp32
-# Projector: ~0.3M params → ~1.2 MB fp32
-# Flamingo cross-attention: ~50M params → ~200 MB fp32
-# Adam optimizer stores grad + m + v → ~3x extra for trainable params
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.params import (LLMS, Budget, activation_bytes, decoder,  # noqa: E402
+                           format_bytes, format_params, gated_cross_attention,
+                           patch_encoder, projector)
+
+# ---------- Architecture ----------
+# OpenTSLM-Flamingo as in self-distillation/fig_008.  Fact §4.9 sizes the
+# encoder (~2M), projector (~0.3M) and Flamingo layers (~50M), which these
+# shapes reproduce; its ~6 GB per frozen LLM is a ~1.5B model, more than
+# Llama-3.2-1B's 1.24B (4.9 GB).
+LLM = "Llama-3.2-1B"
+D_ENC = 128         # encoder width; the cross-attention keys and values read it
+XATTN_EVERY = 4     # gated xattn-dense block every K LLM layers
+XATTN_HEADS = 16    # x 64 dims
+XATTN_FF_MULT = 1   # dense feed-forward width, x d_LLM
+TOKENS = 512        # sequence length per sample
+BATCH = 1
+DTYPE = "float32"   # weights, gradients and Adam states
+
+llm = LLMS[LLM]
+budget = Budget()
+budget.add("LLM", decoder(llm), trainable=False)
+budget.add("Encoder", patch_encoder(4, D_ENC, positions=1024, layers=6, heads=8, ff=1024))
+budget.add("Projector", projector(D_ENC, llm.hidden, norm=True))
+budget.add("Flamingo", gated_cross_attention(llm.hidden, D_ENC,
+                                             layers=llm.layers // XATTN_EVERY,
+                                             heads=XATTN_HEADS, ff_mult=XATTN_FF_MULT))
+
+# Student: Adam stores grad + m + v for trainable params.
+# Teacher (EMA copy): forward only, so no gradients, optimizer states or saved activations.
+student = budget.memory(DTYPE, optimizer="adam", optimizer_dtype=DTYPE,
+                        activations=activation_bytes(llm, TOKENS, BATCH, DTYPE))
+teacher = budget.memory(DTYPE, training=False,
+                        activations=activation_bytes(llm, TOKENS, BATCH, DTYPE, training=False))
+
+GB = 1e9
 
 # --- Student model ---
-student_frozen_llm = 6.0        # GB, frozen — no gradients
-student_encoder_w = 0.008       # ~2M params fp32
-student_projector_w = 0.0012    # ~0.3M params fp32
-student_flamingo_w = 0.2        # ~50M params fp32
-student_grad_optim = (0.008 + 0.0012 + 0.2) * 3  # grad + 2 optimizer states
-student_activations = 1.5       # forward+backward activations estimate
+student_frozen_llm = student.weights["LLM"] / GB         # frozen — no gradients
+student_encoder_w = student.weights["Encoder"] / GB
+student_projector_w = student.weights["Projector"] / GB
+student_flamingo_w = student.weights["Flamingo"] / GB
+student_grad_optim = (student.gradients + student.optimizer) / GB  # grad + 2 optimizer states
+student_activations = student.activations / GB           # saved for the backward pass
 
 # --- Teacher model ---
-teacher_frozen_llm = 6.0
-teacher_encoder_w = 0.008
-teacher_projector_w = 0.0012
-teacher_flamingo_w = 0.2
+teacher_frozen_llm = teacher.weights["LLM"] / GB
+teacher_encoder_w = teacher.weights["Encoder"] / GB
+teacher_projector_w = teacher.weights["Projector"] / GB
+teacher_flamingo_w = teacher.weights["Flamingo"] / GB
 teacher_grad_optim = 0.0        # NO gradient storage
-teacher_activations = 0.6       # forward-only activations
+teacher_activations = teacher.activations / GB           # KV cache + one layer
 
 # ---------- Build stacked bars ----------
 # Stack order (bottom to top):
@@ -58,10 +92,10 @@ teacher_stack = [
 ]
 
 labels = [
-    "Frozen LLM (~6 GB)",
-    "Encoder (~2M params)",
-    "Projector (~0.3M params)",
-    "Flamingo layers (~50M params)",
+    f"Frozen LLM (~{format_bytes(student.weights['LLM'])})",
+    f"Encoder (~{format_params(budget['Encoder'].params)} params)",
+    f"Projector (~{format_params(budget['Projector'].params)} params)",
+    f"Flamingo layers (~{format_params(budget['Flamingo'].params)} params)",
     "Gradients + optimizer states",
     "Activations / KV-cache",
 ]
@@ -120,9 +154,9 @@ flamingo_mid_s = flamingo_bot_s + student_stack[3] / 2
 flamingo_bot_t = sum(teacher_stack[:3])
 flamingo_mid_t = flamingo_bot_t + teacher_stack[3] / 2
 
-# Place "Flamingo ~200 MB" text centrally, below the flamingo band
+# Place the Flamingo size text centrally, below the flamingo band
 ax.annotate(
-    "Flamingo ~200 MB (each)",
+    f"Flamingo ~{format_bytes(student.weights['Flamingo'], 0)} (each)",
     xy=(mid_x, flamingo_mid_s),
     xytext=(mid_x, flamingo_mid_s - 0.45),
     fontsize=9, ha="center", va="top", color="#D45B5B", fontweight="bold",
@@ -150,7 +184,7 @@ grad_top_s = sum(student_stack[:5])
 grad_bot_s = sum(student_stack[:4])
 grad_mid_s = (grad_top_s + grad_bot_s) / 2
 ax.annotate(
-    f"~{student_grad_optim*1000:.0f} MB\n(grad + optimizer)",
+    f"~{format_bytes(student.gradients + student.optimizer)}\n(grad + optimizer)",
     xy=(student_x - bar_width / 2, grad_mid_s),
     xytext=(student_x - bar_width / 2 - 0.15, grad_mid_s),
     fontsize=9, ha="right", va="center", color="#6B50A0", fontweight="bold",
@@ -210,7 +244,13 @@ ax.set_title(
 # ---------- Subtitle / note ----------
 fig.text(
     0.5, 0.005,
-    "Frozen LLM ~6 GB (float32) each  |  Trainable: encoder ~2M, projector ~0.3M, Flamingo ~50M params  |  Teacher maintained via EMA",
+    f"Frozen {LLM} ~{format_bytes(student.weights['LLM'])} ({DTYPE}) each  |  "
+    f"Trainable: encoder ~{format_params(budget['Encoder'].params)}, "
+    f"projector ~{format_params(budget['Projector'].params)}, "
+    f"Flamingo ~{format_params(budget['Flamingo'].params)} params  |  "
+    f"{TOKENS} tokens x {BATCH}  |  Teacher maintained via EMA\n"
+    f"Fact §4.9 quotes ~6 GB per frozen LLM, a ~1.5B model; {LLM} has "
+    f"{format_params(budget['LLM'].params)} params",
     ha="center", fontsize=9, color="#666666", style="italic",
 )
 
@@ -4,12 +4,27 @@ Illustrative diagram of the 5 eye-tracking metrics used as input channels:
 FFD, GD, GPT, TRT, nFixations — showing how they relate to eye movement during reading.
 """
 
+import os
+import sys
+
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+from matplotlib.colors import to_rgba
 from matplotlib.patches import FancyBboxPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.diagram import Diagram  # noqa: E402
+from figkit.eyetracking import bezier_arcs, read_zuco, word_metrics  # noqa: E402
+
+# Set to a ZuCo results .mat file (or a directory of them) to draw a real
+# scanpath: SUBJECT (default: the first) reading sentence SENTENCE.
+ZUCO = None
+SUBJECT = None
+SENTENCE = 0
+
 # ── Color palette ──────────────────────────────────────────────────────
 COLORS = {
     "FFD":        "#E63946",   # red
@@ -28,6 +43,48 @@ SCANPATH   = "#555555"
 
 # ── Sentence words ────────────────────────────────────────────────────
 words = ["The", "researcher", "analyzed", "the", "complex", "data", "carefully", "."]
+word_widths = [0.7, 1.7, 1.4, 0.7, 1.2, 0.8, 1.5, 0.4]
+word_fontsizes = [13] * len(words)
+# (word, pass) per fixation; real fixations also carry where in the word
+# they landed (0-1) and their duration
+fixation_seq = [
+    (0, 1), (1, 1), (1, 2), (2, 1), (3, 1),
+    (4, 1), (5, 1), (4, 2), (5, 2), (6, 1), (7, 1),
+]
+fixation_at = None
+fixation_ms = None
+focus_word = 4
+focus_metrics = None
+
+if ZUCO is not None:
+    fixations = read_zuco(ZUCO)
+    trial = fixations.trial_of(SUBJECT or fixations.subjects[0], SENTENCE)
+    metrics = word_metrics(fixations)
+    words = fixations.sentences[fixations.sentence[trial]]
+    box = fixations.bounds[trial, :len(words)]
+    # Real box widths, scaled so the sentence spans at most 13 units
+    gap_total = 0.15 * (len(words) - 1)
+    word_widths = list((box[:, 2] - box[:, 0]) * min(
+        (13 - gap_total) / np.nansum(box[:, 2] - box[:, 0]), 1.6 / np.nanmax(box[:, 2] - box[:, 0])))
+    # Monospace glyphs are about 0.6 em wide; 72 pt per unit at this size
+    word_fontsizes = [min(13, ww * 72 / (0.66 * max(len(w), 1))) for w, ww in zip(words, word_widths)]
+    rows = fixations.rows(trial)
+    on = fixations.word[rows] >= 0
+    seq = fixations.word[rows][on]
+    fixation_at = ((fixations.x[rows][on] - box[seq, 0]) / (box[seq, 2] - box[seq, 0])).clip(0, 1)
+    fixation_ms = fixations.duration[rows][on]
+    # Pass number: the rank of each run among the runs on its word
+    run = np.cumsum(np.r_[True, seq[1:] != seq[:-1]]) - 1
+    run_word = seq[np.r_[True, seq[1:] != seq[:-1]]]
+    order = np.argsort(run_word, kind="stable")
+    first = np.searchsorted(run_word[order], run_word[order])
+    run_pass = np.empty(len(run_word), int)
+    run_pass[order] = np.arange(len(order)) - first + 1
+    passes = run_pass[run]
+    fixation_seq = list(zip(seq.tolist(), passes.tolist()))
+    focus_word = int(np.argmax(metrics.nFix[trial, :len(words)]))
+    focus_metrics = {name: metrics[name][trial, focus_word]
+                     for name in ("FFD", "GD", "GPT", "TRT", "nFix")}
 n_words = len(words)
 
 # ── Figure layout ─────────────────────────────────────────────────────
@@ -54,7 +111,6 @@ ax.text(8, 13.1, "5 word-level metrics captured during reading, used as input ch
 word_y = 10.8
 box_h  = 0.6
 gap    = 0.15
-word_widths = [0.7, 1.7, 1.4, 0.7, 1.2, 0.8, 1.5, 0.4]
 total_w = sum(word_widths) + gap * (n_words - 1)
 start_x = 8 - total_w / 2
 
@@ -71,7 +127,7 @@ for i, (w, ww) in enumerate(zip(words, word_widths)):
     word_centers_x.append(cx)
     word_lefts.append(x)
     word_rights.append(x + ww)
-    ax.text(cx, word_y, w, fontsize=13, ha="center", va="center",
+    ax.text(cx, word_y, w, fontsize=word_fontsizes[i], ha="center", va="center",
             fontfamily="monospace", fontweight="bold", color="#1A1A2E")
     x += ww + gap
 
@@ -79,35 +135,29 @@ ax.text(start_x - 0.15, word_y, "Sentence:",
         fontsize=10, ha="right", va="center", color="#888888", fontweight="bold")
 
 # Scanpath
-fixation_seq = [
-    (0, 1), (1, 1), (1, 2), (2, 1), (3, 1),
-    (4, 1), (5, 1), (4, 2), (5, 2), (6, 1), (7, 1),
-]
-
 scan_y = 11.8
 fix_radius = 0.13
 
-# Saccade arrows
-for k in range(len(fixation_seq) - 1):
-    wi1, wi2 = fixation_seq[k][0], fixation_seq[k + 1][0]
-    x1, x2 = word_centers_x[wi1], word_centers_x[wi2]
-    if wi2 < wi1:  # regression
-        mid_x = (x1 + x2) / 2
-        mid_y = scan_y + 0.55
-        t = np.linspace(0, 1, 40)
-        sx = (1 - t)**2 * x1 + 2 * (1 - t) * t * mid_x + t**2 * x2
-        sy = (1 - t)**2 * scan_y + 2 * (1 - t) * t * mid_y + t**2 * scan_y
-        ax.plot(sx, sy, color="#CC4444", linewidth=1.2, alpha=0.6, linestyle="--")
-        ax.annotate("", xy=(x2, scan_y), xytext=(sx[-3], sy[-3]),
-                    arrowprops=dict(arrowstyle="->", color="#CC4444", lw=1.2))
-    else:
-        ax.annotate("", xy=(x2, scan_y), xytext=(x1, scan_y),
-                    arrowprops=dict(arrowstyle="->", color=SCANPATH, lw=0.9, alpha=0.5))
-
-# Fixation dots
+# Saccade arrows: all regression arcs as one collection, all arrows batched
+seq = np.array([wi for wi, _ in fixation_seq])
+fix_x = np.array(word_centers_x)[seq] if fixation_at is None \
+    else np.array(word_lefts)[seq] + fixation_at * np.array(word_widths)[seq]
+x1, x2 = fix_x[:-1], fix_x[1:]
+back = seq[1:] < seq[:-1]
+arcs = bezier_arcs(x1[back], scan_y, x2[back], scan_y, 0.55)
+ax.add_collection(LineCollection(arcs, colors="#CC4444", linewidths=1.2, alpha=0.6,
+                                 linestyles="--"))
+saccades = Diagram(ax)
+for (ax_, ay_), bx in zip(arcs[:, -3], x2[back]):
+    saccades.arrow(ax_, ay_, bx, scan_y, color="#CC4444", lw=1.2)
+for a, b in zip(x1[~back], x2[~back]):
+    saccades.arrow(a, scan_y, b, scan_y, color=to_rgba(SCANPATH, 0.5), lw=0.9)
+
+# Fixation dots: sized by pass in the schematic, by duration for real data
 for k, (wi, fn) in enumerate(fixation_seq):
-    r = fix_radius * (0.85 + 0.15 * fn)
-    circle = plt.Circle((word_centers_x[wi], scan_y), r,
+    r = fix_radius * (0.85 + 0.15 * fn) if fixation_ms is None \
+        else fix_radius * (0.6 + 0.6 * fixation_ms[k] / fixation_ms.max())
+    circle = plt.Circle((fix_x[k], scan_y), r,
                          facecolor=SCANPATH, edgecolor="white", linewidth=0.8, alpha=0.7, zorder=5)
     ax.add_patch(circle)
 
@@ -124,8 +174,7 @@ ax.annotate("", xy=(14.0, 12.5), xytext=(13.7, 12.5),
             arrowprops=dict(arrowstyle="->", color="#CC4444", lw=0.9))
 ax.text(14.15, 12.5, "regression", fontsize=9, va="center", color="#777")
 
-# Highlight "complex" as example word
-focus_word = 4
+# Highlight the example word
 fw_left = word_lefts[focus_word]
 fw_right = word_rights[focus_word]
 fw_cx = word_centers_x[focus_word]
@@ -148,7 +197,12 @@ tl_panel = FancyBboxPatch((1.0, 6.55), 14.0, 3.5,
                            facecolor="#FAFBFC", edgecolor="#E0E4E8", linewidth=1)
 ax.add_patch(tl_panel)
 
-ax.text(8, 9.8, 'Fixation timeline for "complex" — what each metric captures',
+timeline_title = f'Fixation timeline for "{words[focus_word]}" — what each metric captures'
+if focus_metrics is not None:
+    timeline_title = f'Fixation timeline for "{words[focus_word]}":  ' + "  ·  ".join(
+        f"{name} {value:.0f}" + ("" if name == "nFix" else " ms")
+        for name, value in focus_metrics.items())
+ax.text(8, 9.8, timeline_title,
         fontsize=11, ha="center", va="center", color="#333", fontweight="bold")
 
 # Timeline axis
@@ -5,6 +5,9 @@ through preprocessing, subject-based splitting, z-score normalization,
 TextTimeSeriesPrompt formatting, to model input.
 """
 
+import os
+import sys
+
 import matplotlib
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
@@ -12,6 +15,14 @@ import matplotlib.patches as mpatches
 from matplotlib.patches import FancyBboxPatch, FancyArrowPatch
 import numpy as np
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from figkit.zscore import SPLITS, load_report  # noqa: E402
+
+# Output directory of figkit.zscore.normalize_zuco (sources in figure order:
+# ZuCo 1.0, then 2.0).  When set, the split counts come from its report and
+# the stage boxes are annotated with their measured throughput.
+PIPELINE = None
+
 # ── colour palette ──────────────────────────────────────────────────
 C_RAW1   = "#E8D5B7"   # warm tan – ZuCo 1.0 raw
 C_RAW2   = "#D5C4E8"   # soft lavender – ZuCo 2.0 raw
@@ -86,17 +97,29 @@ row_top = 7.2   # ZuCo 1.0
 row_bot = 4.4   # ZuCo 2.0
 row_mid = 5.8   # merged path centre
 
+# Subjects per source and their (train, val, test) split
+report = load_report(PIPELINE) if PIPELINE else None
+split_counts = [(8, 2, 2), (10, 3, 3)]
+if report:
+    source_of = [s for s, _ in report.subjects]
+    split_counts = [tuple(sum(1 for src, sp in zip(source_of, report.splits)
+                              if src == s and sp == name) for name in SPLITS)
+                    for s in range(len(report.sources))]
+# A source the report does not have keeps its box, without a count
+subject_lines = [f"{sum(counts)} subjects" for counts in split_counts[:2]]
+subject_lines += ["not in the report"] * (2 - len(subject_lines))
+
 # ── STAGE 1: Raw .mat files ────────────────────────────────────────
 draw_box(ax, col_raw, row_top, box_w, box_h, C_RAW1, [
     "ZuCo 1.0 .mat",
-    "12 subjects",
+    subject_lines[0],
     "NR + TSR tasks",
     "MATLAB v5 format",
 ], fontsize=10)
 
 draw_box(ax, col_raw, row_bot, box_w, box_h, C_RAW2, [
     "ZuCo 2.0 .mat",
-    "16 subjects",
+    subject_lines[1],
     "NR + TSR tasks",
     "MATLAB v7.3 (HDF5)",
 ], fontsize=10)
@@ -251,12 +274,44 @@ for i, (lbl, desc) in enumerate(prompt_lines):
             color=C_TEXT, zorder=3)
 
 # ── Subject split detail annotation ────────────────────────────────
-# ZuCo 1.0 split
 annot_x = col_split + 0.1
-ax.text(annot_x, row_mid - 0.2, "ZuCo 1.0: 8 train / 2 val / 2 test subjects",
-        fontsize=8.5, color="#555555", style="italic", zorder=3)
-ax.text(annot_x, row_mid - 0.55, "ZuCo 2.0: 10 train / 3 val / 3 test subjects",
-        fontsize=8.5, color="#555555", style="italic", zorder=3)
+for i, (n_train, n_val, n_test) in enumerate(split_counts[:2]):
+    ax.text(annot_x, row_mid - 0.2 - 0.35 * i,
+            f"ZuCo {i + 1}.0: {n_train} train / {n_val} val / {n_test} test subjects",
+            fontsize=8.5, color="#555555", style="italic", zorder=3)
+
+
+# ── Measured throughput (figkit.zscore report) ─────────────────────
+def rate(value, unit):
+    for scale, suffix in ((1e9, "G"), (1e6, "M"), (1e3, "k")):
+        if value >= scale:
+            return f"{value / scale:.3g}{suffix} {unit}/s"
+    return f"{value:.3g} {unit}/s"
+
+
+if report:
+    C_RATE = "#B03A2E"
+    stage_boxes = [
+        ("read_v5", col_load, row_top, "fixations"),
+        ("read_v73", col_load, row_bot, "fixations"),
+        ("metrics", col_merge, row_mid - 0.55, "words"),
+        ("moments", col_split, row_mid - 0.55, "words"),
+        ("normalize", col_norm, row_mid - 0.55, "words"),
+    ]
+    for stage, x, y, unit in stage_boxes:
+        if not report.stages[stage].seconds:
+            continue
+        text = rate(report.throughput(stage), unit)
+        if stage.startswith("read") or stage == "normalize":
+            text += f" · {report.bandwidth(stage) / 1e6:.3g} MB/s"
+        ax.text(x + box_w / 2, y - 0.42, text, ha="center", va="center",
+                fontsize=8.5, fontweight="bold", color=C_RATE, zorder=3)
+    words = report.stages["normalize"].items
+    ax.text(11, 9.1,
+            f"Measured throughput per worker · {words:,} words from "
+            f"{len(report.subjects)} subjects on {report.workers} "
+            f"worker{'s' if report.workers > 1 else ''} in {report.wall:.1f} s",
+            ha="center", va="center", fontsize=9.5, color=C_RATE, style="italic")
 
 # ── Title ───────────────────────────────────────────────────────────
 ax.text(11, 9.55, "Data Processing Pipeline: ZuCo Eye-Tracking → OpenTSLM Model Input",